@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Agent CLI - Fast launcher for agent_v5.5.py commands
+
+Running `python3 agent_v5.5.py <cmd>` recompiles the 10k-line agent on every
+launch (a script run as __main__ never uses cached bytecode) and imports all
+of it before looking at the command. This launcher:
+
+- Answers quick commands without loading the agent at all:
+    status   - last run of every operation (dashboard status files)
+    recheck  - when no stocks were skipped for gaps today (the usual case)
+- Otherwise imports the agent as a module, so Python reuses the cached
+  bytecode in __pycache__, and runs its normal main()
+
+Heavy dependencies stay deferred inside the agent: alpaca-trade-api is only
+imported when the broker is created, pandas only for performance analysis and
+sendgrid only when a GO report email is sent.
+
+Usage (same arguments as agent_v5.5.py):
+  python3 agent_cli.py go
+  python3 agent_cli.py recheck
+  python3 agent_cli.py status
+
+Import cost per module: python3 scripts/import_time_report.py
+"""
+
+import importlib.util
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+AGENT_SCRIPT = PROJECT_DIR / 'agent_v5.5.py'
+AGENT_MODULE_NAME = 'agent_v5_5'
+STATUS_DIR = PROJECT_DIR / 'dashboard_data' / 'operation_status'
+
+
+def load_agent_module():
+    """Import agent_v5.5.py as a module (bytecode cached in __pycache__)"""
+    if AGENT_MODULE_NAME in sys.modules:
+        return sys.modules[AGENT_MODULE_NAME]
+    spec = importlib.util.spec_from_file_location(AGENT_MODULE_NAME, AGENT_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[AGENT_MODULE_NAME] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _save_response(command, response):
+    """Same daily_reviews entry TradingAgent.save_response writes"""
+    reviews_dir = PROJECT_DIR / 'daily_reviews'
+    reviews_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    with open(reviews_dir / f'{command}_{timestamp}.json', 'w') as f:
+        json.dump(response, f, indent=2)
+
+
+def _print_banner():
+    # Matches agent_v5.5.py main() so logs look the same either way
+    from zoneinfo import ZoneInfo
+    print(f"\n{'='*60}")
+    print(f"Paper Trading Lab Agent v8.2 (Exit/Analyze Split)")
+    print(f"Time: {datetime.now(ZoneInfo('America/New_York')).strftime('%Y-%m-%d %H:%M:%S ET')}")
+    print(f"{'='*60}")
+
+
+def quick_recheck():
+    """
+    RECHECK without loading the agent when nothing was skipped today
+
+    Returns:
+        True if handled here, False if the full agent is needed
+    """
+    from recheck_queue import load_recheck_queue, report_nothing_to_recheck
+
+    stocks, notes, response = load_recheck_queue(PROJECT_DIR)
+    if stocks:
+        return False
+
+    _print_banner()
+    print("\n" + "="*60)
+    print("RECHECK COMMAND - Gap Settlement Re-evaluation")
+    print("="*60)
+    report_nothing_to_recheck(notes, response, _save_response)
+    print("="*60)
+    print("RECHECK COMMAND COMPLETED SUCCESSFULLY")
+    print("="*60 + "\n")
+    return True
+
+
+def show_status():
+    """Print the last run of every operation from the dashboard status files"""
+    print(f"\n{'Operation':<20} {'Status':<10} {'Last run':<27} Error")
+    print("-" * 80)
+    for status_file in sorted(STATUS_DIR.glob('*_status.json')):
+        try:
+            status = json.loads(status_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        print(f"{status.get('operation', status_file.stem):<20} {status.get('status', '?'):<10} "
+              f"{str(status.get('last_run') or '-'):<27} {status.get('error') or ''}")
+    return True
+
+
+def main():
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else ''
+
+    if command == 'status':
+        show_status()
+        return 0
+    if command == 'recheck' and quick_recheck():
+        return 0
+
+    agent = load_agent_module()
+    sys.argv[0] = str(AGENT_SCRIPT)
+    agent.main()  # Exits non-zero on failure, like the script itself
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Agent Daemon - Resident agent service with an in-process scheduler
+
+Cron launches every command as a new process that re-imports the 10k-line
+agent, reconnects to Alpaca and starts with cold caches. The daemon keeps one
+process alive instead:
+
+- TradingAgent (Alpaca connection, daily-bar window cache) and the imported
+  agent/screener modules stay resident between commands
+- Commands run on an internal market-calendar-aware schedule (weekends and
+  market_holidays.py holidays skipped, EXIT/ANALYZE moved up on early-close days)
+- A local control socket (run/agent_daemon.sock) lets the run_*.sh wrappers
+  trigger commands; output streams back to the wrapper's log and the exit code
+  matches a direct run
+
+Commands run one at a time. Each once-per-day command (screener, pre_go, go,
+execute, recheck, exit, analyze) is skipped if it already completed today, so
+a cron trigger and the internal schedule never run the same command twice.
+Use --force to re-run deliberately.
+
+MONITOR never runs inside the daemon: it streams until MONITOR_END_TIME and
+would hold the run lock through RECHECK, EXIT and ANALYZE. `send monitor`
+always starts it as its own process (it shares the portfolio lock with the
+daemon's commands).
+
+Usage:
+  python3 agent_daemon.py serve [--no-schedule]   # Start the daemon (foreground)
+  python3 agent_daemon.py send go                 # Run a command via the daemon
+  python3 agent_daemon.py send learn 60 --force   # Extra args / force a re-run
+  python3 agent_daemon.py status                  # Schedule and last runs
+  python3 agent_daemon.py stop                    # Shut the daemon down
+
+`send` falls back to running the command directly when no daemon is listening,
+so wrappers keep working if the daemon is down.
+
+Environment:
+  AGENT_DAEMON_SCHEDULE   Override job times, e.g. "go=09:05,learn=off"
+  AGENT_DAEMON_GRACE_MIN  Max minutes late a scheduled job may still start (default 30)
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from agent_cli import load_agent_module
+from market_holidays import EARLY_CLOSE_2026, is_market_holiday
+
+ET = ZoneInfo('America/New_York')
+PROJECT_DIR = Path(__file__).parent
+SCREENER_SCRIPT = PROJECT_DIR / 'market_screener.py'
+SOCKET_PATH = PROJECT_DIR / 'run' / 'agent_daemon.sock'
+LOG_DIR = PROJECT_DIR / 'logs'
+STATUS_DIR = PROJECT_DIR / 'dashboard_data' / 'operation_status'
+
+# (command, 'HH:MM' ET, weekdays) - mirrors the cron schedule in CRON_SCHEDULE.md / TEDBOT_SYSTEM.md
+DEFAULT_SCHEDULE = [
+    ('screener', '07:00', (0, 1, 2, 3, 4)),
+    ('go', '09:00', (0, 1, 2, 3, 4)),
+    ('execute', '09:45', (0, 1, 2, 3, 4)),
+    ('recheck', '10:15', (0, 1, 2, 3, 4)),
+    ('exit', '15:45', (0, 1, 2, 3, 4)),
+    ('analyze', '16:30', (0, 1, 2, 3, 4)),
+    ('learn', '17:00', (4,)),  # Fridays: 30-day performance analysis
+]
+
+# Early-close days (1:00 PM ET): EXIT 15 min before and ANALYZE 30 min after the close
+EARLY_CLOSE_TIMES = {'exit': '12:45', 'analyze': '13:30'}
+
+VALID_COMMANDS = {'screener', 'pre_go', 'go', 'execute', 'recheck', 'exit', 'analyze', 'learn'}
+OWN_PROCESS_COMMANDS = {'monitor'}  # Long-running: never holds the daemon's run lock
+ONCE_PER_DAY = {'screener', 'pre_go', 'go', 'execute', 'recheck', 'exit', 'analyze'}
+SCHEDULE_GRACE_MINUTES = int(os.getenv('AGENT_DAEMON_GRACE_MIN', '30'))
+SCHEDULER_POLL_SECONDS = 20
+
+EXIT_MARKER = '__AGENT_DAEMON_EXIT__'
+
+
+def load_schedule(spec: Optional[str] = None) -> List[tuple]:
+    """DEFAULT_SCHEDULE with AGENT_DAEMON_SCHEDULE overrides ("cmd=HH:MM" or "cmd=off")"""
+    spec = os.getenv('AGENT_DAEMON_SCHEDULE', '') if spec is None else spec
+    overrides = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        command, _, value = item.partition('=')
+        overrides[command.strip().lower()] = value.strip().lower()
+
+    schedule = []
+    for command, at, weekdays in DEFAULT_SCHEDULE:
+        value = overrides.get(command, at)
+        if value == 'off':
+            continue
+        datetime.strptime(value, '%H:%M')  # Validate
+        schedule.append((command, value, weekdays))
+    return schedule
+
+
+def scheduled_time(command: str, at: str, day: date) -> datetime:
+    """ET datetime a job runs on `day` (early-close days shift EXIT/ANALYZE)"""
+    if day in EARLY_CLOSE_2026 and command in EARLY_CLOSE_TIMES:
+        at = EARLY_CLOSE_TIMES[command]
+    hour, minute = map(int, at.split(':'))
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=ET)
+
+
+def due_jobs(schedule: List[tuple], now: datetime, completed: Dict[str, str]) -> List[str]:
+    """Commands whose time has come today (within the grace window) and that have not run yet"""
+    today = now.date()
+    if is_market_holiday(today):
+        return []
+
+    due = []
+    for command, at, weekdays in schedule:
+        if today.weekday() not in weekdays or completed.get(command) == today.isoformat():
+            continue
+        run_at = scheduled_time(command, at, today)
+        if run_at <= now < run_at + timedelta(minutes=SCHEDULE_GRACE_MINUTES):
+            due.append(command)
+    return due
+
+
+class _Tee:
+    """Write-only stream copying output to several targets (log file, control socket client)"""
+
+    def __init__(self, *streams):
+        self.streams = [s for s in streams if s is not None]
+
+    def write(self, data):
+        for stream in list(self.streams):
+            try:
+                stream.write(data)
+            except (OSError, ValueError):
+                self.streams.remove(stream)  # Client disconnected - keep running the command
+        return len(data)
+
+    def flush(self):
+        for stream in list(self.streams):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                self.streams.remove(stream)
+
+
+class AgentDaemon:
+    """Resident TradingAgent + screener, a scheduler loop and a control socket"""
+
+    def __init__(self, schedule_enabled: bool = True):
+        self.schedule = load_schedule() if schedule_enabled else []
+        self.started_at = datetime.now(ET)
+        self.completed: Dict[str, str] = {}  # {command: 'YYYY-MM-DD'} last successful run
+        self.history: List[Dict] = []
+        self.current: Optional[str] = None
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+
+        print("Loading agent and screener modules...")
+        started = time.time()
+        self.agent_module = load_agent_module()
+        import market_screener
+        self.screener_module = market_screener
+        self.agent = self.agent_module.TradingAgent()
+        print(f"✓ Agent resident ({time.time() - started:.1f}s startup paid once)")
+
+    # ------------------------------------------------------------------
+    # Command execution
+    # ------------------------------------------------------------------
+
+    def _refresh_module_state(self):
+        """Recompute values the agent derives once at import (strategy files change during the day)"""
+        self.agent_module.RULESET_VERSION = self.agent_module.get_ruleset_version()
+        self.agent_module.UNIVERSE_VERSION = self.agent_module.get_universe_version()
+
+    def _execute(self, command: str, args: List[str]) -> bool:
+        """Run one command in-process; output goes to the current sys.stdout"""
+        print(f"\n{'='*60}")
+        print(f"Paper Trading Lab Agent v8.2 (daemon)")
+        print(f"Time: {datetime.now(ET).strftime('%Y-%m-%d %H:%M:%S ET')}")
+        print(f"{'='*60}")
+
+        if command == 'screener':
+            screener = self.screener_module.MarketScreener()  # Fresh per-scan state, module stays loaded
+            # Same deadline and fresh degraded-data flags as a cron-launched scan
+            screener.save_results(self.screener_module.run_scan_with_deadline(screener))
+            print("\n✓ Market screening completed successfully")
+            success = True
+        else:
+            self._refresh_module_state()
+            success = self.agent_module.run_command(self.agent, command, args)
+
+        print("=" * 60)
+        print(f"{command.upper()} COMMAND {'COMPLETED SUCCESSFULLY' if success else 'FAILED'}")
+        print("=" * 60 + "\n")
+        return success
+
+    def run(self, command: str, args: Optional[List[str]] = None, force: bool = False,
+            source: str = 'socket', output=None) -> int:
+        """
+        Run a command (serialized); returns a process-style exit code
+
+        0 = success or skipped (already completed today), 1 = failed
+        """
+        args = list(args or [])
+        with self._run_lock:
+            today = datetime.now(ET).date().isoformat()
+            if not force and command in ONCE_PER_DAY and self.completed.get(command) == today:
+                message = f"{command.upper()} already completed today - skipped (use --force to re-run)"
+                print(f"[daemon] {message}")
+                if output is not None:
+                    output.write(message + '\n')
+                return 0
+
+            log_file = None
+            if source == 'schedule':
+                # Scheduled runs log and report status like the run_*.sh wrappers
+                LOG_DIR.mkdir(parents=True, exist_ok=True)
+                log_file = open(LOG_DIR / f'{command}.log', 'a')
+                log_file.write(f"{'='*60}\n{command.upper()} Command Starting (daemon schedule): "
+                               f"{datetime.now(ET).strftime('%c')}\n{'='*60}\n")
+                self._write_status(command, 'RUNNING')
+
+            self.current = command
+            started = time.time()
+            tee = _Tee(sys.__stdout__, log_file, output)
+            success = False
+            try:
+                with contextlib.redirect_stdout(tee), contextlib.redirect_stderr(tee):
+                    try:
+                        success = bool(self._execute(command, args))
+                    except Exception as e:
+                        print(f"\n{'='*60}")
+                        print(f"FATAL ERROR: {e}")
+                        print("=" * 60)
+                        traceback.print_exc()
+            finally:
+                self.current = None
+                duration = time.time() - started
+                if success:
+                    self.completed[command] = today
+                self.history.append({
+                    'command': command, 'source': source, 'success': success,
+                    'finished_at': datetime.now(ET).isoformat(timespec='seconds'),
+                    'duration_seconds': round(duration, 1),
+                })
+                self.history = self.history[-50:]
+                if log_file:
+                    log_file.write(f"{command.upper()} command {'completed successfully' if success else 'failed'}: "
+                                   f"{datetime.now(ET).strftime('%c')}\n")
+                    log_file.close()
+                    self._write_status(command, 'SUCCESS' if success else 'FAILED',
+                                       '' if success else f"{command.upper()} command failed")
+
+        # Same opt-in chaining as run_screener.sh (after releasing the run lock)
+        if success and command == 'screener' and source == 'schedule' and os.getenv('PRE_GO_ENABLED', 'false') == 'true':
+            self.run('pre_go', source='schedule')
+        return 0 if success else 1
+
+    @staticmethod
+    def _write_status(command: str, status: str, error: str = ''):
+        """Same JSON shape the run_*.sh wrappers write for the dashboard"""
+        try:
+            STATUS_DIR.mkdir(parents=True, exist_ok=True)
+            payload = {
+                'operation': command.upper(),
+                'last_run': datetime.now(ET).isoformat(timespec='seconds'),
+                'status': status,
+                'log_file': str(LOG_DIR / f'{command}.log'),
+                'error': error,
+            }
+            (STATUS_DIR / f'{command}_status.json').write_text(json.dumps(payload, indent=2))
+        except Exception as e:
+            print(f"[daemon] ⚠️ Could not write status for {command}: {e}")
+
+    def status(self) -> Dict:
+        now = datetime.now(ET)
+        return {
+            'pid': os.getpid(),
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'current': self.current,
+            'market_open_today': not is_market_holiday(now.date()),
+            'schedule': [
+                {'command': command, 'at': scheduled_time(command, at, now.date()).strftime('%H:%M'),
+                 'weekdays': list(weekdays), 'completed_today': self.completed.get(command) == now.date().isoformat()}
+                for command, at, weekdays in self.schedule
+            ],
+            'recent_runs': self.history[-10:],
+        }
+
+    # ------------------------------------------------------------------
+    # Control socket
+    # ------------------------------------------------------------------
+
+    def _start_socket_server(self):
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline().decode('utf-8') or '{}')
+                except json.JSONDecodeError:
+                    request = {}
+                action = request.get('action', 'run')
+                writer = _SocketWriter(self.wfile)
+
+                if action == 'ping':
+                    writer.write('pong\n')
+                    code = 0
+                elif action == 'status':
+                    writer.write(json.dumps(daemon.status(), indent=2) + '\n')
+                    code = 0
+                elif action == 'stop':
+                    writer.write('stopping\n')
+                    daemon.stop()
+                    code = 0
+                elif action == 'run' and request.get('command') in OWN_PROCESS_COMMANDS:
+                    writer.write(f"{request['command']} runs in its own process, not in the daemon\n")
+                    code = 2
+                elif action == 'run' and request.get('command') in VALID_COMMANDS:
+                    code = daemon.run(request['command'], request.get('args'), request.get('force', False),
+                                      source='socket', output=writer)
+                else:
+                    writer.write(f"Unknown request: {request}\n")
+                    code = 2
+                writer.write(f"{EXIT_MARKER} {code}\n")
+
+        SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+        if SOCKET_PATH.exists():
+            if _daemon_listening():
+                raise RuntimeError(f"Another daemon is already listening on {SOCKET_PATH}")
+            SOCKET_PATH.unlink()  # Stale socket from a crashed daemon
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(SOCKET_PATH), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='control-socket', daemon=True).start()
+        print(f"✓ Control socket listening on {SOCKET_PATH}")
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def serve(self):
+        self._start_socket_server()
+        if self.schedule:
+            print("✓ Schedule (ET): " + ', '.join(f"{command} {at}" for command, at, _ in self.schedule))
+        else:
+            print("✓ Internal schedule disabled - commands run only when triggered")
+
+        try:
+            while not self._stop.is_set():
+                for command in due_jobs(self.schedule, datetime.now(ET), self.completed):
+                    if self._stop.is_set():
+                        break
+                    self.run(command, source='schedule')
+                self._stop.wait(SCHEDULER_POLL_SECONDS)
+        finally:
+            if self._server:
+                self._server.shutdown()
+                self._server.server_close()
+            if SOCKET_PATH.exists():
+                SOCKET_PATH.unlink()
+            print("Agent daemon stopped")
+
+    def stop(self):
+        self._stop.set()
+
+
+class _SocketWriter:
+    """Text wrapper over a socket file with line-buffered flushing"""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, data):
+        self.wfile.write(data.encode('utf-8', errors='replace'))
+        if '\n' in data:
+            self.wfile.flush()
+        return len(data)
+
+    def flush(self):
+        self.wfile.flush()
+
+
+# ----------------------------------------------------------------------
+# Client side (used by run_*.sh wrappers)
+# ----------------------------------------------------------------------
+
+def _connect() -> Optional[socket.socket]:
+    if not SOCKET_PATH.exists():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(SOCKET_PATH))
+        return client
+    except OSError:
+        client.close()
+        return None
+
+
+def _daemon_listening() -> bool:
+    client = _connect()
+    if client is None:
+        return False
+    client.close()
+    return True
+
+
+def send_request(request: Dict) -> Optional[int]:
+    """Send one request and stream the reply to stdout; None if no daemon is listening"""
+    client = _connect()
+    if client is None:
+        return None
+
+    with client, client.makefile('rb') as reply:
+        client.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        code = 1  # Connection dropped before the exit marker (daemon died mid-command)
+        for raw in reply:
+            line = raw.decode('utf-8', errors='replace')
+            if line.startswith(EXIT_MARKER):
+                code = int(line.split()[1])
+                break
+            sys.stdout.write(line)
+            sys.stdout.flush()
+    return code
+
+
+def run_directly(command: str, args: List[str]) -> int:
+    """Fallback when the daemon is down: same process launch as before the daemon existed"""
+    if command == 'screener':
+        argv = [sys.executable, str(SCREENER_SCRIPT)]
+    else:
+        argv = [sys.executable, str(PROJECT_DIR / 'agent_cli.py'), command] + args
+    return subprocess.call(argv, cwd=str(PROJECT_DIR))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident trading agent daemon')
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    serve = sub.add_parser('serve', help='Start the daemon in the foreground')
+    serve.add_argument('--no-schedule', action='store_true', help='Only run commands triggered over the socket')
+
+    send = sub.add_parser('send', help='Run a command through the daemon')
+    send.add_argument('command', choices=sorted(VALID_COMMANDS | OWN_PROCESS_COMMANDS))
+    send.add_argument('args', nargs='*')
+    send.add_argument('--force', action='store_true', help='Re-run even if already completed today')
+
+    sub.add_parser('status', help='Show schedule and recent runs')
+    sub.add_parser('stop', help='Stop a running daemon')
+
+    args = parser.parse_args()
+
+    if args.action == 'serve':
+        daemon = AgentDaemon(schedule_enabled=not args.no_schedule)
+        signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+        signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+        daemon.serve()
+        return 0
+
+    if args.action == 'send':
+        if args.command in OWN_PROCESS_COMMANDS:
+            print(f"[daemon] {args.command} runs in its own process")
+            return run_directly(args.command, args.args)
+        code = send_request({'action': 'run', 'command': args.command, 'args': args.args, 'force': args.force})
+        if code is None:
+            print(f"[daemon] Not running - executing {args.command} directly")
+            code = run_directly(args.command, args.args)
+        return code
+
+    code = send_request({'action': args.action})
+    if code is None:
+        print("Agent daemon is not running")
+        return 1
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -275,14 +275,26 @@ from pathlib import Path
 import traceback
 import pytz
 import hashlib
-
-# SendGrid for email notifications
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# v10.8: Local modules (recheck_queue, allocation, market_data, ...) resolve from the
+# agent's own directory - tests and tools load this file by path from elsewhere
+AGENT_DIR = str(Path(__file__).resolve().parent)
+if AGENT_DIR not in sys.path:
+    sys.path.insert(0, AGENT_DIR)
+
+# v10.8: current_portfolio.json writes are serialized across commands (MONITOR runs
+# alongside RECHECK and ANALYZE); without fcntl they are still atomic, just unlocked
 try:
-    from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail
-    SENDGRID_AVAILABLE = True
+    import fcntl
+    FCNTL_AVAILABLE = True
 except ImportError:
-    SENDGRID_AVAILABLE = False
+    FCNTL_AVAILABLE = False
+
+# SendGrid for email notifications (v10.8: imported only when a GO report is sent)
+SENDGRID_AVAILABLE = importlib.util.find_spec('sendgrid') is not None
 
 # Alpaca Integration (v7.2 - Phase 1: Paper Trading)
 try:
@@ -292,6 +304,58 @@ except ImportError:
     print("⚠️  AlpacaBroker not available - using JSON file portfolio tracking")
     ALPACA_AVAILABLE = False
 
+# Claude call ledger (v10.7 - per-call latency/token/cost tracking)
+try:
+    from claude_ledger import record_claude_call, LEDGER as CLAUDE_LEDGER
+    LEDGER_AVAILABLE = True
+except ImportError:
+    LEDGER_AVAILABLE = False
+
+# Shared cross-command cache (v10.8 - reuse bars/prices/news fetched by earlier commands)
+try:
+    from warm_cache import WARM_CACHE
+    WARM_CACHE_AVAILABLE = True
+except ImportError:
+    WARM_CACHE_AVAILABLE = False
+
+# Incremental per-ticker indicator state (v10.8 - advanced by new bars, shared with the screener)
+try:
+    from indicator_state import INDICATOR_STORE
+    INDICATOR_STATE_AVAILABLE = True
+except ImportError:
+    INDICATOR_STATE_AVAILABLE = False
+
+# Incremental session VWAP from minute bars (v10.8 - RECHECK pullback-to-VWAP)
+try:
+    from minute_vwap import MINUTE_VWAP
+    MINUTE_VWAP_AVAILABLE = True
+except ImportError:
+    MINUTE_VWAP_AVAILABLE = False
+
+from recheck_queue import load_recheck_queue, report_nothing_to_recheck
+
+# Constraint-based sizing of EXECUTE buys (v10.8)
+from allocation import BuyRequest, conviction_of, solve_allocation
+
+# Provider-abstracted bars/prices with health-based failover, circuit breakers and deadlines (v10.8)
+from market_data import (MARKET_DATA, COMMAND_BUDGET_SECONDS, Deadline, ProviderError, deadline_passed,
+                         deadline_scope, select_snapshot_price)
+from market_holidays import EARLY_CLOSE_2026
+
+# Event-driven intraday monitor (v10.8)
+try:
+    from position_monitor import PositionMonitor, ReplayFeed, AlpacaTradeFeed, IntentKind
+    MONITOR_AVAILABLE = True
+except ImportError:
+    MONITOR_AVAILABLE = False
+
+# Concurrent order submission with stream-tracked fills (v10.8)
+try:
+    from order_manager import OrderManager, OrderTicket, TradeUpdatesFeed
+    ORDER_MANAGER_AVAILABLE = True
+except ImportError:
+    ORDER_MANAGER_AVAILABLE = False
+
 # Stagnation Scorer (v8.8 - Dead Capital Detection)
 try:
     from stagnation_scorer import StagnationScorer, StagnationState, StagnationAction
@@ -309,6 +373,42 @@ CLAUDE_API_URL = 'https://api.anthropic.com/v1/messages'
 CLAUDE_MODEL = 'claude-sonnet-4-5-20250929'
 PROJECT_DIR = Path(__file__).parent
 
+# v10.8: Pre-GO preparation (opt-in, chained after the screener by run_screener.sh)
+# GO reuses the prepared candidate text, context and enrichment when it is fresh,
+# leaving only premarket prices and the final Claude call on the 9:00 critical path
+PRE_GO_FILE = PROJECT_DIR / 'portfolio_data' / 'pre_go_prepared.json'
+PRE_GO_WORKERS = int(os.environ.get('PRE_GO_WORKERS', '5'))
+
+# v10.8: GO enrichment engine - one daily-bar window per ticker shared by all checks
+ENRICHMENT_BAR_DAYS = 400  # Widest window any GO check needs (Stage 2: 52 weeks + 200-day MA)
+GO_ENRICHMENT_WORKERS = int(os.environ.get('GO_ENRICHMENT_WORKERS', '8'))
+
+# v10.8: Intraday position monitor (MONITOR command)
+MONITOR_END_TIME = os.environ.get('MONITOR_END_TIME', '15:40')  # Hand over to EXIT at 3:45 PM
+MONITOR_AUTO_EXIT = os.environ.get('MONITOR_AUTO_EXIT', 'false').lower() == 'true'
+MONITOR_REFRESH_SECONDS = float(os.environ.get('MONITOR_REFRESH_SECONDS', '60'))  # Pick up RECHECK entries
+EXIT_INTENTS_FILE = PROJECT_DIR / 'portfolio_data' / 'exit_intents.jsonl'
+
+# v10.8: EXIT news sweep - the whole book's news fetched concurrently, once, then
+# scored for invalidation in one pass (scores cached per article set)
+NEWS_SWEEP_LIMIT = 20
+NEWS_SWEEP_DAYS = 3            # Claude exit review window
+NEWS_INVALIDATION_DAYS = 2     # Invalidation scoring window (subset of the sweep)
+NEWS_SWEEP_WORKERS = int(os.environ.get('NEWS_SWEEP_WORKERS', '8'))
+
+# v10.8: Correlation-aware portfolio construction (correlation.py; "correlated" = CORRELATION_HIGH)
+# A BUY is rejected when this many held/accepted names already move with it;
+# rotation targets that duplicate a remaining holding lose CORRELATION_ROTATION_PENALTY points
+MAX_CORRELATED_POSITIONS = int(os.environ.get('MAX_CORRELATED_POSITIONS', '2'))
+CORRELATION_ROTATION_PENALTY = int(os.environ.get('CORRELATION_ROTATION_PENALTY', '20'))
+
+# v10.8: Command deadlines ('HH:MM' ET). Once a command's deadline passes its market
+# data fetches fail fast and it finishes on cached / partial data, flagged in its
+# output. Override with COMMAND_DEADLINES="go=09:25,exit=off". Other commands, and
+# runs started after their deadline, get COMMAND_BUDGET_SECONDS.
+DEFAULT_COMMAND_DEADLINES = {'go': '09:30', 'execute': '10:05', 'recheck': '10:45', 'exit': '15:58'}
+EARLY_CLOSE_DEADLINES = {'exit': '12:58'}  # 1:00 PM ET close
+
 # System version tracking (Enhancement 4.7)
 SYSTEM_VERSION = 'v8.0'  # Alpaca Paper Trading Integration (real brokerage API execution)
 
@@ -536,6 +636,10 @@ class TradingAgent:
         self.exclusions_file = self.project_dir / 'strategy_evolution' / 'catalyst_exclusions.json'
         self.daily_activity_file = self.project_dir / 'portfolio_data' / 'daily_activity.json'
 
+        # v10.8: Daily aggregate windows shared across checks ({ticker: {'start', 'results'}});
+        # cleared at the start of every command (reset_command_state)
+        self._daily_aggs_cache = {}
+
         # Initialize Alpaca broker (v7.2 - Phase 1: Paper Trading Integration)
         self.broker = None
         self.use_alpaca = False
@@ -543,6 +647,7 @@ class TradingAgent:
             try:
                 self.broker = AlpacaBroker()
                 self.use_alpaca = True
+                MARKET_DATA.providers['alpaca'].attach(self.broker.api)  # v10.8: reuse the client for data failover
                 print("✓ Alpaca broker connected (paper trading mode)")
             except Exception as e:
                 print(f"⚠️  Alpaca broker initialization failed: {e}")
@@ -714,93 +819,11 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         - BREAKAWAY GAP (5-7.9%): Strong but wait for consolidation
         - CONTINUATION GAP (2-4.9%): Tradeable, wait 15min
         - NORMAL (<2%): Enter at open
+        - UNKNOWN (missing price data): Proceed
         """
-        # Handle None values gracefully
-        if previous_close is None or current_price is None:
-            return {
-                'gap_pct': 0,
-                'classification': 'UNKNOWN',
-                'entry_strategy': 'PROCEED',
-                'reasoning': 'Unable to calculate gap (missing price data)',
-                'recommended_action': 'Enter at current price',
-                'should_enter_at_open': True,
-                'should_exit_at_open': False,
-                'risk_level': 'MEDIUM'
-            }
-
-        gap_pct = ((current_price - previous_close) / previous_close) * 100 if previous_close > 0 else 0
-
-        # v8.9.8: Updated gap thresholds - EXECUTE runs at 9:45 AM (15min after open)
-        # Only skip for very large gaps (>=8%), allow others with appropriate caution
-        if gap_pct >= 8.0:
-            return {
-                'gap_pct': gap_pct,
-                'classification': 'EXHAUSTION_GAP',
-                'entry_strategy': 'WAIT_FOR_PULLBACK_OR_SKIP',
-                'reasoning': f'Gap {gap_pct:+.1f}% too large, high fade risk',
-                'recommended_action': 'Wait for gap fill to support or skip entirely',
-                'should_enter_at_open': False,  # Skip and save for RECHECK
-                'should_exit_at_open': False,
-                'risk_level': 'HIGH'
-            }
-        elif gap_pct >= 5.0:
-            # 5-8% gap: Enter with caution at 9:45 AM (opening volatility has passed)
-            return {
-                'gap_pct': gap_pct,
-                'classification': 'BREAKAWAY_GAP',
-                'entry_strategy': 'ENTER_WITH_CAUTION',
-                'reasoning': f'Gap {gap_pct:+.1f}% strong but 9:45 AM entry after opening rush',
-                'recommended_action': 'Enter with reduced size or tighter stop',
-                'should_enter_at_open': True,  # v8.9.8: Allow entry at 9:45 AM
-                'should_exit_at_open': True,
-                'risk_level': 'MEDIUM'
-            }
-        elif gap_pct >= 3.0:
-            # 3-5% gap: Enter normally at 9:45 AM with logging
-            return {
-                'gap_pct': gap_pct,
-                'classification': 'CONTINUATION_GAP',
-                'entry_strategy': 'ENTER_AT_945AM',
-                'reasoning': f'Gap {gap_pct:+.1f}% reasonable, 9:45 AM entry after opening volatility',
-                'recommended_action': 'Normal entry with gap noted',
-                'should_enter_at_open': True,  # v8.9.8: Allow entry
-                'should_exit_at_open': True,
-                'risk_level': 'LOW'
-            }
-        elif gap_pct >= 2.0:
-            # 2-3% gap: Normal entry, minimal concern
-            return {
-                'gap_pct': gap_pct,
-                'classification': 'SMALL_GAP',
-                'entry_strategy': 'ENTER_NORMALLY',
-                'reasoning': f'Gap {gap_pct:+.1f}% minimal',
-                'recommended_action': 'Normal entry',
-                'should_enter_at_open': True,  # v8.9.8: Allow entry
-                'should_exit_at_open': True,
-                'risk_level': 'LOW'
-            }
-        elif gap_pct <= -3.0:
-            return {
-                'gap_pct': gap_pct,
-                'classification': 'GAP_DOWN',
-                'entry_strategy': 'ENTER_AT_OPEN_BUYING_WEAKNESS',
-                'reasoning': f'Gap {gap_pct:+.1f}% down, buying weakness',
-                'recommended_action': 'Enter at open if thesis intact',
-                'should_enter_at_open': True,
-                'should_exit_at_open': True,
-                'risk_level': 'MEDIUM'
-            }
-        else:
-            return {
-                'gap_pct': gap_pct,
-                'classification': 'NORMAL',
-                'entry_strategy': 'ENTER_AT_OPEN',
-                'reasoning': f'Gap {gap_pct:+.1f}% minimal',
-                'recommended_action': 'Normal entry at market open',
-                'should_enter_at_open': True,
-                'should_exit_at_open': True,
-                'risk_level': 'LOW'
-            }
+        # v10.8: Thresholds live in gap_engine (shared with EXECUTE's batched snapshot)
+        from gap_engine import classify, gap_analysis  # v10.8: deferred - numpy adds ~80ms to agent startup
+        return gap_analysis(*classify(previous_close, current_price))
 
     def get_dynamic_profit_target(self, catalyst_tier, catalyst_type, catalyst_details=None):
         """
@@ -945,22 +968,14 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         """
         try:
             # Fetch 260 trading days (~52 weeks + buffer)
-            end_date = datetime.now(ET).strftime('%Y-%m-%d')
-            start_date = (datetime.now(ET) - timedelta(days=400)).strftime('%Y-%m-%d')
+            # v10.8: Served from the prefetched window when available
+            results = self._get_daily_aggs(ticker, 400)
 
-            response = requests.get(
-                f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date}/{end_date}',
-                params={'apiKey': POLYGON_API_KEY, 'limit': 50000},
-                timeout=15
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            if not data.get('results') or len(data['results']) < 200:
+            if len(results) < 200:
                 return {'stage2': False, 'error': 'Insufficient data', 'ticker': ticker}
 
             # Extract closing prices
-            prices = [bar['c'] for bar in data['results']]
+            prices = results.close.tolist()
 
             if len(prices) < 200:
                 return {'stage2': False, 'error': f'Only {len(prices)} days of data', 'ticker': ticker}
@@ -1014,7 +1029,38 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         except Exception as e:
             return {'stage2': False, 'error': str(e), 'ticker': ticker}
 
-    def enforce_sector_concentration(self, new_positions, current_portfolio, leading_sectors=None):
+    def correlation_matrix(self, tickers):
+        """
+        v10.8: Daily-return correlation matrix for held positions plus candidates
+
+        Built from the shared daily-bar windows (prefetch / warm cache) in one
+        vectorized pass and cached until the close (correlation.py).
+
+        Returns: CorrelationMatrix, or None if unavailable (checks are then skipped)
+        """
+        tickers = [t for t in dict.fromkeys(tickers) if t]
+        if len(tickers) < 2:
+            return None
+        try:
+            from correlation import CORRELATION_ENGINE  # v10.8: deferred - numpy adds ~80ms to agent startup
+            return CORRELATION_ENGINE.matrix(tickers, self._correlation_bars)
+        except Exception as e:
+            print(f"   ⚠️ Correlation matrix unavailable: {e}")
+            return None
+
+    def _correlation_bars(self, tickers):
+        """Bar windows for the correlation lookback, one prefetch for all tickers"""
+        from correlation import CORRELATION_BAR_DAYS  # v10.8: deferred - numpy adds ~80ms to agent startup
+        self.prefetch_daily_aggs(tickers)
+        bars = {}
+        for ticker in tickers:
+            try:
+                bars[ticker] = self._get_daily_aggs(ticker, CORRELATION_BAR_DAYS)
+            except Exception as e:
+                print(f"   ⚠️ {ticker}: No bars for correlation ({e})")
+        return bars
+
+    def enforce_sector_concentration(self, new_positions, current_portfolio, leading_sectors=None, exit_tickers=None):
         """
         Enhancement 1.3 + 4.3: Enforce sector concentration limits to reduce correlation risk
 
@@ -1026,11 +1072,15 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         - EXCEPTION: Allow 3 positions if sector is in top 2 leading sectors (+3% vs SPY)
         - Maximum 2 positions per industry (20% of portfolio)
         - Alert if 2+ positions in same sub-sector (high correlation warning)
+        - v10.8: Reject a BUY when MAX_CORRELATED_POSITIONS held/accepted names
+          already have return correlation >= CORRELATION_HIGH with it (sector
+          labels miss co-moving names in "different" sectors)
 
         Args:
             new_positions: List of positions to validate
             current_portfolio: Current portfolio positions
             leading_sectors: List of top 2 leading sectors (from screener data)
+            exit_tickers: Positions being exited today (not counted as held)
 
         Returns:
         - accepted_positions: List of positions that passed validation
@@ -1054,6 +1104,12 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         sector_counts = {}
         industry_counts = {}
 
+        # v10.8: Correlation clusters over the book that remains after today's exits
+        exit_tickers = set(exit_tickers or [])
+        held_tickers = [p if isinstance(p, str) else p.get('ticker') for p in current_portfolio]
+        held_tickers = [t for t in dict.fromkeys(held_tickers) if t and t not in exit_tickers]
+        correlations = self.correlation_matrix(held_tickers + [p.get('ticker') for p in new_positions])
+
         # Validate new positions
         accepted_positions = []
         rejected_positions = []
@@ -1063,6 +1119,20 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             sector = new_pos.get('sector', 'Unknown')
             industry = new_pos.get('industry', 'Unknown')
 
+            if correlations:
+                book = held_tickers + [p.get('ticker') for p in accepted_positions]
+                peers = correlations.correlated_with(ticker, book)
+                if len(peers) >= MAX_CORRELATED_POSITIONS:
+                    rejected_positions.append({
+                        'ticker': ticker,
+                        'reason': (f"Correlated with {', '.join(f'{t} (ρ={rho:.2f})' for t, rho in peers[:3])}"
+                                   f" - max {MAX_CORRELATED_POSITIONS} co-moving positions"),
+                        'sector': sector,
+                        'industry': industry
+                    })
+                    continue
+                new_pos['correlated_with'] = peers
+
             # v5.7.1: REMOVED sector/industry concentration limits
             # Claude is responsible for portfolio allocation decisions in GO prompt
             # Non-catastrophic risk - allocation is optimization, not safety
@@ -1082,6 +1152,12 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             print(f"      {sector}: {count} positions ({pct:.0f}%)")
         print(f"      Total accepted: {len(accepted_positions)} positions")
 
+        if correlations:
+            book = list(dict.fromkeys(held_tickers + [p.get('ticker') for p in accepted_positions]))
+            clusters = correlations.subset(book).clusters()
+            print(f"\n   🔗 Correlation clusters ({len(book)} names): "
+                  f"{'; '.join(', '.join(c) for c in clusters) if clusters else 'none'}")
+
         return accepted_positions, rejected_positions
 
     def check_entry_timing(self, ticker, current_price):
@@ -1101,25 +1177,16 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         """
         try:
             # Fetch 30 days of data (20-day MA + buffer)
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=45)).strftime('%Y-%m-%d')
+            # v10.8: Served from the prefetched window when available
+            results = self._get_daily_aggs(ticker, 45)
 
-            response = requests.get(
-                f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date}/{end_date}',
-                params={'apiKey': POLYGON_API_KEY, 'limit': 50},
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            if 'results' not in data:
+            if not results:
                 return {
                     'entry_quality': 'UNKNOWN',
                     'wait_for_pullback': False,
                     'reasons': ['Insufficient data for entry timing check']
                 }
 
-            results = response.json()['results']
             if len(results) < 20:
                 return {
                     'entry_quality': 'UNKNOWN',
@@ -1128,8 +1195,8 @@ Stagnation = position hasn't moved as expected given time held and volatility.
                 }
 
             # Extract prices and volumes
-            prices = [r['c'] for r in results]
-            volumes = [r['v'] for r in results]
+            prices = results.close.tolist()
+            volumes = results.volume.tolist()
 
             # Calculate 20-day MA
             ma_20 = sum(prices[-20:]) / 20
@@ -1202,28 +1269,12 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             }
 
     def _calculate_rsi(self, prices, period=14):
-        """Calculate RSI (Relative Strength Index)"""
+        """Calculate RSI (Relative Strength Index) - mean gain/loss over the last `period` changes"""
         if len(prices) < period + 1:
             return 50.0  # Neutral if insufficient data
 
-        # Calculate price changes
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-
-        # Separate gains and losses
-        gains = [d if d > 0 else 0 for d in deltas[-period:]]
-        losses = [-d if d < 0 else 0 for d in deltas[-period:]]
-
-        # Calculate average gain and loss
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
-
-        if avg_loss == 0:
-            return 100.0  # All gains
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi
+        import indicators  # v10.8: deferred - numpy adds ~80ms to agent startup
+        return indicators.scalar(indicators.rsi(prices, period))
 
     def detect_post_earnings_drift(self, ticker, catalyst_details):
         """
@@ -1550,6 +1601,172 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             print(f"      ⚠️ {error_msg}")
             return False, error_msg, None, 0, None
 
+    def _apply_entry_fill(self, pos, actual_shares, fill_price):
+        """
+        Move a new position onto its Alpaca fill (v8.9: fill price is the source of truth)
+
+        Returns:
+            Stop-loss price for the protective order
+        """
+        if actual_shares and actual_shares > 0:
+            pos['shares'] = actual_shares
+        if fill_price:
+            pos['entry_price'] = fill_price
+            # Recalculate stop and target based on actual fill price
+            pos['stop_loss'] = round(fill_price * (1 + pos.get('stop_pct', -7.0)/100), 2)
+            pos['price_target'] = round(fill_price * (1 + pos.get('target_pct', 10)/100), 2)
+        return pos.get('stop_loss', pos['entry_price'] * 0.93)
+
+    def _order_manager(self):
+        """Order manager for one batch, on the trade-updates stream when available (v10.8)"""
+        return OrderManager(self.broker, updates_feed=TradeUpdatesFeed.from_broker(self.broker))
+
+    def _execute_alpaca_sells(self, exits):
+        """
+        Execute exit orders as one concurrent batch (v10.8)
+
+        Args:
+            exits: List of (ticker, shares, reason)
+
+        Returns:
+            List of (success, message, order_id, fill_price), same order as exits
+        """
+        if not self.use_alpaca or not self.broker:
+            return [(False, "Alpaca not available - using JSON tracking", None, None)] * len(exits)
+        if not ORDER_MANAGER_AVAILABLE:
+            return [self._execute_alpaca_sell(ticker, shares, reason) for ticker, shares, reason in exits]
+
+        tickets = [OrderTicket.exit(ticker, shares) for ticker, shares, _ in exits]
+        with self._order_manager() as manager:
+            manager.submit_exits(tickets)
+
+        results = []
+        for ticket in tickets:
+            if not ticket.success:
+                results.append((False, ticket.error, None, None))
+                continue
+            if ticket.fill_price:
+                print(f"      ✓ Alpaca order filled: {ticket.order_id} @ ${ticket.fill_price:.2f}")
+            else:
+                print(f"      ✓ Alpaca order placed: {ticket.order_id} (status: {ticket.status})")
+            results.append((True, f"Sold {ticket.qty} shares via Alpaca", ticket.order_id, ticket.fill_price))
+        return results
+
+    def _entry_bars(self, tickers):
+        """
+        Final daily bars (through yesterday) for EXECUTE entries, one shared window per ticker (v10.8)
+
+        Served from the GO/screener windows in the warm cache when present; used
+        for the previous close (gap analysis) and the ATR stop.
+
+        Returns: {ticker: BarSeries or None}
+        """
+        self.prefetch_daily_aggs(tickers)
+        yesterday = (datetime.now(ET) - timedelta(days=1)).strftime('%Y-%m-%d')
+        entry_bars = {}
+        for ticker in tickers:
+            try:
+                entry_bars[ticker] = self._get_daily_aggs(ticker, 30).until(yesterday)
+            except Exception as e:
+                print(f"⚠️ Warning: Failed to fetch daily bars for {ticker}: {e}")
+                entry_bars[ticker] = None
+        return entry_bars
+
+    @staticmethod
+    def _previous_close(bars):
+        """Previous session's close from final daily bars, or None"""
+        return float(bars.close[-1]) if bars is not None and len(bars) else None
+
+    def plan_buy_allocation(self, entry_candidates, account_value, cash_available, held_positions):
+        """
+        Size all EXECUTE buys in one pass (v10.8, allocation.py)
+
+        Cash, sector exposure (held + new), conviction order and per-name caps
+        are solved together; list order no longer decides who gets the cash.
+
+        Args:
+            entry_candidates: [(pos, entry_price, spread_check)] that passed the entry checks
+            account_value: Current account value (sizes are % of it)
+            cash_available: Cash for new entries
+            held_positions: Positions kept today (sector exposure)
+
+        Returns: AllocationPlan (orders for sized buys, dropped buys with reasons)
+        """
+        sector_exposure = {}
+        for held in held_positions:
+            sector = held.get('sector', 'Unknown')
+            sector_exposure[sector] = sector_exposure.get(sector, 0.0) + held.get('position_size', 0)
+
+        buy_requests = [BuyRequest(ticker=pos['ticker'], price=entry_price,
+                                   requested_pct=pos.get('position_size_pct', 10.0),
+                                   sector=pos.get('sector', 'Unknown'), conviction=conviction_of(pos))
+                        for pos, entry_price, _ in entry_candidates]
+        plan = solve_allocation(buy_requests, account_value, cash_available, sector_exposure)
+
+        print(f"   Allocation: {len(plan.orders)} buys, ${plan.total_dollars:.2f} of ${cash_available:.2f} cash "
+              f"(${plan.cash_after:.2f} left)")
+        for ticker, reason in plan.dropped:
+            print(f"   ⚠️ SKIPPED {ticker}: {reason}")
+        return plan
+
+    def _execute_alpaca_buys(self, entries):
+        """
+        Execute entry orders as one concurrent batch, placing each stop-loss as its fill arrives (v10.8)
+
+        Args:
+            entries: List of (pos, position_size_dollars, entry_price); each pos is
+                     updated to its fill (shares, entry, stop, target)
+
+        Returns:
+            List of (success, message, order_id, actual_shares, fill_price, stop) where
+            stop is (placed, message, order_id, stop_price) or None, same order as entries
+        """
+        if not self.use_alpaca or not self.broker:
+            return [(False, "Alpaca not available - using JSON tracking", None, 0, None, None)] * len(entries)
+        if not ORDER_MANAGER_AVAILABLE:
+            results = []
+            for pos, position_size_dollars, entry_price in entries:
+                success, msg, order_id, actual_shares, fill_price = self._execute_alpaca_buy(
+                    pos['ticker'], position_size_dollars, entry_price)
+                stop = None
+                if success:
+                    stop_price = self._apply_entry_fill(pos, actual_shares, fill_price)
+                    time.sleep(3)  # Wash trade avoidance (v8.9.6)
+                    shares_for_stop = int(actual_shares) if actual_shares > 0 else int(pos.get('shares', 0))
+                    if shares_for_stop > 0:
+                        stop = self.broker.place_stop_loss_order(
+                            ticker=pos['ticker'], qty=shares_for_stop, stop_price=stop_price) + (stop_price,)
+                results.append((success, msg, order_id, actual_shares, fill_price, stop))
+            return results
+
+        tickets = [OrderTicket.entry(pos['ticker'], position_size_dollars, entry_price, context=pos)
+                   for pos, position_size_dollars, entry_price in entries]
+        with self._order_manager() as manager:
+            manager.submit_entries(
+                tickets,
+                stop_price_for=lambda t: self._apply_entry_fill(t.context, t.filled_qty, t.fill_price)
+            )
+            print(f"      ℹ️  Fills tracked via {'trade updates stream' if manager.stream_events else 'polling'}")
+
+        results = []
+        for ticket in tickets:
+            if not ticket.success:
+                results.append((False, f"Alpaca buy failed: {ticket.error}" if ticket.order_id else ticket.error,
+                                ticket.order_id, 0, None, None))
+                continue
+            actual_shares = ticket.filled_qty or ticket.qty
+            if ticket.fill_price:
+                print(f"      ✓ Alpaca order filled: {ticket.ticker} {ticket.order_id} @ ${ticket.fill_price:.2f} ({actual_shares} shares)")
+            else:
+                print(f"      ⚠️ Alpaca order pending, fill price unavailable: {ticket.ticker} {ticket.order_id}")
+                print(f"      → {ticket.stop_message or 'Stop-loss covers the verified filled quantity only'}")
+            stop = None
+            if ticket.stop_price:
+                stop = (ticket.stop_placed, ticket.stop_message, ticket.stop_order_id, ticket.stop_price)
+            results.append((True, f"Bought {actual_shares} shares via Alpaca", ticket.order_id,
+                            actual_shares, ticket.fill_price, stop))
+        return results
+
     def _log_trade_to_csv(self, trade):
         """
         Wrapper to log closed trade to CSV via log_completed_trade()
@@ -1758,13 +1975,124 @@ Stagnation = position hasn't moved as expected given time held and volatility.
                 'portfolio_status': 'Empty - No active positions'
             }
 
+    @contextmanager
+    def portfolio_lock(self):
+        """
+        Hold the current_portfolio.json lock for one read-modify-write (v10.8)
+
+        MONITOR acts on intents while RECHECK (10:15 AM) or ANALYZE may be running
+        in another process. Re-read the portfolio inside the lock and write it
+        with save_portfolio() so neither side overwrites the other's changes.
+        Not reentrant - never nest.
+        """
+        lock_path = self.portfolio_file.with_name(self.portfolio_file.name + '.lock')
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, 'a') as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save_portfolio(self, portfolio):
+        """Replace current_portfolio.json atomically - readers never see a half-written file (v10.8)"""
+        temp_path = self.portfolio_file.with_name(self.portfolio_file.name + '.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(portfolio, f, indent=2)
+        os.replace(temp_path, self.portfolio_file)
+
     # =====================================================================
     # ALPHA VANTAGE PRICE FETCHING
     # =====================================================================
     
+    # Polygon multi-ticker snapshot: tickers per request (keeps URLs well under length limits)
+    SNAPSHOT_BATCH_SIZE = 200
+
+    def _select_snapshot_price(self, ticker_data, is_after_market):
+        """
+        Pick the best price from a Polygon snapshot ticker object
+
+        FIELD PRIORITY (see market_data.select_snapshot_price):
+        day.c → min.c → lastTrade.p → prevDay.c (emergency fallback only)
+
+        Returns: (price, source) or (None, None); $0 values are skipped
+        """
+        return select_snapshot_price(ticker_data, is_after_market)
+
+    def _fetch_snapshot_batch(self, tickers):
+        """
+        Fetch Polygon snapshots for many tickers in one request
+
+        Returns: {ticker: ticker_data} for tickers present in the response
+        """
+        return MARKET_DATA.call('polygon', 'snapshots', tickers)
+
+    def _fetch_snapshot_single(self, ticker):
+        """Fetch one ticker's Polygon snapshot; returns (ticker, ticker_data or None, error)"""
+        try:
+            return ticker, MARKET_DATA.call('polygon', 'snapshot', ticker), None
+        except Exception as e:
+            return ticker, None, str(e)
+
+    def take_gap_snapshot(self, tickers, label, prices=None, previous_closes=None):
+        """
+        v10.8: One bulk premarket gap snapshot for held and candidate tickers
+
+        Previous close (prevDay.c), last price and today's volume (min.av, else
+        day.v) come from one batched Polygon snapshot per SNAPSHOT_BATCH_SIZE
+        tickers; gap classes for all of them are computed in one vectorized pass
+        (gap_engine). The snapshot is saved under `label` for RECHECK to diff.
+
+        Args:
+            tickers: Held and candidate tickers
+            label: Command taking the snapshot ('EXECUTE', 'RECHECK')
+            prices: {ticker: price} the command will act on (wins over the snapshot's)
+            previous_closes: {ticker: close} from final daily bars (wins over prevDay.c)
+
+        Returns: GapSnapshot
+        """
+        from gap_engine import GapSnapshot, save_gap_snapshot  # v10.8: deferred - numpy adds ~80ms to agent startup
+
+        tickers = list(dict.fromkeys(tickers))
+        snapshot_prices, snapshot_previous, volumes = {}, {}, {}
+        if POLYGON_API_KEY:
+            is_after_market = datetime.now().hour >= 16
+            for start in range(0, len(tickers), self.SNAPSHOT_BATCH_SIZE):
+                chunk = tickers[start:start + self.SNAPSHOT_BATCH_SIZE]
+                try:
+                    snapshots = self._fetch_snapshot_batch(chunk)
+                except Exception as e:
+                    print(f"   ⚠️ Gap snapshot failed for {len(chunk)} tickers ({e}) - using known prices only")
+                    continue
+                for ticker, ticker_data in snapshots.items():
+                    price, _ = self._select_snapshot_price(ticker_data, is_after_market)
+                    if price:
+                        snapshot_prices[ticker] = price
+                    prev_close = (ticker_data.get('prevDay') or {}).get('c')
+                    if prev_close:
+                        snapshot_previous[ticker] = float(prev_close)
+                    volume = (ticker_data.get('min') or {}).get('av') or (ticker_data.get('day') or {}).get('v')
+                    if volume:
+                        volumes[ticker] = float(volume)
+
+        snapshot_prices.update({t: p for t, p in (prices or {}).items() if p})
+        snapshot_previous.update({t: c for t, c in (previous_closes or {}).items() if c})
+        snapshot = GapSnapshot.build(label, tickers, snapshot_previous, snapshot_prices, volumes)
+
+        counts = snapshot.counts()
+        summary = ', '.join(f"{n} {cls}" for cls, n in sorted(counts.items(), key=lambda c: -c[1]))
+        print(f"   📊 Gap snapshot ({label}): {len(snapshot)} tickers - {summary}")
+        try:
+            save_gap_snapshot(self.project_dir, snapshot)
+        except Exception as e:
+            print(f"   ⚠️ Could not save gap snapshot: {e}")
+        return snapshot
+
     def fetch_current_prices(self, tickers, max_retries=2):
         """
-        Fetch current prices using Polygon.io API with retry logic
+        Fetch current prices using Polygon.io multi-ticker snapshot (v10.8 batched)
 
         STARTER PLAN ($29/mo) - 15-MINUTE DELAYED DATA:
         - Unlimited API calls (no daily/minute rate limits)
@@ -1773,16 +2101,17 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         - At 9:45 AM EXECUTE: Gets 9:30 AM market open prices (9:30 + 15min = 9:45)
         - At 4:50 PM ANALYZE: Gets 4:00 PM market close prices (4:00 + 15min + buffer = 4:50)
 
-        FIELD PRIORITY:
-        1. day.c - Today's official closing price (best after 4:15 PM)
-        2. lastTrade.p - Most recent trade (for intraday)
-        3. prevDay.c - Yesterday's close (emergency fallback only)
+        FETCH STRATEGY:
+        1. One multi-ticker snapshot request for all tickers (chunked by SNAPSHOT_BATCH_SIZE)
+        2. Tickers missing from the batch (or without a usable price) are retried
+           individually and concurrently, up to max_retries rounds
 
-        This ensures we get TODAY's closing prices, not yesterday's stale data.
+        Field priority is unchanged (see _select_snapshot_price): day.c → min.c →
+        lastTrade.p → prevDay.c, so we get TODAY's prices, not yesterday's stale data.
 
         Args:
             tickers: List of ticker symbols to fetch prices for
-            max_retries: Number of retry attempts for failed fetches (default 2)
+            max_retries: Number of retry rounds for missing tickers (default 2)
 
         Returns:
             dict: {ticker: price} for successfully fetched prices
@@ -1792,105 +2121,75 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             print("   ⚠️ POLYGON_API_KEY not set - using entry prices")
             return {}
 
+        tickers = list(dict.fromkeys(tickers))  # De-duplicate, keep order
+        if not tickers:
+            return {}
+
         prices = {}
-        failed_tickers = []
+        errors = {}
         current_hour = datetime.now().hour
         is_after_market = current_hour >= 16  # After 4:00 PM
+        position = {ticker: i for i, ticker in enumerate(tickers, 1)}
 
-        print(f"   Fetching prices for {len(tickers)} tickers via Polygon.io...")
+        fetched = {}  # ticker -> {'price', 'source'} for the warm cache
 
-        for i, ticker in enumerate(tickers, 1):
-            price_fetched = False
-
-            for attempt in range(max_retries + 1):
-                try:
-                    # Use snapshot endpoint for 15-min delayed price
-                    url = f'https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers/{ticker}?apiKey={POLYGON_API_KEY}'
-                    response = requests.get(url, timeout=10)
-                    data = response.json()
-
-                    if data.get('status') == 'OK' and 'ticker' in data:
-                        ticker_data = data['ticker']
-                        price = None
-                        source = None
-
-                        # PRIORITY 1: Use today's price (day.c) if available (works during AND after market)
-                        if 'day' in ticker_data and ticker_data['day'] and 'c' in ticker_data['day']:
-                            price = float(ticker_data['day']['c'])
-                            # Validate price is non-zero (0 means no trading data yet)
-                            if price > 0:
-                                source = "today's close" if is_after_market else "intraday"
-                            else:
-                                price = None  # Skip $0 prices
-
-                        # PRIORITY 2: Use most recent minute bar (for intraday when day.c not available)
-                        if not price and 'min' in ticker_data and ticker_data['min'] and 'c' in ticker_data['min']:
-                            price = float(ticker_data['min']['c'])
-                            if price > 0:
-                                source = "recent min"
-                            else:
-                                price = None
-
-                        # PRIORITY 3: Use most recent trade (if available)
-                        if not price and 'lastTrade' in ticker_data and ticker_data['lastTrade'] and 'p' in ticker_data['lastTrade']:
-                            price = float(ticker_data['lastTrade']['p'])
-                            if price > 0:
-                                source = "last trade"
-                            else:
-                                price = None
-
-                        # PRIORITY 4: Emergency fallback to yesterday's close (should rarely happen)
-                        if not price and 'prevDay' in ticker_data and ticker_data['prevDay'] and 'c' in ticker_data['prevDay']:
-                            price = float(ticker_data['prevDay']['c'])
-                            if price > 0:
-                                source = "prev close ⚠️"
-                            else:
-                                price = None
-
-                        if price and price > 0:
-                            prices[ticker] = price
-                            retry_str = f" (retry {attempt})" if attempt > 0 else ""
-                            print(f"   [{i}/{len(tickers)}] {ticker}: ${price:.2f} ({source}){retry_str}")
-                            price_fetched = True
-                            break
-                        else:
-                            if attempt < max_retries:
-                                print(f"   [{i}/{len(tickers)}] {ticker}: No price data, retrying...")
-                                time.sleep(1)  # Wait 1 second before retry
-                            else:
-                                print(f"   [{i}/{len(tickers)}] {ticker}: No price data available (after {max_retries} retries)")
-                                failed_tickers.append(ticker)
+        def record(ticker, price, source, attempt):
+            if price:
+                prices[ticker] = price
+                fetched[ticker] = {'price': price, 'source': source}
+                retry_str = f" (retry {attempt})" if attempt > 0 else ""
+                print(f"   [{position[ticker]}/{len(tickers)}] {ticker}: ${price:.2f} ({source}){retry_str}")
+            else:
+                errors[ticker] = 'No price data'
+
+        # v10.8: Prices fetched seconds ago (EXECUTE prices the same tickers several times)
+        if WARM_CACHE_AVAILABLE:
+            for ticker, cached in WARM_CACHE.get_many('intraday_price', tickers).items():
+                prices[ticker] = cached['price']
+                print(f"   [{position[ticker]}/{len(tickers)}] {ticker}: ${cached['price']:.2f} ({cached['source']}, cached)")
+
+        to_fetch = [t for t in tickers if t not in prices]
+        if to_fetch:
+            print(f"   Fetching prices for {len(to_fetch)} tickers via Polygon.io (batched snapshot)...")
+            # v10.8: Market data layer - tickers Polygon fails or misses fail over to Alpaca
+            for ticker, (price, source) in MARKET_DATA.latest_prices(to_fetch, is_after_market).items():
+                record(ticker, price, source, 0)
+            for ticker in to_fetch:
+                if ticker not in prices:
+                    errors[ticker] = 'Not in batch snapshot'
+
+        for attempt in range(1, max_retries + 1):
+            missing = [t for t in tickers if t not in prices]
+            if not missing:
+                break
+            if deadline_passed():
+                print(f"   ⚠️ Command deadline passed - not retrying {len(missing)} tickers")
+                break
+            if not MARKET_DATA.healthy('polygon', 'snapshot'):
+                print(f"   ⚠️ Polygon snapshots degraded - not retrying {len(missing)} tickers")
+                break
+            print(f"   Retrying {len(missing)} missing tickers concurrently (attempt {attempt}/{max_retries})...")
+            time.sleep(1)  # Wait 1 second before retry
+            with ThreadPoolExecutor(max_workers=min(10, len(missing))) as executor:
+                for ticker, ticker_data, error in executor.map(self._fetch_snapshot_single, missing):
+                    if ticker_data:
+                        record(ticker, *self._select_snapshot_price(ticker_data, is_after_market), attempt)
                     else:
-                        # Debug: show what we actually received
-                        if attempt < max_retries:
-                            error_msg = data.get('error', f"status: {data.get('status', 'unknown')}")
-                            print(f"   [{i}/{len(tickers)}] {ticker}: {error_msg}, retrying...")
-                            time.sleep(1)  # Wait 1 second before retry
-                        else:
-                            if 'error' in data:
-                                print(f"   [{i}/{len(tickers)}] {ticker}: API error - {data['error']} (after {max_retries} retries)")
-                            else:
-                                print(f"   [{i}/{len(tickers)}] {ticker}: No data (status: {data.get('status', 'unknown')}) (after {max_retries} retries)")
-                            failed_tickers.append(ticker)
-                            break
+                        errors[ticker] = error
 
-                    # No rate limiting needed for Starter plan (unlimited calls)
-                    # Small delay to be respectful to API
-                    if not price_fetched:
-                        time.sleep(0.1)
+        if WARM_CACHE_AVAILABLE:
+            WARM_CACHE.set_many('intraday_price', fetched)
 
-                except Exception as e:
-                    if attempt < max_retries:
-                        print(f"   [{i}/{len(tickers)}] {ticker}: Error ({e}), retrying...")
-                        time.sleep(1)  # Wait 1 second before retry
-                    else:
-                        print(f"   ⚠️ Error fetching {ticker} after {max_retries} retries: {e}")
-                        failed_tickers.append(ticker)
-                        break
+            # v10.8: Providers down or out of time - a price from the last few minutes (flagged)
+            missing = [t for t in tickers if t not in prices]
+            for ticker, cached in WARM_CACHE.get_many('intraday_price', missing, stale=True).items():
+                prices[ticker] = cached['price']
+                MARKET_DATA.flag('stale_cache', 'latest_prices')
+                print(f"   [{position[ticker]}/{len(tickers)}] {ticker}: ${cached['price']:.2f} ({cached['source']}, stale cache ⚠️)")
 
-            # Small delay between tickers
-            if price_fetched:
-                time.sleep(0.1)
+        failed_tickers = [t for t in tickers if t not in prices]
+        for ticker in failed_tickers:
+            print(f"   [{position[ticker]}/{len(tickers)}] {ticker}: {errors.get(ticker, 'No data')} (after {max_retries} retries)")
 
         success_count = len(prices)
         total_count = len(tickers)
@@ -1901,7 +2200,7 @@ Stagnation = position hasn't moved as expected given time held and volatility.
 
         return prices
 
-    def calculate_atr(self, ticker, period=14):
+    def calculate_atr(self, ticker, period=14, bars=None):
         """
         Calculate Average True Range for volatility-aware stops (v7.0)
 
@@ -1912,6 +2211,7 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         Args:
             ticker: Stock ticker symbol
             period: Lookback period in days (default 14, industry standard)
+            bars: Daily bars already loaded (BarSeries; v10.8) - skips the fetch
 
         Returns:
             float: ATR value in dollars, or None if data unavailable
@@ -1923,49 +2223,23 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             For volatile stocks (high ATR), stop is wider
             For stable stocks (low ATR), stop is tighter
         """
-        if not POLYGON_API_KEY:
+        if bars is None and not POLYGON_API_KEY:
             return None
 
         try:
-            # Fetch OHLC data for past period+1 days (need previous close for TR)
-            from datetime import timedelta
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=period + 10)  # Extra buffer for weekends
+            import indicators  # v10.8: deferred - numpy adds ~80ms to agent startup
+            if bars is None:
+                # Fetch OHLC data for past period+1 days (need previous close for TR)
+                start_date = datetime.now() - timedelta(days=period + 10)  # Extra buffer for weekends
+                bars = self._request_daily_aggs(ticker, start_date.strftime('%Y-%m-%d'))
 
-            # Use Polygon aggregates endpoint (bars)
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date.strftime("%Y-%m-%d")}/{end_date.strftime("%Y-%m-%d")}?adjusted=true&sort=asc&apiKey={POLYGON_API_KEY}'
-            response = requests.get(url, timeout=10)
-            data = response.json()
+            if len(bars) < period + 1:
+                return None  # Not enough data
 
-            if data.get('status') == 'OK' and 'results' in data:
-                bars = data['results']
-
-                if len(bars) < period + 1:
-                    return None  # Not enough data
-
-                # Calculate True Range for each day
-                true_ranges = []
-                for i in range(1, len(bars)):
-                    high = bars[i]['h']
-                    low = bars[i]['l']
-                    prev_close = bars[i-1]['c']
-
-                    # TR = max(high-low, abs(high-prev_close), abs(low-prev_close))
-                    tr = max(
-                        high - low,
-                        abs(high - prev_close),
-                        abs(low - prev_close)
-                    )
-                    true_ranges.append(tr)
-
-                # ATR = average of last 'period' true ranges
-                if len(true_ranges) >= period:
-                    atr = sum(true_ranges[-period:]) / period
-                    return round(atr, 2)
-                else:
-                    return None
-            else:
-                return None
+            # ATR = average of last 'period' true ranges
+            # TR = max(high-low, abs(high-prev_close), abs(low-prev_close))
+            atr = indicators.scalar(indicators.atr(bars.high, bars.low, bars.close, period, method='simple'))
+            return round(atr, 2) if atr is not None else None
 
         except Exception as e:
             print(f"   ⚠️ ATR calculation failed for {ticker}: {e}")
@@ -1998,43 +2272,59 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             Bid: $99.00, Ask: $101.00, Mid: $100.00
             Spread: $2.00 / $100 = 2.00% → should_skip=True (too expensive)
         """
-        if not POLYGON_API_KEY:
-            return {'spread_pct': 0.0, 'should_skip': False, 'mid_price': None, 'bid': None, 'ask': None}
+        return self.check_bid_ask_spreads([ticker])[ticker]
 
-        try:
-            # Use Polygon snapshot endpoint for real-time quotes
-            url = f'https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers/{ticker}?apiKey={POLYGON_API_KEY}'
-            response = requests.get(url, timeout=10)
-            data = response.json()
+    def _spread_result(self, bid, ask):
+        """Build a spread check result from a bid/ask pair (no data → allow trade)"""
+        if bid and ask and bid > 0 and ask > 0:
+            mid_price = (bid + ask) / 2
+            spread_dollars = ask - bid
+            spread_pct = (spread_dollars / mid_price) * 100
 
-            if data.get('status') == 'OK' and 'ticker' in data:
-                ticker_data = data['ticker']
+            return {
+                'spread_pct': round(spread_pct, 3),
+                'should_skip': spread_pct > 1.0,  # v10.5: Widened from 0.5% to 1.0% to deploy capital more aggressively
+                'mid_price': round(mid_price, 2),
+                'bid': round(bid, 2),
+                'ask': round(ask, 2)
+            }
 
-                # Get bid/ask from lastQuote
-                if 'lastQuote' in ticker_data:
-                    bid = ticker_data['lastQuote'].get('p')  # bid price
-                    ask = ticker_data['lastQuote'].get('P')  # ask price
+        # If no bid/ask data, allow trade (assume reasonable spread)
+        return {'spread_pct': 0.0, 'should_skip': False, 'mid_price': None, 'bid': None, 'ask': None}
 
-                    if bid and ask and bid > 0 and ask > 0:
-                        mid_price = (bid + ask) / 2
-                        spread_dollars = ask - bid
-                        spread_pct = (spread_dollars / mid_price) * 100
+    def check_bid_ask_spreads(self, tickers):
+        """
+        Batched bid-ask spread check (v10.8)
 
-                        return {
-                            'spread_pct': round(spread_pct, 3),
-                            'should_skip': spread_pct > 1.0,  # v10.5: Widened from 0.5% to 1.0% to deploy capital more aggressively
-                            'mid_price': round(mid_price, 2),
-                            'bid': round(bid, 2),
-                            'ask': round(ask, 2)
-                        }
+        Quotes come from one Alpaca multi-symbol latest-quotes request (real-time
+        NBBO) when the broker is connected, otherwise from the Polygon multi-ticker
+        snapshot (lastQuote). Symbols without a quote are allowed to trade, same
+        as check_bid_ask_spread.
 
-            # If no bid/ask data, allow trade (assume reasonable spread)
-            return {'spread_pct': 0.0, 'should_skip': False, 'mid_price': None, 'bid': None, 'ask': None}
+        Returns:
+            dict: {ticker: spread result} for every requested ticker
+        """
+        quotes = {}
 
-        except Exception as e:
-            print(f"   ⚠️ Spread check failed for {ticker}: {e}")
-            # On error, allow trade (don't block on data failure)
-            return {'spread_pct': 0.0, 'should_skip': False, 'mid_price': None, 'bid': None, 'ask': None}
+        if self.use_alpaca and self.broker:
+            try:
+                quotes = {t: (q['bid'], q['ask']) for t, q in self.broker.get_latest_quotes(tickers).items()}
+            except Exception as e:
+                print(f"   ⚠️ Alpaca quote fetch failed ({e}) - trying Polygon")
+
+        missing = [t for t in tickers if t not in quotes]
+        if missing and POLYGON_API_KEY:
+            try:
+                for start in range(0, len(missing), self.SNAPSHOT_BATCH_SIZE):
+                    snapshots = self._fetch_snapshot_batch(missing[start:start + self.SNAPSHOT_BATCH_SIZE])
+                    for ticker, ticker_data in snapshots.items():
+                        last_quote = ticker_data.get('lastQuote') or {}
+                        quotes[ticker] = (last_quote.get('p'), last_quote.get('P'))  # bid, ask
+            except Exception as e:
+                # On error, allow trade (don't block on data failure)
+                print(f"   ⚠️ Spread check failed for {', '.join(missing)}: {e}")
+
+        return {ticker: self._spread_result(*quotes.get(ticker, (None, None))) for ticker in tickers}
 
     # =====================================================================
     # NEWS MONITORING SYSTEM (Phase 1)
@@ -2069,6 +2359,17 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             print(f"   ⚠️ POLYGON_API_KEY not set - skipping news fetch")
             return []
 
+        # v10.8: News fetched by an earlier command in the last few minutes (EXIT → ANALYZE)
+        cache_key = f'{ticker}:{limit}:{days_back}'
+        if WARM_CACHE_AVAILABLE:
+            cached_articles = WARM_CACHE.get('news', cache_key)
+            if cached_articles:
+                for article in cached_articles:
+                    pub_time = datetime.fromisoformat(article['published_utc'].replace('Z', '+00:00'))
+                    article['age_hours'] = (datetime.now(pytz.UTC) - pub_time).total_seconds() / 3600
+                print(f"   ✓ Fetched {len(cached_articles)} news articles for {ticker} (cached)")
+                return cached_articles
+
         try:
             # Calculate date range
             from datetime import timedelta
@@ -2088,7 +2389,7 @@ Stagnation = position hasn't moved as expected given time held and volatility.
                 'apiKey': POLYGON_API_KEY
             }
 
-            response = requests.get(url, params=params, timeout=15)
+            response = MARKET_DATA.http_get('polygon', 'news', url, params=params)
             data = response.json()
 
             if data.get('status') == 'OK' and 'results' in data:
@@ -2101,6 +2402,8 @@ Stagnation = position hasn't moved as expected given time held and volatility.
                     article['age_hours'] = age.total_seconds() / 3600
 
                 print(f"   ✓ Fetched {len(articles)} news articles for {ticker}")
+                if WARM_CACHE_AVAILABLE and articles:
+                    WARM_CACHE.set('news', cache_key, articles)
                 return articles
             else:
                 print(f"   ⚠️ No news articles found for {ticker}")
@@ -2303,10 +2606,15 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             'key_findings': key_findings
         }
 
-    def calculate_news_invalidation_score(self, ticker):
+    def calculate_news_invalidation_score(self, ticker, articles=None):
         """
         Calculate news invalidation score (0-100 points) for EXIT decisions (ANALYZE command)
 
+        Args:
+            ticker: Stock ticker
+            articles: Already-fetched articles (v10.8 - from the book news sweep);
+                      fetched from Polygon when None
+
         Scoring breakdown:
         1. Negative Keyword Scoring (base points)
         2. Context Amplifiers (quantified damage)
@@ -2332,8 +2640,13 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         """
 
         # Fetch very recent news (last 2 days)
-        articles = self.fetch_polygon_news(ticker, limit=15, days_back=2)
+        if articles is None:
+            articles = self.fetch_polygon_news(ticker, limit=15, days_back=NEWS_INVALIDATION_DAYS)
 
+        return self._score_invalidation_articles(ticker, articles)
+
+    def _score_invalidation_articles(self, ticker, articles):
+        """Score already-fetched articles (see calculate_news_invalidation_score)"""
         if not articles:
             return {
                 'score': 0,
@@ -2503,6 +2816,68 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             'triggering_articles': triggering_articles[:3]  # Top 3 worst articles
         }
 
+    def sweep_position_news(self, tickers):
+        """
+        Fetch news for every held ticker concurrently (v10.8 - EXIT news sweep)
+
+        One fetch per ticker covers both the Claude review (NEWS_SWEEP_DAYS) and
+        invalidation scoring (NEWS_INVALIDATION_DAYS). Articles fetched in the last
+        15 minutes come from the warm cache instead of Polygon.
+
+        Returns:
+            {ticker: [articles]} (newest first, empty list on failure)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+
+        def fetch(ticker):
+            try:
+                return self.fetch_polygon_news(ticker, limit=NEWS_SWEEP_LIMIT, days_back=NEWS_SWEEP_DAYS)
+            except Exception as e:
+                print(f"   ⚠️ News fetch failed for {ticker}: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=min(NEWS_SWEEP_WORKERS, len(tickers))) as executor:
+            return dict(zip(tickers, executor.map(fetch, tickers)))
+
+    def score_book_news_invalidation(self, position_news):
+        """
+        Invalidation scores for the whole book in one pass (v10.8)
+
+        Only articles inside NEWS_INVALIDATION_DAYS are scored. Scores are cached per
+        article set - article ids plus their recency bucket, the only time-dependent
+        input - so an unchanged news set is never rescored.
+
+        Args:
+            position_news: {ticker: [articles]} from sweep_position_news()
+
+        Returns:
+            {ticker: calculate_news_invalidation_score() result}
+        """
+        window_start = (datetime.now() - timedelta(days=NEWS_INVALIDATION_DAYS)).strftime('%Y-%m-%d')
+
+        def recency_bucket(article):
+            age_hours = article.get('age_hours', 999)
+            return 0 if age_hours < 1 else 1 if age_hours < 4 else 2
+
+        scoring_sets = {}
+        for ticker, articles in position_news.items():
+            recent = [a for a in articles if a.get('published_utc', '')[:10] >= window_start]
+            article_set = sorted((a.get('id') or a.get('title', ''), recency_bucket(a)) for a in recent)
+            key = hashlib.sha1(json.dumps([ticker, article_set]).encode()).hexdigest()
+            scoring_sets[ticker] = (key, recent)
+
+        cached = WARM_CACHE.get_many('news_score', [key for key, _ in scoring_sets.values()]) if WARM_CACHE_AVAILABLE else {}
+        scores, new_scores = {}, {}
+        for ticker, (key, recent) in scoring_sets.items():
+            if key not in cached:
+                cached[key] = new_scores[key] = self._score_invalidation_articles(ticker, recent)
+            scores[ticker] = cached[key]
+        if WARM_CACHE_AVAILABLE:
+            WARM_CACHE.set_many('news_score', new_scores)
+        return scores
+
     def log_news_monitoring(self, ticker, event_type, result, entry_price=None, exit_price=None):
         """
         Log news monitoring events to learning_data/news_monitoring_log.csv
@@ -2899,7 +3274,7 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             try:
                 # CBOE publishes daily VIX data as CSV
                 url = 'https://cdn.cboe.com/api/global/us_indices/daily_prices/VIX_History.csv'
-                response = requests.get(url, timeout=10)
+                response = MARKET_DATA.http_get('cboe', 'vix', url)
 
                 if response.status_code == 200:
                     lines = response.text.strip().split('\n')
@@ -2983,27 +3358,26 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             start_date = end_date - timedelta(days=250)  # ~1 year
 
             start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
 
-            url = f'https://api.polygon.io/v2/aggs/ticker/SPY/range/1/day/{start_str}/{end_str}?apiKey={POLYGON_API_KEY}'
-            response = requests.get(url, timeout=10)
-            data = response.json()
+            # v10.8: Market data layer (failover between providers)
+            try:
+                closes = self._request_daily_aggs('SPY', start_str).close
+            except Exception as e:
+                print(f"   ⚠️ SPY bars unavailable: {e}")
+                closes = []
 
             spy_above_50d = False
             spy_above_200d = False
 
-            if data.get('status') in ['OK', 'DELAYED'] and 'results' in data:
-                results = data['results']
+            if len(closes) >= 200:
+                current_price = float(closes[-1])
 
-                if len(results) >= 200:
-                    current_price = results[-1]['c']
+                # Calculate 50-day and 200-day MAs
+                ma_50 = float(closes[-50:].mean())
+                ma_200 = float(closes[-200:].mean())
 
-                    # Calculate 50-day and 200-day MAs
-                    ma_50 = sum([r['c'] for r in results[-50:]]) / 50
-                    ma_200 = sum([r['c'] for r in results[-200:]]) / 200
-
-                    spy_above_50d = current_price > ma_50
-                    spy_above_200d = current_price > ma_200
+                spy_above_50d = current_price > ma_50
+                spy_above_200d = current_price > ma_200
 
             # v7.0: Use pre-calculated breadth from screener (prevent lookahead bias)
             # Screener calculates breadth at 7:00 AM and saves to screener_candidates.json
@@ -3221,6 +3595,128 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         'Communication Services': 'XLC'
     }
 
+    def reset_command_state(self):
+        """
+        Drop in-memory state that is only valid for one command (v10.8)
+
+        A resident agent (agent_daemon.py) runs EXIT and ANALYZE on the same
+        instance GO used at 9:00 - windows fetched then have no final bar for today.
+        """
+        self._daily_aggs_cache.clear()
+
+    def _get_daily_aggs(self, ticker, days):
+        """
+        Daily Polygon aggregates covering the last `days` calendar days
+
+        Served from the shared window cache when prefetch_daily_aggs() already
+        loaded a wide enough window today, so every check on a ticker reuses one
+        request. Otherwise fetches just this window (not cached).
+
+        Returns: BarSeries (typed arrays, oldest first; zero-copy slice of the
+                 cached window); empty if no data. When no provider can serve the
+                 bars (down, or the command's deadline passed) a recently expired
+                 cached window is returned instead, flagged 'stale_cache'.
+        Raises: market_data.ProviderError when neither is available
+        """
+        start_str = (datetime.now(ET) - timedelta(days=days)).strftime('%Y-%m-%d')
+
+        cached = self._daily_aggs_cache.get(ticker)
+        if cached and cached['fetched_on'] == datetime.now(ET).strftime('%Y-%m-%d') and cached['start'] <= start_str:
+            return cached['results'].since(start_str)
+
+        # v10.8: Window left by an earlier command (screener, GO, ...)
+        if WARM_CACHE_AVAILABLE:
+            warm = WARM_CACHE.get_daily_bars(ticker, start_str)
+            if warm is not None:
+                return warm
+
+        try:
+            results = self._request_daily_aggs(ticker, start_str)
+        except ProviderError:
+            # v10.8: Providers down or out of time - an expired window beats no bars (flagged)
+            stale = WARM_CACHE.get_daily_bars(ticker, start_str, stale=True) if WARM_CACHE_AVAILABLE else None
+            if stale is None:
+                raise
+            MARKET_DATA.flag('stale_cache', 'daily_bars')
+            return stale
+        if WARM_CACHE_AVAILABLE:
+            WARM_CACHE.put_daily_bars(ticker, start_str, results)
+        return results
+
+    def _request_daily_aggs(self, ticker, start_str):
+        """
+        One daily-bars request from start_str through today, as a BarSeries
+
+        v10.8: Through the market data layer - split-adjusted bars from Polygon,
+        or Alpaca when Polygon is erroring/slow. Raises ProviderError if neither can serve.
+        """
+        from bar_series import BarSeries  # v10.8: deferred - numpy adds ~80ms to agent startup
+        end_str = datetime.now(ET).strftime('%Y-%m-%d')
+        return BarSeries.from_polygon(MARKET_DATA.daily_bars(ticker, start_str, end_str))
+
+    def _request_minute_aggs(self, ticker, from_ms, to_ms):
+        """One 1-minute bars request for [from_ms, to_ms] (epoch ms), oldest first (market data layer)"""
+        return MARKET_DATA.minute_bars(ticker, from_ms, to_ms)
+
+    def session_vwap(self, tickers):
+        """
+        v10.8: Session VWAP / range for tickers from minute bars (see minute_vwap.py)
+
+        One minute-aggregates request per ticker for the minutes not yet in its
+        stored session state, all tickers concurrently.
+
+        Returns: {ticker: values}; empty when minute bars are unavailable
+        """
+        if not (MINUTE_VWAP_AVAILABLE and POLYGON_API_KEY and tickers):
+            return {}
+        return MINUTE_VWAP.update(tickers, self._request_minute_aggs)
+
+    def prefetch_daily_aggs(self, tickers, days=ENRICHMENT_BAR_DAYS):
+        """
+        Load one maximal daily-bar window per ticker, concurrently (v10.8)
+
+        Afterwards get_3month_return, fetch_daily_bars, check_stage2_alignment and
+        check_entry_timing slice this window instead of issuing their own requests.
+        Failed tickers are simply not cached - the checks then fetch as before.
+        """
+        if not POLYGON_API_KEY:
+            return
+
+        today = datetime.now(ET).strftime('%Y-%m-%d')
+        start_str = (datetime.now(ET) - timedelta(days=days)).strftime('%Y-%m-%d')
+        pending = [t for t in dict.fromkeys(tickers)
+                   if not (self._daily_aggs_cache.get(t, {}).get('fetched_on') == today
+                           and self._daily_aggs_cache[t]['start'] <= start_str)]
+        if not pending or deadline_passed():
+            return
+
+        # v10.8: Windows already in the cross-command cache (e.g. from the screener)
+        if WARM_CACHE_AVAILABLE:
+            for ticker, (window_start, bars) in WARM_CACHE.get_many_daily_bars(pending).items():
+                if window_start <= start_str:
+                    self._daily_aggs_cache[ticker] = {'fetched_on': today, 'start': window_start, 'results': bars}
+            pending = [t for t in pending if t not in self._daily_aggs_cache]
+            if not pending:
+                return
+
+        def fetch(ticker):
+            try:
+                return ticker, self._request_daily_aggs(ticker, start_str)
+            except Exception as e:
+                print(f"   ⚠️ Bar prefetch failed for {ticker}: {e}")
+                return ticker, None
+
+        with ThreadPoolExecutor(max_workers=min(GO_ENRICHMENT_WORKERS, len(pending))) as executor:
+            for ticker, results in executor.map(fetch, pending):
+                if results is not None and len(results):
+                    self._daily_aggs_cache[ticker] = {'fetched_on': today, 'start': start_str, 'results': results}
+
+        if WARM_CACHE_AVAILABLE:
+            WARM_CACHE.set_many_daily_bars({
+                ticker: (start_str, self._daily_aggs_cache[ticker]['results'])
+                for ticker in pending if ticker in self._daily_aggs_cache
+            })
+
     def get_3month_return(self, ticker):
         """
         Get 3-month return for a ticker using Polygon.io
@@ -3231,29 +3727,14 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             return 0.0  # Can't calculate without API
 
         try:
-            from datetime import timedelta
-
-            # Calculate date range (90 days ago to today)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=90)
-
-            # Format dates for Polygon API
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
-
-            # Use aggregates (bars) endpoint for historical data
-            # Get first bar (90 days ago) and last bar (today)
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_str}/{end_str}?apiKey={POLYGON_API_KEY}'
-            response = requests.get(url, timeout=15)
-            data = response.json()
-
-            # Accept both 'OK' and 'DELAYED' status (delayed data is fine for our purposes)
-            if data.get('status') in ['OK', 'DELAYED'] and 'results' in data and len(data['results']) >= 2:
-                results = data['results']
+            # Daily bars for the last 90 days (first bar = 90 days ago, last bar = today)
+            # v10.8: Served from the prefetched window when available
+            results = self._get_daily_aggs(ticker, 90)
 
+            if len(results) >= 2:
                 # First close (90 days ago) and last close (today)
-                first_close = results[0]['c']
-                last_close = results[-1]['c']
+                first_close = float(results.close[0])
+                last_close = float(results.close[-1])
 
                 # Calculate percentage return
                 return_pct = ((last_close - first_close) / first_close) * 100
@@ -3333,68 +3814,36 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             days: Number of days of history to fetch (default 90 for moving averages)
 
         Returns:
-            List of bar dictionaries with OHLCV data, or empty list on error
-            Each bar: {'date': 'YYYY-MM-DD', 'open': float, 'high': float, 'low': float, 'close': float, 'volume': int}
+            BarSeries (v10.8: typed OHLCV arrays, oldest first), empty on error
+            bars.close / bars.volume are arrays; bars[-1]['close'] still works per bar
         """
+        from bar_series import BarSeries  # v10.8: deferred - numpy adds ~80ms to agent startup
         if not POLYGON_API_KEY:
-            return []
+            return BarSeries.empty()
 
         try:
-            from datetime import timedelta
-
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
-
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_str}/{end_str}?apiKey={POLYGON_API_KEY}'
-            response = requests.get(url, timeout=15)
-            data = response.json()
-
-            if data.get('status') in ['OK', 'DELAYED'] and 'results' in data:
-                bars = []
-                for bar in data['results']:
-                    bars.append({
-                        'date': datetime.fromtimestamp(bar['t'] / 1000).strftime('%Y-%m-%d'),
-                        'open': bar['o'],
-                        'high': bar['h'],
-                        'low': bar['l'],
-                        'close': bar['c'],
-                        'volume': bar['v']
-                    })
-                return bars
-
-            return []
+            # v10.8: Served from the prefetched window when available
+            return self._get_daily_aggs(ticker, days)
 
         except Exception as e:
             print(f"   ⚠️ Error fetching bars for {ticker}: {e}")
-            return []
+            return BarSeries.empty()
 
     def calculate_sma(self, bars, period):
         """Calculate Simple Moving Average"""
         if len(bars) < period:
             return None
 
-        closes = [bar['close'] for bar in bars[-period:]]
-        return sum(closes) / period
+        import indicators  # v10.8: deferred - numpy adds ~80ms to agent startup
+        return indicators.scalar(indicators.sma(indicators.bar_arrays(bars[-period:], ('close',))['close'], period))
 
     def calculate_ema(self, bars, period):
-        """Calculate Exponential Moving Average"""
+        """Calculate Exponential Moving Average (seeded with the SMA of the first period)"""
         if len(bars) < period:
             return None
 
-        closes = [bar['close'] for bar in bars]
-
-        # Start with SMA for first period
-        sma = sum(closes[:period]) / period
-        multiplier = 2 / (period + 1)
-
-        ema = sma
-        for close in closes[period:]:
-            ema = (close * multiplier) + (ema * (1 - multiplier))
-
-        return ema
+        import indicators
+        return indicators.scalar(indicators.ema(indicators.bar_arrays(bars, ('close',))['close'], period))
 
     def calculate_adx(self, bars, period=14):
         """
@@ -3405,64 +3854,19 @@ Stagnation = position hasn't moved as expected given time held and volatility.
         - ADX 20-25 = Moderate trend
         - ADX <20 = Weak/choppy (avoid swing trades)
 
-        Returns: Float (0-100, typically 10-60 range)
+        v10.8: Wilder ADX - the DX series is smoothed over `period` (previously the
+        last unsmoothed DX). Needs 2 x period bars; shorter histories return None.
+
+        Returns: Float (0-100, typically 10-60 range), or None
         """
-        if len(bars) < period + 1:
+        if len(bars) < 2 * period:
             return None
 
         try:
-            # Calculate True Range and Directional Movement
-            tr_list = []
-            plus_dm_list = []
-            minus_dm_list = []
-
-            for i in range(1, len(bars)):
-                high = bars[i]['high']
-                low = bars[i]['low']
-                prev_close = bars[i-1]['close']
-
-                # True Range = max of:
-                # - High - Low
-                # - |High - Previous Close|
-                # - |Low - Previous Close|
-                tr = max(
-                    high - low,
-                    abs(high - prev_close),
-                    abs(low - prev_close)
-                )
-                tr_list.append(tr)
-
-                # Directional Movement
-                plus_dm = max(high - bars[i-1]['high'], 0) if (high - bars[i-1]['high']) > (bars[i-1]['low'] - low) else 0
-                minus_dm = max(bars[i-1]['low'] - low, 0) if (bars[i-1]['low'] - low) > (high - bars[i-1]['high']) else 0
-
-                plus_dm_list.append(plus_dm)
-                minus_dm_list.append(minus_dm)
-
-            if len(tr_list) < period:
-                return None
-
-            # Smooth TR and DM using Wilder's smoothing
-            atr = sum(tr_list[:period]) / period
-            plus_di_smooth = sum(plus_dm_list[:period]) / period
-            minus_di_smooth = sum(minus_dm_list[:period]) / period
-
-            for i in range(period, len(tr_list)):
-                atr = (atr * (period - 1) + tr_list[i]) / period
-                plus_di_smooth = (plus_di_smooth * (period - 1) + plus_dm_list[i]) / period
-                minus_di_smooth = (minus_di_smooth * (period - 1) + minus_dm_list[i]) / period
-
-            # Calculate DI+ and DI-
-            plus_di = 100 * (plus_di_smooth / atr) if atr > 0 else 0
-            minus_di = 100 * (minus_di_smooth / atr) if atr > 0 else 0
-
-            # Calculate DX and ADX
-            dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di) if (plus_di + minus_di) > 0 else 0
-
-            # ADX is smoothed DX
-            adx = dx  # Simplified - in production would smooth this further
-
-            return round(adx, 2)
+            import indicators  # v10.8: deferred - numpy adds ~80ms to agent startup
+            columns = indicators.bar_arrays(bars, ('high', 'low', 'close'))
+            adx = indicators.scalar(indicators.adx(columns['high'], columns['low'], columns['close'], period))
+            return round(adx, 2) if adx is not None else None
 
         except Exception as e:
             print(f"   ⚠️ Error calculating ADX: {e}")
@@ -3510,26 +3914,34 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             }
 
         try:
-            current_price = bars[-1]['close']
+            current_price = float(bars.close[-1])
+
+            # v10.8: Stored indicator state advanced by the new bars (no full recompute)
+            if INDICATOR_STATE_AVAILABLE:
+                state = INDICATOR_STORE.update(ticker, bars)
+                sma50, ema5, ema20 = state['sma50'], state['ema5'], state['ema20']
+                adx = round(state['adx14'], 2) if state['adx14'] is not None else None  # Same as calculate_adx
+            else:
+                sma50 = self.calculate_sma(bars, 50)
+                ema5 = self.calculate_ema(bars, 5)
+                ema20 = self.calculate_ema(bars, 20)
+                adx = self.calculate_adx(bars, period=14)
 
             # 1. TREND FILTER: 50-day SMA
-            sma50 = self.calculate_sma(bars, 50)
             above_50ma = current_price > sma50 if sma50 else False
 
             # 2. MOMENTUM FILTER: 5 EMA / 20 EMA
-            ema5 = self.calculate_ema(bars, 5)
-            ema20 = self.calculate_ema(bars, 20)
             ema_bullish = (ema5 > ema20) if (ema5 and ema20) else False
 
             # 3. TREND STRENGTH: ADX
-            adx = self.calculate_adx(bars, period=14)
             trend_strong = adx > 20 if adx else False
 
             # 4. VOLUME CONFIRMATION (Enhancement 2.2)
             if len(bars) >= 20:
-                avg_volume = sum([bar['volume'] for bar in bars[-20:]]) / 20
-                current_volume = bars[-1]['volume']
-                volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
+                import indicators
+                volumes = bars.volume
+                avg_volume = float(volumes[-20:].mean())
+                volume_ratio = indicators.scalar(indicators.volume_ratio(volumes[-20:], 20)) or 0
 
                 # Enhancement 2.2: Volume quality rating
                 if volume_ratio >= 3.0:
@@ -3543,9 +3955,8 @@ Stagnation = position hasn't moved as expected given time held and volatility.
 
                 # Enhancement 2.2: Volume trend (increasing over 5 days?)
                 if len(bars) >= 5:
-                    recent_volumes = [bar['volume'] for bar in bars[-5:]]
-                    avg_recent = sum(recent_volumes) / 5
-                    avg_prior = sum([bar['volume'] for bar in bars[-25:-5]]) / 20 if len(bars) >= 25 else avg_volume
+                    avg_recent = float(volumes[-5:].mean())
+                    avg_prior = float(volumes[-25:-5].mean()) if len(bars) >= 25 else avg_volume
                     volume_trending_up = avg_recent > avg_prior * 1.2 if avg_prior > 0 else False
                 else:
                     volume_trending_up = False
@@ -4279,7 +4690,21 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             print(f"   ⚠️ DEBUG: format_screener_candidates returning None (no data or no candidates)")
             return None
 
+        segments = self._build_screener_candidate_segments(screener_data)
+        return self._assemble_screener_candidates(segments, screener_data.get('premarket_prices', {}))
+
+    def _build_screener_candidate_segments(self, screener_data):
+        """
+        Pre-format the screener candidate list for the GO prompt (v10.8 pre-GO)
+
+        Everything except each candidate's premarket price line is fixed once the
+        screener has run, so the text is split around that line. The pre-GO stage
+        builds these segments right after the screener; GO only fills in prices.
+
+        Returns: Dict with 'header', 'blocks' (ticker, screener_price, head, tail) and 'footer'
+        """
         candidates = screener_data['candidates']
+        blocks = []
 
         output = f"PRE-SCREENED CANDIDATES (Top {len(candidates)} from S&P 1500 scan):\n\n"
         output += f"Scanned: {screener_data['universe_size']} stocks\n"
@@ -4289,6 +4714,7 @@ Stagnation = position hasn't moved as expected given time held and volatility.
 
         output += "TOP CANDIDATES (sorted by composite score):\n"
         output += "=" * 80 + "\n\n"
+        header = output
 
         for candidate in candidates[:15]:  # Show top 15 with full news (reduced from 25 due to news content)
             rank = candidate['rank']
@@ -4301,7 +4727,7 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             vol = candidate['volume_analysis']
             tech = candidate['technical_setup']
 
-            output += f"{rank}. {ticker} ({sector}) - Score: {score:.1f}/100\n"
+            output = f"{rank}. {ticker} ({sector}) - Score: {score:.1f}/100\n"
             output += f"   RS: +{rs['rs_pct']}% vs {rs['sector_etf']} "
             output += f"(stock: +{rs['stock_return_3m']}%, sector: +{rs['sector_return_3m']}%)\n"
             output += f"   News: {news['score']}/20 ({news['count']} articles"
@@ -4385,26 +4811,9 @@ Stagnation = position hasn't moved as expected given time held and volatility.
             output += f"   Technical: {tech['distance_from_52w_high_pct']:.1f}% from 52w high "
             output += f"(${tech['current_price']:.2f} vs ${tech['high_52w']:.2f})\n"
 
-            # v8.9: Show premarket price comparison (screener price vs current Alpaca premarket)
-            premarket_prices = screener_data.get('premarket_prices', {})
-            premarket_price = premarket_prices.get(ticker)
-            screener_price = tech.get('current_price', 0)
-            if premarket_price and screener_price and screener_price > 0:
-                price_change = premarket_price - screener_price
-                price_change_pct = (price_change / screener_price) * 100
-                if abs(price_change_pct) >= 0.5:  # Only show if meaningful change
-                    change_label = ""
-                    if price_change_pct >= 5:
-                        change_label = " ⚠️ LARGE GAP - Consider waiting"
-                    elif price_change_pct >= 2:
-                        change_label = " ⚡ Gapping up"
-                    elif price_change_pct <= -2:
-                        change_label = " 📉 Gapping down"
-                    output += f"   💰 Price Update: Screener ${screener_price:.2f} → Premarket ${premarket_price:.2f} ({'+' if price_change_pct > 0 else ''}{price_change_pct:.1f}%){change_label}\n"
-                else:
-                    output += f"   💰 Price Update: Screener ${screener_price:.2f} → Premarket ${premarket_price:.2f} (stable)\n"
-            elif screener_price:
-                output += f"   💰 Screener Price: ${screener_price:.2f} (no premarket data yet)\n"
+            # v8.9: Premarket price comparison is filled in at GO time (_format_candidate_price_line)
+            head = output
+            output = ""
 
             # Add full technical indicators for holistic decision making
             output += f"   📊 Technical Indicators:\n"
@@ -4460,11 +4869,49 @@ Stagnation = position hasn't moved as expected given time held and volatility.
 
             output += f"   Why: {candidate['why_selected']}\n\n"
 
-        if len(candidates) > 15:
-            output += f"\n... and {len(candidates) - 15} more candidates available\n"
-            output += f"(News details shown for top 15 only to manage context size)\n"
+            blocks.append({
+                'ticker': ticker,
+                'screener_price': tech.get('current_price', 0),
+                'head': head,
+                'tail': output
+            })
 
-        return output
+        footer = ""
+        if len(candidates) > 15:
+            footer += f"\n... and {len(candidates) - 15} more candidates available\n"
+            footer += f"(News details shown for top 15 only to manage context size)\n"
+
+        return {'header': header, 'blocks': blocks, 'footer': footer}
+
+    def _format_candidate_price_line(self, screener_price, premarket_price):
+        """v8.9: Premarket price comparison line (screener price vs current Alpaca premarket)"""
+        if premarket_price and screener_price and screener_price > 0:
+            price_change = premarket_price - screener_price
+            price_change_pct = (price_change / screener_price) * 100
+            if abs(price_change_pct) >= 0.5:  # Only show if meaningful change
+                change_label = ""
+                if price_change_pct >= 5:
+                    change_label = " ⚠️ LARGE GAP - Consider waiting"
+                elif price_change_pct >= 2:
+                    change_label = " ⚡ Gapping up"
+                elif price_change_pct <= -2:
+                    change_label = " 📉 Gapping down"
+                return f"   💰 Price Update: Screener ${screener_price:.2f} → Premarket ${premarket_price:.2f} ({'+' if price_change_pct > 0 else ''}{price_change_pct:.1f}%){change_label}\n"
+            return f"   💰 Price Update: Screener ${screener_price:.2f} → Premarket ${premarket_price:.2f} (stable)\n"
+        elif screener_price:
+            return f"   💰 Screener Price: ${screener_price:.2f} (no premarket data yet)\n"
+        return ""
+
+    def _assemble_screener_candidates(self, segments, premarket_prices):
+        """Join pre-formatted candidate segments with current premarket price lines"""
+        premarket_prices = premarket_prices or {}
+        parts = [segments['header']]
+        for block in segments['blocks']:
+            parts.append(block['head'])
+            parts.append(self._format_candidate_price_line(block['screener_price'], premarket_prices.get(block['ticker'])))
+            parts.append(block['tail'])
+        parts.append(segments['footer'])
+        return ''.join(parts)
 
     # =====================================================================
     # CLAUDE API INTEGRATION
@@ -4517,7 +4964,13 @@ Stagnation = position hasn't moved as expected given time held and volatility.
                         screener_data['premarket_prices'] = premarket_candidate_prices
 
                     screener_section = f"\n\n{'='*70}\n⚠️ ACTION REQUIRED: FILL ALL {vacant_slots} VACANT SLOTS\n{'='*70}\n\nYou MUST recommend {vacant_slots} ENTER positions to reach our target of 10 positions.\nUndeployed capital is earning 0% - put it to work!\n\n"
-                    formatted_candidates = self.format_screener_candidates(screener_data)
+                    prepared = getattr(self, 'pre_go_prepared', None)
+                    if prepared and prepared.get('candidate_segments'):
+                        # v10.8: Only the premarket price lines change since pre-GO
+                        formatted_candidates = self._assemble_screener_candidates(
+                            prepared['candidate_segments'], screener_data.get('premarket_prices', {}))
+                    else:
+                        formatted_candidates = self.format_screener_candidates(screener_data)
                     print(f"   ✅ DEBUG: Formatted candidates length: {len(formatted_candidates) if formatted_candidates else 0}")
                     screener_section += formatted_candidates
                     screener_section += f"\n\n{'='*70}\n"
@@ -4991,17 +5444,27 @@ CRITICAL: When executing 'go' command, you MUST include a properly formatted JSO
                 timeout = base_timeout * (attempt + 1)  # 120s, 240s, 360s
                 print(f"   API call attempt {attempt + 1}/{max_retries} (timeout: {timeout}s)...")
 
+                call_started = time.time()
                 response = requests.post(
                     CLAUDE_API_URL,
                     headers=headers,
                     json=payload,
                     timeout=timeout
                 )
+                if response.status_code >= 400:
+                    self._record_claude_call(command, payload['model'], call_started, attempt,
+                                             status='rate_limited' if response.status_code == 429 else 'http_error',
+                                             http_status=response.status_code)
                 response.raise_for_status()
 
-                return response.json()
+                response_data = response.json()
+                self._record_claude_call(command, payload['model'], call_started, attempt,
+                                         usage=response_data.get('usage'), http_status=response.status_code)
+                return response_data
 
             except requests.exceptions.Timeout as e:
+                self._record_claude_call(command, payload['model'], call_started, attempt,
+                                         status='timeout', error=str(e))
                 if attempt < max_retries - 1:
                     wait_time = 5 * (attempt + 1)
                     print(f"   ⚠️ Timeout after {timeout}s. Retrying in {wait_time}s...")
@@ -5011,6 +5474,9 @@ CRITICAL: When executing 'go' command, you MUST include a properly formatted JSO
                     raise
 
             except requests.exceptions.RequestException as e:
+                if not isinstance(e, requests.exceptions.HTTPError):  # HTTP errors recorded above
+                    self._record_claude_call(command, payload['model'], call_started, attempt,
+                                             status='error', error=str(e))
                 if attempt < max_retries - 1:
                     wait_time = 5 * (attempt + 1)
                     print(f"   ⚠️ Request error: {type(e).__name__}. Retrying in {wait_time}s...")
@@ -5019,6 +5485,18 @@ CRITICAL: When executing 'go' command, you MUST include a properly formatted JSO
                     print(f"   ✗ Failed after {max_retries} attempts")
                     raise
     
+    def _record_claude_call(self, command, model, call_started, retries, status='ok',
+                            usage=None, http_status=None, error=None, stage='decision'):
+        """Append one Claude HTTP attempt to the call ledger (v10.7, no-op if unavailable)"""
+        if not LEDGER_AVAILABLE:
+            return
+        record_claude_call(
+            command=command, stage=stage, model=model,
+            latency_ms=(time.time() - call_started) * 1000,
+            status=status, usage=usage, retries=retries,
+            http_status=http_status, error=error
+        )
+
     def load_optimized_context(self, command):
         """
         Load optimized context for command.
@@ -6407,6 +6885,9 @@ CURRENT PORTFOLIO
             email_body = decisions_text + portfolio_text
 
             # Create and send email
+            from sendgrid import SendGridAPIClient
+            from sendgrid.helpers.mail import Mail
+
             message = Mail(
                 from_email=from_email,
                 to_emails=to_emails,
@@ -7079,9 +7560,14 @@ CURRENT PORTFOLIO
         - Stalling (days > 5 and unrealized < +3%)
         - Catalyst aging (>3 days)
 
+        v10.8: Replacements correlated with a holding that stays lose
+        CORRELATION_ROTATION_PENALTY points (swapping into the same exposure).
+
         Returns list of dicts with rotation recommendations
         """
         candidates = []
+        held_tickers = [pos['ticker'] for pos in hold_positions]
+        correlations = self.correlation_matrix(held_tickers + [opp.get('ticker') for opp in new_opportunities])
 
         for pos in hold_positions:
             ticker = pos['ticker']
@@ -7121,9 +7607,12 @@ CURRENT PORTFOLIO
                 # Find best replacement opportunity
                 best_opp = None
                 best_opp_score = 0
+                best_opp_peers = []
+                remaining = [t for t in held_tickers if t != ticker]
 
                 for opp in new_opportunities:
                     opp_score = 0
+                    peers = correlations.correlated_with(opp.get('ticker'), remaining) if correlations else []
                     opp_tier = opp.get('catalyst_tier', '')
                     opp_news = opp.get('news_validation_score', 0)
                     opp_age = opp.get('catalyst_age_hours', 999)
@@ -7144,9 +7633,14 @@ CURRENT PORTFOLIO
                     if opp.get('rs_rating', 0) > 75:
                         opp_score += 10
 
+                    # v10.8: Moves with a position we keep: -CORRELATION_ROTATION_PENALTY (no diversification gained)
+                    if peers:
+                        opp_score -= CORRELATION_ROTATION_PENALTY
+
                     if opp_score > best_opp_score:
                         best_opp_score = opp_score
                         best_opp = opp
+                        best_opp_peers = peers
 
                 # Only recommend if new opportunity is significantly better (score >60)
                 if best_opp and best_opp_score >= 60:
@@ -7157,6 +7651,7 @@ CURRENT PORTFOLIO
                         'enter_ticker': best_opp['ticker'],
                         'enter_score': best_opp_score,
                         'enter_catalyst': best_opp.get('catalyst', 'Unknown'),
+                        'enter_correlated_with': best_opp_peers,  # v10.8: [(held ticker, ρ)]
                         'net_score': best_opp_score - (100 - rotation_score)  # Positive = good swap
                     })
 
@@ -7205,56 +7700,321 @@ CURRENT PORTFOLIO
                 context += f"  Reasons: {', '.join(cand['exit_reasons'])}\n"
                 context += f"ENTER: {cand['enter_ticker']} (Score: {cand['enter_score']}/100)\n"
                 context += f"  Catalyst: {cand['enter_catalyst']}\n"
+                if cand.get('enter_correlated_with'):
+                    context += (f"  Correlated with holdings: "
+                                f"{', '.join(f'{t} (ρ={rho:.2f})' for t, rho in cand['enter_correlated_with'])}\n")
                 context += f"  Net Score: {cand['net_score']:+d} (Positive = favorable swap)\n"
                 context += "\n"
 
-        # New opportunities analysis
-        context += "\n" + "="*70 + "\n\n"
-        context += f"NEW OPPORTUNITIES ({len(new_opportunities)} signals):\n"
-        context += "-"*70 + "\n\n"
+        # New opportunities analysis
+        context += "\n" + "="*70 + "\n\n"
+        context += f"NEW OPPORTUNITIES ({len(new_opportunities)} signals):\n"
+        context += "-"*70 + "\n\n"
+
+        for opp in new_opportunities:
+            context += f"Ticker: {opp['ticker']}\n"
+            context += f"  Catalyst: {opp.get('catalyst', 'Unknown')} ({opp.get('catalyst_tier', 'Unknown')})\n"
+            context += f"  Thesis: {opp.get('thesis', 'N/A')[:150]}...\n"
+            context += f"  News Score: {opp.get('news_validation_score', 0)}/100\n"
+            context += f"  Catalyst Age: {opp.get('catalyst_age_hours', 'Unknown')} hours\n"
+            context += "\n"
+
+        # Rotation guidance
+        context += "\n" + "="*70 + "\n\n"
+        context += "ROTATION DECISION CRITERIA:\n\n"
+        context += "Consider rotating IF:\n"
+        context += "1. WEAK POSITION: Low momentum (<0.3%/day), stalling thesis, or underperforming\n"
+        context += "2. STRONG OPPORTUNITY: Tier 1 catalyst, fresh (<24hrs), high validation (>80/100)\n"
+        context += "3. NET POSITIVE EV: Expected gain from new > current position + exit cost\n\n"
+        context += "AVOID rotating IF:\n"
+        context += "- Position has strong momentum (>0.5%/day)\n"
+        context += "- Position near target (+8% or more)\n"
+        context += "- New opportunity is stale (>48hrs) or low conviction\n"
+        context += "- Would cause excessive churn (>3 rotations/week)\n\n"
+        context += "="*70 + "\n\n"
+        context += "TASK: Should we rotate any positions?\n\n"
+        context += "Return JSON in this format:\n"
+        context += "{\n"
+        context += '  "rotations": [\n'
+        context += '    {\n'
+        context += '      "ticker": "XYZ",  // Position to exit\n'
+        context += '      "reason": "Stalling at +2% after 8 days, momentum fading",\n'
+        context += '      "target_ticker": "NVDA",  // New position to enter\n'
+        context += '      "target_rationale": "Fresh Tier 1 earnings beat, 95/100 validation",\n'
+        context += '      "expected_net_gain": "+6-8% vs holding to stop",\n'
+        context += '      "confidence": "HIGH"\n'
+        context += '    }\n'
+        context += '  ]\n'
+        context += "}\n\n"
+        context += "If NO rotations recommended, return: {\"rotations\": []}\n"
+
+        return context
+
+    # =====================================================================
+    # COMMAND EXECUTION
+    # =====================================================================
+
+    # =====================================================================
+    # GO ENRICHMENT ENGINE (v10.8)
+    # =====================================================================
+
+    def _enrich_buy_candidate(self, buy_pos):
+        """
+        All per-ticker GO validation checks for one BUY recommendation
+
+        Pre-GO results are reused where valid; the rest is derived from the
+        prefetched daily-bar window. Entry timing runs after the technical score
+        because it needs its current price.
+        """
+        ticker = buy_pos.get('ticker', 'UNKNOWN')
+        sector = buy_pos.get('sector', 'Unknown')
+
+        rs_result = (self._prepared_enrichment(ticker, 'relative_strength', sector=sector)
+                     or self.calculate_relative_strength(ticker, sector))
+        tech_result = (self._prepared_enrichment(ticker, 'technical')
+                       or self.calculate_technical_score(ticker))
+        current_price = tech_result.get('details', {}).get('price', 0)
+        stage2_result = (self._prepared_enrichment(ticker, 'stage2')
+                         or self._screener_stage2(ticker)
+                         or self.check_stage2_alignment(ticker))
+        timing_result = (self._prepared_enrichment(ticker, 'entry_timing', price=current_price)
+                         or self.check_entry_timing(ticker, current_price))
+        ped_result = self.detect_post_earnings_drift(ticker, buy_pos.get('catalyst_details', {}))
+
+        return ticker, {
+            'relative_strength': rs_result,
+            'technical': tech_result,
+            'stage2': stage2_result,
+            'entry_timing': timing_result,
+            'ped': ped_result
+        }
+
+    def enrich_go_candidates(self, buy_positions, screener_lookup=None):
+        """
+        Run GO enrichment for all BUY recommendations at once
+
+        1. Prefetch one ENRICHMENT_BAR_DAYS window per ticker and sector ETF (concurrent)
+        2. Derive RS, technical score, Stage 2, entry timing and PED per ticker (concurrent)
+
+        Args:
+            screener_lookup: Today's screener candidates by ticker (Stage 2 flags are reused)
+
+        Returns: {ticker: {'relative_strength', 'technical', 'stage2', 'entry_timing', 'ped'}}
+        """
+        buy_positions = [bp for bp in buy_positions if bp.get('ticker')]
+        if not buy_positions:
+            return {}
+
+        self.screener_stage2 = {ticker: candidate['stage2'] for ticker, candidate in (screener_lookup or {}).items()
+                                if candidate.get('stage2')}
+
+        started = time.time()
+        tickers = [bp['ticker'] for bp in buy_positions]
+        sector_etfs = [self.SECTOR_ETF_MAP.get(bp.get('sector', 'Unknown'), 'SPY') for bp in buy_positions]
+        self.prefetch_daily_aggs(tickers + sector_etfs)
+
+        with ThreadPoolExecutor(max_workers=min(GO_ENRICHMENT_WORKERS, len(buy_positions))) as executor:
+            enrichment = dict(executor.map(self._enrich_buy_candidate, buy_positions))
+
+        print(f"   ✓ Enriched {len(enrichment)} candidates in {time.time() - started:.1f}s")
+        return enrichment
+
+    # =====================================================================
+    # PRE-GO PREPARATION (v10.8)
+    # =====================================================================
+
+    def _pre_go_context_fingerprint(self):
+        """
+        Fingerprint of the files load_optimized_context('go') reads
+
+        If any of them changes between the pre-GO run and GO, the prepared
+        context is discarded and rebuilt (candidate text and enrichment are
+        still reused - they depend only on the screener output).
+        """
+        sources = [
+            self.project_dir / 'PROJECT_INSTRUCTIONS.md',
+            self.project_dir / 'strategy_evolution' / 'strategy_rules.md',
+            self.project_dir / 'strategy_evolution' / 'learning_database.json',
+            self.project_dir / 'daily_reviews',
+            self.exclusions_file,
+            self.portfolio_file,
+            self.account_file,
+        ]
+        parts = []
+        for path in sources:
+            if path.exists():
+                stat = path.stat()
+                parts.append(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}")
+            else:
+                parts.append(f"{path.name}:missing")
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+    def _screener_fingerprint(self):
+        """Identify the screener run the pre-GO artifact was built from"""
+        screener_file = self.project_dir / 'screener_candidates.json'
+        if not screener_file.exists():
+            return None
+        stat = screener_file.stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _prepare_candidate_enrichment(self, candidate):
+        """
+        Run the ticker-only GO validation checks for one screener candidate
+
+        Only successful results are kept so GO retries anything that failed.
+        PED is not prepared - it depends on Claude's catalyst_details.
+        """
+        ticker = candidate['ticker']
+        sector = candidate.get('sector', 'Unknown')
+        enrichment = {'sector': sector}
+
+        tech_result = self.calculate_technical_score(ticker)
+        if tech_result.get('details'):
+            enrichment['technical'] = tech_result
+
+        # v10.8: The screener already evaluated the trend template for the whole universe
+        stage2_result = candidate.get('stage2')
+        if not stage2_result or 'error' in stage2_result:
+            stage2_result = self.check_stage2_alignment(ticker)
+        if 'error' not in stage2_result:
+            enrichment['stage2'] = stage2_result
+
+        timing_price = tech_result.get('details', {}).get('price', 0)
+        if timing_price:
+            timing_result = self.check_entry_timing(ticker, timing_price)
+            if timing_result.get('entry_quality') != 'UNKNOWN':
+                enrichment['entry_timing'] = timing_result
+                enrichment['timing_price'] = timing_price
+
+        enrichment['relative_strength'] = self.calculate_relative_strength(ticker, sector)
+        return ticker, enrichment
+
+    def execute_pre_go_command(self):
+        """
+        Execute PRE-GO command (v10.8) - chained after the screener, opt-in
+
+        Builds everything GO needs that does not depend on premarket prices:
+        1. Formatted candidate segments (all text except the premarket price line)
+        2. GO context (system prompt prefix) with a fingerprint of its source files
+        3. Candidate enrichment (technical score, Stage 2, entry timing, RS)
+
+        Saved to portfolio_data/pre_go_prepared.json. At 9:00 GO fetches prices,
+        fills them into the prepared text and makes the Claude call.
+        """
+        print("\n" + "="*60)
+        print("EXECUTING 'PRE-GO' COMMAND - SPECULATIVE GO PREPARATION")
+        print("="*60 + "\n")
+
+        started = time.time()
+
+        print("1. Loading screener candidates...")
+        screener_data = self.load_screener_candidates()
+        if not screener_data or not screener_data.get('candidates'):
+            print("   ⚠️ No fresh screener data - nothing to prepare (GO will run normally)\n")
+            return False
+
+        candidates = screener_data['candidates'][:15]
+        segments = self._build_screener_candidate_segments(screener_data)
+        print(f"   ✓ Pre-formatted {len(segments['blocks'])} candidate blocks\n")
+
+        print("2. Building GO context...")
+        context = self.load_optimized_context('go')
+        print(f"   ✓ Context prepared ({len(context):,} chars)\n")
+
+        print(f"3. Enriching {len(candidates)} candidates ({PRE_GO_WORKERS} workers)...")
+        self.prefetch_daily_aggs([c['ticker'] for c in candidates] +
+                                 [self.SECTOR_ETF_MAP.get(c.get('sector', 'Unknown'), 'SPY') for c in candidates])
+        with ThreadPoolExecutor(max_workers=PRE_GO_WORKERS) as executor:
+            enrichment = dict(executor.map(self._prepare_candidate_enrichment, candidates))
+        checks = sum(len([k for k in e if k in ('technical', 'stage2', 'entry_timing', 'relative_strength')])
+                     for e in enrichment.values())
+        print(f"   ✓ Prepared {checks} checks for {len(enrichment)} candidates\n")
+
+        prepared = {
+            'prepared_at': datetime.now(ET).isoformat(),
+            'scan_date': screener_data.get('scan_date'),
+            'screener_fingerprint': self._screener_fingerprint(),
+            'context_fingerprint': self._pre_go_context_fingerprint(),
+            'context': context,
+            'candidate_segments': segments,
+            'enrichment': enrichment,
+        }
+
+        PRE_GO_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(PRE_GO_FILE, 'w') as f:
+            json.dump(prepared, f, indent=2, default=str)
+
+        print(f"   ✓ Saved to {PRE_GO_FILE.name} in {time.time() - started:.1f}s")
+        print()
+        return True
+
+    def load_pre_go_prepared(self):
+        """
+        Load the pre-GO artifact if it matches today's screener run
+
+        Returns: Dict with prepared data, or None (GO then builds everything itself)
+        """
+        if not PRE_GO_FILE.exists():
+            return None
+
+        try:
+            with open(PRE_GO_FILE, 'r') as f:
+                prepared = json.load(f)
+        except Exception as e:
+            print(f"   ⚠️ Could not load pre-GO preparation: {e}")
+            return None
+
+        today = datetime.now().strftime('%Y-%m-%d')  # Same date basis as load_screener_candidates
+        if prepared.get('scan_date') != today:
+            print(f"   ℹ️  Pre-GO preparation is stale (from {prepared.get('scan_date')}) - ignoring")
+            return None
+
+        if prepared.get('screener_fingerprint') != self._screener_fingerprint():
+            print("   ℹ️  Screener re-ran since pre-GO preparation - ignoring")
+            return None
+
+        if prepared.get('context_fingerprint') != self._pre_go_context_fingerprint():
+            print("   ℹ️  Context sources changed since pre-GO - context will be rebuilt")
+            prepared['context'] = None
+
+        return prepared
 
-        for opp in new_opportunities:
-            context += f"Ticker: {opp['ticker']}\n"
-            context += f"  Catalyst: {opp.get('catalyst', 'Unknown')} ({opp.get('catalyst_tier', 'Unknown')})\n"
-            context += f"  Thesis: {opp.get('thesis', 'N/A')[:150]}...\n"
-            context += f"  News Score: {opp.get('news_validation_score', 0)}/100\n"
-            context += f"  Catalyst Age: {opp.get('catalyst_age_hours', 'Unknown')} hours\n"
-            context += "\n"
+    def _screener_stage2(self, ticker):
+        """
+        Stage 2 trend template from today's screener run (v10.8), or None to compute live
 
-        # Rotation guidance
-        context += "\n" + "="*70 + "\n\n"
-        context += "ROTATION DECISION CRITERIA:\n\n"
-        context += "Consider rotating IF:\n"
-        context += "1. WEAK POSITION: Low momentum (<0.3%/day), stalling thesis, or underperforming\n"
-        context += "2. STRONG OPPORTUNITY: Tier 1 catalyst, fresh (<24hrs), high validation (>80/100)\n"
-        context += "3. NET POSITIVE EV: Expected gain from new > current position + exit cost\n\n"
-        context += "AVOID rotating IF:\n"
-        context += "- Position has strong momentum (>0.5%/day)\n"
-        context += "- Position near target (+8% or more)\n"
-        context += "- New opportunity is stale (>48hrs) or low conviction\n"
-        context += "- Would cause excessive churn (>3 rotations/week)\n\n"
-        context += "="*70 + "\n\n"
-        context += "TASK: Should we rotate any positions?\n\n"
-        context += "Return JSON in this format:\n"
-        context += "{\n"
-        context += '  "rotations": [\n'
-        context += '    {\n'
-        context += '      "ticker": "XYZ",  // Position to exit\n'
-        context += '      "reason": "Stalling at +2% after 8 days, momentum fading",\n'
-        context += '      "target_ticker": "NVDA",  // New position to enter\n'
-        context += '      "target_rationale": "Fresh Tier 1 earnings beat, 95/100 validation",\n'
-        context += '      "expected_net_gain": "+6-8% vs holding to stop",\n'
-        context += '      "confidence": "HIGH"\n'
-        context += '    }\n'
-        context += '  ]\n'
-        context += "}\n\n"
-        context += "If NO rotations recommended, return: {\"rotations\": []}\n"
+        The screener evaluates check_stage2_alignment's checks for the whole
+        universe from its cached bars; results with an error are recomputed.
+        """
+        stage2_result = getattr(self, 'screener_stage2', {}).get(ticker)
+        if not stage2_result or 'error' in stage2_result:
+            return None
+        print(f"   ⚡ {ticker}: Using screener Stage 2 flags")
+        return stage2_result
 
-        return context
+    def _prepared_enrichment(self, ticker, kind, sector=None, price=None):
+        """
+        Pre-GO enrichment result for a BUY candidate, or None to compute live
 
-    # =====================================================================
-    # COMMAND EXECUTION
-    # =====================================================================
+        Args:
+            kind: 'technical', 'stage2', 'entry_timing' or 'relative_strength'
+            sector: Claude's sector (RS is only reused if it matches the screener's)
+            price: Current price for entry timing (reused only if unchanged)
+        """
+        prepared = getattr(self, 'pre_go_prepared', None)
+        if not prepared:
+            return None
+
+        entry = prepared.get('enrichment', {}).get(ticker)
+        if not entry or kind not in entry:
+            return None
+        if kind == 'relative_strength' and entry.get('sector') != sector:
+            return None
+        if kind == 'entry_timing' and entry.get('timing_price') != price:
+            return None
+
+        print(f"   ⚡ {ticker}: Using pre-GO {kind.replace('_', ' ')}")
+        return entry[kind]
 
     def execute_go_command(self):
         """
@@ -7277,6 +8037,11 @@ CURRENT PORTFOLIO
         print("Agent v5.7.1 - AI-FIRST WITH EXPLICIT DECISIONS (Testing Phase)")
         print("="*60 + "\n")
 
+        # v10.8: Reuse pre-GO preparation from the screener run when fresh
+        self.pre_go_prepared = self.load_pre_go_prepared()
+        if self.pre_go_prepared:
+            print(f"⚡ Using pre-GO preparation from {self.pre_go_prepared.get('prepared_at', 'unknown')}\n")
+
         # Step 1: Load current portfolio
         print("1. Loading current portfolio...")
         current_portfolio = self.load_current_portfolio()
@@ -7337,8 +8102,12 @@ CURRENT PORTFOLIO
 
         # Step 3: Load context and call Claude for review
         print("3. Loading context for portfolio review...")
-        context = self.load_optimized_context('go')
-        print("   ✓ Context loaded\n")
+        if self.pre_go_prepared and self.pre_go_prepared.get('context'):
+            context = self.pre_go_prepared['context']
+            print("   ✓ Context loaded (pre-GO)\n")
+        else:
+            context = self.load_optimized_context('go')
+            print("   ✓ Context loaded\n")
 
         print("4. Calling Claude for position review and decisions...")
 
@@ -7465,12 +8234,24 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     }
 
                     print("   📤 Recovery API call (30s timeout)...")
-                    recovery_response = requests.post(
-                        CLAUDE_API_URL,
-                        headers=headers,
-                        json=recovery_payload,
-                        timeout=30
-                    )
+                    recovery_started = time.time()
+                    try:
+                        recovery_response = requests.post(
+                            CLAUDE_API_URL,
+                            headers=headers,
+                            json=recovery_payload,
+                            timeout=30
+                        )
+                    except requests.exceptions.RequestException as e:
+                        self._record_claude_call('go', recovery_payload['model'], recovery_started, 0,
+                                                 status='timeout' if isinstance(e, requests.exceptions.Timeout) else 'error',
+                                                 error=str(e), stage='json_recovery')
+                        raise
+                    recovery_ok = recovery_response.status_code < 400
+                    self._record_claude_call('go', recovery_payload['model'], recovery_started, 0,
+                                             status='ok' if recovery_ok else 'http_error',
+                                             usage=recovery_response.json().get('usage') if recovery_ok else None,
+                                             http_status=recovery_response.status_code, stage='json_recovery')
                     recovery_response.raise_for_status()
 
                     recovery_data = recovery_response.json()
@@ -7714,6 +8495,10 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
         if original_buy_positions:
             print("5.5 Validating BUY recommendations (Phases 1-4: Full validation pipeline)...")
 
+            # v10.8: Fetch-once, concurrent enrichment for every BUY (skipped in blackouts)
+            go_enrichment = (self.enrich_go_candidates(original_buy_positions, screener_lookup)
+                             if can_enter_positions else {})
+
             for buy_pos in original_buy_positions:
                 ticker = buy_pos.get('ticker', 'UNKNOWN')
                 catalyst_type = buy_pos.get('catalyst', 'Unknown')
@@ -7876,7 +8661,8 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                             rejection_reasons.append(f"VIX {vix_result['vix']} - requires Tier1 only")
 
                     # PHASE 4: Relative Strength + Conviction Sizing
-                    rs_result = self.calculate_relative_strength(ticker, sector)
+                    enrichment = go_enrichment.get(ticker) or self._enrich_buy_candidate(buy_pos)[1]
+                    rs_result = enrichment['relative_strength']
                     # NOTE: RS filter removed in v7.1 - RS now used for scoring only
 
                     # PHASE 5.6: Technical Filters (4 essential swing trading indicators)
@@ -7884,7 +8670,7 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     # Rationale: Screener finds catalyst momentum, these filters reject momentum
                     # Solution: Convert to risk context for learning, not veto power
                     print(f"   📊 Checking technical setup for {ticker}...")
-                    tech_result = self.calculate_technical_score(ticker)
+                    tech_result = enrichment['technical']
 
                     # Extract current price from technical result for later use
                     current_price = tech_result.get('details', {}).get('price', 0)
@@ -7902,7 +8688,7 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     # Enhancement 1.5: Stage 2 Alignment Check (Minervini)
                     # v5.6 (Jan 11, 2026): SOFT FLAGS ONLY - Stage 2 is for trend-following, not catalyst momentum
                     print(f"   📈 Checking Stage 2 alignment for {ticker}...")
-                    stage2_result = self.check_stage2_alignment(ticker)
+                    stage2_result = enrichment['stage2']
 
                     if not stage2_result['stage2']:
                         if 'error' in stage2_result:
@@ -7925,7 +8711,7 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     # v5.6 (Jan 11, 2026): SOFT FLAGS ONLY - Entry timing rejects catalyst momentum
                     # Catalyst stocks are EXPECTED to be extended/overbought (that's the momentum from news)
                     print(f"   ⏱️  Checking entry timing for {ticker}...")
-                    timing_result = self.check_entry_timing(ticker, current_price)
+                    timing_result = enrichment['entry_timing']
 
                     if timing_result['wait_for_pullback']:
                         reason = f"Entry timing concern: {', '.join(timing_result['reasons'])}"
@@ -7952,7 +8738,7 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
 
                     # Enhancement 1.4: Post-Earnings Drift Check
                     print(f"   📈 Checking for post-earnings drift potential...")
-                    ped_result = self.detect_post_earnings_drift(ticker, catalyst_details)
+                    ped_result = enrichment['ped']
 
                     if ped_result['drift_expected']:
                         print(f"   ✓ PED Detected: {ped_result['confidence']} confidence")
@@ -8242,7 +9028,8 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
             accepted_buys, rejected_buys = self.enforce_sector_concentration(
                 new_positions=buy_positions,
                 current_portfolio=existing_positions + hold_positions,  # Include HOLD positions
-                leading_sectors=leading_sectors_list  # PHASE 4.3: Pass leading sectors for exception
+                leading_sectors=leading_sectors_list,  # PHASE 4.3: Pass leading sectors for exception
+                exit_tickers=exit_tickers  # v10.8: Exited names don't count toward correlation clusters
             )
 
             # Log rejections
@@ -8334,8 +9121,11 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
             'hold': hold_positions,
             'exit': exit_positions,
             'buy': buy_positions,
-            'trailing_stops': trailing_stop_positions  # NEW: Trailing stops to place at market open
+            'trailing_stops': trailing_stop_positions,  # NEW: Trailing stops to place at market open
+            'data_quality': MARKET_DATA.data_quality()  # v10.8: Deadline / circuit / stale-cache flags
         }
+        if pending['data_quality']['degraded']:
+            print(f"   ⚠️ Decisions made on degraded market data: {pending['data_quality']['flags']}")
 
         with open(self.pending_file, 'w') as f:
             json.dump(pending, f, indent=2)
@@ -8485,6 +9275,7 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
             exit_tickers = [e['ticker'] for e in exit_decisions]
             tickers_to_fetch = list(set(exit_tickers + [p['ticker'] for p in current_positions]))
             market_prices = self.fetch_current_prices(tickers_to_fetch)
+            approved_exits = []  # (position, exit_price, standardized_reason) - sold as one batch below
 
             for exit_decision in exit_decisions:
                 ticker = exit_decision['ticker']
@@ -8569,28 +9360,7 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     if should_execute_exit:
                         # Standardize the exit reason (converts Claude's freeform text to consistent format)
                         standardized_reason = self.standardize_exit_reason(position, exit_price, claude_reason)
-
-                        # v8.9: Execute sell order via Alpaca and get actual fill price
-                        alpaca_success, alpaca_msg, order_id, fill_price = self._execute_alpaca_sell(
-                            ticker,
-                            position.get('shares', 0),
-                            standardized_reason
-                        )
-                        if alpaca_success:
-                            print(f"      ✓ Alpaca: {alpaca_msg} (Order: {order_id})")
-
-                            # v8.9: Use Alpaca fill price as source of truth, fallback to quote price
-                            actual_exit_price = fill_price if fill_price else exit_price
-
-                            closed_trade = self._close_position(position, actual_exit_price, standardized_reason)
-                            closed_trades.append(closed_trade)
-                            exited_tickers.add(ticker)  # Track this ticker was exited
-                            print(f"   ✓ CLOSED {ticker}: {standardized_reason}")
-                        else:
-                            # v10.5: If Alpaca sell fails, keep position open - don't close in JSON
-                            print(f"      ⚠️ Alpaca: {alpaca_msg}")
-                            print(f"      → KEEPING POSITION OPEN (Alpaca sell failed)")
-                            # Don't add to closed_trades or exited_tickers - position stays open
+                        approved_exits.append((position, exit_price, standardized_reason))
                     else:
                         print(f"   ✗ REJECTED EXIT for {ticker}: {rejection_reason}")
                         print(f"      → Moved to HOLD instead")
@@ -8599,6 +9369,30 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                             hold_tickers.append(ticker)
                 else:
                     print(f"   ⚠️ {ticker} not found in portfolio")
+
+            # v10.8: Submit all sells at once and collect the fills (was one order + polling per ticker)
+            # v8.9: Alpaca fill price is the source of truth
+            exit_results = self._execute_alpaca_sells(
+                [(p['ticker'], p.get('shares', 0), reason) for p, _, reason in approved_exits]
+            )
+            for (position, exit_price, standardized_reason), result in zip(approved_exits, exit_results):
+                ticker = position['ticker']
+                alpaca_success, alpaca_msg, order_id, fill_price = result
+                if alpaca_success:
+                    print(f"      ✓ Alpaca: {alpaca_msg} (Order: {order_id})")
+
+                    # v8.9: Use Alpaca fill price as source of truth, fallback to quote price
+                    actual_exit_price = fill_price if fill_price else exit_price
+
+                    closed_trade = self._close_position(position, actual_exit_price, standardized_reason)
+                    closed_trades.append(closed_trade)
+                    exited_tickers.add(ticker)  # Track this ticker was exited
+                    print(f"   ✓ CLOSED {ticker}: {standardized_reason}")
+                else:
+                    # v10.5: If Alpaca sell fails, keep position open - don't close in JSON
+                    print(f"      ⚠️ Alpaca: {alpaca_msg}")
+                    print(f"      → KEEPING POSITION OPEN (Alpaca sell failed)")
+                    # Don't add to closed_trades or exited_tickers - position stays open
         else:
             print("   No exits\n")
 
@@ -8698,23 +9492,23 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
             buy_tickers = [p['ticker'] for p in buy_positions]
             market_prices = self.fetch_current_prices(buy_tickers)
 
-            # Enhancement 0.1: Fetch previous closes for gap analysis
-            # Need to get yesterday's close for all buy candidates
-            previous_closes = {}
-            for ticker in buy_tickers:
-                try:
-                    # Fetch 2-day history to get previous close
-                    bars = requests.get(
-                        f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{(datetime.now() - timedelta(days=5)).strftime("%Y-%m-%d")}/{datetime.now().strftime("%Y-%m-%d")}',
-                        params={'apiKey': POLYGON_API_KEY},
-                        timeout=10
-                    ).json()
-                    if bars.get('results') and len(bars['results']) >= 2:
-                        previous_closes[ticker] = bars['results'][-2]['c']  # Previous day close
-                except Exception as e:
-                    print(f"⚠️ Warning: Failed to fetch previous close for {ticker}: {e}")
-                    previous_closes[ticker] = None
+            # v10.8: One batched quote request for all entry spread checks
+            spread_checks = self.check_bid_ask_spreads(buy_tickers)
+
+            # Enhancement 0.1: Previous closes for gap analysis
+            # v10.8: From one shared daily-bar window per buy (also used for ATR stops)
+            entry_bars = self._entry_bars(buy_tickers)
+            previous_closes = {ticker: self._previous_close(bars) for ticker, bars in entry_bars.items()}
 
+            # v10.8: One bulk gap snapshot for held and candidate tickers (saved for RECHECK to diff)
+            held_prices = {p['ticker']: p.get('current_price') for p in updated_positions}
+            gap_snapshot = self.take_gap_snapshot(
+                list(held_prices) + buy_tickers, 'EXECUTE',
+                prices={**held_prices, **market_prices}, previous_closes=previous_closes)
+
+            # v10.8: Stage 1 - collect every buy's inputs and apply the hard skips (price, spread, gap)
+            # before sizing anything, so early buys can't take the cash later ones need
+            entry_candidates = []  # (pos, entry_price, spread_check)
             for pos in buy_positions:
                 ticker = pos['ticker']
                 if ticker in market_prices:
@@ -8722,24 +9516,18 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     if not entry_price or entry_price <= 0:
                         print(f"   ⚠️ SKIPPED {ticker}: Invalid entry price ({entry_price})")
                         continue
-                    previous_close = previous_closes.get(ticker) or (entry_price * 0.98)  # Fallback estimate
+                    previous_close = gap_snapshot.previous(ticker) or (entry_price * 0.98)  # Fallback estimate
 
                     # v7.0: Check bid-ask spread to prevent expensive execution
-                    spread_check = self.check_bid_ask_spread(ticker)
+                    spread_check = spread_checks[ticker]
                     if spread_check['should_skip']:
                         print(f"   ⚠️ SKIPPED {ticker}: Spread too wide ({spread_check['spread_pct']:.2%}) - would erode edge")
                         print(f"      Bid: ${spread_check['bid']:.2f}, Ask: ${spread_check['ask']:.2f}, Mid: ${spread_check['mid_price']:.2f}")
                         print(f"      Illiquid stock - market order could be costly")
                         continue  # Skip this entry
 
-                    # v7.1: Store bid/ask for slippage tracking (execution cost validation)
-                    entry_bid = spread_check.get('bid', 0)
-                    entry_ask = spread_check.get('ask', 0)
-                    entry_mid_price = spread_check.get('mid_price', entry_price)
-                    entry_spread_pct = spread_check.get('spread_pct', 0)
-
-                    # Enhancement 0.1: Gap-aware entry logic
-                    gap_analysis = self.analyze_premarket_gap(ticker, entry_price, previous_close)
+                    # Enhancement 0.1: Gap-aware entry logic (v10.8: classified in the bulk snapshot)
+                    gap_analysis = gap_snapshot.analysis(ticker)
 
                     # Check if we should skip entry due to large gap
                     if not gap_analysis['should_enter_at_open']:
@@ -8770,8 +9558,10 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                                 'previous_close': previous_close,
                                 'gap_pct': gap_analysis['gap_pct'],
                                 'classification': gap_analysis['classification'],
+                                'premarket_volume': gap_snapshot.volume_of(ticker),
                                 'position_data': pos,  # Full position data for entry
-                                'skipped_at': datetime.now().strftime('%H:%M:%S')
+                                # v10.8: ET, like the VWAP touch times RECHECK compares it with
+                                'skipped_at': datetime.now(ET).strftime('%H:%M:%S')
                             })
 
                             with open(skipped_file, 'w') as f:
@@ -8790,152 +9580,157 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     if abs(gap_analysis['gap_pct']) >= 2.0:
                         print(f"   ℹ️  {ticker}: {gap_analysis['classification']} ({gap_analysis['gap_pct']:+.1f}%) - {gap_analysis['entry_strategy']}")
 
-                    # COMPOUND GROWTH: Calculate position size based on CURRENT account value
-                    position_size_pct = pos.get('position_size_pct', 10.0)
-                    position_size_dollars = round((position_size_pct / 100) * current_account_value, 2)
-
-                    # Ensure we don't exceed available cash
-                    if position_size_dollars > cash_available:
-                        position_size_dollars = round(cash_available, 2)
-                        print(f"   ⚠️ {ticker}: Reduced size to available cash ${cash_available:.2f}")
-
-                    # Enhancement 1.2: Calculate dynamic profit target based on catalyst
-                    catalyst_tier = pos.get('catalyst_tier', 'Tier2')
-                    catalyst_type = pos.get('catalyst', 'Unknown')
-                    catalyst_details = pos.get('catalyst_details', {})
-
-                    target_info = self.get_dynamic_profit_target(catalyst_tier, catalyst_type, catalyst_details)
-                    dynamic_target_pct = target_info['target_pct']
-                    target_rationale = target_info['rationale']
-
-                    pos['entry_price'] = entry_price
-                    pos['current_price'] = entry_price
-                    pos['entry_date'] = datetime.now().strftime('%Y-%m-%d')
-                    pos['days_held'] = 0
-                    pos['position_size'] = position_size_dollars  # Store actual dollar amount
-                    pos['shares'] = position_size_dollars / entry_price
-
-                    # v7.1: Calculate slippage (execution cost beyond spread)
-                    # Slippage = (fill_price - mid_price) / mid_price * 10000 bps
-                    # Positive = paid more than mid, negative = paid less than mid
-                    if entry_mid_price is not None and entry_mid_price > 0:
-                        slippage_bps = ((entry_price - entry_mid_price) / entry_mid_price) * 10000
-                        pos['entry_bid'] = entry_bid
-                        pos['entry_ask'] = entry_ask
-                        pos['entry_mid_price'] = entry_mid_price
-                        pos['entry_spread_pct'] = entry_spread_pct
-                        pos['slippage_bps'] = round(slippage_bps, 2)
-                    else:
-                        # Fallback if mid_price unavailable
-                        pos['entry_bid'] = 0
-                        pos['entry_ask'] = 0
-                        pos['entry_mid_price'] = entry_price
-                        pos['entry_spread_pct'] = 0
-                        pos['slippage_bps'] = 0
-
-                    # v8.9.9: Custom stop support with -7% ceiling enforcement
-                    custom_stop_pct = pos.get('custom_stop_pct')
-                    if custom_stop_pct is not None:
-                        # Enforce -7% ceiling: custom stop can be tighter (e.g., -3%) but never wider
-                        if custom_stop_pct < -7.0:
-                            print(f"      ⚠️ Custom stop {custom_stop_pct}% exceeds -7% max, capping at -7%")
-                            custom_stop_pct = -7.0
-                        elif custom_stop_pct > -1.0:
-                            print(f"      ⚠️ Custom stop {custom_stop_pct}% too tight, setting to -1%")
-                            custom_stop_pct = -1.0
-                        pos['stop_loss'] = round(entry_price * (1 + custom_stop_pct/100), 2)
-                        pos['stop_pct'] = custom_stop_pct
-                        print(f"      Stop: ${pos['stop_loss']:.2f} ({custom_stop_pct:.1f}%) - Custom (GO recommendation)")
-                    else:
-                        # v7.0: ATR-based stops (2.5x ATR, capped at -7%)
-                        atr = self.calculate_atr(ticker, period=14)
-                        if atr and atr > 0:
-                            # Stop = entry - (2.5 * ATR), but not wider than -7%
-                            atr_stop_distance = atr * 2.5
-                            atr_stop = entry_price - atr_stop_distance
-                            max_stop = entry_price * 0.93  # -7% cap for safety
-                            pos['stop_loss'] = round(max(atr_stop, max_stop), 2)  # Use tighter of the two
-                            stop_pct = ((pos['stop_loss'] - entry_price) / entry_price) * 100
-                            pos['stop_pct'] = round(stop_pct, 2)
-                            print(f"      Stop: ${pos['stop_loss']:.2f} ({stop_pct:.1f}%) - ATR-based (ATR=${atr:.2f}, 2.5x=${atr_stop_distance:.2f})")
-                        else:
-                            # Fallback to -7% if ATR unavailable
-                            pos['stop_loss'] = round(entry_price * 0.93, 2)
-                            pos['stop_pct'] = -7.0
-                            print(f"      Stop: ${pos['stop_loss']:.2f} (-7.0%) - Fixed (ATR unavailable)")
-
-                    pos['price_target'] = round(entry_price * (1 + dynamic_target_pct/100), 2)  # Dynamic target
-                    pos['target_pct'] = dynamic_target_pct  # Store for reference
-                    pos['target_rationale'] = target_rationale
-                    pos['stretch_target'] = target_info.get('stretch_target')
-                    pos['expected_hold_days'] = target_info.get('expected_hold_days', '5-7 days')
-                    pos['unrealized_gain_pct'] = 0.0
-                    pos['unrealized_gain_dollars'] = 0.0
-
-                    # Update cash available for next position
-                    cash_available -= position_size_dollars
-
-                    # v8.9: Execute buy order via Alpaca and get actual fill price
-                    alpaca_success, alpaca_msg, order_id, actual_shares, fill_price = self._execute_alpaca_buy(
-                        ticker,
-                        position_size_dollars,
-                        entry_price
-                    )
-                    if alpaca_success:
-                        print(f"      ✓ Alpaca: {alpaca_msg} (Order: {order_id})")
-                        # Update shares if Alpaca returned actual quantity
-                        if actual_shares > 0:
-                            pos['shares'] = actual_shares
-
-                        # v8.9: Use Alpaca fill price as source of truth
-                        if fill_price:
-                            pos['entry_price'] = fill_price
-                            # Recalculate stop and target based on actual fill price
-                            pos['stop_loss'] = round(fill_price * (1 + pos.get('stop_pct', -7.0)/100), 2)
-                            pos['price_target'] = round(fill_price * (1 + pos.get('target_pct', 10)/100), 2)
-                            print(f"      → Entry price updated to Alpaca fill: ${fill_price:.2f}")
+                    entry_candidates.append((pos, entry_price, spread_check))
+                else:
+                    print(f"   ⚠️ {ticker}: Failed to fetch price")
 
-                        # v8.9.5: Place stop-loss order via Alpaca for real-time protection
-                        # Add delay to avoid wash trade detection (Alpaca rejects rapid order sequences)
-                        time.sleep(3)  # Wait 3 seconds for buy order to fully settle (v8.9.6)
+            # v10.8: Stage 2 - size all buys in one pass (cash, sector, conviction, per-name caps)
+            # COMPOUND GROWTH: Sizes are percentages of the CURRENT account value
+            allocation_plan = self.plan_buy_allocation(
+                entry_candidates, current_account_value, cash_available, updated_positions)
 
-                        actual_entry = fill_price if fill_price else entry_price
-                        stop_loss_price = pos.get('stop_loss', actual_entry * 0.93)
-                        shares_for_stop = int(actual_shares) if actual_shares > 0 else int(pos.get('shares', 0))
-                        if shares_for_stop > 0:
-                            sl_success, sl_msg, sl_order_id = self.broker.place_stop_loss_order(
-                                ticker=ticker,
-                                qty=shares_for_stop,
-                                stop_price=stop_loss_price
-                            )
-                            if sl_success:
-                                pos['alpaca_stop_loss_order_id'] = sl_order_id
-                                print(f"      ✓ Alpaca: Stop-loss placed at ${stop_loss_price:.2f} (Order: {sl_order_id})")
-                            else:
-                                print(f"      ⚠️ Alpaca stop-loss failed: {sl_msg}")
-                                print(f"      → Using JSON stop-loss tracking as fallback")
+            # v10.8: Stage 3 - complete order plan (stops, targets) before any order goes out
+            pending_entries = []  # Sized entries awaiting the batched Alpaca submission
+            for pos, entry_price, spread_check in entry_candidates:
+                ticker = pos['ticker']
+                allocation = allocation_plan.get(ticker)
+                if allocation is None:
+                    continue
+                position_size_pct = allocation.pct
+                position_size_dollars = allocation.dollars
+                limits = f" - cut by {', '.join(allocation.constraints)}" if allocation.constraints else ''
+                print(f"   📋 {ticker}: ${position_size_dollars:.2f} ({position_size_pct}%), "
+                      f"{allocation.shares} shares @ ${entry_price:.2f}{limits}")
+
+                # v7.1: Store bid/ask for slippage tracking (execution cost validation)
+                entry_bid = spread_check.get('bid', 0)
+                entry_ask = spread_check.get('ask', 0)
+                entry_mid_price = spread_check.get('mid_price', entry_price)
+                entry_spread_pct = spread_check.get('spread_pct', 0)
+
+                # Enhancement 1.2: Calculate dynamic profit target based on catalyst
+                catalyst_tier = pos.get('catalyst_tier', 'Tier2')
+                catalyst_type = pos.get('catalyst', 'Unknown')
+                catalyst_details = pos.get('catalyst_details', {})
+
+                target_info = self.get_dynamic_profit_target(catalyst_tier, catalyst_type, catalyst_details)
+                dynamic_target_pct = target_info['target_pct']
+                target_rationale = target_info['rationale']
+
+                pos['entry_price'] = entry_price
+                pos['current_price'] = entry_price
+                pos['entry_date'] = datetime.now().strftime('%Y-%m-%d')
+                pos['days_held'] = 0
+                pos['position_size'] = position_size_dollars  # Store actual dollar amount
+                pos['shares'] = position_size_dollars / entry_price
+
+                # v7.1: Calculate slippage (execution cost beyond spread)
+                # Slippage = (fill_price - mid_price) / mid_price * 10000 bps
+                # Positive = paid more than mid, negative = paid less than mid
+                if entry_mid_price is not None and entry_mid_price > 0:
+                    slippage_bps = ((entry_price - entry_mid_price) / entry_mid_price) * 10000
+                    pos['entry_bid'] = entry_bid
+                    pos['entry_ask'] = entry_ask
+                    pos['entry_mid_price'] = entry_mid_price
+                    pos['entry_spread_pct'] = entry_spread_pct
+                    pos['slippage_bps'] = round(slippage_bps, 2)
+                else:
+                    # Fallback if mid_price unavailable
+                    pos['entry_bid'] = 0
+                    pos['entry_ask'] = 0
+                    pos['entry_mid_price'] = entry_price
+                    pos['entry_spread_pct'] = 0
+                    pos['slippage_bps'] = 0
+
+                # v8.9.9: Custom stop support with -7% ceiling enforcement
+                custom_stop_pct = pos.get('custom_stop_pct')
+                if custom_stop_pct is not None:
+                    # Enforce -7% ceiling: custom stop can be tighter (e.g., -3%) but never wider
+                    if custom_stop_pct < -7.0:
+                        print(f"      ⚠️ Custom stop {custom_stop_pct}% exceeds -7% max, capping at -7%")
+                        custom_stop_pct = -7.0
+                    elif custom_stop_pct > -1.0:
+                        print(f"      ⚠️ Custom stop {custom_stop_pct}% too tight, setting to -1%")
+                        custom_stop_pct = -1.0
+                    pos['stop_loss'] = round(entry_price * (1 + custom_stop_pct/100), 2)
+                    pos['stop_pct'] = custom_stop_pct
+                    print(f"      Stop: ${pos['stop_loss']:.2f} ({custom_stop_pct:.1f}%) - Custom (GO recommendation)")
+                else:
+                    # v7.0: ATR-based stops (2.5x ATR, capped at -7%)
+                    atr = self.calculate_atr(ticker, period=14, bars=entry_bars.get(ticker))
+                    if atr and atr > 0:
+                        # Stop = entry - (2.5 * ATR), but not wider than -7%
+                        atr_stop_distance = atr * 2.5
+                        atr_stop = entry_price - atr_stop_distance
+                        max_stop = entry_price * 0.93  # -7% cap for safety
+                        pos['stop_loss'] = round(max(atr_stop, max_stop), 2)  # Use tighter of the two
+                        stop_pct = ((pos['stop_loss'] - entry_price) / entry_price) * 100
+                        pos['stop_pct'] = round(stop_pct, 2)
+                        print(f"      Stop: ${pos['stop_loss']:.2f} ({stop_pct:.1f}%) - ATR-based (ATR=${atr:.2f}, 2.5x=${atr_stop_distance:.2f})")
+                    else:
+                        # Fallback to -7% if ATR unavailable
+                        pos['stop_loss'] = round(entry_price * 0.93, 2)
+                        pos['stop_pct'] = -7.0
+                        print(f"      Stop: ${pos['stop_loss']:.2f} (-7.0%) - Fixed (ATR unavailable)")
+
+                pos['price_target'] = round(entry_price * (1 + dynamic_target_pct/100), 2)  # Dynamic target
+                pos['target_pct'] = dynamic_target_pct  # Store for reference
+                pos['target_rationale'] = target_rationale
+                pos['stretch_target'] = target_info.get('stretch_target')
+                pos['expected_hold_days'] = target_info.get('expected_hold_days', '5-7 days')
+                pos['unrealized_gain_pct'] = 0.0
+                pos['unrealized_gain_dollars'] = 0.0
+
+                # Update cash available for next position
+                cash_available -= position_size_dollars
+                pending_entries.append((pos, entry_price, position_size_dollars, position_size_pct,
+                                        dynamic_target_pct, target_rationale))
 
-                    elif "not available" not in alpaca_msg:
-                        # v10.5: DON'T add position if Alpaca failed to execute
-                        # This prevents phantom positions (like DE) that exist in JSON but not in Alpaca
-                        if "Invalid quantity" in alpaca_msg:
-                            print(f"      ⚠️ Alpaca: {alpaca_msg}")
-                            print(f"      ✗ SKIPPED {ticker}: Cannot buy 0 shares (price too high for allocation)")
-                            # Restore cash since we didn't actually buy
-                            cash_available += position_size_dollars
-                            continue  # Skip adding to portfolio
+            # v10.8: Submit all buys at once; each stop-loss is placed as its fill arrives
+            # (was one order, up to 5s of fill polling and a 3s stop delay per ticker)
+            entry_results = self._execute_alpaca_buys(
+                [(pos, size, price) for pos, price, size, *_ in pending_entries]
+            )
+            for entry, result in zip(pending_entries, entry_results):
+                pos, entry_price, position_size_dollars, position_size_pct, dynamic_target_pct, target_rationale = entry
+                ticker = pos['ticker']
+                alpaca_success, alpaca_msg, order_id, actual_shares, fill_price, stop = result
+                if alpaca_success:
+                    print(f"      ✓ Alpaca {ticker}: {alpaca_msg} (Order: {order_id})")
+                    # v8.9: Use Alpaca fill price as source of truth (stop/target recalculated)
+                    self._apply_entry_fill(pos, actual_shares, fill_price)
+                    if fill_price:
+                        print(f"      → Entry price updated to Alpaca fill: ${fill_price:.2f}")
+
+                    # v8.9.5: Stop-loss order via Alpaca for real-time protection
+                    if stop:
+                        sl_success, sl_msg, sl_order_id, stop_loss_price = stop
+                        if sl_success:
+                            pos['alpaca_stop_loss_order_id'] = sl_order_id
+                            print(f"      ✓ Alpaca: Stop-loss placed at ${stop_loss_price:.2f} (Order: {sl_order_id})")
                         else:
-                            print(f"      ⚠️ Alpaca: {alpaca_msg}")
-                            print(f"      ✗ SKIPPED {ticker}: Alpaca order failed - not adding to portfolio")
-                            cash_available += position_size_dollars
-                            continue  # Skip adding to portfolio
-
-                    updated_positions.append(pos)
-                    actual_entry = pos['entry_price']  # v8.9: Use actual fill price
-                    print(f"   ✓ ENTERED {ticker}: ${actual_entry:.2f}, {pos['shares']:.2f} shares (${position_size_dollars:.2f} = {position_size_pct}% of ${current_account_value:.2f})")
-                    print(f"      Target: +{dynamic_target_pct}% (${pos['price_target']:.2f}) - {target_rationale}")
-                else:
-                    print(f"   ⚠️ {ticker}: Failed to fetch price")
+                            print(f"      ⚠️ Alpaca stop-loss failed: {sl_msg}")
+                            print(f"      → Using JSON stop-loss tracking as fallback")
+
+                elif "not available" not in alpaca_msg:
+                    # v10.5: DON'T add position if Alpaca failed to execute
+                    # This prevents phantom positions (like DE) that exist in JSON but not in Alpaca
+                    if "Invalid quantity" in alpaca_msg:
+                        print(f"      ⚠️ Alpaca: {alpaca_msg}")
+                        print(f"      ✗ SKIPPED {ticker}: Cannot buy 0 shares (price too high for allocation)")
+                        # Restore cash since we didn't actually buy
+                        cash_available += position_size_dollars
+                        continue  # Skip adding to portfolio
+                    else:
+                        print(f"      ⚠️ Alpaca: {alpaca_msg}")
+                        print(f"      ✗ SKIPPED {ticker}: Alpaca order failed - not adding to portfolio")
+                        cash_available += position_size_dollars
+                        continue  # Skip adding to portfolio
+
+                updated_positions.append(pos)
+                actual_entry = pos['entry_price']  # v8.9: Use actual fill price
+                print(f"   ✓ ENTERED {ticker}: ${actual_entry:.2f}, {pos['shares']:.2f} shares (${position_size_dollars:.2f} = {position_size_pct}% of ${current_account_value:.2f})")
+                print(f"      Target: +{dynamic_target_pct}% (${pos['price_target']:.2f}) - {target_rationale}")
         else:
             print("   No new entries\n")
 
@@ -9278,47 +10073,12 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
         print("RECHECK COMMAND - Gap Settlement Re-evaluation")
         print("="*60)
 
-        # Load skipped stocks
+        # Load skipped stocks (v10.8: shared with agent_cli.py's fast no-work path)
         skipped_file = self.project_dir / 'skipped_for_gap.json'
-        if not skipped_file.exists():
-            print("\n✓ No skipped stocks file found.")
-            print("   (No stocks were skipped for gaps during EXECUTE)")
-            print(f"\n{'='*60}")
-            print(f"RECHECK SUMMARY")
-            print(f"{'='*60}")
-            print(f"   Stocks checked:  0")
-            print(f"   Entered:         0")
-            print(f"   Still skipped:   0")
-            self.save_response("recheck", "No stocks skipped for gaps - nothing to recheck")
-            return True  # SUCCESS - nothing to recheck is a valid outcome
-
-        with open(skipped_file) as f:
-            skipped_data = json.load(f)
-
-        today = datetime.now().strftime('%Y-%m-%d')
-        if skipped_data.get('date') != today:
-            print(f"\n✓ Skipped stocks file is from {skipped_data.get('date')}, not today ({today}).")
-            print("   (Stale file from previous day - ignoring)")
-            print(f"\n{'='*60}")
-            print(f"RECHECK SUMMARY")
-            print(f"{'='*60}")
-            print(f"   Stocks checked:  0")
-            print(f"   Entered:         0")
-            print(f"   Still skipped:   0")
-            self.save_response("recheck", f"Skipped file from {skipped_data.get('date')} - stale, nothing to recheck today")
-            return True  # SUCCESS - nothing to recheck today is a valid outcome
-
-        stocks = skipped_data.get('stocks', [])
+        stocks, notes, response = load_recheck_queue(self.project_dir)
         if not stocks:
-            print("\n✓ Skipped stocks file exists but is empty.")
-            print(f"\n{'='*60}")
-            print(f"RECHECK SUMMARY")
-            print(f"{'='*60}")
-            print(f"   Stocks checked:  0")
-            print(f"   Entered:         0")
-            print(f"   Still skipped:   0")
-            self.save_response("recheck", "Skipped file empty - nothing to recheck")
-            return True
+            report_nothing_to_recheck(notes, response, self.save_response)
+            return True  # SUCCESS - nothing to recheck is a valid outcome
 
         print(f"\n📋 Found {len(stocks)} stock(s) skipped at 9:45 AM for gap re-evaluation:\n")
 
@@ -9372,6 +10132,29 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
         # v8.9.4: Build set of existing tickers to prevent duplicate entries
         existing_tickers = {p['ticker'] for p in positions}
 
+        # v10.8: Live prices for all skipped stocks in one request, then one gap snapshot
+        # diffed against EXECUTE's (how far each gap moved, volume traded since 9:45 AM)
+        recheck_tickers = [s['ticker'] for s in stocks if s['ticker'] not in existing_tickers]
+        live_prices = {}
+        if recheck_tickers and self.use_alpaca and self.broker:
+            try:
+                live_prices = self.broker.get_latest_trades(recheck_tickers)
+            except Exception as e:
+                print(f"   ⚠️ Alpaca batch price fetch failed: {e}")
+        gap_changes = {}
+        if recheck_tickers:
+            from gap_engine import load_gap_snapshot  # v10.8: deferred - numpy adds ~80ms to agent startup
+            recheck_snapshot = self.take_gap_snapshot(
+                recheck_tickers, 'RECHECK', prices=live_prices,
+                previous_closes={s['ticker']: s['previous_close'] for s in stocks})
+            execute_snapshot = load_gap_snapshot(self.project_dir, 'EXECUTE')
+            if execute_snapshot:
+                gap_changes = execute_snapshot.diff(recheck_snapshot)
+        # v10.8: Session VWAP for all skipped stocks from minute bars (incremental on repeat runs)
+        vwap_values = self.session_vwap(recheck_tickers)
+        if recheck_tickers:
+            print()
+
         for stock in stocks:
             ticker = stock['ticker']
             original_gap = stock['gap_pct']
@@ -9387,18 +10170,16 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                 still_skipped.append({**stock, 'final_gap': original_gap, 'skip_reason': 'already_in_portfolio'})
                 continue
 
-            # Get current price via Alpaca (real-time) - RECHECK needs live prices during market hours
-            current_price = None
-            if self.use_alpaca and self.broker:
-                current_price = self.broker.get_last_price(ticker)
+            # Current price via Alpaca (real-time) - RECHECK needs live prices during market hours
+            current_price = live_prices.get(ticker)
 
             if not current_price:
                 print(f"      ❌ Could not get current price for {ticker}")
                 still_skipped.append(stock)
                 continue
 
-            # Calculate current gap from previous close
-            current_gap = ((current_price - previous_close) / previous_close) * 100
+            # Current gap from previous close (v10.8: from the RECHECK gap snapshot)
+            current_gap = recheck_snapshot.analysis(ticker)['gap_pct']
 
             # Calculate price change since 9:45 AM
             price_change_since_945 = ((current_price - original_price) / original_price) * 100
@@ -9407,12 +10188,25 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
             print(f"      9:45 AM price:  ${original_price:.2f} ({original_gap:+.1f}% gap)")
             print(f"      Current price:  ${current_price:.2f} ({current_gap:+.1f}% from close)")
             print(f"      Change since 9:45: {price_change_since_945:+.1f}%")
+            change = gap_changes.get(ticker)
+            if change and change['volume_since'] is not None:
+                print(f"      Volume since 9:45: {change['volume_since']:,.0f} "
+                      f"({change['class_then']} → {change['class_now']})")
+            session = vwap_values.get(ticker)
+            vwap = session['vwap'] if session else None
+            pulled_back_to_vwap = bool(session and session['last_touch']
+                                       and session['last_touch'] >= stock.get('skipped_at', '09:45')[:5])
+            if vwap:
+                touch_note = f", last touched {session['last_touch']}" if session['last_touch'] else ", not touched"
+                print(f"      Session VWAP:   ${vwap:.2f} ({(current_price - vwap) / vwap * 100:+.1f}%{touch_note}; "
+                      f"range ${session['session_low']:.2f}-${session['session_high']:.2f})")
 
             # Decision logic for gap settlement
             # Enter if:
             # 1. Gap has reduced to <2% (normal entry territory), OR
             # 2. Price has pulled back at least 1% from 9:45 AM price (pullback entry), OR
-            # 3. Current gap is <3% and original was 2-5% range (gap settling)
+            # 3. Current gap is <3% and original was 2-5% range (gap settling), OR
+            # 4. Price pulled back to session VWAP after the skip and holds above it (v10.8)
             should_enter = False
             entry_reason = ""
 
@@ -9425,6 +10219,9 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
             elif original_gap <= 5.0 and current_gap < 3.0:
                 should_enter = True
                 entry_reason = f"Gap reduced from {original_gap:+.1f}% to {current_gap:+.1f}%"
+            elif pulled_back_to_vwap and current_price >= vwap:
+                should_enter = True
+                entry_reason = f"Pullback to VWAP ${vwap:.2f} at {session['last_touch']}, holding above"
 
             if should_enter:
                 print(f"      ✓ GAP SETTLED: {entry_reason}")
@@ -9461,6 +10258,7 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                     'original_gap': original_gap,
                     'entry_gap': current_gap,
                     'gap_settlement_reason': entry_reason,
+                    'entry_vwap': vwap,
                     # Copy ALL learning-relevant fields from original position
                     'catalyst': pos_data.get('catalyst', 'Unknown'),
                     'catalyst_tier': pos_data.get('catalyst_tier', 'Tier2'),
@@ -9572,11 +10370,18 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
 
         # Save updated portfolio
         if entered_count > 0:
-            portfolio['positions'] = positions
-            portfolio['cash_available'] = cash_available
-            portfolio['last_updated'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
-            with open(self.portfolio_file, 'w') as f:
-                json.dump(portfolio, f, indent=2)
+            # v10.8: Re-read under the lock - MONITOR may have closed or trailed positions
+            # since RECHECK loaded; only the new entries are added to what is there now
+            with self.portfolio_lock():
+                portfolio = self.load_current_portfolio()
+                entered_tickers = {p['ticker'] for p in entered_positions}
+                positions = [p for p in portfolio.get('positions', []) if p['ticker'] not in entered_tickers]
+                positions.extend(entered_positions)
+                portfolio['positions'] = positions
+                portfolio['total_positions'] = len(positions)
+                portfolio['cash_available'] = cash_available
+                portfolio['last_updated'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+                self.save_portfolio(portfolio)
             print(f"\n✓ Portfolio updated with {entered_count} new position(s)")
 
         # Clear the skipped file (processed for today)
@@ -9640,7 +10445,8 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
         Fetch REAL-TIME prices from Alpaca API (no delay)
 
         Used by EXIT command at 3:45 PM for same-day execution decisions.
-        Falls back to Polygon if Alpaca unavailable.
+        Tickers Alpaca has no trade for (failed chunk, no trade) fall back to
+        Polygon.
 
         Args:
             tickers: List of ticker symbols
@@ -9648,27 +10454,169 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
         Returns:
             dict: {ticker: price} for successfully fetched prices
         """
-        prices = {}
-
         if not self.use_alpaca or not self.broker:
             print("   ⚠️ Alpaca not available, falling back to Polygon (15-min delay)")
             return self.fetch_current_prices(tickers)
 
-        print(f"   Fetching REAL-TIME prices for {len(tickers)} tickers via Alpaca...")
-
-        for ticker in tickers:
-            try:
-                price = self.broker.get_last_price(ticker)
-                if price and price > 0:
-                    prices[ticker] = price
-                else:
+        print(f"   Fetching REAL-TIME prices for {len(tickers)} tickers via Alpaca (batched latest trades)...")
+
+        # v10.8: One multi-symbol request instead of a round-trip per ticker. The broker
+        # logs and skips failed chunks, so missing tickers are the failure signal.
+        prices = self.broker.get_latest_trades(tickers)
+        missing = [ticker for ticker in dict.fromkeys(tickers) if ticker not in prices]
+        if missing:
+            print(f"   ⚠️ No Alpaca price for {len(missing)} tickers, falling back to Polygon (15-min delay)")
+            fallback = self.fetch_current_prices(missing)
+            prices.update(fallback)
+            for ticker in missing:
+                if ticker not in fallback:
                     print(f"      ⚠️ No price for {ticker}")
-            except Exception as e:
-                print(f"      ⚠️ Failed to fetch {ticker}: {e}")
 
         print(f"   ✓ Fetched {len(prices)}/{len(tickers)} prices")
         return prices
 
+    # =====================================================================
+    # INTRADAY POSITION MONITOR (v10.8)
+    # =====================================================================
+
+    def execute_monitor_command(self, replay_file=None):
+        """
+        Execute MONITOR command (after EXECUTE until MONITOR_END_TIME)
+
+        Streams trades for every open position and evaluates stop/target/trailing
+        rules on each tick (position_monitor.py). Intents are appended to
+        portfolio_data/exit_intents.jsonl as they happen:
+        - TARGET_REACHED: trailing stop activated via check_position_exits
+          (places the Alpaca trailing order hours before ANALYZE would)
+        - STOP_LOSS / TRAILING_STOP: sold immediately when MONITOR_AUTO_EXIT=true
+          and no Alpaca stop order already covers the position; otherwise
+          logged for EXIT to act on
+
+        Args:
+            replay_file: JSONL/CSV of recorded ticks to replay instead of the live stream
+
+        Returns:
+            True if monitoring ran (or there was nothing to monitor)
+        """
+        print("\n" + "="*60)
+        print("MONITOR COMMAND - Event-Driven Position Monitoring")
+        print("="*60)
+
+        if not MONITOR_AVAILABLE:
+            print("   ⚠️ position_monitor module not available")
+            return False
+
+        positions = self.load_current_portfolio().get('positions', [])
+        if not positions:
+            print("\n✓ No open positions to monitor")
+            return True
+
+        monitor = PositionMonitor(positions, broker_trailing=bool(self.use_alpaca and self.broker))
+
+        if replay_file:
+            feed = ReplayFeed.from_file(replay_file)
+            until = None
+            print(f"\n📼 Replaying ticks from {replay_file}")
+        else:
+            try:
+                feed = AlpacaTradeFeed(monitor.tickers)
+            except ValueError as e:
+                print(f"   ⚠️ Live stream unavailable: {e}")
+                return False
+            hour, minute = map(int, MONITOR_END_TIME.split(':'))
+            until = datetime.now(ET).replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if datetime.now(ET) >= until:
+                print(f"\n✓ Past monitor end time ({MONITOR_END_TIME} ET) - EXIT handles the rest")
+                return True
+            print(f"\n📡 Streaming trades for {len(monitor.tickers)} positions until {MONITOR_END_TIME} ET")
+
+        print(f"   Auto-exit: {'ON' if MONITOR_AUTO_EXIT else 'OFF (intents logged for EXIT)'}")
+
+        # Intents arrive on the feed thread; act on them one at a time off that thread
+        # so slow broker calls never delay tick evaluation
+        with ThreadPoolExecutor(max_workers=1) as actions:
+            monitor.on_intent = lambda intent: actions.submit(self._handle_monitor_intent, intent)
+            # Live: re-read the portfolio so positions entered after the start (RECHECK)
+            # are subscribed and positions closed elsewhere are dropped
+            refresh = None if replay_file else (lambda: self.load_current_portfolio().get('positions', []))
+            monitor.run(feed, until=until, refresh=refresh, refresh_seconds=MONITOR_REFRESH_SECONDS)
+
+        exits = sum(1 for intent in monitor.intents if intent.is_exit)
+        print(f"\n{'='*60}")
+        print(f"MONITOR SUMMARY")
+        print(f"{'='*60}")
+        print(f"   Ticks evaluated: {monitor.ticks}")
+        print(f"   Targets reached: {len(monitor.intents) - exits}")
+        print(f"   Exit intents:    {exits}")
+        return True
+
+    def _handle_monitor_intent(self, intent):
+        """Log one monitor intent and act on it (runs on the monitor's action thread)"""
+        print(f"   ⚡ {intent.timestamp} {intent.ticker}: {intent.kind.value} @ ${intent.price:.2f} "
+              f"({intent.return_pct:+.1f}%) - {intent.reason}")
+        try:
+            EXIT_INTENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(EXIT_INTENTS_FILE, 'a') as f:
+                f.write(json.dumps(intent.to_dict()) + '\n')
+        except Exception as e:
+            print(f"      ⚠️ Could not log intent: {e}")
+
+        try:
+            with self.portfolio_lock():
+                closed = self._apply_monitor_intent(intent)
+            if closed:
+                self.update_account_status()
+        except Exception as e:
+            print(f"      ⚠️ Failed to act on {intent.ticker} intent: {e}")
+
+    def _apply_monitor_intent(self, intent):
+        """
+        Act on one intent against a fresh read of the portfolio (caller holds portfolio_lock)
+
+        Returns:
+            True if the position was closed
+        """
+        portfolio = self.load_current_portfolio()
+        positions = portfolio.get('positions', [])
+        position = next((p for p in positions if p['ticker'] == intent.ticker), None)
+        if position is None:
+            print(f"      → {intent.ticker} no longer in portfolio")
+            return False
+
+        if intent.kind == IntentKind.TARGET_REACHED:
+            # Same activation path ANALYZE uses (JSON trailing fields + Alpaca trailing order)
+            self.check_position_exits(position, intent.price)
+        elif position.get('alpaca_stop_loss_order_id') or position.get('alpaca_trailing_order_id'):
+            print(f"      → Alpaca stop order covers {intent.ticker} - broker executes the exit")
+            return False
+        elif not MONITOR_AUTO_EXIT:
+            print(f"      → Logged for EXIT (MONITOR_AUTO_EXIT=false)")
+            return False
+        else:
+            # Reasons match update_portfolio_prices_and_check_exits
+            if intent.kind == IntentKind.STOP_LOSS:
+                exit_reason = self.standardize_exit_reason(position, intent.price, 'stop loss')
+            else:
+                exit_reason = intent.reason
+            alpaca_success, alpaca_msg, order_id, fill_price = self._execute_alpaca_sell(
+                intent.ticker, position.get('shares', 0), exit_reason
+            )
+            if not alpaca_success:
+                print(f"      ⚠️ Alpaca: {alpaca_msg}")
+                print(f"      → KEEPING POSITION OPEN (Alpaca sell failed)")
+                return False
+            exit_price = fill_price or intent.price
+            trade_data = self.close_position(position, exit_price, exit_reason)
+            self.log_completed_trade(trade_data)
+            positions.remove(position)
+            print(f"      ✓ Closed {intent.ticker} at ${exit_price:.2f} ({exit_reason})")
+
+        portfolio['positions'] = positions
+        portfolio['last_updated'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        portfolio['total_positions'] = len(positions)
+        self.save_portfolio(portfolio)
+        return intent.is_exit
+
     def execute_exit_command(self):
         """
         Execute EXIT command (3:45 PM - before market close)
@@ -9839,19 +10787,14 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
         print()
 
         # STEP 4: Fetch news for each position (v8.3 - Claude semantic review)
+        # v10.8: One concurrent sweep for the whole book, scored for invalidation in one pass
         print("4. Fetching news for positions...")
-        position_news = {}
         all_positions_to_check = [ae['position'] for ae in auto_exits] + [pr['position'] for pr in positions_for_claude_review]
-
-        for position in all_positions_to_check:
-            ticker = position['ticker']
-            try:
-                articles = self.fetch_polygon_news(ticker, limit=5, days_back=3)
-                position_news[ticker] = articles
-                print(f"   ✓ Fetched {len(articles)} news articles for {ticker}")
-            except Exception as e:
-                position_news[ticker] = []
-                print(f"   ⚠️ News fetch failed for {ticker}: {e}")
+        position_news = self.sweep_position_news([p['ticker'] for p in all_positions_to_check])
+        news_scores = self.score_book_news_invalidation(position_news)
+        for ticker, news_score in news_scores.items():
+            if news_score['score'] >= 30:
+                print(f"   📰 {ticker}: News invalidation {news_score['score']}/100 ({news_score['decision']})")
 
         print()
 
@@ -9913,8 +10856,9 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
             # Add news for this position
             articles = position_news.get(ticker, [])
             if articles:
-                position_summary += f"  Recent News ({len(articles)} articles):\n"
-                for article in articles[:3]:  # Top 3 articles
+                shown = articles[:3]  # Top 3 of up to NEWS_SWEEP_LIMIT swept articles
+                position_summary += f"  Recent News ({len(shown)} articles):\n"
+                for article in shown:
                     title = article.get('title', '')[:80]
                     source = article.get('publisher', {}).get('name', 'Unknown')
                     age_hours = article.get('age_hours', 0)
@@ -9927,6 +10871,12 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                             break
                     position_summary += f"    • [{source}] {title}\n"
                     position_summary += f"      ({age_hours:.0f}h ago, sentiment: {sentiment})\n"
+                # v10.8: Keyword invalidation score as a hint - Claude still judges the thesis
+                news_score = news_scores.get(ticker)
+                if news_score and news_score['score'] >= 30:
+                    worst = news_score['triggering_articles'][0]
+                    position_summary += (f"  News Invalidation Score: {news_score['score']}/100 ({news_score['decision']}) - "
+                                         f"worst: {worst['title'][:80]}\n")
             else:
                 position_summary += f"  Recent News: None found\n"
 
@@ -10217,19 +11167,24 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
                 # and just want accurate end-of-day values for display
                 closing_prices = self.fetch_current_prices(tickers)
 
-                for position in positions:
-                    ticker = position['ticker']
-                    if ticker in closing_prices:
-                        current_price = closing_prices[ticker]
-                        entry_price = position['entry_price']
-                        position['current_price'] = current_price
-                        position['unrealized_gain_pct'] = round(((current_price - entry_price) / entry_price) * 100, 2)
-                        position['unrealized_gain_dollars'] = round((current_price - entry_price) * position['shares'], 2)
-
-                # Save updated portfolio
-                portfolio['last_updated'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
-                with open(self.portfolio_file, 'w') as f:
-                    json.dump(portfolio, f, indent=2)
+                # v10.8: Apply to a fresh read under the lock (a late MONITOR action may have landed)
+                with self.portfolio_lock():
+                    with open(self.portfolio_file, 'r') as f:
+                        portfolio = json.load(f)
+                    positions = portfolio.get('positions', [])
+
+                    for position in positions:
+                        ticker = position['ticker']
+                        if ticker in closing_prices:
+                            current_price = closing_prices[ticker]
+                            entry_price = position['entry_price']
+                            position['current_price'] = current_price
+                            position['unrealized_gain_pct'] = round(((current_price - entry_price) / entry_price) * 100, 2)
+                            position['unrealized_gain_dollars'] = round((current_price - entry_price) * position['shares'], 2)
+
+                    # Save updated portfolio
+                    portfolio['last_updated'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+                    self.save_portfolio(portfolio)
 
                 print(f"   ✓ Updated {len(positions)} positions with closing prices\n")
             else:
@@ -10318,15 +11273,210 @@ IMPORTANT: Output ONLY the JSON block above. Nothing else."""
 # MAIN EXECUTION
 # =====================================================================
 
+# Commands accepted by main() and the resident daemon (agent_daemon.py)
+AGENT_COMMANDS = ('pre_go', 'go', 'execute', 'recheck', 'monitor', 'exit', 'analyze', 'learn')
+
+
+def command_deadline(command, now=None, spec=None):
+    """
+    Deadline for one agent command (v10.8)
+
+    GO must finish before the 9:30 open, EXECUTE / RECHECK within their
+    windows and EXIT before the close (DEFAULT_COMMAND_DEADLINES, earlier on
+    early-close days, COMMAND_DEADLINES overrides). Commands without a clock
+    deadline, and runs started after it, get COMMAND_BUDGET_SECONDS. MONITOR
+    runs until MONITOR_END_TIME on its own and has none.
+
+    Returns: market_data.Deadline, or None
+    """
+    if command == 'monitor':
+        return None
+    now = now or datetime.now(ET)
+    deadlines = dict(DEFAULT_COMMAND_DEADLINES)
+    if now.date() in EARLY_CLOSE_2026:
+        deadlines.update(EARLY_CLOSE_DEADLINES)
+    spec = os.environ.get('COMMAND_DEADLINES', '') if spec is None else spec
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        deadlines[name.strip().lower()] = value.strip().lower()
+
+    at = deadlines.get(command)
+    if at == 'off':
+        return None
+    if at is None:
+        return Deadline.after(COMMAND_BUDGET_SECONDS, command)
+    return Deadline.at(at, command, now=now)
+
+
+def begin_command(agent):
+    """
+    Clear everything that is only valid for one command (v10.8)
+
+    Cron starts each command in a fresh process; the daemon reuses one. Degraded-data
+    flags, the printed per-command counters, the agent's daily-bar windows and the
+    in-memory correlation matrices all start over. Provider health and circuit
+    states carry over (they decide routing).
+    """
+    MARKET_DATA.reset_flags()
+    MARKET_DATA.reset_stats()
+    agent.reset_command_state()
+    if WARM_CACHE_AVAILABLE:
+        WARM_CACHE.reset_stats()
+    if INDICATOR_STATE_AVAILABLE:
+        INDICATOR_STORE.reset_stats()
+    if MINUTE_VWAP_AVAILABLE:
+        MINUTE_VWAP.reset_stats()
+    if 'correlation' in sys.modules:
+        sys.modules['correlation'].CORRELATION_ENGINE.reset()
+
+
+def run_command(agent, command, args=()):
+    """
+    Run one agent command on an existing TradingAgent (v10.8)
+
+    Shared by main() and agent_daemon.py so a resident agent behaves exactly
+    like a cron-launched one. Exceptions propagate to the caller.
+
+    Returns:
+        True if the command succeeded
+    """
+    # v10.8: Market data fetches fail fast past the command's deadline; flags, stats
+    # and per-command caches start clean (a resident agent runs many commands)
+    begin_command(agent)
+    deadline = command_deadline(command)
+    if deadline is not None:
+        print(f"   ⏱️  {command.upper()} deadline: {deadline.describe()['at']}")
+
+    # v10.8: Positions, account and open orders fetched once per command, then read
+    # from memory until an order action invalidates them
+    broker = agent.broker if getattr(agent, 'use_alpaca', False) else None
+    if broker is not None:
+        broker.begin_snapshot()
+    try:
+        with deadline_scope(deadline):
+            success = _dispatch_command(agent, command, args)
+    finally:
+        if broker is not None:
+            snapshot_stats = broker.end_snapshot()
+            if snapshot_stats['hits']:
+                print(f"   ✓ Broker snapshot: {snapshot_stats['hits']} lookups from memory, "
+                      f"{snapshot_stats['fetches']} API fetches, {snapshot_stats['invalidations']} invalidations")
+
+    # v10.7: Refresh dashboard rollup of today's Claude calls
+    if LEDGER_AVAILABLE:
+        CLAUDE_LEDGER.write_daily_rollup()
+
+    # v10.8: Persist indicator states advanced by this command
+    if INDICATOR_STATE_AVAILABLE:
+        INDICATOR_STORE.save()
+        INDICATOR_STORE.print_stats()
+
+    # v10.8: Persist session VWAP states advanced by this command
+    if MINUTE_VWAP_AVAILABLE:
+        MINUTE_VWAP.save()
+        MINUTE_VWAP.print_stats()
+
+    # v10.8: Provider latency / errors / failovers / open circuits / degraded-data flags
+    MARKET_DATA.print_stats()
+
+    # v10.8: Correlation matrices built by this command (module is loaded only when used)
+    if 'correlation' in sys.modules:
+        sys.modules['correlation'].CORRELATION_ENGINE.print_stats()
+
+    # v10.8: Report cross-command cache reuse and drop expired entries
+    if WARM_CACHE_AVAILABLE:
+        WARM_CACHE.print_stats()
+        WARM_CACHE.purge_expired(keep_stale=True)
+
+    return success
+
+
+def _dispatch_command(agent, command, args):
+    """Run the command itself (see run_command)"""
+    if command == 'go':
+        success = agent.execute_go_command()
+    elif command == 'pre_go':
+        success = agent.execute_pre_go_command()
+    elif command == 'execute':
+        success = agent.execute_execute_command()
+    elif command == 'recheck':
+        success = agent.execute_recheck_command()
+    elif command == 'exit':
+        success = agent.execute_exit_command()
+    elif command == 'analyze':
+        success = agent.execute_analyze_command()
+    elif command == 'monitor':
+        # Optional replay file for dry runs: monitor <ticks.jsonl>
+        success = agent.execute_monitor_command(replay_file=args[0] if args else None)
+    elif command == 'learn':
+        # Phase 5: Learning analysis
+        days = int(args[0]) if args else 30
+        print(f"\nAnalyzing performance over last {days} days...\n")
+
+        analysis = agent.analyze_performance_metrics(days=days)
+
+        if 'error' in analysis:
+            print(f"⚠️ {analysis['error']}\n")
+            success = False
+        else:
+            # Print summary
+            print("="*60)
+            print(f"PERFORMANCE ANALYSIS - Last {days} Days")
+            print("="*60)
+            print(f"\nOverall Performance:")
+            print(f"  Total Trades: {analysis['total_trades']}")
+            print(f"  Win Rate: {analysis['win_rate']:.1f}%")
+            print(f"  Avg Return: {analysis['avg_return_pct']:.2f}%")
+            print(f"  Total Return: {analysis['total_return_pct']:.2f}%")
+            print(f"  Avg Hold Days: {analysis['avg_hold_days']:.1f}")
+
+            # Conviction accuracy
+            if analysis['conviction_accuracy']:
+                print(f"\nConviction Accuracy:")
+                for conviction, stats in analysis['conviction_accuracy'].items():
+                    print(f"  {conviction}: {stats['count']} trades, {stats['win_rate']:.1f}% win rate, {stats['avg_return']:.2f}% avg")
+
+            # Tier performance
+            if analysis['tier_performance']:
+                print(f"\nCatalyst Tier Performance:")
+                for tier, stats in analysis['tier_performance'].items():
+                    print(f"  {tier}: {stats['count']} trades, {stats['win_rate']:.1f}% win rate, {stats['avg_return']:.2f}% avg")
+
+            # VIX regime
+            if analysis['vix_regime_performance']:
+                print(f"\nVIX Regime Performance:")
+                for regime, stats in analysis['vix_regime_performance'].items():
+                    print(f"  {regime}: {stats['count']} trades, {stats['win_rate']:.1f}% win rate, {stats['avg_return']:.2f}% avg")
+
+            # Recommendations
+            if analysis['recommendations']:
+                print(f"\nRecommendations:")
+                for rec in analysis['recommendations']:
+                    print(f"  {rec}")
+
+            # Save analysis
+            agent.save_learning_analysis(analysis, 'monthly')
+
+            print("\n" + "="*60)
+            print("LEARNING ANALYSIS COMPLETE")
+            print("="*60 + "\n")
+            success = True
+    else:
+        raise ValueError(f"Unknown command '{command}'")
+    return success
+
+
 def main():
     """Main execution"""
 
     if len(sys.argv) < 2:
-        print("\nUsage: python agent.py [go|execute|recheck|exit|analyze|learn]")
+        print("\nUsage: python agent.py [pre_go|go|execute|recheck|monitor|exit|analyze|learn]")
         print("\nCommands:")
+        print("  pre_go   - Prepare GO inputs after the screener (opt-in) [v10.8]")
         print("  go       - Select stocks for today (9:00 AM)")
         print("  execute  - Enter positions (9:45 AM)")
         print("  recheck  - Re-evaluate gap-skipped stocks (10:30 AM)")
+        print("  monitor  - Stream trades and evaluate stops/targets on every tick [v10.8]")
         print("  exit     - Exit positions before close (3:45 PM) [NEW v8.2]")
         print("  analyze  - Summary & learning (4:30 PM)")
         print("  learn    - Analyze performance metrics")
@@ -10334,6 +11484,11 @@ def main():
 
     command = sys.argv[1].lower()
 
+    if command not in AGENT_COMMANDS:
+        print(f"\nERROR: Unknown command '{command}'")
+        print("Valid commands: go, execute, analyze, learn")
+        sys.exit(1)
+
     print(f"\n{'='*60}")
     print(f"Paper Trading Lab Agent v8.2 (Exit/Analyze Split)")
     et_tz = pytz.timezone('America/New_York')
@@ -10343,74 +11498,8 @@ def main():
     agent = TradingAgent()
 
     try:
-        if command == 'go':
-            success = agent.execute_go_command()
-        elif command == 'execute':
-            success = agent.execute_execute_command()
-        elif command == 'recheck':
-            success = agent.execute_recheck_command()
-        elif command == 'exit':
-            success = agent.execute_exit_command()
-        elif command == 'analyze':
-            success = agent.execute_analyze_command()
-        elif command == 'learn':
-            # Phase 5: Learning analysis
-            days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
-            print(f"\nAnalyzing performance over last {days} days...\n")
-
-            analysis = agent.analyze_performance_metrics(days=days)
+        success = run_command(agent, command, sys.argv[2:])
 
-            if 'error' in analysis:
-                print(f"⚠️ {analysis['error']}\n")
-                success = False
-            else:
-                # Print summary
-                print("="*60)
-                print(f"PERFORMANCE ANALYSIS - Last {days} Days")
-                print("="*60)
-                print(f"\nOverall Performance:")
-                print(f"  Total Trades: {analysis['total_trades']}")
-                print(f"  Win Rate: {analysis['win_rate']:.1f}%")
-                print(f"  Avg Return: {analysis['avg_return_pct']:.2f}%")
-                print(f"  Total Return: {analysis['total_return_pct']:.2f}%")
-                print(f"  Avg Hold Days: {analysis['avg_hold_days']:.1f}")
-
-                # Conviction accuracy
-                if analysis['conviction_accuracy']:
-                    print(f"\nConviction Accuracy:")
-                    for conviction, stats in analysis['conviction_accuracy'].items():
-                        print(f"  {conviction}: {stats['count']} trades, {stats['win_rate']:.1f}% win rate, {stats['avg_return']:.2f}% avg")
-
-                # Tier performance
-                if analysis['tier_performance']:
-                    print(f"\nCatalyst Tier Performance:")
-                    for tier, stats in analysis['tier_performance'].items():
-                        print(f"  {tier}: {stats['count']} trades, {stats['win_rate']:.1f}% win rate, {stats['avg_return']:.2f}% avg")
-
-                # VIX regime
-                if analysis['vix_regime_performance']:
-                    print(f"\nVIX Regime Performance:")
-                    for regime, stats in analysis['vix_regime_performance'].items():
-                        print(f"  {regime}: {stats['count']} trades, {stats['win_rate']:.1f}% win rate, {stats['avg_return']:.2f}% avg")
-
-                # Recommendations
-                if analysis['recommendations']:
-                    print(f"\nRecommendations:")
-                    for rec in analysis['recommendations']:
-                        print(f"  {rec}")
-
-                # Save analysis
-                agent.save_learning_analysis(analysis, 'monthly')
-
-                print("\n" + "="*60)
-                print("LEARNING ANALYSIS COMPLETE")
-                print("="*60 + "\n")
-                success = True
-        else:
-            print(f"\nERROR: Unknown command '{command}'")
-            print("Valid commands: go, execute, analyze, learn")
-            sys.exit(1)
-        
         if success:
             print("="*60)
             print(f"{command.upper()} COMMAND COMPLETED SUCCESSFULLY")
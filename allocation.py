@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Allocation - Constraint-based sizing for EXECUTE buys
+
+EXECUTE used to size each pending buy inside its order loop: the first buys
+took their full size and whatever cash was left went to the rest, so list
+order - not conviction - decided who got starved. This module sizes all
+pending buys together, after their inputs (price, spread, gap, ATR) are known
+and before any order goes out.
+
+Constraints, in one pass over conviction tiers (HIGH → MEDIUM-HIGH → MEDIUM → LOW):
+- per name  : GO's position_size_pct, capped at ALLOCATION_MAX_POSITION_PCT
+- sector    : held + new exposure per sector <= ALLOCATION_MAX_SECTOR_PCT
+- cash      : total <= cash available minus ALLOCATION_CASH_RESERVE_PCT
+- conviction: a tier is funded before the next; a tier that does not fit the
+              remaining cash (or sector headroom) is scaled pro rata
+- minimum   : buys cut below ALLOCATION_MIN_POSITION_PCT (or below one share)
+              are dropped and the solve repeats without them (their cash is
+              redistributed); a buy requested smaller than the minimum keeps its size
+
+All percentages are of account value.
+
+Usage:
+    plan = solve_allocation(requests, account_value=10500, cash_available=3200,
+                            sector_exposure={'Technology': 2100.0})
+    for order in plan.orders: ...      # ticker, dollars, pct, shares, constraints
+    for ticker, reason in plan.dropped: ...
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+ALLOCATION_MAX_POSITION_PCT = float(os.environ.get('ALLOCATION_MAX_POSITION_PCT', '15'))
+ALLOCATION_MAX_SECTOR_PCT = float(os.environ.get('ALLOCATION_MAX_SECTOR_PCT', '30'))
+ALLOCATION_MIN_POSITION_PCT = float(os.environ.get('ALLOCATION_MIN_POSITION_PCT', '3'))
+ALLOCATION_CASH_RESERVE_PCT = float(os.environ.get('ALLOCATION_CASH_RESERVE_PCT', '0'))
+
+# Funding order; unknown levels rank with MEDIUM
+CONVICTION_PRIORITY = {'HIGH': 0, 'MEDIUM-HIGH': 1, 'MEDIUM': 2, 'LOW': 3, 'SKIP': 4}
+
+
+def conviction_of(position: Dict) -> str:
+    """Conviction of a pending buy (GO's conviction_level, else Claude's confidence)"""
+    return (position.get('conviction_level') or position.get('confidence') or 'MEDIUM').upper()
+
+
+@dataclass
+class BuyRequest:
+    """One pending buy with the inputs the solver needs"""
+    ticker: str
+    price: float
+    requested_pct: float
+    sector: str = 'Unknown'
+    conviction: str = 'MEDIUM'
+
+    @property
+    def priority(self) -> int:
+        return CONVICTION_PRIORITY.get(self.conviction, CONVICTION_PRIORITY['MEDIUM'])
+
+    def requested_dollars(self, account_value: float) -> float:
+        return account_value * self.requested_pct / 100
+
+
+@dataclass
+class Allocation:
+    """Solved size for one buy; `constraints` names what cut it below the request"""
+    ticker: str
+    dollars: float
+    pct: float
+    shares: int
+    requested_dollars: float
+    constraints: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AllocationPlan:
+    """Complete order plan: sized buys (request order) and dropped buys with reasons"""
+    orders: List[Allocation]
+    dropped: List[Tuple[str, str]]
+    account_value: float
+    cash_available: float
+
+    @property
+    def total_dollars(self) -> float:
+        return round(sum(o.dollars for o in self.orders), 2)
+
+    @property
+    def cash_after(self) -> float:
+        return round(self.cash_available - self.total_dollars, 2)
+
+    def get(self, ticker: str) -> Optional[Allocation]:
+        return next((o for o in self.orders if o.ticker == ticker), None)
+
+
+def _solve(requests: List[BuyRequest], account_value: float, budget: float,
+           sector_exposure: Dict[str, float], max_position_pct: float, max_sector_pct: float):
+    """Dollar sizes {ticker: (dollars, constraints)} for one set of requests"""
+    remaining = budget
+    headroom = {}
+    sizes = {}
+    for tier in sorted({r.priority for r in requests}):
+        members = [r for r in requests if r.priority == tier]
+        wanted = {}
+        for r in members:
+            constraints = []
+            pct = r.requested_pct
+            if pct > max_position_pct:
+                pct, constraints = max_position_pct, ['per-name cap']
+            wanted[r.ticker] = [account_value * pct / 100, constraints]
+
+        # Sector headroom shared by this tier's buys in the sector (pro rata)
+        for sector in {r.sector for r in members}:
+            if sector not in headroom:
+                headroom[sector] = max(account_value * max_sector_pct / 100 - sector_exposure.get(sector, 0.0), 0.0)
+            in_sector = [r.ticker for r in members if r.sector == sector]
+            demand = sum(wanted[t][0] for t in in_sector)
+            if demand > headroom[sector]:
+                scale = headroom[sector] / demand if demand else 0.0
+                for t in in_sector:
+                    wanted[t][0] *= scale
+                    wanted[t][1].append('sector cap')
+
+        # Cash left after higher tiers (pro rata within the tier)
+        demand = sum(w[0] for w in wanted.values())
+        if demand > remaining:
+            scale = remaining / demand if demand else 0.0
+            for w in wanted.values():
+                w[0] *= scale
+                w[1].append('cash')
+
+        for r in members:
+            dollars, constraints = wanted[r.ticker]
+            sizes[r.ticker] = (dollars, constraints)
+            headroom[r.sector] -= dollars
+            remaining -= dollars
+    return sizes
+
+
+def solve_allocation(requests: List[BuyRequest], account_value: float, cash_available: float,
+                     sector_exposure: Optional[Dict[str, float]] = None,
+                     max_position_pct: float = ALLOCATION_MAX_POSITION_PCT,
+                     max_sector_pct: float = ALLOCATION_MAX_SECTOR_PCT,
+                     min_position_pct: float = ALLOCATION_MIN_POSITION_PCT,
+                     cash_reserve_pct: float = ALLOCATION_CASH_RESERVE_PCT) -> AllocationPlan:
+    """
+    Size every pending buy at once
+
+    Args:
+        requests: Buys that passed price/spread/gap checks (duplicate tickers: first wins)
+        account_value: Current account value (percentages are of this)
+        cash_available: Cash the buys may use
+        sector_exposure: {sector: dollars already held}
+
+    Returns: AllocationPlan with orders in request order
+    """
+    sector_exposure = sector_exposure or {}
+    budget = max(cash_available - account_value * cash_reserve_pct / 100, 0.0)
+    min_dollars = account_value * min_position_pct / 100
+
+    active, dropped, seen = [], [], set()
+    for r in requests:
+        if r.ticker in seen:
+            dropped.append((r.ticker, 'Duplicate buy'))
+        elif r.requested_pct <= 0 or r.price <= 0:
+            dropped.append((r.ticker, f'Nothing to allocate ({r.requested_pct}% at ${r.price})'))
+        else:
+            active.append(r)
+        seen.add(r.ticker)
+
+    # Drop the weakest undersized buy and re-solve until every size is viable
+    while True:
+        sizes = _solve(active, account_value, budget, sector_exposure, max_position_pct, max_sector_pct)
+        too_small = [r for r in active
+                     if sizes[r.ticker][0] < max(min(min_dollars, r.requested_dollars(account_value)), r.price)]
+        if not too_small:
+            break
+        weakest = max(too_small, key=lambda r: (r.priority, -sizes[r.ticker][0]))
+        dollars, constraints = sizes[weakest.ticker]
+        limits = f" (limited by {', '.join(constraints)})" if constraints else ''
+        reason = ('Allocation below one share' if dollars < weakest.price
+                  else f'Allocation ${dollars:.2f} below {min_position_pct}% minimum')
+        dropped.append((weakest.ticker, reason + limits))
+        active.remove(weakest)
+
+    orders = []
+    for r in active:
+        dollars, constraints = sizes[r.ticker]
+        dollars = round(dollars, 2)
+        orders.append(Allocation(
+            ticker=r.ticker,
+            dollars=dollars,
+            pct=round(dollars / account_value * 100, 2) if account_value else 0.0,
+            shares=int(dollars / r.price),
+            requested_dollars=round(r.requested_dollars(account_value), 2),
+            constraints=constraints,
+        ))
+    return AllocationPlan(orders=orders, dropped=dropped, account_value=account_value, cash_available=cash_available)
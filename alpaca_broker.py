@@ -17,17 +17,31 @@ Environment Variables Required:
                    https://api.alpaca.markets (live trading - NOT recommended for MVP)
 """
 
+import importlib.util
 import os
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
-try:
-    import alpaca_trade_api as tradeapi
-except ImportError:
+# v10.8: alpaca-trade-api (and the pandas/aiohttp it pulls in) costs ~0.6s to
+# import, so only check it is installed here and import it when a broker is created
+ALPACA_SDK_INSTALLED = importlib.util.find_spec('alpaca_trade_api') is not None
+if not ALPACA_SDK_INSTALLED:
     print("⚠️  WARNING: alpaca-trade-api not installed")
     print("   Install with: pip install alpaca-trade-api")
-    tradeapi = None
+
+# Symbols per multi-symbol market data request (latest trades/quotes, snapshots)
+MARKET_DATA_BATCH_SIZE = 200
+
+# v10.8: Request-scoped state snapshot - during one agent command, positions,
+# account and open orders are fetched once and then read from memory until an
+# order action invalidates them (or they are older than this many seconds)
+BROKER_SNAPSHOT_MAX_AGE = float(os.environ.get('BROKER_SNAPSHOT_MAX_AGE', '60'))
+SNAPSHOT_PARTS = ('account', 'positions', 'open_orders')
+OPEN_ORDERS_LIMIT = 500  # Alpaca's maximum page (list_orders defaults to 50)
 
 
 class AlpacaBroker:
@@ -46,8 +60,9 @@ class AlpacaBroker:
             base_url: Alpaca base URL (defaults to ALPACA_BASE_URL env var)
             paper: If True, forces paper trading URL (safety check)
         """
-        if tradeapi is None:
+        if not ALPACA_SDK_INSTALLED:
             raise ImportError("alpaca-trade-api package not installed")
+        import alpaca_trade_api as tradeapi
 
         self.api_key = api_key or os.environ.get('ALPACA_API_KEY')
         self.secret_key = secret_key or os.environ.get('ALPACA_SECRET_KEY')
@@ -79,6 +94,85 @@ class AlpacaBroker:
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Alpaca: {e}")
 
+        self._snapshot = None  # {part: (fetched_at, value)} while a command snapshot is open
+        self._snapshot_lock = threading.RLock()
+        self.snapshot_stats = {'hits': 0, 'fetches': 0, 'invalidations': 0}
+
+    # =====================================================================
+    # STATE SNAPSHOT (v10.8 - one fetch per command, invalidated by order actions)
+    # =====================================================================
+
+    def begin_snapshot(self):
+        """Start serving positions/account/open orders from a per-command snapshot"""
+        with self._snapshot_lock:
+            self._snapshot = {}
+            self.snapshot_stats = {'hits': 0, 'fetches': 0, 'invalidations': 0}
+
+    def end_snapshot(self) -> Dict:
+        """Stop snapshotting (every read goes to the API again); returns the stats"""
+        with self._snapshot_lock:
+            self._snapshot = None
+            return dict(self.snapshot_stats)
+
+    @contextmanager
+    def command_snapshot(self):
+        """with broker.command_snapshot(): ... - snapshot for the duration of the block"""
+        self.begin_snapshot()
+        try:
+            yield self
+        finally:
+            self.end_snapshot()
+
+    def invalidate(self, *parts: str):
+        """Drop snapshot parts ('account', 'positions', 'open_orders'); no parts = all"""
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                return
+            for part in parts or SNAPSHOT_PARTS:
+                if self._snapshot.pop(part, None) is not None:
+                    self.snapshot_stats['invalidations'] += 1
+
+    def _cached(self, part: str, fetch):
+        """Snapshot value for part, fetching it if missing or stale (plain fetch when not snapshotting)"""
+        if self._snapshot is None:
+            return fetch()
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                return fetch()
+            entry = self._snapshot.get(part)
+            if entry and time.monotonic() - entry[0] <= BROKER_SNAPSHOT_MAX_AGE:
+                self.snapshot_stats['hits'] += 1
+                return entry[1]
+            value = fetch()
+            self._snapshot[part] = (time.monotonic(), value)
+            self.snapshot_stats['fetches'] += 1
+            return value
+
+    def _position_index(self) -> Dict:
+        """{symbol: Position} for all open positions"""
+        return self._cached('positions', lambda: {p.symbol: p for p in self.api.list_positions()})
+
+    def _open_order_index(self) -> Dict:
+        """{symbol: {order type: [Order]}} for all open orders"""
+        def fetch():
+            index = {}
+            for order in self.api.list_orders(status='open', limit=OPEN_ORDERS_LIMIT):
+                index.setdefault(order.symbol, {}).setdefault(order.type, []).append(order)
+            return index
+        return self._cached('open_orders', fetch)
+
+    def _forget_order(self, order_id: str):
+        """Remove a canceled order from the snapshot index (no refetch needed)"""
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                return
+            entry = self._snapshot.get('open_orders')
+            if entry:
+                for by_type in entry[1].values():
+                    for order_type, orders in by_type.items():
+                        by_type[order_type] = [o for o in orders if o.id != order_id]
+            self.invalidate('account')  # A canceled buy releases buying power
+
     # =====================================================================
     # ACCOUNT MANAGEMENT
     # =====================================================================
@@ -95,7 +189,7 @@ class AlpacaBroker:
             - portfolio_value: Value of positions
             - status: Account status (ACTIVE, etc)
         """
-        return self.api.get_account()
+        return self._cached('account', self.api.get_account)
 
     def get_account_value(self) -> float:
         """Get total account equity as a float"""
@@ -132,6 +226,8 @@ class AlpacaBroker:
             - unrealized_plpc: Unrealized P/L percent (0.05 = 5%)
             - side: 'long' or 'short'
         """
+        if self._snapshot is not None:
+            return list(self._position_index().values())
         return self.api.list_positions()
 
     def get_position(self, ticker: str):
@@ -144,6 +240,8 @@ class AlpacaBroker:
         Returns:
             Position object or None if no position exists
         """
+        if self._snapshot is not None:
+            return self._position_index().get(ticker)
         try:
             return self.api.get_position(ticker)
         except:
@@ -180,13 +278,16 @@ class AlpacaBroker:
         if side.lower() not in ['buy', 'sell']:
             raise ValueError(f"Invalid side: {side}. Must be 'buy' or 'sell'")
 
-        return self.api.submit_order(
-            symbol=ticker,
-            qty=qty,
-            side=side.lower(),
-            type='market',
-            time_in_force='day'  # Cancel at end of day if not filled
-        )
+        try:
+            return self.api.submit_order(
+                symbol=ticker,
+                qty=qty,
+                side=side.lower(),
+                type='market',
+                time_in_force='day'  # Cancel at end of day if not filled
+            )
+        finally:
+            self.invalidate()  # Fills change positions, cash and open orders
 
     def place_limit_order(self, ticker: str, qty: int, limit_price: float, side: str = 'buy'):
         """
@@ -207,14 +308,17 @@ class AlpacaBroker:
         if limit_price <= 0:
             raise ValueError(f"Invalid limit price: {limit_price}. Must be > 0")
 
-        return self.api.submit_order(
-            symbol=ticker,
-            qty=qty,
-            side=side.lower(),
-            type='limit',
-            limit_price=limit_price,
-            time_in_force='day'
-        )
+        try:
+            return self.api.submit_order(
+                symbol=ticker,
+                qty=qty,
+                side=side.lower(),
+                type='limit',
+                limit_price=limit_price,
+                time_in_force='day'
+            )
+        finally:
+            self.invalidate()
 
     def get_order(self, order_id: str):
         """Get order details by order ID"""
@@ -230,15 +334,26 @@ class AlpacaBroker:
         Returns:
             List of Order objects
         """
+        if status == 'open' and self._snapshot is not None:
+            return [o for by_type in self._open_order_index().values() for orders in by_type.values() for o in orders]
         return self.api.list_orders(status=status)
 
     def cancel_order(self, order_id: str):
         """Cancel a specific order"""
-        return self.api.cancel_order(order_id)
+        try:
+            result = self.api.cancel_order(order_id)
+        except Exception:
+            self.invalidate('open_orders')  # Unknown state - refetch on next read
+            raise
+        self._forget_order(order_id)
+        return result
 
     def cancel_all_orders(self):
         """Cancel all open orders"""
-        return self.api.cancel_all_orders()
+        try:
+            return self.api.cancel_all_orders()
+        finally:
+            self.invalidate('open_orders', 'account')
 
     # =====================================================================
     # STOP-LOSS ORDERS (Real-time protection by Alpaca)
@@ -279,6 +394,8 @@ class AlpacaBroker:
 
         except Exception as e:
             return False, f"Failed to place stop-loss: {str(e)}", None
+        finally:
+            self.invalidate('open_orders')
 
     def has_stop_loss_order(self, ticker: str) -> Tuple[bool, Optional[str], Optional[float]]:
         """
@@ -288,7 +405,10 @@ class AlpacaBroker:
             Tuple of (has_order: bool, order_id: str or None, stop_price: float or None)
         """
         try:
-            orders = self.api.list_orders(status='open', symbols=[ticker])
+            if self._snapshot is not None:
+                orders = self._open_order_index().get(ticker, {}).get('stop', [])
+            else:
+                orders = self.api.list_orders(status='open', symbols=[ticker])
 
             for order in orders:
                 if order.type == 'stop' and order.side == 'sell':
@@ -344,6 +464,8 @@ class AlpacaBroker:
 
         except Exception as e:
             return False, f"Failed to place trailing stop for {ticker}: {str(e)}", None
+        finally:
+            self.invalidate('open_orders')
 
     def get_orders_for_symbol(self, ticker: str, status: str = 'open') -> List:
         """
@@ -357,6 +479,8 @@ class AlpacaBroker:
             List of Order objects for this symbol
         """
         try:
+            if status == 'open' and self._snapshot is not None:
+                return [o for orders in self._open_order_index().get(ticker, {}).values() for o in orders]
             all_orders = self.api.list_orders(status=status)
             return [o for o in all_orders if o.symbol == ticker]
         except Exception as e:
@@ -378,7 +502,7 @@ class AlpacaBroker:
             orders = self.get_orders_for_symbol(ticker, status='open')
             for order in orders:
                 try:
-                    self.api.cancel_order(order.id)
+                    self.cancel_order(order.id)
                     canceled.append(order.id)
                 except Exception as e:
                     logging.warning(f"Failed to cancel order {order.id}: {e}")
@@ -452,13 +576,69 @@ class AlpacaBroker:
             tickers: List of stock symbols
 
         Returns:
-            Dict of {ticker: price}
+            Dict of {ticker: price} (0.0 for symbols with no trade)
+        """
+        trades = self.get_latest_trades(tickers)
+        return {ticker: trades.get(ticker, 0.0) for ticker in tickers}
+
+    def _chunks(self, tickers: List[str]):
+        """Split a symbol list into request-sized chunks (deduplicated, order kept)"""
+        unique = list(dict.fromkeys(tickers))
+        for start in range(0, len(unique), MARKET_DATA_BATCH_SIZE):
+            yield unique[start:start + MARKET_DATA_BATCH_SIZE]
+
+    def get_latest_trades(self, tickers: List[str]) -> Dict[str, float]:
+        """
+        Get latest trade prices for many tickers in one request per chunk
+
+        Args:
+            tickers: List of stock symbols
+
+        Returns:
+            Dict of {ticker: price} for symbols with a trade (missing symbols omitted)
         """
         prices = {}
-        for ticker in tickers:
-            prices[ticker] = self.get_last_price(ticker)
+        for chunk in self._chunks(tickers):
+            try:
+                trades = self.api.get_latest_trades(chunk)
+            except Exception as e:
+                logging.warning(f"Failed to fetch latest trades for {len(chunk)} symbols: {e}")
+                continue
+            for ticker, trade in trades.items():
+                if trade is not None and trade.price and float(trade.price) > 0:
+                    prices[ticker] = float(trade.price)
         return prices
 
+    def get_latest_quotes(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Get latest NBBO quotes for many tickers in one request per chunk
+
+        Args:
+            tickers: List of stock symbols
+
+        Returns:
+            Dict of {ticker: {'bid', 'ask', 'bid_size', 'ask_size', 'timestamp'}}
+            for symbols with a quote (missing symbols omitted)
+        """
+        quotes = {}
+        for chunk in self._chunks(tickers):
+            try:
+                latest = self.api.get_latest_quotes(chunk)
+            except Exception as e:
+                logging.warning(f"Failed to fetch latest quotes for {len(chunk)} symbols: {e}")
+                continue
+            for ticker, quote in latest.items():
+                if quote is None:
+                    continue
+                quotes[ticker] = {
+                    'bid': float(quote.bid_price or 0),
+                    'ask': float(quote.ask_price or 0),
+                    'bid_size': int(quote.bid_size or 0),
+                    'ask_size': int(quote.ask_size or 0),
+                    'timestamp': str(quote.timestamp) if quote.timestamp else None
+                }
+        return quotes
+
     def get_bars(self, ticker: str, timeframe: str = '1Day', limit: int = 100,
                  start: Optional[datetime] = None, end: Optional[datetime] = None):
         """
@@ -494,6 +674,24 @@ class AlpacaBroker:
         """
         return self.api.get_snapshot(ticker)
 
+    def get_snapshots(self, tickers: List[str]) -> Dict:
+        """
+        Get snapshots for many tickers in one request per chunk
+
+        Returns:
+            Dict of {ticker: Snapshot} (latest_trade, latest_quote, minute_bar,
+            daily_bar, prev_daily_bar); missing symbols omitted
+        """
+        snapshots = {}
+        for chunk in self._chunks(tickers):
+            try:
+                batch = self.api.get_snapshots(chunk)
+            except Exception as e:
+                logging.warning(f"Failed to fetch snapshots for {len(chunk)} symbols: {e}")
+                continue
+            snapshots.update({ticker: snap for ticker, snap in batch.items() if snap is not None})
+        return snapshots
+
     # =====================================================================
     # PORTFOLIO HELPERS (For Tedbot Integration)
     # =====================================================================
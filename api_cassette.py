@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+API Cassette - Record/replay harness for external API calls
+
+Every external call (Polygon, Finnhub, FMP, Anthropic and Alpaca via
+alpaca-trade-api) goes through requests.Session.request. This module patches
+that single transport point so a full command run can be:
+
+- RECORDED: real calls are made and responses saved to a cassette file
+- REPLAYED: responses are served from the cassette, no network access
+
+Cassette keys are normalized requests: method + host + path + sorted query
+params + canonical JSON body, with API keys/secrets stripped (query params
+and auth headers never reach the cassette, and echoed credentials are
+redacted from recorded bodies). Replays made on a later day fall
+back to a "loose" key with dates and epoch timestamps masked, so yesterday's
+cassette still matches today's date-windowed URLs.
+
+Optional simulated latency during replay:
+- none      : serve instantly (pure CPU profiling)
+- recorded  : sleep for each response's recorded latency
+- <file>    : JSON profile of per-host milliseconds, e.g. {"api.polygon.io": 120, "default": 50}
+
+Usage:
+  python3 api_cassette.py record cassettes/go.json -- agent_v5.5.py go
+  python3 api_cassette.py replay cassettes/go.json --latency recorded -- agent_v5.5.py go
+  python3 api_cassette.py replay cassettes/scan.json -- market_screener.py
+
+Or from code/tests:
+  with Cassette('cassettes/exit.json', mode='replay'):
+      agent.execute_exit_command()
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import runpy
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+PROJECT_DIR = Path(__file__).parent
+
+# Query params that carry credentials (compared lowercase)
+SECRET_PARAMS = {'apikey', 'api_key', 'token', 'key', 'secret', 'access_token'}
+
+# Masks for the loose key (replays on a different day)
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}(?:T[\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?')
+_EPOCH_RE = re.compile(r'(?<!\d)1\d{9}(?:\d{3})?(?!\d)')
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Replay requested a call that was never recorded (behaves like a network failure)"""
+
+
+def _canonical_body(json_body=None, data=None) -> str:
+    if json_body is not None:
+        return json.dumps(json_body, sort_keys=True, separators=(',', ':'))
+    if isinstance(data, bytes):
+        data = data.decode('utf-8', errors='replace')
+    if isinstance(data, dict):
+        return urlencode(sorted(data.items()))
+    return data or ''
+
+
+def normalize_request(method: str, url: str, params=None, json_body=None, data=None):
+    """
+    Build (exact_key, loose_key) for a request with credentials stripped
+
+    Returns:
+        Tuple of (exact_key: str, loose_key: str, display: str)
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if isinstance(params, dict):
+        query.extend((k, v) for k, v in params.items() if v is not None)
+    elif params:
+        query.extend(params)
+
+    query = sorted((str(k), str(v)) for k, v in query if str(k).lower() not in SECRET_PARAMS)
+    display = f"{method.upper()} {parts.netloc}{parts.path}"
+    if query:
+        display += '?' + urlencode(query)
+
+    body = _canonical_body(json_body, data)
+    body_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()[:16] if body else ''
+    exact_key = f"{display}#{body_hash}" if body_hash else display
+
+    loose_display = _EPOCH_RE.sub('<ts>', _DATE_RE.sub('<date>', display))
+    loose_body = _EPOCH_RE.sub('<ts>', _DATE_RE.sub('<date>', body))
+    loose_hash = hashlib.sha256(loose_body.encode('utf-8')).hexdigest()[:16] if body else ''
+    loose_key = f"{loose_display}#{loose_hash}" if loose_hash else loose_display
+
+    return exact_key, loose_key, display
+
+
+def _secret_values(url: str, params=None, headers=None):
+    """Credential values carried by a request (query params and auth headers)"""
+    values = [v for k, v in parse_qsl(urlsplit(url).query) if k.lower() in SECRET_PARAMS]
+    if isinstance(params, dict):
+        values.extend(str(v) for k, v in params.items() if str(k).lower() in SECRET_PARAMS and v)
+    for name, value in (headers or {}).items():
+        if any(marker in name.lower() for marker in ('key', 'secret', 'authorization')) and value:
+            values.append(str(value))
+    return [v for v in values if len(v) >= 6]
+
+
+def load_latency_profile(spec: Optional[str]):
+    """Parse --latency: None/'none', 'recorded', or path to a JSON {host: ms} profile"""
+    if not spec or spec == 'none':
+        return None
+    if spec == 'recorded':
+        return 'recorded'
+    with open(spec) as f:
+        return {str(k): float(v) for k, v in json.load(f).items()}
+
+
+class Cassette:
+    """
+    Patch requests.Session.request to record or replay external API traffic
+
+    Identical requests are replayed in recorded order; once exhausted the last
+    response repeats (polling loops keep working).
+    """
+
+    def __init__(self, path, mode: str = 'replay', latency=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Invalid cassette mode: {mode}. Must be 'record' or 'replay'")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.entries: Dict[str, list] = {}
+        self.loose_index: Dict[str, str] = {}
+        self.play_counts: Dict[str, int] = {}
+        self.stats = {'calls': 0, 'hits': 0, 'loose_hits': 0, 'misses': 0, 'simulated_latency_ms': 0.0, 'by_host': {}}
+        self._lock = threading.Lock()
+        self._original_request = None
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f).get('entries', {})
+        elif mode == 'replay':
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+        for exact_key, responses in self.entries.items():
+            if responses:
+                self.loose_index.setdefault(responses[0]['loose_key'], exact_key)
+
+    # ------------------------------------------------------------------
+    # Install / uninstall
+    # ------------------------------------------------------------------
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.uninstall()
+        return False
+
+    def install(self):
+        if self._original_request is not None:
+            return
+        self._original_request = requests.Session.request
+        cassette = self
+
+        def patched_request(session, method, url, **kwargs):
+            return cassette._handle(session, method, url, **kwargs)
+
+        requests.Session.request = patched_request
+
+    def uninstall(self):
+        if self._original_request is None:
+            return
+        requests.Session.request = self._original_request
+        self._original_request = None
+        if self.mode == 'record':
+            self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {'version': 1, 'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'entries': self.entries}
+        with open(self.path, 'w') as f:
+            json.dump(payload, f, indent=1)
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    def _handle(self, session, method, url, **kwargs):
+        exact_key, loose_key, display = normalize_request(
+            method, url, kwargs.get('params'), kwargs.get('json'), kwargs.get('data')
+        )
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['by_host'][host] = self.stats['by_host'].get(host, 0) + 1
+
+        if self.mode == 'record':
+            started = time.time()
+            response = self._original_request(session, method, url, **kwargs)
+            elapsed_ms = (time.time() - started) * 1000
+            body = response.text
+            for secret in _secret_values(url, kwargs.get('params'), kwargs.get('headers')):
+                body = body.replace(secret, '<redacted>')
+            with self._lock:
+                self.entries.setdefault(exact_key, []).append({
+                    'loose_key': loose_key,
+                    'request': display,
+                    'status': response.status_code,
+                    'reason': response.reason,
+                    'headers': {k: v for k, v in response.headers.items() if k.lower() == 'content-type'},
+                    'body': body,
+                    'elapsed_ms': round(elapsed_ms, 1),
+                })
+                self.loose_index.setdefault(loose_key, exact_key)
+            return response
+
+        with self._lock:
+            key = exact_key if exact_key in self.entries else None
+            if key:
+                self.stats['hits'] += 1
+            else:
+                key = self.loose_index.get(loose_key)
+                if key:
+                    self.stats['loose_hits'] += 1
+                else:
+                    self.stats['misses'] += 1
+
+            if key is None:
+                raise CassetteMiss(f"No recorded response for {display}")
+
+            index = self.play_counts.get(key, 0)
+            self.play_counts[key] = index + 1
+            responses = self.entries[key]
+            recorded = responses[min(index, len(responses) - 1)]
+
+        delay_ms = self._simulated_delay_ms(host, recorded)
+        if delay_ms:
+            with self._lock:
+                self.stats['simulated_latency_ms'] += delay_ms
+            time.sleep(delay_ms / 1000)
+
+        return self._build_response(recorded, url)
+
+    def _simulated_delay_ms(self, host, recorded) -> float:
+        if self.latency is None:
+            return 0.0
+        if self.latency == 'recorded':
+            return recorded.get('elapsed_ms', 0.0)
+        return self.latency.get(host, self.latency.get('default', 0.0))
+
+    @staticmethod
+    def _build_response(recorded, url):
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded.get('reason', '')
+        response.headers = CaseInsensitiveDict(recorded.get('headers', {}))
+        response._content = recorded.get('body', '').encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        return response
+
+    def print_summary(self):
+        s = self.stats
+        print(f"\n📼 CASSETTE {self.mode.upper()}: {self.path}")
+        print(f"   Calls: {s['calls']} | Exact hits: {s['hits']} | Loose hits: {s['loose_hits']} | Misses: {s['misses']}")
+        if s['simulated_latency_ms']:
+            print(f"   Simulated latency: {s['simulated_latency_ms'] / 1000:.1f}s")
+        for host, count in sorted(s['by_host'].items(), key=lambda x: -x[1]):
+            print(f"   {host}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record or replay external API calls for a command run')
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('cassette', help='Cassette JSON file')
+    parser.add_argument('--latency', default='none',
+                        help="Replay latency: none | recorded | path to {host: ms} JSON profile")
+    parser.add_argument('script', nargs=argparse.REMAINDER,
+                        help='-- script.py [args], e.g. -- agent_v5.5.py go')
+    args = parser.parse_args()
+
+    script_args = args.script[1:] if args.script and args.script[0] == '--' else args.script
+    if not script_args:
+        parser.error('No script given (e.g. -- agent_v5.5.py go)')
+
+    cassette = Cassette(args.cassette, mode=args.mode,
+                        latency=load_latency_profile(args.latency) if args.mode == 'replay' else None)
+
+    script_path = Path(script_args[0])
+    if not script_path.is_absolute():
+        script_path = PROJECT_DIR / script_path
+    sys.argv = [str(script_path)] + script_args[1:]
+    sys.path.insert(0, str(script_path.parent))
+
+    exit_code = 0
+    started = time.time()
+    cassette.install()
+    try:
+        runpy.run_path(str(script_path), run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        cassette.uninstall()
+        cassette.print_summary()
+        print(f"   Wall time: {time.time() - started:.2f}s")
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Bar Series - Daily bars as a struct of typed arrays
+
+A ticker's daily history as six parallel arrays instead of a list of per-bar
+dicts (1,500 tickers x 252 days was ~380k small dicts per scan):
+
+    day     int32    ET trading date as days since 1970-01-01
+    open    float64
+    high    float64
+    low     float64
+    close   float64
+    volume  int64
+
+Slicing (series[-20:], series.since('2026-01-05')) returns views of the same
+arrays - no copies. Indexing returns a lightweight Bar view so code written
+against Polygon result dicts keeps working (bar['c'], bar['close'],
+bar['t'], bar['date']), but hot paths should read the arrays directly.
+
+The warm cache stores a series as columns (to_columns / from_columns), so a
+cached window loads straight into arrays without building bar dicts.
+
+Usage:
+    bars = BarSeries.from_polygon(data['results'])
+    sma50 = bars.close[-50:].mean()
+    recent = bars.since('2026-01-05')
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Union
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+ET = ZoneInfo('America/New_York')
+EPOCH = date(1970, 1, 1)
+
+# Polygon daily bars are stamped at ET midnight; shifting by the EDT offset
+# gives the ET date for any stamp before 11 PM ET, in both EST and EDT
+_ET_DATE_SHIFT_MS = 4 * 3600 * 1000
+_MS_PER_DAY = 86400 * 1000
+
+# Column names in the cached JSON form, and Bar keys (Polygon / agent style)
+COLUMNS = ('day', 'o', 'h', 'l', 'c', 'v')
+_FIELDS = {
+    'o': 'open', 'open': 'open',
+    'h': 'high', 'high': 'high',
+    'l': 'low', 'low': 'low',
+    'c': 'close', 'close': 'close',
+}
+
+
+def to_day(date_str: str) -> int:
+    """'YYYY-MM-DD' -> epoch day"""
+    return (date.fromisoformat(date_str) - EPOCH).days
+
+
+def to_date(day: int) -> str:
+    """Epoch day -> 'YYYY-MM-DD'"""
+    return (EPOCH + timedelta(days=int(day))).isoformat()
+
+
+class Bar:
+    """Read-only view of one bar in a BarSeries (dict-style access)"""
+
+    __slots__ = ('_series', '_index')
+
+    def __init__(self, series: 'BarSeries', index: int):
+        self._series = series
+        self._index = index
+
+    def __getitem__(self, key: str):
+        series, i = self._series, self._index
+        field = _FIELDS.get(key)
+        if field:
+            return float(getattr(series, field)[i])
+        if key in ('v', 'volume'):
+            return int(series.volume[i])
+        if key == 'date':
+            return to_date(series.day[i])
+        if key == 't':
+            day = EPOCH + timedelta(days=int(series.day[i]))
+            return int(datetime(day.year, day.month, day.day, tzinfo=ET).timestamp() * 1000)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELDS or key in ('v', 'volume', 'date', 't')
+
+    def __repr__(self):
+        return (f"Bar({self['date']} o={self['o']} h={self['h']} l={self['l']} "
+                f"c={self['c']} v={self['v']})")
+
+
+class BarSeries:
+    """Daily bars for one ticker, oldest first, as parallel typed arrays"""
+
+    __slots__ = ('day', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, day, open, high, low, close, volume):
+        self.day = np.asarray(day, dtype=np.int32)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls) -> 'BarSeries':
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_polygon(cls, results: Iterable[Dict]) -> 'BarSeries':
+        """From Polygon aggregate results (t/o/h/l/c/v dicts); missing fields become NaN/0"""
+        results = list(results)
+        n = len(results)
+        nan = float('nan')
+        stamps = np.fromiter((r['t'] for r in results), dtype=np.int64, count=n)
+        return cls(
+            (stamps - _ET_DATE_SHIFT_MS) // _MS_PER_DAY,
+            np.fromiter((r.get('o', nan) for r in results), dtype=np.float64, count=n),
+            np.fromiter((r.get('h', nan) for r in results), dtype=np.float64, count=n),
+            np.fromiter((r.get('l', nan) for r in results), dtype=np.float64, count=n),
+            np.fromiter((r['c'] for r in results), dtype=np.float64, count=n),
+            np.fromiter((r.get('v', 0) for r in results), dtype=np.float64, count=n),
+        )
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List]) -> 'BarSeries':
+        """From the cached JSON form (see to_columns)"""
+        return cls(*(columns[name] for name in COLUMNS))
+
+    @classmethod
+    def of(cls, bars: Union['BarSeries', Dict, Iterable[Dict], None]) -> 'BarSeries':
+        """Coerce a BarSeries, cached columns or Polygon results into a BarSeries"""
+        if isinstance(bars, BarSeries):
+            return bars
+        if bars is None:
+            return cls.empty()
+        if isinstance(bars, dict):
+            return cls.from_columns(bars)
+        return cls.from_polygon(bars)
+
+    def to_columns(self) -> Dict[str, List]:
+        """JSON-serializable columns (day/o/h/l/c/v lists)"""
+        return dict(zip(COLUMNS, (a.tolist() for a in
+                                  (self.day, self.open, self.high, self.low, self.close, self.volume))))
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BarSeries(self.day[index], self.open[index], self.high[index],
+                             self.low[index], self.close[index], self.volume[index])
+        n = len(self.day)
+        if not -n <= index < n:
+            raise IndexError('bar index out of range')
+        return Bar(self, index % n)
+
+    def __iter__(self):
+        return (Bar(self, i) for i in range(len(self.day)))
+
+    def __repr__(self):
+        if not len(self):
+            return 'BarSeries(empty)'
+        return f"BarSeries({len(self)} bars, {self.first_date} .. {self.last_date})"
+
+    def column(self, key: str) -> np.ndarray:
+        """Array for a Bar key ('c'/'close', 'v'/'volume', 'day', ...)"""
+        if key in ('v', 'volume'):
+            return self.volume
+        if key == 'day':
+            return self.day
+        return getattr(self, _FIELDS[key])
+
+    @property
+    def first_date(self) -> Optional[str]:
+        return to_date(self.day[0]) if len(self.day) else None
+
+    @property
+    def last_date(self) -> Optional[str]:
+        return to_date(self.day[-1]) if len(self.day) else None
+
+    def dates(self) -> List[str]:
+        return [to_date(d) for d in self.day]
+
+    def index_of(self, date_str: str) -> Optional[int]:
+        """Position of the bar dated date_str, or None"""
+        day = to_day(date_str)
+        i = int(np.searchsorted(self.day, day))
+        return i if i < len(self.day) and self.day[i] == day else None
+
+    def since(self, date_str: str) -> 'BarSeries':
+        """Bars dated on or after date_str (view)"""
+        return self[int(np.searchsorted(self.day, to_day(date_str))):]
+
+    def until(self, date_str: str) -> 'BarSeries':
+        """Bars dated on or before date_str (view)"""
+        return self[:int(np.searchsorted(self.day, to_day(date_str), side='right'))]
+
+    def last_bar_time(self) -> Optional[datetime]:
+        """ET midnight of the latest bar (what Polygon's `t` encodes), for freshness checks"""
+        if not len(self.day):
+            return None
+        day = EPOCH + timedelta(days=int(self.day[-1]))
+        return datetime(day.year, day.month, day.day, tzinfo=ET)
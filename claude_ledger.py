@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Claude Call Ledger - Per-call Anthropic usage tracking
+
+Every Anthropic API request from market_screener.py and agent_v5.5.py appends
+one compact JSON line to logs/claude_ledger/YYYY-MM-DD.jsonl:
+- command, stage, ticker, model
+- input/output/cache-read/cache-write tokens
+- latency, retries, status (ok, rate_limited, http_error, timeout, error)
+- estimated cost (from MODEL_PRICING)
+
+Daily rollups (by command, stage and model) are written to
+dashboard_data/claude_usage/YYYY-MM-DD.json and latest.json so the dashboard
+can show slow or expensive stages without parsing logs.
+
+Recording never raises - a ledger failure must not break trading commands.
+
+Usage:
+  python3 claude_ledger.py              # Rollup for today
+  python3 claude_ledger.py 2026-02-20   # Rollup for a specific date
+"""
+
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo('America/New_York')  # Ledger days follow the trading calendar
+PROJECT_DIR = Path(__file__).parent
+
+# $ per million tokens: (input, output, cache_read, cache_write)
+MODEL_PRICING = {
+    'claude-haiku-4-5': (1.00, 5.00, 0.10, 1.25),
+    'claude-sonnet-4-5': (3.00, 15.00, 0.30, 3.75),
+    'claude-opus-4-1': (15.00, 75.00, 1.50, 18.75),
+}
+DEFAULT_PRICING = MODEL_PRICING['claude-sonnet-4-5']
+
+
+def _pricing_for(model: str):
+    """Match dated model ids (claude-sonnet-4-5-20250929) to their family price"""
+    for prefix, pricing in MODEL_PRICING.items():
+        if model and model.startswith(prefix):
+            return pricing
+    return DEFAULT_PRICING
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int,
+                  cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    """Estimated USD cost of one call"""
+    price_in, price_out, price_cache_read, price_cache_write = _pricing_for(model)
+    return (input_tokens * price_in + output_tokens * price_out
+            + cache_read_tokens * price_cache_read + cache_write_tokens * price_cache_write) / 1_000_000
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ClaudeLedger:
+    """Append-only JSONL ledger of Claude API calls with daily rollups"""
+
+    def __init__(self, base_dir: Optional[Path] = None):
+        self.base_dir = Path(base_dir) if base_dir else PROJECT_DIR
+        self.ledger_dir = self.base_dir / 'logs' / 'claude_ledger'
+        self.rollup_dir = self.base_dir / 'dashboard_data' / 'claude_usage'
+        self._lock = threading.Lock()  # Screener records from worker threads
+
+    def ledger_file(self, date: str) -> Path:
+        return self.ledger_dir / f'{date}.jsonl'
+
+    def record(self, *, command: str, model: str, latency_ms: float, status: str = 'ok',
+               ticker: Optional[str] = None, stage: Optional[str] = None,
+               usage: Optional[Dict] = None, retries: int = 0,
+               http_status: Optional[int] = None, error: Optional[str] = None) -> Optional[Dict]:
+        """
+        Append one call record
+
+        Args:
+            command: 'screener', 'go', 'exit', ... (the cron command)
+            model: Model id sent in the payload
+            latency_ms: Wall time of the HTTP request
+            status: ok | rate_limited | http_error | timeout | error
+            ticker: Ticker for per-stock calls (screener), None for portfolio calls
+            stage: Sub-step within the command (e.g. 'catalyst', 'json_recovery')
+            usage: Anthropic response 'usage' dict (tokens)
+            retries: Number of retries before this attempt
+            http_status: HTTP status code if a response was received
+            error: Short error message
+
+        Returns:
+            The record written, or None if writing failed
+        """
+        try:
+            usage = usage or {}
+            input_tokens = int(usage.get('input_tokens', 0) or 0)
+            output_tokens = int(usage.get('output_tokens', 0) or 0)
+            cache_read = int(usage.get('cache_read_input_tokens', 0) or 0)
+            cache_write = int(usage.get('cache_creation_input_tokens', 0) or 0)
+
+            entry = {
+                'ts': datetime.now(ET).isoformat(timespec='seconds'),
+                'cmd': command,
+                'stage': stage,
+                'ticker': ticker,
+                'model': model,
+                'in': input_tokens,
+                'out': output_tokens,
+                'cr': cache_read,
+                'cw': cache_write,
+                'ms': round(latency_ms, 1),
+                'rt': retries,
+                'st': status,
+                'http': http_status,
+                'usd': round(estimate_cost(model, input_tokens, output_tokens, cache_read, cache_write), 6),
+                'err': error[:120] if error else None,
+            }
+            # Compact: drop empty optional fields
+            entry = {k: v for k, v in entry.items() if v is not None}
+
+            line = json.dumps(entry, separators=(',', ':'))
+            with self._lock:
+                self.ledger_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.ledger_file(entry['ts'][:10]), 'a') as f:
+                    f.write(line + '\n')
+            return entry
+        except Exception as e:
+            print(f"   ⚠️ Claude ledger write failed: {e}")
+            return None
+
+    def load_records(self, date: str) -> List[Dict]:
+        """Load all records for a YYYY-MM-DD date"""
+        ledger_file = self.ledger_file(date)
+        if not ledger_file.exists():
+            return []
+
+        records = []
+        with open(ledger_file) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Skip partially written lines
+        return records
+
+    @staticmethod
+    def _summarize(records: List[Dict]) -> Dict:
+        latencies = sorted(r.get('ms', 0) for r in records)
+        input_tokens = sum(r.get('in', 0) for r in records)
+        cache_read = sum(r.get('cr', 0) for r in records)
+        cache_write = sum(r.get('cw', 0) for r in records)
+        prompt_tokens = input_tokens + cache_read + cache_write
+
+        return {
+            'calls': len(records),
+            'ok': sum(1 for r in records if r.get('st') == 'ok'),
+            'errors': sum(1 for r in records if r.get('st') not in ('ok', 'rate_limited')),
+            'rate_limited': sum(1 for r in records if r.get('st') == 'rate_limited'),
+            'retries': sum(r.get('rt', 0) for r in records),
+            'input_tokens': input_tokens,
+            'output_tokens': sum(r.get('out', 0) for r in records),
+            'cache_read_tokens': cache_read,
+            'cache_write_tokens': cache_write,
+            'cache_hit_rate_pct': round(cache_read / prompt_tokens * 100, 1) if prompt_tokens else 0.0,
+            'cost_usd': round(sum(r.get('usd', 0) for r in records), 4),
+            'latency_ms': {
+                'total': round(sum(latencies), 1),
+                'avg': round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+                'p50': _percentile(latencies, 50),
+                'p95': _percentile(latencies, 95),
+                'max': latencies[-1] if latencies else 0.0,
+            },
+        }
+
+    def build_daily_rollup(self, date: str) -> Dict:
+        """Aggregate a day's records by command, command/stage and model"""
+        records = self.load_records(date)
+
+        def group(key_fn):
+            groups = {}
+            for r in records:
+                groups.setdefault(key_fn(r), []).append(r)
+            return {key: self._summarize(rs) for key, rs in sorted(groups.items())}
+
+        slowest = sorted(records, key=lambda r: r.get('ms', 0), reverse=True)[:5]
+
+        return {
+            'date': date,
+            'generated_at': datetime.now(ET).isoformat(timespec='seconds'),
+            'totals': self._summarize(records),
+            'by_command': group(lambda r: r.get('cmd', 'unknown')),
+            'by_stage': group(lambda r: f"{r.get('cmd', 'unknown')}:{r.get('stage', '-')}"),
+            'by_model': group(lambda r: r.get('model', 'unknown')),
+            'slowest_calls': slowest,
+        }
+
+    def write_daily_rollup(self, date: Optional[str] = None) -> Optional[Dict]:
+        """Write dashboard rollup for date (default today); never raises"""
+        date = date or datetime.now(ET).strftime('%Y-%m-%d')
+        try:
+            rollup = self.build_daily_rollup(date)
+            self.rollup_dir.mkdir(parents=True, exist_ok=True)
+            payload = json.dumps(rollup, indent=2)
+            (self.rollup_dir / f'{date}.json').write_text(payload)
+            (self.rollup_dir / 'latest.json').write_text(payload)
+            return rollup
+        except Exception as e:
+            print(f"   ⚠️ Claude usage rollup failed: {e}")
+            return None
+
+
+# Shared instance used by the screener and agent
+LEDGER = ClaudeLedger()
+
+
+def record_claude_call(**kwargs) -> Optional[Dict]:
+    """Append a call record to the shared ledger (see ClaudeLedger.record)"""
+    return LEDGER.record(**kwargs)
+
+
+def print_rollup(rollup: Dict):
+    """Console summary of a daily rollup"""
+    totals = rollup['totals']
+    print(f"\nCLAUDE USAGE - {rollup['date']}")
+    print("=" * 60)
+    print(f"Calls: {totals['calls']} ({totals['errors']} errors, {totals['rate_limited']} rate-limited)")
+    print(f"Tokens: {totals['input_tokens']:,} in / {totals['output_tokens']:,} out / "
+          f"{totals['cache_read_tokens']:,} cache read ({totals['cache_hit_rate_pct']:.1f}% hit)")
+    print(f"Cost: ${totals['cost_usd']:.4f} | Latency p50 {totals['latency_ms']['p50']:.0f}ms, "
+          f"p95 {totals['latency_ms']['p95']:.0f}ms")
+    print(f"\n{'Stage':<28} {'Calls':>6} {'Cost $':>9} {'p95 ms':>9} {'Total s':>9}")
+    print("-" * 64)
+    for stage, stats in rollup['by_stage'].items():
+        print(f"{stage:<28} {stats['calls']:>6} {stats['cost_usd']:>9.4f} "
+              f"{stats['latency_ms']['p95']:>9.0f} {stats['latency_ms']['total'] / 1000:>9.1f}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    target_date = sys.argv[1] if len(sys.argv) > 1 else datetime.now(ET).strftime('%Y-%m-%d')
+    result = LEDGER.write_daily_rollup(target_date)
+    if result:
+        print_rollup(result)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Correlation - Return correlation / covariance engine for portfolio construction
+
+Sector labels miss co-moving names: five semiconductor-adjacent stocks can sit
+in "Technology", "Industrials" and "Communication Services" and still fall
+together. This module builds the correlation and covariance matrix of daily
+returns for a set of tickers (held positions plus candidates) from the bar
+windows the commands already share (warm cache / prefetch), in one pass:
+
+- Returns are simple close-to-close returns over the last CORRELATION_LOOKBACK
+  trading days (60-120), aligned on trading dates; a ticker missing a day is
+  NaN there, and each pair uses the days both have (pairwise complete)
+- Correlation and covariance for all pairs come from a handful of matrix
+  products, so ~50 names take a few milliseconds
+- Pairs with fewer than CORRELATION_MIN_OVERLAP common returns are undefined
+
+Matrices are cached per ticker set until the next daily close (warm cache kind
+'correlation'); a request covered by a matrix this process built since the last
+close is served as a sub-matrix.
+
+Usage:
+    matrix = CORRELATION_ENGINE.matrix(tickers, bars_for)   # bars_for(tickers) -> {ticker: BarSeries}
+    matrix.get('NVDA', 'AMD')                               # 0.83
+    matrix.correlated_with('NVDA', held, CORRELATION_HIGH)  # [('AMD', 0.83), ...]
+"""
+
+import hashlib
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from warm_cache import WARM_CACHE, expires_at
+
+# Trading days of returns in the matrix
+CORRELATION_LOOKBACK = int(os.environ.get('CORRELATION_LOOKBACK', '90'))
+
+# Calendar days of bars that cover the lookback (weekends + holidays)
+CORRELATION_BAR_DAYS = CORRELATION_LOOKBACK * 7 // 5 + 14
+
+# Common returns a pair needs before its correlation is defined
+CORRELATION_MIN_OVERLAP = int(os.environ.get('CORRELATION_MIN_OVERLAP', '40'))
+
+# Pairs at or above this correlation move together (portfolio construction threshold)
+CORRELATION_HIGH = float(os.environ.get('CORRELATION_HIGH', '0.80'))
+
+
+def aligned_returns(bars_by_ticker: Dict, lookback: int = CORRELATION_LOOKBACK) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Daily returns as a tickers x days matrix aligned on trading dates
+
+    Args:
+        bars_by_ticker: {ticker: BarSeries}; tickers with <2 bars get an all-NaN row
+        lookback: Number of most recent return dates kept
+
+    Returns: (tickers, epoch days, returns) - NaN where a ticker has no return that day
+    """
+    tickers = list(bars_by_ticker)
+    per_ticker = []
+    for ticker in tickers:
+        bars = bars_by_ticker[ticker]
+        if bars is None or len(bars) < 2:
+            per_ticker.append((np.empty(0, dtype=np.int32), np.empty(0)))
+            continue
+        close = bars.close
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = close[1:] / close[:-1] - 1
+        per_ticker.append((bars.day[1:], returns))
+
+    days = np.unique(np.concatenate([d for d, _ in per_ticker])) if per_ticker else np.empty(0, dtype=np.int32)
+    days = days[-lookback:]
+    matrix = np.full((len(tickers), len(days)), np.nan)
+    for row, (ticker_days, returns) in enumerate(per_ticker):
+        keep = ticker_days >= days[0] if len(days) else np.zeros(len(ticker_days), dtype=bool)
+        matrix[row, np.searchsorted(days, ticker_days[keep])] = returns[keep]
+    matrix[~np.isfinite(matrix)] = np.nan
+    return tickers, days, matrix
+
+
+def pairwise(returns: np.ndarray, min_overlap: int = CORRELATION_MIN_OVERLAP) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete correlation and covariance of the rows of `returns`
+
+    Each pair uses only the days where both rows have a value. Sums over
+    those days come from matrix products of the values and presence masks.
+
+    Returns: (correlation, covariance, overlap) - N x N; NaN below min_overlap
+    """
+    present = ~np.isnan(returns)
+    mask = present.astype(np.float64)
+    x = np.where(present, returns, 0.0)
+
+    overlap = mask @ mask.T              # n_ij: days both have
+    sum_x = x @ mask.T                   # sum of x_i over those days
+    sum_xx = (x * x) @ mask.T            # sum of x_i^2 over those days
+    sum_xy = x @ x.T                     # sum of x_i * x_j
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = sum_x / overlap
+        centered_xy = sum_xy - sum_x * sum_x.T / overlap
+        var_x = sum_xx - sum_x * mean_x     # Row i's variance on the pair's days (unnormalized)
+        covariance = centered_xy / (overlap - 1)
+        correlation = centered_xy / np.sqrt(var_x * var_x.T)
+
+    undefined = (overlap < max(min_overlap, 2)) | ~np.isfinite(correlation)
+    correlation = np.clip(correlation, -1.0, 1.0)
+    correlation[undefined] = np.nan
+    covariance[overlap < max(min_overlap, 2)] = np.nan
+    return correlation, covariance, overlap.astype(np.int64)
+
+
+class CorrelationMatrix:
+    """Correlations / covariances of daily returns for a fixed ticker set"""
+
+    def __init__(self, tickers: List[str], correlation, covariance, overlap, as_of: Optional[int] = None):
+        self.tickers = list(tickers)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.correlation = np.asarray(correlation, dtype=np.float64)
+        self.covariance = np.asarray(covariance, dtype=np.float64)
+        self.overlap = np.asarray(overlap, dtype=np.int64)
+        self.as_of = as_of  # Epoch day of the latest return
+
+    @classmethod
+    def from_bars(cls, bars_by_ticker: Dict, lookback: int = CORRELATION_LOOKBACK,
+                  min_overlap: int = CORRELATION_MIN_OVERLAP) -> 'CorrelationMatrix':
+        tickers, days, returns = aligned_returns(bars_by_ticker, lookback)
+        correlation, covariance, overlap = pairwise(returns, min_overlap)
+        return cls(tickers, correlation, covariance, overlap, int(days[-1]) if len(days) else None)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.index
+
+    def get(self, a: str, b: str) -> Optional[float]:
+        """Correlation of two tickers, None if undefined or not in the matrix"""
+        if a not in self.index or b not in self.index:
+            return None
+        value = self.correlation[self.index[a], self.index[b]]
+        return None if np.isnan(value) else float(value)
+
+    def correlated_with(self, ticker: str, others: List[str], threshold: float = CORRELATION_HIGH) -> List[Tuple[str, float]]:
+        """Tickers in `others` correlated >= threshold with `ticker`, highest first"""
+        peers = []
+        for other in dict.fromkeys(others):
+            if other == ticker:
+                continue
+            value = self.get(ticker, other)
+            if value is not None and value >= threshold:
+                peers.append((other, round(value, 2)))
+        return sorted(peers, key=lambda p: p[1], reverse=True)
+
+    def max_correlation(self, ticker: str, others: List[str]) -> Tuple[Optional[str], Optional[float]]:
+        """(other, correlation) for the most correlated of `others`, (None, None) if none defined"""
+        best = (None, None)
+        for other in others:
+            value = self.get(ticker, other) if other != ticker else None
+            if value is not None and (best[1] is None or value > best[1]):
+                best = (other, round(value, 2))
+        return best
+
+    def clusters(self, threshold: float = CORRELATION_HIGH) -> List[List[str]]:
+        """Groups of tickers linked by correlation >= threshold (connected components, size >= 2)"""
+        linked = np.nan_to_num(self.correlation, nan=-1.0) >= threshold
+        seen, groups = set(), []
+        for start in range(len(self.tickers)):
+            if start in seen:
+                continue
+            group, stack = [], [start]
+            seen.add(start)
+            while stack:
+                i = stack.pop()
+                group.append(self.tickers[i])
+                for j in np.flatnonzero(linked[i]):
+                    if j not in seen:
+                        seen.add(int(j))
+                        stack.append(int(j))
+            if len(group) > 1:
+                groups.append(sorted(group))
+        return groups
+
+    def subset(self, tickers: List[str]) -> 'CorrelationMatrix':
+        """Sub-matrix for tickers (all must be in this matrix)"""
+        rows = [self.index[t] for t in tickers]
+        grid = np.ix_(rows, rows)
+        return CorrelationMatrix(tickers, self.correlation[grid], self.covariance[grid], self.overlap[grid], self.as_of)
+
+    def to_entry(self) -> Dict:
+        """JSON-serializable form for the warm cache (NaN stored as None)"""
+        def clean(matrix):
+            return [[None if np.isnan(v) else v for v in row] for row in matrix.tolist()]
+        return {'tickers': self.tickers, 'correlation': clean(self.correlation),
+                'covariance': clean(self.covariance), 'overlap': self.overlap.tolist(), 'as_of': self.as_of}
+
+    @classmethod
+    def from_entry(cls, entry: Dict) -> 'CorrelationMatrix':
+        def restore(matrix):
+            return np.array([[np.nan if v is None else v for v in row] for row in matrix], dtype=np.float64)
+        return cls(entry['tickers'], restore(entry['correlation']), restore(entry['covariance']),
+                   entry['overlap'], entry.get('as_of'))
+
+
+class CorrelationEngine:
+    """Builds and caches correlation matrices (per process and in the warm cache until the close)"""
+
+    def __init__(self, cache=None, lookback: int = CORRELATION_LOOKBACK):
+        self.cache = cache if cache is not None else WARM_CACHE
+        self.lookback = lookback
+        self._matrices: List[Tuple[float, CorrelationMatrix]] = []  # (expiry epoch, matrix)
+        self.stats = {'built': 0, 'reused': 0, 'cached': 0, 'seconds': 0.0}
+
+    def _key(self, tickers: List[str]) -> str:
+        digest = hashlib.sha1(','.join(sorted(tickers)).encode('utf-8')).hexdigest()[:16]
+        return f"{self.lookback}:{digest}"
+
+    def matrix(self, tickers: List[str], bars_for: Callable[[List[str]], Dict],
+               now: Optional[float] = None) -> CorrelationMatrix:
+        """
+        Correlation matrix for tickers
+
+        Args:
+            tickers: Held positions plus candidates (duplicates ignored)
+            bars_for: Called with the tickers when the matrix must be built;
+                      returns {ticker: BarSeries} covering CORRELATION_BAR_DAYS
+            now: Epoch seconds (default: current time)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        now = time.time() if now is None else now
+        # Same expiry as the warm cache's 'correlation' kind: a new close adds a return
+        self._matrices = [(expiry, built) for expiry, built in self._matrices if expiry > now]
+        for _, built in self._matrices:
+            if all(t in built for t in tickers):
+                self.stats['reused'] += 1
+                return built.subset(tickers)
+
+        key = self._key(tickers)
+        entry = self.cache.get('correlation', key)
+        if entry:
+            self.stats['cached'] += 1
+            matrix = CorrelationMatrix.from_entry(entry).subset(tickers)
+        else:
+            bars = bars_for(tickers)
+            started = time.perf_counter()
+            matrix = CorrelationMatrix.from_bars({t: bars.get(t) for t in tickers}, self.lookback)
+            self.stats['seconds'] += time.perf_counter() - started
+            self.stats['built'] += 1
+            self.cache.set('correlation', key, matrix.to_entry())
+        self._matrices.append((expires_at('correlation', now), matrix))
+        return matrix
+
+    def reset(self):
+        """Drop matrices and counters from the previous command (the daemon reuses this instance)"""
+        self._matrices = []
+        self.stats = {'built': 0, 'reused': 0, 'cached': 0, 'seconds': 0.0}
+
+    def print_stats(self, label: str = 'Correlation'):
+        s = self.stats
+        if not (s['built'] or s['reused'] or s['cached']):
+            return
+        print(f"   🔗 {label}: {s['built']} matrices built in {s['seconds'] * 1000:.0f}ms, "
+              f"{s['cached']} from cache, {s['reused']} sub-matrices reused")
+
+
+# Shared instance used by the agent
+CORRELATION_ENGINE = CorrelationEngine()
@@ -451,6 +451,36 @@ def daily_picks():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/claude-usage')
+@require_auth
+def claude_usage():
+    """Get daily Claude API usage rollup (calls, tokens, cost, latency by stage)"""
+    try:
+        date = request.args.get('date')
+        usage_dir = PROJECT_DIR / 'dashboard_data' / 'claude_usage'
+        usage_file = usage_dir / (f'{date}.json' if date else 'latest.json')
+
+        # Only allow YYYY-MM-DD file names
+        if date and not (len(date) == 10 and date[4] == '-' and date[7] == '-' and date.replace('-', '').isdigit()):
+            return jsonify({'error': 'Invalid date'}), 400
+
+        if not usage_file.exists():
+            return jsonify({
+                'available': False,
+                'message': 'No Claude usage data yet. Run the screener or an agent command to generate.'
+            })
+
+        with open(usage_file) as f:
+            usage_data = json.load(f)
+
+        return jsonify({
+            'available': True,
+            'data': usage_data
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/system-health')
 @require_auth
 def data_integrity_health():
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Gap Engine - Batched premarket gap analysis for held and candidate tickers
+
+EXECUTE used to classify gaps one ticker at a time inside its buy loop, and
+RECHECK re-priced each skipped name separately with nothing to compare against
+but the 9:45 AM price. This module works on one bulk snapshot instead:
+
+- A snapshot holds previous close, last price and today's volume for every
+  held and candidate ticker (one batched quote request upstream)
+- Gap % and gap class for the whole snapshot come from one vectorized pass,
+  using the same thresholds as TradingAgent.analyze_premarket_gap
+- Snapshots are persisted per command in premarket_gaps.json (today only), so
+  RECHECK can diff a later snapshot against EXECUTE's
+
+Gap classes (v8.9.8 thresholds, EXECUTE runs at 9:45 AM):
+- EXHAUSTION_GAP (>=8%): skip, save for RECHECK
+- BREAKAWAY_GAP (5-8%), CONTINUATION_GAP (3-5%), SMALL_GAP (2-3%): enter
+- GAP_DOWN (<=-3%), NORMAL: enter
+- UNKNOWN: price or previous close missing - proceed
+
+Usage:
+    snapshot = GapSnapshot.build('EXECUTE', tickers, previous_closes, prices, volumes)
+    snapshot.analysis('NVDA')                    # analyze_premarket_gap-format dict
+    save_gap_snapshot(project_dir, snapshot)
+    earlier = load_gap_snapshot(project_dir, 'EXECUTE')
+    earlier.diff(later)                          # {ticker: {'gap_then', 'gap_now', ...}}
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+GAP_SNAPSHOT_FILE_NAME = 'premarket_gaps.json'
+
+# Gap classes, indexed by the codes classify() returns
+# (classification, entry_strategy, reasoning, recommended_action, should_enter_at_open, should_exit_at_open, risk_level)
+GAP_CLASSES = (
+    ('EXHAUSTION_GAP', 'WAIT_FOR_PULLBACK_OR_SKIP', 'Gap {gap:+.1f}% too large, high fade risk',
+     'Wait for gap fill to support or skip entirely', False, False, 'HIGH'),
+    ('BREAKAWAY_GAP', 'ENTER_WITH_CAUTION', 'Gap {gap:+.1f}% strong but 9:45 AM entry after opening rush',
+     'Enter with reduced size or tighter stop', True, True, 'MEDIUM'),
+    ('CONTINUATION_GAP', 'ENTER_AT_945AM', 'Gap {gap:+.1f}% reasonable, 9:45 AM entry after opening volatility',
+     'Normal entry with gap noted', True, True, 'LOW'),
+    ('SMALL_GAP', 'ENTER_NORMALLY', 'Gap {gap:+.1f}% minimal', 'Normal entry', True, True, 'LOW'),
+    ('GAP_DOWN', 'ENTER_AT_OPEN_BUYING_WEAKNESS', 'Gap {gap:+.1f}% down, buying weakness',
+     'Enter at open if thesis intact', True, True, 'MEDIUM'),
+    ('NORMAL', 'ENTER_AT_OPEN', 'Gap {gap:+.1f}% minimal', 'Normal entry at market open', True, True, 'LOW'),
+    ('UNKNOWN', 'PROCEED', 'Unable to calculate gap (missing price data)', 'Enter at current price', True, False, 'MEDIUM'),
+)
+CLASS_CODES = {row[0]: code for code, row in enumerate(GAP_CLASSES)}
+UNKNOWN = CLASS_CODES['UNKNOWN']
+
+
+def classify(previous_close, last):
+    """
+    Gap % and class codes for arrays (or scalars) of previous closes and prices
+
+    Missing (NaN/None) inputs give class UNKNOWN with gap 0; a non-positive
+    previous close gives gap 0 (NORMAL), as analyze_premarket_gap does.
+
+    Returns: (gap_pct, codes) - arrays, or scalars for scalar input
+    """
+    scalar = np.ndim(previous_close) == 0 and np.ndim(last) == 0
+    previous_close = np.atleast_1d(np.asarray(previous_close, dtype=np.float64))
+    last = np.atleast_1d(np.asarray(last, dtype=np.float64))
+
+    missing = np.isnan(previous_close) | np.isnan(last)
+    valid = ~missing & (previous_close > 0)
+    gap_pct = np.zeros(np.broadcast(previous_close, last).shape)
+    np.divide(last - previous_close, previous_close, out=gap_pct, where=valid)
+    gap_pct *= 100
+
+    codes = np.select(
+        [missing, gap_pct >= 8.0, gap_pct >= 5.0, gap_pct >= 3.0, gap_pct >= 2.0, gap_pct <= -3.0],
+        [UNKNOWN, CLASS_CODES['EXHAUSTION_GAP'], CLASS_CODES['BREAKAWAY_GAP'], CLASS_CODES['CONTINUATION_GAP'],
+         CLASS_CODES['SMALL_GAP'], CLASS_CODES['GAP_DOWN']],
+        default=CLASS_CODES['NORMAL'])
+    if scalar:
+        return float(gap_pct[0]), int(codes[0])
+    return gap_pct, codes
+
+
+def gap_analysis(gap_pct: float, code: int) -> Dict:
+    """analyze_premarket_gap-format dict for one classified gap"""
+    classification, strategy, reasoning, action, enter, exit_, risk = GAP_CLASSES[code]
+    return {
+        'gap_pct': gap_pct,
+        'classification': classification,
+        'entry_strategy': strategy,
+        'reasoning': reasoning.format(gap=gap_pct),
+        'recommended_action': action,
+        'should_enter_at_open': enter,
+        'should_exit_at_open': exit_,
+        'risk_level': risk,
+    }
+
+
+def _column(values: Optional[Dict], tickers: List[str]) -> np.ndarray:
+    values = values or {}
+    return np.array([values.get(t) if values.get(t) is not None else np.nan for t in tickers], dtype=np.float64)
+
+
+class GapSnapshot:
+    """Previous close, last price, volume and gap class for a set of tickers at one moment"""
+
+    def __init__(self, label: str, tickers: List[str], previous_close, last, volume, taken_at: Optional[str] = None):
+        self.label = label
+        self.tickers = list(tickers)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.previous_close = np.asarray(previous_close, dtype=np.float64)
+        self.last = np.asarray(last, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.taken_at = taken_at or datetime.now().strftime('%H:%M:%S')
+        self.gap_pct, self.codes = classify(self.previous_close, self.last)
+
+    @classmethod
+    def build(cls, label: str, tickers: List[str], previous_closes: Dict, prices: Dict,
+              volumes: Optional[Dict] = None) -> 'GapSnapshot':
+        """Snapshot from {ticker: value} dicts (missing tickers become NaN)"""
+        tickers = list(dict.fromkeys(tickers))
+        return cls(label, tickers, _column(previous_closes, tickers), _column(prices, tickers),
+                   _column(volumes, tickers))
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.index
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def _value(self, column, ticker) -> Optional[float]:
+        if ticker not in self.index:
+            return None
+        value = column[self.index[ticker]]
+        return None if np.isnan(value) else float(value)
+
+    def price(self, ticker: str) -> Optional[float]:
+        return self._value(self.last, ticker)
+
+    def previous(self, ticker: str) -> Optional[float]:
+        return self._value(self.previous_close, ticker)
+
+    def volume_of(self, ticker: str) -> Optional[float]:
+        return self._value(self.volume, ticker)
+
+    def analysis(self, ticker: str) -> Dict:
+        """analyze_premarket_gap-format dict (UNKNOWN for tickers not in the snapshot)"""
+        if ticker not in self.index:
+            return gap_analysis(0, UNKNOWN)
+        i = self.index[ticker]
+        return gap_analysis(float(self.gap_pct[i]), int(self.codes[i]))
+
+    def counts(self) -> Dict[str, int]:
+        """{classification: tickers} for classes present in the snapshot"""
+        codes, counts = np.unique(self.codes, return_counts=True)
+        return {GAP_CLASSES[c][0]: int(n) for c, n in zip(codes, counts)}
+
+    def diff(self, later: 'GapSnapshot') -> Dict[str, Dict]:
+        """
+        Per-ticker change from this snapshot to a later one (tickers in both)
+
+        Returns: {ticker: {'gap_then', 'gap_now', 'class_then', 'class_now',
+                           'price_then', 'price_now', 'price_change_pct', 'volume_since'}}
+                 price_change_pct / volume_since are None when either side is missing
+        """
+        common = [t for t in later.tickers if t in self.index]
+        if not common:
+            return {}
+        rows = np.array([self.index[t] for t in common])
+        later_rows = np.array([later.index[t] for t in common])
+        price_then, price_now = self.last[rows], later.last[later_rows]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            change = (price_now - price_then) / price_then * 100
+        volume_since = later.volume[later_rows] - self.volume[rows]
+
+        def value(array, k):
+            return None if not np.isfinite(array[k]) else round(float(array[k]), 2)
+
+        return {
+            ticker: {
+                'gap_then': round(float(self.gap_pct[rows[k]]), 2),
+                'gap_now': round(float(later.gap_pct[later_rows[k]]), 2),
+                'class_then': GAP_CLASSES[self.codes[rows[k]]][0],
+                'class_now': GAP_CLASSES[later.codes[later_rows[k]]][0],
+                'price_then': value(price_then, k),
+                'price_now': value(price_now, k),
+                'price_change_pct': value(change, k),
+                'volume_since': value(volume_since, k),
+            }
+            for k, ticker in enumerate(common)
+        }
+
+    def to_entry(self) -> Dict:
+        """JSON-serializable form (NaN stored as None)"""
+        def clean(array):
+            return [None if np.isnan(v) else v for v in array.tolist()]
+        return {'tickers': self.tickers, 'taken_at': self.taken_at, 'previous_close': clean(self.previous_close),
+                'last': clean(self.last), 'volume': clean(self.volume),
+                'gap_pct': [round(v, 2) for v in self.gap_pct.tolist()],
+                'classification': [GAP_CLASSES[c][0] for c in self.codes]}
+
+    @classmethod
+    def from_entry(cls, label: str, entry: Dict) -> 'GapSnapshot':
+        def restore(values):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        return cls(label, entry['tickers'], restore(entry['previous_close']), restore(entry['last']),
+                   restore(entry['volume']), entry.get('taken_at'))
+
+
+def save_gap_snapshot(project_dir: Path, snapshot: GapSnapshot):
+    """Store a snapshot under its label in today's premarket_gaps.json (other days are discarded)"""
+    path = Path(project_dir) / GAP_SNAPSHOT_FILE_NAME
+    today = datetime.now().strftime('%Y-%m-%d')
+    data = {'date': today, 'snapshots': {}}
+    if path.exists():
+        try:
+            with open(path) as f:
+                existing = json.load(f)
+            if existing.get('date') == today:
+                data = existing
+        except (OSError, ValueError):
+            pass
+    data['snapshots'][snapshot.label] = snapshot.to_entry()
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_gap_snapshot(project_dir: Path, label: str) -> Optional[GapSnapshot]:
+    """Today's snapshot for label, None if missing, stale or unreadable"""
+    path = Path(project_dir) / GAP_SNAPSHOT_FILE_NAME
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    entry = data.get('snapshots', {}).get(label)
+    if data.get('date') != datetime.now().strftime('%Y-%m-%d') or not entry:
+        return None
+    return GapSnapshot.from_entry(label, entry)
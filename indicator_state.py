@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Indicator State - Incremental per-ticker indicator maintenance
+
+Recomputing EMA/ATR/RSI/ADX from 45-400 days of history on every command is
+wasted work: one new daily bar arrives per day. This module keeps each
+ticker's indicator state (EMA values, Wilder accumulators, short rolling
+windows) in the warm cache next to the daily bars and advances it by exactly
+the bars that are new since the state's last bar - O(1) per bar.
+
+A full recompute (replaying the available bars) only happens when:
+- there is no stored state (or the state layout changed)
+- the bar at the state's last date is missing from the new history (gap)
+- that bar's close changed (split/dividend adjustment rewrote history)
+
+Bars that are not final yet (today's bar before 4:15 PM ET) are applied to a
+copy for the returned values, never to the stored state.
+
+Definitions match indicators.py on the same bar history:
+- sma20/sma50, ema5/ema20 (SMA-seeded), rsi14 (simple), atr14 (simple),
+  atr14_wilder, dx14, adx14 (Wilder), volume_ratio20
+
+Usage:
+    values = INDICATOR_STORE.update('AAPL', bars)   # BarSeries (or Polygon t/h/l/c/v results)
+    INDICATOR_STORE.save()                          # Persist advanced states (one transaction)
+"""
+
+import copy
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from warm_cache import WARM_CACHE, ET, first_open_day
+
+# Bump when the stored layout or indicator set changes (old states are rebuilt)
+STATE_VERSION = 2
+
+SMA_PERIODS = (20, 50)
+EMA_PERIODS = (5, 20)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+ADX_PERIOD = 14
+VOLUME_WINDOW = 20
+
+# Closes kept for the SMAs and the simple RSI (needs period + 1 closes)
+CLOSE_WINDOW = max(max(SMA_PERIODS), RSI_PERIOD + 1)
+
+# Relative tolerance when checking the anchor bar's close for adjustments
+ADJUSTMENT_TOLERANCE = 1e-6
+
+
+def _smooth(acc: Dict, value: float, period: int, alpha: float):
+    """
+    Advance an SMA-seeded recursive average by one value
+
+    acc = {'n': values seen, 'sum': seed sum, 'value': average or None}
+    """
+    acc['n'] += 1
+    if acc['n'] < period:
+        acc['sum'] += value
+    elif acc['n'] == period:
+        acc['value'] = (acc['sum'] + value) / period
+    else:
+        acc['value'] = value * alpha + acc['value'] * (1 - alpha)
+
+
+def _new_acc() -> Dict:
+    return {'n': 0, 'sum': 0.0, 'value': None}
+
+
+def _push(window: List[float], value: float, size: int):
+    window.append(value)
+    if len(window) > size:
+        del window[0]
+
+
+class TickerIndicators:
+    """One ticker's indicator state (JSON-serializable via .state)"""
+
+    def __init__(self, state: Optional[Dict] = None):
+        self.state = state or {
+            'version': STATE_VERSION,
+            'day': None, 'high': None, 'low': None, 'close': None,
+            'bars': 0,
+            'closes': [], 'volumes': [], 'trs': [],
+            'ema': {str(p): _new_acc() for p in EMA_PERIODS},
+            'tr': _new_acc(), 'plus_dm': _new_acc(), 'minus_dm': _new_acc(), 'adx': _new_acc(),
+        }
+
+    def advance(self, bars):
+        """Apply new daily bars (BarSeries, oldest first)"""
+        for high, low, close, volume in zip(bars.high.tolist(), bars.low.tolist(),
+                                            bars.close.tolist(), bars.volume.tolist()):
+            self._advance(high, low, close, volume)
+        if len(bars):
+            self.state['day'] = int(bars.day[-1])
+
+    def _advance(self, high: float, low: float, close: float, volume: int):
+        s = self.state
+
+        for period in EMA_PERIODS:
+            _smooth(s['ema'][str(period)], close, period, 2 / (period + 1))
+
+        if s['close'] is not None:
+            tr = max(high - low, abs(high - s['close']), abs(low - s['close']))
+            up, down = high - s['high'], s['low'] - low
+            _push(s['trs'], tr, ATR_PERIOD)
+            alpha = 1 / ADX_PERIOD
+            _smooth(s['tr'], tr, ADX_PERIOD, alpha)
+            _smooth(s['plus_dm'], up if up > down and up > 0 else 0.0, ADX_PERIOD, alpha)
+            _smooth(s['minus_dm'], down if down > up and down > 0 else 0.0, ADX_PERIOD, alpha)
+            dx = self._dx()
+            if dx is not None:
+                _smooth(s['adx'], dx, ADX_PERIOD, alpha)
+
+        _push(s['closes'], close, CLOSE_WINDOW)
+        _push(s['volumes'], volume, VOLUME_WINDOW)
+        s['high'], s['low'], s['close'] = high, low, close
+        s['bars'] += 1
+
+    def _dx(self) -> Optional[float]:
+        s = self.state
+        smoothed_tr = s['tr']['value']
+        if smoothed_tr is None:
+            return None
+        if smoothed_tr <= 0:
+            return 0.0
+        plus_di = 100 * s['plus_dm']['value'] / smoothed_tr
+        minus_di = 100 * s['minus_dm']['value'] / smoothed_tr
+        return 100 * abs(plus_di - minus_di) / (plus_di + minus_di) if plus_di + minus_di > 0 else 0.0
+
+    def values(self) -> Dict:
+        """Current indicator values (None where there is not enough history)"""
+        s = self.state
+        closes, volumes, trs = s['closes'], s['volumes'], s['trs']
+        day = s['day']
+        values = {'date': (date(1970, 1, 1) + timedelta(days=day)).isoformat() if day is not None else None,
+                  'close': s['close'], 'bars': s['bars']}
+
+        for period in SMA_PERIODS:
+            values[f'sma{period}'] = sum(closes[-period:]) / period if len(closes) >= period else None
+        for period in EMA_PERIODS:
+            values[f'ema{period}'] = s['ema'][str(period)]['value']
+
+        rsi = None
+        if len(closes) >= RSI_PERIOD + 1:
+            window = closes[-(RSI_PERIOD + 1):]
+            changes = [b - a for a, b in zip(window, window[1:])]
+            avg_gain = sum(c for c in changes if c > 0) / RSI_PERIOD
+            avg_loss = sum(-c for c in changes if c < 0) / RSI_PERIOD
+            rsi = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+        values[f'rsi{RSI_PERIOD}'] = rsi
+
+        values[f'atr{ATR_PERIOD}'] = sum(trs) / ATR_PERIOD if len(trs) == ATR_PERIOD else None
+        values[f'atr{ADX_PERIOD}_wilder'] = s['tr']['value']
+        values[f'dx{ADX_PERIOD}'] = self._dx()
+        values[f'adx{ADX_PERIOD}'] = s['adx']['value']
+
+        ratio = None
+        if len(volumes) == VOLUME_WINDOW:
+            average = sum(volumes) / VOLUME_WINDOW
+            ratio = volumes[-1] / average if average > 0 else 0.0
+        values[f'volume_ratio{VOLUME_WINDOW}'] = ratio
+        return values
+
+    def copy(self) -> 'TickerIndicators':
+        return TickerIndicators(copy.deepcopy(self.state))
+
+
+class IndicatorStore:
+    """Per-ticker indicator states, loaded from and saved to the warm cache"""
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else WARM_CACHE
+        self._states: Dict[str, TickerIndicators] = {}
+        self._dirty = set()
+        self._looked_up = set()  # Tickers already queried (found or not)
+        self.stats = {'advanced': 0, 'bars': 0, 'current': 0, 'rebuilt': 0, 'seconds': 0.0}
+
+    def load(self, tickers: List[str]):
+        """Bulk-load stored states (one query) ahead of a universe pass"""
+        pending = [t for t in tickers if t not in self._looked_up]
+        if not pending:
+            return
+        self._looked_up.update(pending)
+        for ticker, state in self.cache.get_many('indicator_state', pending).items():
+            if state.get('version') == STATE_VERSION:
+                self._states[ticker] = TickerIndicators(state)
+
+    def _stored(self, ticker: str) -> Optional[TickerIndicators]:
+        self.load([ticker])
+        return self._states.get(ticker)
+
+    def update(self, ticker: str, bars, now: Optional[datetime] = None) -> Dict:
+        """
+        Indicator values for ticker after the latest of `bars` (oldest first)
+
+        Advances the stored state by the final bars newer than it, or rebuilds
+        it from `bars` on a gap/adjustment. Trailing non-final bars are applied
+        to a copy only.
+        """
+        from bar_series import BarSeries  # numpy only when bars are touched
+        started = time.perf_counter()
+        bars = BarSeries.of(bars)
+        indicators = self._stored(ticker)
+        new_bars = self._new_bars(indicators, bars) if indicators else None
+        rebuild = new_bars is None
+        if rebuild:
+            indicators = TickerIndicators()
+            new_bars = bars
+
+        split = int(new_bars.day.searchsorted(first_open_day(now)))
+        final, partial = new_bars[:split], new_bars[split:]
+
+        if rebuild:
+            self.stats['rebuilt'] += 1
+        elif len(final):
+            self.stats['advanced'] += 1
+            self.stats['bars'] += len(final)
+        else:
+            self.stats['current'] += 1
+
+        indicators.advance(final)
+        if len(final):
+            self._states[ticker] = indicators
+            self._dirty.add(ticker)
+
+        if len(partial):
+            indicators = indicators.copy()
+            indicators.advance(partial)
+        self.stats['seconds'] += time.perf_counter() - started
+        return indicators.values()
+
+    @staticmethod
+    def _new_bars(indicators: TickerIndicators, bars):
+        """Bars after the state's last bar (view), or None if the state must be rebuilt"""
+        state = indicators.state
+        if not len(bars):
+            return None
+        if bars.day[-1] < state['day']:
+            return bars[len(bars):]  # Stale history: the state is already past it
+        index = int(bars.day.searchsorted(state['day']))
+        if bars.day[index] != state['day']:
+            return None  # Anchor bar missing: gap between the state and this history
+        if abs(bars.close[index] - state['close']) > ADJUSTMENT_TOLERANCE * max(abs(state['close']), 1.0):
+            return None  # Split/dividend adjustment: stored history is stale
+        return bars[index + 1:]
+
+    def save(self):
+        """Persist states changed since the last save"""
+        if not self._dirty:
+            return
+        self.cache.set_many('indicator_state', {t: self._states[t].state for t in self._dirty})
+        self._dirty.clear()
+
+    def reset_stats(self):
+        """Start a new command's counters (the daemon reuses this instance)"""
+        self.stats = {'advanced': 0, 'bars': 0, 'current': 0, 'rebuilt': 0, 'seconds': 0.0}
+
+    def print_stats(self, label: str = 'Indicator state'):
+        s = self.stats
+        tickers = s['advanced'] + s['current'] + s['rebuilt']
+        if not tickers:
+            return
+        print(f"   📈 {label}: {tickers} tickers ({s['advanced']} advanced by {s['bars']} bars, "
+              f"{s['current']} current, {s['rebuilt']} rebuilt) in {s['seconds'] * 1000:.0f}ms")
+
+
+# Shared instance used by the screener and agent
+INDICATOR_STORE = IndicatorStore()
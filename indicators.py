@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Indicators - Vectorized technical indicator kernels (NumPy)
+
+One implementation of the indicators the agent and the screener use, over
+contiguous float arrays instead of lists of per-bar dicts. Every kernel takes
+either one series (shape: days) or a whole universe (shape: tickers x days)
+and returns the full indicator series in the same shape, NaN where it is not
+defined yet. The time loop of the recursive indicators (EMA, Wilder) runs over
+days with NumPy ops across tickers, so a universe costs about as much as one
+ticker; a single series runs the same loop over plain floats.
+
+Shorter histories in a universe matrix are left-padded with NaN (stack());
+each row's indicators start at its own first bar.
+
+Definitions:
+- sma / ema             : EMA seeded with the SMA of its first `period` values
+- atr(method='wilder')  : Wilder-smoothed true range; 'simple' = mean of the
+                          last `period` true ranges (TradingAgent.calculate_atr)
+- rsi(method='simple')  : mean gain / mean loss over the last `period` changes
+                          (the agent's and screener's RSI); 'wilder' = Wilder's RSI
+- adx                   : Wilder ADX - DI+/DI- from Wilder-smoothed TR/DM, then
+                          the DX series Wilder-smoothed again
+- dx                    : unsmoothed DX (what calculate_adx used to return)
+- rolling_max/min       : rolling highs/lows
+- volume_ratio          : volume / its `window`-day average (current bar included)
+- trend_template        : Minervini Stage 2 checks per series (TradingAgent.check_stage2_alignment)
+
+Usage:
+    closes = indicators.stack([bars_a, bars_b], 'c', length=252)
+    sma50 = indicators.last(indicators.sma(closes, 50))
+"""
+
+import math
+import warnings
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from bar_series import BarSeries
+
+
+def as_matrix(values) -> np.ndarray:
+    """float64 2-D view (1 x days for a single series)"""
+    array = np.asarray(values, dtype=np.float64)
+    return array.reshape(1, -1) if array.ndim == 1 else array
+
+
+def _shaped(result: np.ndarray, like) -> np.ndarray:
+    """Return a 1-D result for 1-D input"""
+    return result[0] if np.ndim(like) == 1 else result
+
+
+def stack(series: Iterable[Sequence], field: Optional[str] = None, length: Optional[int] = None) -> np.ndarray:
+    """
+    Right-aligned tickers x days matrix, left-padded with NaN
+
+    Args:
+        series: Per-ticker sequences/arrays of numbers, BarSeries, or bar dicts read with `field`
+        field: Bar key ('c', 'close', 'v', ...) when series are BarSeries or hold dicts
+        length: Number of most recent days to keep (default: longest series)
+    """
+    rows = [s.column(field) if isinstance(s, BarSeries) else [bar[field] for bar in s] if field else s
+            for s in series]
+    width = length or max((len(r) for r in rows), default=0)
+    matrix = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        row = row[-width:] if width else []
+        if len(row):
+            matrix[i, width - len(row):] = row
+    return matrix
+
+
+def last(values) -> np.ndarray:
+    """Most recent value of each series (scalar for 1-D input)"""
+    array = np.asarray(values, dtype=np.float64)
+    return array[..., -1] if array.shape[-1] else np.full(array.shape[:-1], np.nan)
+
+
+def scalar(values) -> Optional[float]:
+    """Most recent value of a 1-D series as a float, None if undefined"""
+    value = float(last(values)) if len(values) else float('nan')
+    return None if np.isnan(value) else value
+
+
+def valid_count(values) -> np.ndarray:
+    """Running count of non-NaN values along days"""
+    return np.cumsum(~np.isnan(as_matrix(values)), axis=1)
+
+
+# ----------------------------------------------------------------------
+# Moving averages
+# ----------------------------------------------------------------------
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average (NaN until `period` values are available)"""
+    x = as_matrix(values)
+    filled = np.nan_to_num(x, nan=0.0)
+    csum = np.cumsum(filled, axis=1)
+    window_sum = csum.copy()
+    window_sum[:, period:] -= csum[:, :-period]
+    counts = valid_count(x)
+    window_count = counts.copy()
+    window_count[:, period:] -= counts[:, :-period]
+    result = np.where(window_count == period, window_sum / period, np.nan)
+    return _shaped(result, values)
+
+
+def _recursive(x: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    Exponential recursion seeded with the SMA of each row's first `period` values
+
+    value[t] = alpha * x[t] + (1 - alpha) * value[t-1]
+    """
+    if x.shape[0] == 1:
+        return _recursive_series(x[0], period, alpha).reshape(1, -1)
+    counts = valid_count(x)
+    seeds = sma(x, period)
+    result = np.full(x.shape, np.nan)
+    current = np.full(x.shape[0], np.nan)
+    for t in range(x.shape[1]):
+        seeded = counts[:, t] == period
+        advancing = counts[:, t] > period
+        current = np.where(seeded, seeds[:, t],
+                           np.where(advancing, x[:, t] * alpha + current * (1 - alpha), current))
+        result[:, t] = np.where(counts[:, t] >= period, current, np.nan)
+    return result
+
+
+def _recursive_series(x: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    _recursive for one series with plain floats
+
+    Per-day NumPy calls on a 1-element row cost ~100x the arithmetic itself;
+    the universe form keeps the NumPy loop (one pass covers every ticker).
+    """
+    values = x.tolist()
+    result = [math.nan] * len(values)
+    count, current = 0, math.nan
+    for t, value in enumerate(values):
+        if value == value:  # Not NaN
+            count += 1
+        if count < period:
+            continue
+        if count == period:
+            current = sum(values[t - period + 1:t + 1]) / period  # NaN if the window has a gap
+        else:
+            current = value * alpha + current * (1 - alpha)
+        result[t] = current
+    return np.array(result)
+
+
+def ema(values, period: int) -> np.ndarray:
+    """Exponential moving average (multiplier 2 / (period + 1), SMA seed)"""
+    return _shaped(_recursive(as_matrix(values), period, 2 / (period + 1)), values)
+
+
+def wilder(values, period: int) -> np.ndarray:
+    """Wilder smoothing: (previous * (period - 1) + value) / period, SMA seed"""
+    return _shaped(_recursive(as_matrix(values), period, 1 / period), values)
+
+
+def above_sma(values, period: int) -> np.ndarray:
+    """Whether each series' latest value is above its `period` SMA (False while the SMA is undefined)"""
+    x = as_matrix(values)
+    average = last(sma(x, period))
+    with np.errstate(invalid='ignore'):
+        result = last(x) > average
+    return result[0] if np.ndim(values) == 1 else result
+
+
+# ----------------------------------------------------------------------
+# Volatility / trend
+# ----------------------------------------------------------------------
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; NaN on each series' first bar (no previous close)"""
+    h, l, c = as_matrix(high), as_matrix(low), as_matrix(close)
+    prev_close = np.full(c.shape, np.nan)
+    prev_close[:, 1:] = c[:, :-1]
+    with np.errstate(invalid='ignore'):
+        tr = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+    tr[np.isnan(prev_close)] = np.nan
+    return _shaped(tr, close)
+
+
+def atr(high, low, close, period: int = 14, method: str = 'wilder') -> np.ndarray:
+    """Average true range ('wilder' smoothing, or 'simple' rolling mean)"""
+    tr = as_matrix(true_range(high, low, close))
+    result = wilder(tr, period) if method == 'wilder' else sma(tr, period)
+    return _shaped(result, close)
+
+
+def directional_movement(high, low):
+    """(+DM, -DM) per bar; NaN on the first bar"""
+    h, l = as_matrix(high), as_matrix(low)
+    up = np.full(h.shape, np.nan)
+    down = np.full(h.shape, np.nan)
+    up[:, 1:] = h[:, 1:] - h[:, :-1]
+    down[:, 1:] = l[:, :-1] - l[:, 1:]
+    with np.errstate(invalid='ignore'):
+        plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+        minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    missing = np.isnan(up) | np.isnan(down)
+    plus_dm[missing] = np.nan
+    minus_dm[missing] = np.nan
+    return _shaped(plus_dm, high), _shaped(minus_dm, high)
+
+
+def directional_index(high, low, close, period: int = 14):
+    """(+DI, -DI, DX) from Wilder-smoothed true range and directional movement"""
+    smoothed_tr = as_matrix(wilder(as_matrix(true_range(high, low, close)), period))
+    plus_dm, minus_dm = directional_movement(high, low)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = np.where(smoothed_tr > 0, 100 * wilder(as_matrix(plus_dm), period) / smoothed_tr, 0.0)
+        minus_di = np.where(smoothed_tr > 0, 100 * wilder(as_matrix(minus_dm), period) / smoothed_tr, 0.0)
+        di_sum = plus_di + minus_di
+        dx_values = np.where(di_sum > 0, 100 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+    undefined = np.isnan(smoothed_tr)
+    for array in (plus_di, minus_di, dx_values):
+        array[undefined] = np.nan
+    return _shaped(plus_di, close), _shaped(minus_di, close), _shaped(dx_values, close)
+
+
+def dx(high, low, close, period: int = 14) -> np.ndarray:
+    """Directional index without the final smoothing"""
+    return directional_index(high, low, close, period)[2]
+
+
+def adx(high, low, close, period: int = 14) -> np.ndarray:
+    """Average directional index: DX Wilder-smoothed over `period` (needs ~2 x period bars)"""
+    return _shaped(wilder(as_matrix(dx(high, low, close, period)), period), close)
+
+
+def rsi(close, period: int = 14, method: str = 'simple') -> np.ndarray:
+    """
+    Relative strength index (100 when there are no losses in the window)
+
+    'simple' averages the last `period` gains and losses; 'wilder' smooths them.
+    """
+    c = as_matrix(close)
+    change = np.full(c.shape, np.nan)
+    change[:, 1:] = c[:, 1:] - c[:, :-1]
+    with np.errstate(invalid='ignore'):
+        gains = np.where(np.isnan(change), np.nan, np.where(change > 0, change, 0.0))
+        losses = np.where(np.isnan(change), np.nan, np.where(change < 0, -change, 0.0))
+    smooth = wilder if method == 'wilder' else sma
+    avg_gain, avg_loss = as_matrix(smooth(gains, period)), as_matrix(smooth(losses, period))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    result[np.isnan(avg_gain) | np.isnan(avg_loss)] = np.nan
+    return _shaped(result, close)
+
+
+# ----------------------------------------------------------------------
+# Ranges / volume
+# ----------------------------------------------------------------------
+
+def _rolling_extreme(values, window: int, combine) -> np.ndarray:
+    """
+    Rolling max/min in O(log window) array passes
+
+    Doubles the covered span (1, 2, 4, ...) up to the largest power of two
+    <= window, then combines two overlapping spans to cover exactly `window`.
+    """
+    x = as_matrix(values)
+    result = np.full(x.shape, np.nan)
+    days = x.shape[1]
+    if window <= days:
+        span, spans = 1, x  # spans[:, i] = extreme of x[:, i:i + span]
+        while span * 2 <= window:
+            spans = combine(spans[:, :-span], spans[:, span:])
+            span *= 2
+        # Window ending at t covers [t - window + 1, t]: spans starting at both ends
+        result[:, window - 1:] = combine(spans[:, :days - window + 1], spans[:, window - span:])
+        result[valid_count(x) < window] = np.nan
+    return _shaped(result, values)
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    """Highest value over the trailing `window` days"""
+    return _rolling_extreme(values, window, np.fmax)
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    """Lowest value over the trailing `window` days"""
+    return _rolling_extreme(values, window, np.fmin)
+
+
+def volume_ratio(volume, window: int = 20) -> np.ndarray:
+    """Volume relative to its `window`-day average (average includes the current bar)"""
+    v = as_matrix(volume)
+    average = as_matrix(sma(v, window))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = np.where(average > 0, v / average, 0.0)
+    result[np.isnan(average)] = np.nan
+    return _shaped(result, volume)
+
+
+# ----------------------------------------------------------------------
+# Trend template (Minervini Stage 2)
+# ----------------------------------------------------------------------
+
+STAGE2_MIN_BARS = 200
+STAGE2_CHECKS = ('above_150_200', 'ma_alignment', 'ma_200_rising', 'near_highs', 'ma_50_strong')
+
+
+def trend_template(close) -> Dict[str, np.ndarray]:
+    """
+    Stage 2 trend-template flags for each series' latest bar
+
+    Same definitions as TradingAgent.check_stage2_alignment: price above the
+    150/200-day MAs, 150 above 200, 200-day MA above its value 20 bars ago
+    (flat when there are <220 bars), price within 25% of the 252-bar high,
+    50-day MA above both. Series with fewer than STAGE2_MIN_BARS closes
+    (`eligible` False) fail every check.
+
+    Returns: {name: array over tickers} (scalars for 1-D input) with
+    eligible, bars, current_price, ma_50, ma_150, ma_200, ma_200_20d_ago,
+    week_52_high, distance_from_52w_high_pct, the five checks,
+    checks_passed and stage2
+    """
+    x = as_matrix(close)
+    bars = valid_count(x)[:, -1] if x.shape[1] else np.zeros(len(x), dtype=np.int64)
+    price = last(x)
+    ma_200_series = as_matrix(sma(x, 200))
+    ma_50, ma_150, ma_200 = last(sma(x, 50)), last(sma(x, 150)), last(ma_200_series)
+    ma_200_20d_ago = ma_200_series[:, -21] if x.shape[1] >= 21 else np.full(len(x), np.nan)
+    ma_200_20d_ago = np.where(bars >= 220, ma_200_20d_ago, ma_200)
+    eligible = bars >= STAGE2_MIN_BARS
+
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN rows (no bars at all)
+        week_52_high = np.nanmax(x[:, -252:], axis=1) if x.shape[1] else np.full(len(x), np.nan)
+        template = {
+            'above_150_200': (price > ma_150) & (price > ma_200),
+            'ma_alignment': ma_150 > ma_200,
+            'ma_200_rising': ma_200 > ma_200_20d_ago,
+            'near_highs': price >= week_52_high * 0.75,
+            'ma_50_strong': (ma_50 > ma_150) & (ma_50 > ma_200),
+        }
+        distance = (price / week_52_high - 1) * 100
+
+    for name in STAGE2_CHECKS:
+        template[name] &= eligible
+    checks_passed = sum(template[name].astype(np.int64) for name in STAGE2_CHECKS)
+    template.update({
+        'eligible': eligible,
+        'bars': bars,
+        'current_price': price,
+        'ma_50': ma_50,
+        'ma_150': ma_150,
+        'ma_200': ma_200,
+        'ma_200_20d_ago': ma_200_20d_ago,
+        'week_52_high': week_52_high,
+        'distance_from_52w_high_pct': distance,
+        'checks_passed': checks_passed,
+        'stage2': checks_passed == len(STAGE2_CHECKS),
+    })
+    if np.ndim(close) == 1:
+        return {name: values[0] for name, values in template.items()}
+    return template
+
+
+def stage2_record(template: Dict[str, np.ndarray], row: int, ticker: str) -> Dict:
+    """
+    One ticker's trend_template() row in check_stage2_alignment's result format
+
+    Rows without enough history get {'stage2': False, 'error': ...} like the agent.
+    """
+    if not template['eligible'][row]:
+        return {'stage2': False, 'error': 'Insufficient data', 'ticker': ticker}
+    record = {'stage2': bool(template['stage2'][row]), 'ticker': ticker}
+    for name in ('current_price', 'ma_50', 'ma_150', 'ma_200', 'week_52_high'):
+        record[name] = float(template[name][row])
+    record['ma_200_rising'] = bool(template['ma_200_rising'][row])
+    record['distance_from_52w_high_pct'] = round(float(template['distance_from_52w_high_pct'][row]), 1)
+    for name in ('above_150_200', 'ma_alignment', 'ma_50_strong', 'near_highs'):
+        record[name] = bool(template[name][row])
+    record['checks_passed'] = int(template['checks_passed'][row])
+    return record
+
+
+def bar_arrays(bars, keys=('open', 'high', 'low', 'close', 'volume')) -> Dict[str, np.ndarray]:
+    """
+    Columns of bars as arrays: {'close': array([...]), ...}
+
+    A BarSeries hands out its own arrays (no copy); a list of bar dicts is converted.
+    """
+    if isinstance(bars, BarSeries):
+        return {key: bars.column(key) for key in keys}
+    return {key: np.fromiter((bar[key] for bar in bars), dtype=np.float64, count=len(bars)) for key in keys}
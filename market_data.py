@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+"""
+Market Data - Provider-abstracted bars and prices with failover (v10.8)
+
+Polygon used to be hard-wired into every bar and price fetch, with Alpaca
+market data used in only a couple of places. This module puts both behind one
+interface:
+
+    daily_bars(ticker, start, end)       -> Polygon-style bars (t/o/h/l/c/v/vw), oldest first
+    minute_bars(ticker, from_ms, to_ms)  -> same, 1-minute bars
+    latest_prices(tickers, ...)          -> {ticker: (price, source)}
+
+Every call is timed and its outcome recorded per (provider, endpoint). Providers
+are tried in their configured order, except that a provider which is erroring
+(MARKET_DATA_ERROR_THRESHOLD consecutive failures) or slow (latency EWMA above
+MARKET_DATA_SLOW_MS) moves behind the healthy ones until it has rested for
+MARKET_DATA_RETRY_SECONDS. A failed call fails over to the next provider; for
+price batches only the tickers still missing are sent on.
+
+Bar semantics are the same for every provider: split-adjusted (Polygon
+adjusted=true, Alpaca adjustment=split), consolidated volume, timestamps in
+epoch ms. Alpaca bars therefore come from the SIP feed (ALPACA_BAR_FEED),
+which every plan may query up to ALPACA_SIP_DELAY_MINUTES ago - the request
+end is clamped there, like Polygon's 15-minute delay. IEX volume is ~2-3% of
+consolidated and would skew volume filters, so IEX (ALPACA_DATA_FEED) serves
+latest trades only, like the monitor's trade stream. A 403 from an
+unsubscribed feed counts as an outage, so Alpaca's circuit opens and requests
+stay on Polygon. Requests use MARKET_DATA_TIMEOUT (8s) instead of 10-15s.
+
+Fail-fast under outages and time pressure:
+- Circuit breakers, one per provider (Polygon, Alpaca, and the Finnhub / FMP /
+  SEC / CBOE endpoints called through http_get). CIRCUIT_FAILURE_THRESHOLD
+  consecutive outage errors (connection errors, timeouts, HTTP 5xx/429) open
+  the circuit: calls then raise CircuitOpen without a request. After
+  CIRCUIT_COOLDOWN_SECONDS one probe call is let through (half-open); it
+  closes the circuit on success or reopens it. Per-ticker errors (404, no
+  data) never open a circuit.
+- Deadlines: a command runs inside deadline_scope(Deadline.at('09:30', 'go')).
+  Request timeouts shrink to the time left, and once the deadline passes calls
+  raise DeadlineExceeded without a request.
+- Every call that could not be served that way, and every fallback a caller
+  makes to stale cached data, is counted under an explicit flag. data_quality()
+  summarizes them for the command's output files.
+
+Usage:
+    bars = MARKET_DATA.daily_bars('NVDA', '2026-01-02', '2026-03-10')
+    prices = MARKET_DATA.latest_prices(['NVDA', 'AMD'])          # {'NVDA': (131.2, 'intraday'), ...}
+    response = MARKET_DATA.http_get('finnhub', 'earnings', url, params=params)
+    with deadline_scope(Deadline.at('09:30', 'go')):
+        ...
+    MARKET_DATA.data_quality()   # {'degraded': True, 'flags': {'deadline:daily_bars': 12}, ...}
+    MARKET_DATA.print_stats()
+"""
+
+import contextlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import requests
+
+MARKET_DATA_TIMEOUT = float(os.environ.get('MARKET_DATA_TIMEOUT', '8'))
+MARKET_DATA_SLOW_MS = float(os.environ.get('MARKET_DATA_SLOW_MS', '2500'))
+MARKET_DATA_ERROR_THRESHOLD = int(os.environ.get('MARKET_DATA_ERROR_THRESHOLD', '2'))
+MARKET_DATA_RETRY_SECONDS = float(os.environ.get('MARKET_DATA_RETRY_SECONDS', '30'))
+
+# Provider order per endpoint: Polygon (15-min delayed, the agent's timing basis) first
+PROVIDER_ORDER = [p.strip() for p in os.environ.get('MARKET_DATA_PROVIDERS', 'polygon,alpaca').split(',') if p.strip()]
+
+# Weight of the newest sample in the latency average
+LATENCY_ALPHA = 0.3
+
+# Symbols per multi-ticker request
+PRICE_BATCH_SIZE = 200
+
+# Consecutive outage errors that open a provider's circuit, and how long it stays
+# open before one probe call is let through
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURE_THRESHOLD', '4'))
+CIRCUIT_COOLDOWN_SECONDS = float(os.environ.get('CIRCUIT_COOLDOWN_SECONDS', '60'))
+
+# Alpaca feeds: historical bars on SIP (consolidated volume, free up to 15 minutes ago),
+# latest trades on IEX (real-time on every plan)
+ALPACA_BAR_FEED = os.environ.get('ALPACA_BAR_FEED', 'sip')
+ALPACA_SIP_DELAY_MINUTES = 15
+
+# Budget for a command started after its clock deadline (e.g. a manual re-run)
+COMMAND_BUDGET_SECONDS = float(os.environ.get('COMMAND_BUDGET_SECONDS', '1800'))
+
+# Shortest timeout given to a request made just before the deadline
+MIN_REQUEST_TIMEOUT = 1.0
+
+ET = ZoneInfo('America/New_York')
+
+
+class ProviderError(Exception):
+    """Raised when no provider could serve a request"""
+
+
+class CircuitOpen(ProviderError):
+    """Raised without a request while a provider's circuit is open"""
+
+
+class DeadlineExceeded(ProviderError):
+    """Raised without a request once the command's deadline has passed"""
+
+
+def is_outage(error: Exception) -> bool:
+    """
+    Connection error, timeout, HTTP 5xx/429, or 403 (plan / feed not subscribed -
+    every call would fail the same way), as opposed to a per-request error (404, bad status)
+    """
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status_code', None)
+    if status is not None:
+        return status >= 500 or status in (403, 429)
+    return isinstance(error, OSError)  # requests' ConnectionError / Timeout are OSErrors
+
+
+def is_per_request(error: Exception) -> bool:
+    """Error about this request only (unknown ticker, no data, bad status) - says nothing about provider health"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status_code', None)
+    if status is not None:
+        return 400 <= status < 500 and not is_outage(error)
+    return type(error) is ProviderError
+
+
+class Deadline:
+    """Wall-clock budget for one command"""
+
+    def __init__(self, expires_at: float, label: str = 'command'):
+        self.expires_at = expires_at
+        self.label = label
+
+    @classmethod
+    def at(cls, hhmm: str, label: str, now: Optional[datetime] = None,
+           fallback_seconds: float = COMMAND_BUDGET_SECONDS) -> 'Deadline':
+        """Today's 'HH:MM' ET, or fallback_seconds from now if that time has already passed"""
+        now = (now or datetime.now(ET)).astimezone(ET)
+        hour, minute = map(int, hhmm.split(':'))
+        at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if at <= now:
+            at = now + timedelta(seconds=fallback_seconds)
+        return cls(at.timestamp(), label)
+
+    @classmethod
+    def after(cls, seconds: float, label: str) -> 'Deadline':
+        return cls(time.time() + seconds, label)
+
+    def remaining(self, now: Optional[float] = None) -> float:
+        return self.expires_at - (now or time.time())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def describe(self) -> Dict:
+        return {'label': self.label,
+                'at': datetime.fromtimestamp(self.expires_at, ET).strftime('%H:%M:%S ET'),
+                'missed': self.expired()}
+
+
+# Deadline of the command being run (process-wide: commands run one at a time, and
+# fetches happen on worker threads)
+_DEADLINE: Optional[Deadline] = None
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _DEADLINE
+
+
+def deadline_passed() -> bool:
+    return _DEADLINE is not None and _DEADLINE.expired()
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Run a command under `deadline` (None: no deadline)"""
+    global _DEADLINE
+    previous, _DEADLINE = _DEADLINE, deadline
+    try:
+        yield deadline
+    finally:
+        _DEADLINE = previous
+
+
+def request_timeout(default: float = MARKET_DATA_TIMEOUT) -> float:
+    """Timeout for one request: `default`, shrunk to the time left; raises DeadlineExceeded once it has passed"""
+    if _DEADLINE is None:
+        return default
+    remaining = _DEADLINE.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded(f'{_DEADLINE.label} deadline passed')
+    return max(MIN_REQUEST_TIMEOUT, min(default, remaining))
+
+
+def select_snapshot_price(ticker_data: Dict, is_after_market: bool) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Pick the best price from a Polygon snapshot ticker object
+
+    FIELD PRIORITY:
+    1. day.c - Today's price (works during AND after market)
+    2. min.c - Most recent minute bar (intraday when day.c not available)
+    3. lastTrade.p - Most recent trade
+    4. prevDay.c - Yesterday's close (emergency fallback only)
+
+    Returns: (price, source) or (None, None); $0 values are skipped
+    """
+    day_source = "today's close" if is_after_market else "intraday"
+    for field, key, source in (('day', 'c', day_source), ('min', 'c', 'recent min'),
+                               ('lastTrade', 'p', 'last trade'), ('prevDay', 'c', 'prev close ⚠️')):
+        block = ticker_data.get(field)
+        if block and key in block:
+            price = float(block[key])
+            if price > 0:  # 0 means no trading data yet
+                return price, source
+    return None, None
+
+
+class PolygonProvider:
+    """Polygon.io REST (Starter plan: 15-minute delayed)"""
+
+    name = 'polygon'
+    BASE_URL = 'https://api.polygon.io'
+
+    def __init__(self, api_key: Optional[str] = None, timeout: float = MARKET_DATA_TIMEOUT):
+        self.api_key = api_key if api_key is not None else os.environ.get('POLYGON_API_KEY', '')
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        response = requests.get(f'{self.BASE_URL}{path}', params={**(params or {}), 'apiKey': self.api_key},
+                                timeout=request_timeout(self.timeout))
+        response.raise_for_status()
+        data = response.json()
+        if data.get('status') not in ('OK', 'DELAYED'):
+            raise ProviderError(data.get('error') or f"status: {data.get('status', 'unknown')}")
+        return data
+
+    def _aggs(self, ticker: str, span: str, start, end) -> List[Dict]:
+        data = self._get(f'/v2/aggs/ticker/{ticker}/range/1/{span}/{start}/{end}',
+                         {'adjusted': 'true', 'sort': 'asc', 'limit': 50000})
+        return data.get('results') or []
+
+    def daily_bars(self, ticker: str, start: str, end: str) -> List[Dict]:
+        return self._aggs(ticker, 'day', start, end)
+
+    def minute_bars(self, ticker: str, from_ms: int, to_ms: int) -> List[Dict]:
+        return self._aggs(ticker, 'minute', from_ms, to_ms)
+
+    def snapshots(self, tickers: List[str]) -> Dict[str, Dict]:
+        """Multi-ticker snapshot: {ticker: ticker_data} for tickers in the response"""
+        data = self._get('/v2/snapshot/locale/us/markets/stocks/tickers', {'tickers': ','.join(tickers)})
+        return {t['ticker']: t for t in data.get('tickers', []) if t.get('ticker')}
+
+    def snapshot(self, ticker: str) -> Dict:
+        """One ticker's snapshot"""
+        data = self._get(f'/v2/snapshot/locale/us/markets/stocks/tickers/{ticker}')
+        if 'ticker' not in data:
+            raise ProviderError(f"status: {data.get('status', 'unknown')}")
+        return data['ticker']
+
+    def latest_prices(self, tickers: List[str], is_after_market: bool = False) -> Dict[str, Tuple[float, str]]:
+        prices = {}
+        for start in range(0, len(tickers), PRICE_BATCH_SIZE):
+            for ticker, ticker_data in self.snapshots(tickers[start:start + PRICE_BATCH_SIZE]).items():
+                price, source = select_snapshot_price(ticker_data, is_after_market)
+                if price:
+                    prices[ticker] = (price, source)
+        return prices
+
+
+def _alpaca_time(value) -> str:
+    """RFC3339 for an Alpaca request bound (epoch ms or 'YYYY-MM-DD')"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, timezone.utc).isoformat().replace('+00:00', 'Z')
+    return value
+
+
+def _alpaca_bound(value, end_of_day: bool = False) -> datetime:
+    """UTC datetime for an Alpaca request bound (epoch ms, or 'YYYY-MM-DD' as an ET day)"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, timezone.utc)
+    day = datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=ET)
+    return (day + timedelta(days=1) if end_of_day else day).astimezone(timezone.utc)
+
+
+def _alpaca_bar(bar) -> Dict:
+    """Polygon-style dict for an Alpaca bar entity (raw keys t/o/h/l/c/v/vw, t as RFC3339)"""
+    raw = getattr(bar, '_raw', bar)
+    stamp = raw['t']
+    if isinstance(stamp, str):
+        stamp = datetime.fromisoformat(stamp.replace('Z', '+00:00'))
+    converted = {'t': int(stamp.timestamp() * 1000), 'o': float(raw['o']), 'h': float(raw['h']),
+                 'l': float(raw['l']), 'c': float(raw['c']), 'v': int(raw['v'])}
+    if raw.get('vw'):
+        converted['vw'] = float(raw['vw'])
+    return converted
+
+
+class AlpacaProvider:
+    """
+    Alpaca market data via the broker's REST client or one built from env
+
+    Bars: SIP feed, split-adjusted, ending at least ALPACA_SIP_DELAY_MINUTES ago.
+    Latest trades: IEX feed by default (ALPACA_DATA_FEED).
+    """
+
+    name = 'alpaca'
+
+    def __init__(self, api=None, feed: Optional[str] = None, bar_feed: Optional[str] = None):
+        self._api = api
+        self.feed = feed or os.environ.get('ALPACA_DATA_FEED', 'iex')
+        self.bar_feed = bar_feed or ALPACA_BAR_FEED
+        self._lock = threading.Lock()
+
+    def attach(self, api):
+        """Use an existing REST client (e.g. AlpacaBroker.api)"""
+        self._api = api
+
+    def available(self) -> bool:
+        if self._api is not None:
+            return True
+        import importlib.util
+        return bool(os.environ.get('ALPACA_API_KEY') and os.environ.get('ALPACA_SECRET_KEY')
+                    and importlib.util.find_spec('alpaca_trade_api'))
+
+    @property
+    def api(self):
+        with self._lock:
+            if self._api is None:
+                import alpaca_trade_api as tradeapi  # ~0.6s import, only when Alpaca is actually used
+                self._api = tradeapi.REST(os.environ.get('ALPACA_API_KEY'), os.environ.get('ALPACA_SECRET_KEY'),
+                                          os.environ.get('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets'),
+                                          api_version='v2')
+            return self._api
+
+    def _bars(self, ticker: str, timeframe: str, start, end, now: Optional[datetime] = None) -> List[Dict]:
+        latest = (now or datetime.now(timezone.utc)) - timedelta(minutes=ALPACA_SIP_DELAY_MINUTES)
+        end_at = min(_alpaca_bound(end, end_of_day=True), latest).astimezone(timezone.utc)
+        if end_at <= _alpaca_bound(start):
+            return []  # Whole window inside the SIP delay
+        bars = self.api.get_bars(ticker, timeframe, start=_alpaca_time(start),
+                                 end=end_at.isoformat().replace('+00:00', 'Z'),
+                                 adjustment='split', feed=self.bar_feed)
+        return [_alpaca_bar(bar) for bar in bars]
+
+    def daily_bars(self, ticker: str, start: str, end: str) -> List[Dict]:
+        return self._bars(ticker, '1Day', start, end)
+
+    def minute_bars(self, ticker: str, from_ms: int, to_ms: int) -> List[Dict]:
+        return self._bars(ticker, '1Min', from_ms, to_ms)
+
+    def latest_prices(self, tickers: List[str], is_after_market: bool = False) -> Dict[str, Tuple[float, str]]:
+        prices = {}
+        for start in range(0, len(tickers), PRICE_BATCH_SIZE):
+            for ticker, trade in self.api.get_latest_trades(tickers[start:start + PRICE_BATCH_SIZE], feed=self.feed).items():
+                if trade is not None and trade.price and float(trade.price) > 0:
+                    prices[ticker] = (float(trade.price), 'alpaca last trade')
+        return prices
+
+
+class EndpointHealth:
+    """Latency and error record for one (provider, endpoint)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.latency_ms: Optional[float] = None  # EWMA of successful calls
+        self.last_error: Optional[str] = None
+        self.last_seen = 0.0
+
+    def record(self, seconds: float, error: Optional[Exception] = None):
+        self.calls += 1
+        self.last_seen = time.time()
+        if error is not None:
+            self.errors += 1
+            self.last_error = str(error)[:200]
+            if not is_per_request(error):  # A 404 for one ticker is not a sick provider
+                self.consecutive_errors += 1
+            return
+        self.consecutive_errors = 0
+        ms = seconds * 1000
+        self.latency_ms = ms if self.latency_ms is None else LATENCY_ALPHA * ms + (1 - LATENCY_ALPHA) * self.latency_ms
+
+    def degraded(self, now: Optional[float] = None) -> bool:
+        """Erroring or slow, and not yet rested long enough to be tried first again"""
+        if (now or time.time()) - self.last_seen >= MARKET_DATA_RETRY_SECONDS:
+            return False
+        return (self.consecutive_errors >= MARKET_DATA_ERROR_THRESHOLD
+                or (self.latency_ms is not None and self.latency_ms > MARKET_DATA_SLOW_MS))
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated outage errors -> half-open probe after a cooldown"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, threshold: Optional[int] = None, cooldown: Optional[float] = None):
+        self.threshold = threshold or CIRCUIT_FAILURE_THRESHOLD
+        self.cooldown = cooldown if cooldown is not None else CIRCUIT_COOLDOWN_SECONDS
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def is_open(self, now: Optional[float] = None) -> bool:
+        """Open and still cooling down (calls would be rejected)"""
+        return self.state == self.OPEN and (now or time.time()) - self.opened_at < self.cooldown
+
+    def allow(self) -> bool:
+        """Whether a call may go out; after the cooldown exactly one probe is let through"""
+        with self._lock:
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.CLOSED or (self.state == self.HALF_OPEN and not self._probing):
+                self._probing = self.state == self.HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def cancel(self):
+        """An allowed call made no request after all (e.g. out of time)"""
+        with self._lock:
+            self._probing = False
+
+    def record(self, outage: bool):
+        """Outcome of an allowed call (outage: connection error, timeout, 5xx/429)"""
+        with self._lock:
+            self._probing = False
+            if not outage:
+                self.state, self.failures = self.CLOSED, 0
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state, self.opened_at = self.OPEN, time.time()
+
+
+class MarketData:
+    """Routes market data requests to providers by health, with failover"""
+
+    def __init__(self, providers: Optional[List] = None, order: Optional[List[str]] = None):
+        providers = providers if providers is not None else [PolygonProvider(), AlpacaProvider()]
+        self.providers = {p.name: p for p in providers}
+        self.order = [name for name in (order or PROVIDER_ORDER) if name in self.providers]
+        self.order += [name for name in self.providers if name not in self.order]
+        self.health: Dict[Tuple[str, str], EndpointHealth] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.flags: Dict[str, int] = {}
+        self.failovers = 0
+        self._lock = threading.Lock()
+
+    @property
+    def polygon(self) -> PolygonProvider:
+        return self.providers['polygon']
+
+    def _health(self, provider: str, endpoint: str) -> EndpointHealth:
+        with self._lock:
+            return self.health.setdefault((provider, endpoint), EndpointHealth())
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            return self.breakers.setdefault(provider, CircuitBreaker())
+
+    def healthy(self, provider: str, endpoint: str) -> bool:
+        return not (self._health(provider, endpoint).degraded() or self.breaker(provider).is_open())
+
+    def route(self, endpoint: str, prefer: Optional[str] = None) -> List[str]:
+        """
+        Available providers for endpoint: healthy first (configured order, `prefer`
+        first), then degraded; providers with an open circuit are left out
+        """
+        names = [prefer] + [n for n in self.order if n != prefer] if prefer in self.providers else list(self.order)
+        names = [n for n in names if hasattr(self.providers[n], endpoint) and self.providers[n].available()
+                 and not self.breaker(n).is_open()]
+        return sorted(names, key=lambda n: self._health(n, endpoint).degraded())
+
+    def flag(self, reason: str, endpoint: str, count: int = 1):
+        """
+        Count requests served degraded or not at all
+
+        reason: 'deadline' (skipped, command out of time), 'circuit_open' (skipped,
+        provider down), 'partial' (some tickers unserved), 'stale_cache' (caller
+        used expired cached data instead)
+        """
+        with self._lock:
+            key = f'{reason}:{endpoint}'
+            self.flags[key] = self.flags.get(key, 0) + count
+
+    def reset_flags(self):
+        """Start a new command's flags (the daemon reuses this instance)"""
+        with self._lock:
+            self.flags = {}
+
+    def reset_stats(self):
+        """
+        Start a new command's counters (calls, errors, failovers, circuit trips)
+
+        Latency EWMAs, consecutive errors and circuit states are kept - they
+        decide routing and must carry over between a resident process's commands.
+        """
+        with self._lock:
+            for health in self.health.values():
+                health.calls = 0
+                health.errors = 0
+            for breaker in self.breakers.values():
+                breaker.trips = 0
+                breaker.rejected = 0
+            self.failovers = 0
+
+    def data_quality(self) -> Dict:
+        """Explicit degradation flags for a command's output"""
+        with self._lock:
+            flags = dict(sorted(self.flags.items()))
+            open_circuits = sorted(name for name, b in self.breakers.items() if b.state != CircuitBreaker.CLOSED)
+        deadline = current_deadline()
+        return {'degraded': bool(flags), 'flags': flags, 'open_circuits': open_circuits,
+                'deadline': deadline.describe() if deadline else None}
+
+    def guarded(self, provider: str, endpoint: str, fn: Callable, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) as a request to `provider`: fails fast once the
+        deadline has passed or while the provider's circuit is open, records
+        latency / errors, and feeds the outcome to the circuit breaker
+        """
+        if deadline_passed():
+            self.flag('deadline', endpoint)
+            raise DeadlineExceeded(f'{current_deadline().label} deadline passed - {provider}.{endpoint} skipped')
+        breaker = self.breaker(provider)
+        if not breaker.allow():
+            self.flag('circuit_open', endpoint)
+            raise CircuitOpen(f'{provider} circuit open - {endpoint} skipped')
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except DeadlineExceeded:
+            breaker.cancel()
+            self.flag('deadline', endpoint)
+            raise
+        except Exception as e:
+            self._health(provider, endpoint).record(time.perf_counter() - started, e)
+            breaker.record(outage=is_outage(e))
+            raise
+        self._health(provider, endpoint).record(time.perf_counter() - started)
+        breaker.record(outage=False)
+        return result
+
+    def call(self, provider: str, endpoint: str, *args, **kwargs):
+        """Call one provider's endpoint (guarded; exceptions propagate)"""
+        return self.guarded(provider, endpoint, getattr(self.providers[provider], endpoint), *args, **kwargs)
+
+    def http_get(self, provider: str, endpoint: str, url: str, timeout: float = MARKET_DATA_TIMEOUT, **kwargs):
+        """
+        requests.get for endpoints outside the provider interface (news, earnings,
+        ticker details, ...), behind `provider`'s circuit breaker and the command
+        deadline. HTTP 5xx/429 raise (and count as outages); other responses are
+        returned as-is.
+        """
+        def get():
+            response = requests.get(url, timeout=request_timeout(timeout), **kwargs)
+            if response.status_code >= 500 or response.status_code == 429:
+                response.raise_for_status()
+            return response
+        return self.guarded(provider, endpoint, get)
+
+    def _first(self, endpoint: str, *args, prefer: Optional[str] = None, **kwargs):
+        if deadline_passed():
+            self.flag('deadline', endpoint)
+            raise DeadlineExceeded(f'{current_deadline().label} deadline passed - {endpoint} skipped')
+        providers = self.route(endpoint, prefer)
+        if not providers and any(b.is_open() for b in self.breakers.values()):
+            self.flag('circuit_open', endpoint)
+            raise CircuitOpen(f'All providers for {endpoint} have an open circuit')
+        errors = []
+        for provider in providers:
+            try:
+                result = self.call(provider, endpoint, *args, **kwargs)
+            except Exception as e:
+                errors.append(f"{provider}: {e}")
+                continue
+            if errors:
+                self.failovers += 1
+            return result
+        raise ProviderError('; '.join(errors) or f'No provider available for {endpoint}')
+
+    def daily_bars(self, ticker: str, start: str, end: str, prefer: Optional[str] = None) -> List[Dict]:
+        """Split-adjusted daily bars from start through end (YYYY-MM-DD); raises ProviderError"""
+        return self._first('daily_bars', ticker, start, end, prefer=prefer)
+
+    def minute_bars(self, ticker: str, from_ms: int, to_ms: int, prefer: Optional[str] = None) -> List[Dict]:
+        """1-minute bars in [from_ms, to_ms]; raises ProviderError"""
+        return self._first('minute_bars', ticker, from_ms, to_ms, prefer=prefer)
+
+    def latest_prices(self, tickers: List[str], is_after_market: bool = False,
+                      prefer: Optional[str] = None) -> Dict[str, Tuple[float, str]]:
+        """
+        {ticker: (price, source)}; tickers a provider fails or misses go to the next one
+
+        Never raises - tickers no provider could price are omitted.
+        """
+        prices = {}
+        missing = list(dict.fromkeys(tickers))
+        failed = False
+        for k, provider in enumerate(self.route('latest_prices', prefer)):
+            if not missing:
+                break
+            if k:
+                self.failovers += 1
+            try:
+                prices.update(self.call(provider, 'latest_prices', missing, is_after_market=is_after_market))
+            except Exception as e:
+                failed = True
+                print(f"   ⚠️ {provider} prices failed for {len(missing)} tickers: {e}")
+                if isinstance(e, DeadlineExceeded):
+                    break
+            missing = [t for t in missing if t not in prices]
+        if missing and (failed or deadline_passed()):
+            self.flag('partial', 'latest_prices', len(missing))
+        return prices
+
+    def print_stats(self, label: str = 'Market data'):
+        with self._lock:
+            used = {key: h for key, h in self.health.items() if h.calls}
+        if used:
+            parts = []
+            for (provider, endpoint), h in sorted(used.items()):
+                latency = f"{h.latency_ms:.0f}ms" if h.latency_ms is not None else '-'
+                errors = f", {h.errors} errors" if h.errors else ''
+                parts.append(f"{provider}.{endpoint} {h.calls} calls ({latency}{errors})")
+            failovers = f"; {self.failovers} failovers" if self.failovers else ''
+            print(f"   🛰️  {label}: {', '.join(parts)}{failovers}")
+        for name, b in sorted(self.breakers.items()):
+            if b.trips or b.rejected:
+                print(f"   🔌 {name} circuit {b.state}: opened {b.trips}x, {b.rejected} calls failed fast")
+        quality = self.data_quality()
+        if quality['degraded']:
+            deadline = quality['deadline']
+            missed = f" ({deadline['label']} deadline {deadline['at']} passed)" if deadline and deadline['missed'] else ''
+            print(f"   ⚠️ Degraded data{missed}: {', '.join(f'{k} x{n}' for k, n in quality['flags'].items())}")
+
+
+# Shared instance used by the screener and agent
+MARKET_DATA = MarketData()
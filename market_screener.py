@@ -22,6 +22,16 @@ Prompt Caching (v10.4):
 - 90% cost reduction on repeated Claude API calls
 - Cache TTL: 5 minutes (covers full screener run)
 
+Local Fast-Path (v10.5):
+- No-news candidates resolved locally as Tier 4 technical-only
+- Plainly negative headlines (offering/lawsuit/downgrade/...) hard-rejected locally
+- Only ambiguous candidates escalated to Claude; local share reported each run
+
+Model Routing (v10.6):
+- Fast model (Haiku) first, Tier 1/2 or low-confidence verdicts confirmed by strong model
+- Policy/thresholds via CATALYST_ROUTING_POLICY, CATALYST_*_MODEL, CATALYST_ESCALATE_*
+- Per-tier agreement stats logged to logs/catalyst_routing_stats.json
+
 Output: Top 40 candidates for GO command analysis
 
 Author: Paper Trading Lab
@@ -37,8 +47,38 @@ import re
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
+import threading
 from zoneinfo import ZoneInfo
 
+# Claude call ledger (v10.7 - per-call latency/token/cost tracking)
+try:
+    from claude_ledger import record_claude_call, LEDGER as CLAUDE_LEDGER
+    LEDGER_AVAILABLE = True
+except ImportError:
+    LEDGER_AVAILABLE = False
+
+# Shared cross-command cache (v10.8 - bars/sector lookups reused by GO and later commands)
+try:
+    from warm_cache import WARM_CACHE
+    WARM_CACHE_AVAILABLE = True
+except ImportError:
+    WARM_CACHE_AVAILABLE = False
+
+# Incremental per-ticker indicator state (v10.8 - advanced by new bars, shared with the agent)
+try:
+    from indicator_state import INDICATOR_STORE
+    INDICATOR_STATE_AVAILABLE = True
+except ImportError:
+    INDICATOR_STATE_AVAILABLE = False
+
+# Vectorized indicator kernels and typed-array bar series (v10.8 - shared with the agent)
+import indicators
+from bar_series import BarSeries
+
+# Provider-abstracted bars/prices with health-based failover, circuit breakers and
+# deadlines (v10.8 - shared with the agent)
+from market_data import MARKET_DATA, Deadline, ProviderError, deadline_scope
+
 # Configuration
 ET = ZoneInfo('America/New_York')  # Eastern Time for trading operations
 PROJECT_DIR = Path(__file__).parent
@@ -49,6 +89,31 @@ CLAUDE_API_KEY = os.environ.get('CLAUDE_API_KEY', '')
 CLAUDE_API_URL = 'https://api.anthropic.com/v1/messages'
 CLAUDE_MODEL = 'claude-haiku-4-5'  # Haiku 4.5 ($1/MTok input, $5/MTok output)
 
+# v10.6: Cascaded model routing for catalyst analysis
+# Every candidate goes to the fast model first; only verdicts worth confirming
+# (Tier 1/2 or low confidence by default) are re-analyzed by the strong model.
+# CATALYST_ROUTING_POLICY=single sends everything to the fast model only.
+CATALYST_ROUTING_POLICY = os.environ.get('CATALYST_ROUTING_POLICY', 'cascade')  # 'cascade' | 'single'
+CATALYST_FAST_MODEL = os.environ.get('CATALYST_FAST_MODEL', CLAUDE_MODEL)
+CATALYST_STRONG_MODEL = os.environ.get('CATALYST_STRONG_MODEL', 'claude-sonnet-4-5-20250929')
+CATALYST_ESCALATE_TIERS = [t.strip() for t in os.environ.get('CATALYST_ESCALATE_TIERS', 'Tier1,Tier2').split(',') if t.strip()]
+CATALYST_ESCALATE_CONFIDENCE = [c.strip() for c in os.environ.get('CATALYST_ESCALATE_CONFIDENCE', 'Low').split(',') if c.strip()]
+CATALYST_ROUTING_LOG_PATH = PROJECT_DIR / 'logs' / 'catalyst_routing_stats.json'
+
+# v10.8: get_technical_setup fetches this many calendar days so the warm cache holds
+# a window wide enough for GO's Stage 2 check (it still analyzes only ~1 year)
+WARM_BAR_DAYS = 400
+
+# v10.8: Composite-score bonus for candidates passing the full Stage 2 trend template
+# (compute_stage2_flags); checks passed also breaks ties within a tier. 0 disables the bonus.
+STAGE2_RANK_BONUS = float(os.environ.get('STAGE2_RANK_BONUS', '5'))
+
+# v10.8: The scan must be done before GO (9:00 AM ET). Past this time its fetches fail
+# fast and candidates are scored on cached / partial data, flagged in the output.
+# A scan started after it (manual run) gets SCREENER_BUDGET_SECONDS instead.
+SCREENER_DEADLINE = os.environ.get('SCREENER_DEADLINE', '08:50')
+SCREENER_BUDGET_SECONDS = float(os.environ.get('SCREENER_BUDGET_SECONDS', '3600'))
+
 # v10.4: Cached system prompt for catalyst analysis (90% cost reduction on repeated calls)
 # This prompt is sent as a system message with cache_control to avoid re-tokenizing on every call
 # IMPORTANT: Minimum 4096 tokens required for Haiku 4.5 caching - expanded with examples
@@ -589,6 +654,125 @@ def classify_fda_approval(text):
     return None
 
 
+# ============================================================================
+# v10.5: LOCAL FAST-PATH CATALYST CLASSIFIER
+# ============================================================================
+# Many binary-gate survivors are trivially decidable without Claude:
+# - No articles at all -> Tier 4 technical-only (Claude can only say the same)
+# - Headline plainly matches a NEGATIVE FLAG in CATALYST_SYSTEM_PROMPT -> hard reject
+# Everything else (mixed headlines, law firm spam, debt offerings) is escalated.
+# Set LOCAL_PREFILTER_ENABLED=0 to send every candidate to Claude (v10.4 behavior).
+
+LOCAL_PREFILTER_ENABLED = os.environ.get('LOCAL_PREFILTER_ENABLED', '1') != '0'
+
+# Flag names match the negative_flags enum in CATALYST_SYSTEM_PROMPT
+LOCAL_NEGATIVE_HEADLINE_PATTERNS = {
+    'offering': [
+        r'\bpublic offering\b', r'\bsecondary offering\b', r'\bfollow-on offering\b',
+        r'\bshelf registration\b', r'\bat-the-market offering\b', r'\batm offering\b',
+        r'\b(?:common )?stock offering\b', r'\bshare offering\b', r'\bstock issuance\b',
+    ],
+    'lawsuit': [
+        r'\bclass action lawsuit\b', r'\bsec investigation\b', r'\bdoj probe\b',
+        r'\bfaces lawsuit\b', r'\bsecurities fraud\b', r'\bshareholder lawsuit\b',
+    ],
+    'downgrade': [
+        r'\bdowngrade[sd]?\b', r'\bprice target lowered\b', r'\blowers price target\b',
+        r'\blowers rating\b', r'\bcut to (?:sell|underperform)\b',
+    ],
+    'earnings_miss': [
+        r'\bearnings miss\b', r'\brevenue miss\b', r'\bmiss(?:es)? estimates\b',
+        r'\bmiss(?:es)? expectations\b', r'\bdisappointing results\b',
+    ],
+    'guidance_cut': [
+        r'\bguidance cut\b', r'\bcuts? (?:guidance|forecast|outlook)\b',
+        r'\blowers? (?:guidance|forecast|outlook)\b', r'\breduces? (?:guidance|outlook)\b',
+    ],
+    'regulatory_delay': [
+        r'\bfda rejects\b', r'\bfda delays\b', r'\bregulatory delay\b', r'\bcomplete response letter\b',
+        r'\bcrl\b', r'\bclinical trial failure\b', r'\brecall(?:s|ed)?\b',
+    ],
+}
+
+# A negative headline that ALSO contains one of these is nuanced -> escalate to Claude
+# (e.g. "beats earnings but lowers guidance" is fine to reject, "upgrade after downgrade" is not)
+LOCAL_AMBIGUITY_MARKERS = [
+    r'\bupgrade[sd]?\b', r'\braises? (?:guidance|outlook|price target)\b', r'\bapprov(?:al|es|ed)\b',
+    r'\bto be acquired\b', r'\bacquired by\b', r'\bnotes\b', r'\bdebt\b', r'\bconvertible\b',
+    r'\bdismiss(?:es|ed)?\b', r'\bsettle(?:s|d|ment)?\b',
+    # Law firm solicitations are spam (V5 filter), not company-specific legal events
+    r'\blaw firm\b', r'\bshareholder alert\b', r'\binvestors? who\b', r'\bencourages\b', r'\breminds\b',
+]
+
+_LOCAL_NEGATIVE_RE = {
+    flag: re.compile('|'.join(patterns), re.IGNORECASE)
+    for flag, patterns in LOCAL_NEGATIVE_HEADLINE_PATTERNS.items()
+}
+_LOCAL_AMBIGUITY_RE = re.compile('|'.join(LOCAL_AMBIGUITY_MARKERS), re.IGNORECASE)
+
+
+def classify_catalyst_locally(ticker, news_articles):
+    """
+    Deterministic pre-classifier for Claude catalyst analysis (v10.5)
+
+    Args:
+        ticker: Stock symbol
+        news_articles: top_articles list from get_news_score()
+
+    Returns:
+        Dict in the same shape as analyze_catalyst_with_claude() (plus
+        'source': 'local_prefilter' and 'local_rule') when the verdict is
+        unambiguous, or None to escalate the candidate to Claude.
+    """
+    if not news_articles:
+        return {
+            'has_tier1_catalyst': False,
+            'catalyst_type': 'Technical_Only',
+            'tier': 'Tier4',
+            'confidence': 'Low',
+            'reasoning': 'No news in last 7 days - technical-only setup (resolved locally).',
+            'catalyst_age_days': 0,
+            'multi_catalyst': False,
+            'negative_flags': [],
+            'source': 'local_prefilter',
+            'local_rule': 'no_news'
+        }
+
+    negative_flags = []
+    matched_headline = None
+    for article in news_articles:
+        title = article.get('title', '') or ''
+        matched = [flag for flag, pattern in _LOCAL_NEGATIVE_RE.items() if pattern.search(title)]
+        if not matched:
+            continue
+
+        # Mixed or spammy headline - needs Claude's nuance detection
+        if _LOCAL_AMBIGUITY_RE.search(title):
+            return None
+
+        for flag in matched:
+            if flag not in negative_flags:
+                negative_flags.append(flag)
+        if matched_headline is None:
+            matched_headline = title
+
+    if not negative_flags:
+        return None  # Has news, no plain negative - Claude decides
+
+    return {
+        'has_tier1_catalyst': False,
+        'catalyst_type': 'None',
+        'tier': 'None',
+        'confidence': 'High',
+        'reasoning': f'Negative headline ({", ".join(negative_flags)}): "{matched_headline[:80]}" (resolved locally).',
+        'catalyst_age_days': 0,
+        'multi_catalyst': False,
+        'negative_flags': negative_flags,
+        'source': 'local_prefilter',
+        'local_rule': 'negative_headline'
+    }
+
+
 class MarketScreener:
     """Scans S&P 1500 for high-probability swing trade candidates"""
 
@@ -614,6 +798,24 @@ class MarketScreener:
         # PHASE 3.3: Real-time sector classification cache
         self.sector_cache = {}  # {ticker: sector_name}
 
+        # v10.5: Local fast-path classifier stats (reported in scan output)
+        self.local_prefilter_stats = None
+
+        # v10.8: Universe-wide Stage 2 trend template (compute_stage2_flags)
+        self.stage2_flags = {}  # {ticker: check_stage2_alignment-style dict}
+
+        # v10.6: Cascaded model routing stats (updated from worker threads)
+        self.routing_lock = threading.Lock()
+        self.routing_stats = {
+            'policy': CATALYST_ROUTING_POLICY,
+            'fast_model': CATALYST_FAST_MODEL,
+            'strong_model': CATALYST_STRONG_MODEL,
+            'fast_only': 0,
+            'escalated': 0,
+            'escalation_errors': 0,
+            'by_tier': {}  # {fast_tier: {'escalated': n, 'agreed': n, 'changed_to': {tier: n}}}
+        }
+
         # BUG FIX (Dec 30): Rejection reason tracking for diagnostics
         # AUDIT FIX #4 (Dec 30): Extended freshness to 120h (5 days) for Tier 1 catalysts
         self.rejection_reasons = {
@@ -752,7 +954,7 @@ class MarketScreener:
             f.write(f'{price:.2f},{market_cap},{volume_20d},{rs_pct:.2f},{sector},')
             f.write(',,\n')  # Forward returns filled later by batch job
 
-    def analyze_catalyst_with_claude(self, ticker, sector, news_articles, technical_data, retry_count=0, max_retries=5):
+    def analyze_catalyst_with_claude(self, ticker, sector, news_articles, technical_data, retry_count=0, max_retries=5, model=None):
         """
         HYBRID SCREENER v10.0 (Jan 1, 2026)
         Use Claude to analyze catalysts with exponential backoff retry logic
@@ -767,6 +969,7 @@ class MarketScreener:
             technical_data: Dict with price, volume, RS data
             retry_count: Current retry attempt (for exponential backoff)
             max_retries: Maximum number of retries for 429 errors
+            model: Claude model to use (defaults to CLAUDE_MODEL, see analyze_catalyst_routed)
 
         Returns:
             Dict with Claude's catalyst analysis:
@@ -828,6 +1031,7 @@ Technical Context:
 - RS Percentile: {technical_data.get('rs_percentile', 0)} (relative strength vs market)
 {learning_context}"""
 
+        call_started = None
         try:
             headers = {
                 'x-api-key': CLAUDE_API_KEY,
@@ -839,7 +1043,7 @@ Technical Context:
             # v10.4: Use system message with cache_control for 90% cost reduction
             # The static instructions are cached and reused across all API calls
             payload = {
-                'model': CLAUDE_MODEL,
+                'model': model or CLAUDE_MODEL,
                 'max_tokens': 500,  # Small response for JSON only
                 'temperature': 0,  # Deterministic for consistency
                 'system': [
@@ -852,6 +1056,7 @@ Technical Context:
                 'messages': [{'role': 'user', 'content': user_message}]
             }
 
+            call_started = time.time()
             response = requests.post(
                 CLAUDE_API_URL,
                 headers=headers,
@@ -859,6 +1064,24 @@ Technical Context:
                 timeout=30
             )
 
+            # v10.7: Ledger every HTTP attempt (429s included, tagged rate_limited)
+            if LEDGER_AVAILABLE:
+                if response.status_code == 429:
+                    call_status = 'rate_limited'
+                elif response.status_code >= 400:
+                    call_status = 'http_error'
+                else:
+                    call_status = 'ok'
+                try:
+                    call_usage = response.json().get('usage') if call_status == 'ok' else None
+                except ValueError:
+                    call_usage = None
+                record_claude_call(
+                    command='screener', stage='catalyst', ticker=ticker, model=payload['model'],
+                    latency_ms=(time.time() - call_started) * 1000, status=call_status,
+                    usage=call_usage, retries=retry_count, http_status=response.status_code
+                )
+
             # Handle rate limiting with exponential backoff
             if response.status_code == 429:
                 if retry_count < max_retries:
@@ -870,7 +1093,7 @@ Technical Context:
                     # Recursive retry with incremented count
                     return self.analyze_catalyst_with_claude(
                         ticker, sector, news_articles, technical_data,
-                        retry_count=retry_count + 1, max_retries=max_retries
+                        retry_count=retry_count + 1, max_retries=max_retries, model=model
                     )
                 else:
                     print(f"   ❌ {ticker}: Max retries exceeded for rate limiting")
@@ -927,6 +1150,13 @@ Technical Context:
             }
         except Exception as e:
             print(f"   ⚠️ {ticker}: Claude API error: {e}")
+            if LEDGER_AVAILABLE and isinstance(e, requests.exceptions.RequestException) and call_started:
+                record_claude_call(
+                    command='screener', stage='catalyst', ticker=ticker, model=model or CLAUDE_MODEL,
+                    latency_ms=(time.time() - call_started) * 1000,
+                    status='timeout' if isinstance(e, requests.exceptions.Timeout) else 'error',
+                    retries=retry_count, error=str(e)
+                )
             return {
                 'has_tier1_catalyst': False,
                 'catalyst_type': 'None',
@@ -939,6 +1169,95 @@ Technical Context:
                 'error': str(e)
             }
 
+    def analyze_catalyst_routed(self, ticker, sector, news_articles, technical_data):
+        """
+        Cascaded model routing for catalyst analysis (v10.6)
+
+        Sends the candidate to CATALYST_FAST_MODEL first. Verdicts in
+        CATALYST_ESCALATE_TIERS or with confidence in CATALYST_ESCALATE_CONFIDENCE
+        are re-analyzed by CATALYST_STRONG_MODEL, whose verdict is final.
+        If the strong model errors, the fast verdict is kept.
+
+        Returns:
+            Same dict as analyze_catalyst_with_claude(), plus 'model' and,
+            when escalated, 'escalated': True and 'fast_verdict'
+        """
+        fast_result = self.analyze_catalyst_with_claude(
+            ticker, sector, news_articles, technical_data, model=CATALYST_FAST_MODEL
+        )
+        fast_result['model'] = CATALYST_FAST_MODEL
+
+        should_escalate = (
+            CATALYST_ROUTING_POLICY == 'cascade'
+            and not fast_result.get('error')  # API failures are not low-confidence verdicts
+            and (fast_result.get('tier') in CATALYST_ESCALATE_TIERS
+                 or fast_result.get('confidence') in CATALYST_ESCALATE_CONFIDENCE)
+        )
+
+        if not should_escalate:
+            with self.routing_lock:
+                self.routing_stats['fast_only'] += 1
+            return fast_result
+
+        strong_result = self.analyze_catalyst_with_claude(
+            ticker, sector, news_articles, technical_data, model=CATALYST_STRONG_MODEL
+        )
+
+        fast_tier = fast_result.get('tier', 'None')
+        with self.routing_lock:
+            if strong_result.get('error'):
+                self.routing_stats['escalation_errors'] += 1
+                return fast_result
+
+            self.routing_stats['escalated'] += 1
+            tier_stats = self.routing_stats['by_tier'].setdefault(
+                fast_tier, {'escalated': 0, 'agreed': 0, 'changed_to': {}}
+            )
+            tier_stats['escalated'] += 1
+            strong_tier = strong_result.get('tier', 'None')
+            if strong_tier == fast_tier:
+                tier_stats['agreed'] += 1
+            else:
+                tier_stats['changed_to'][strong_tier] = tier_stats['changed_to'].get(strong_tier, 0) + 1
+
+        strong_result['model'] = CATALYST_STRONG_MODEL
+        strong_result['escalated'] = True
+        strong_result['fast_verdict'] = {
+            'tier': fast_tier,
+            'confidence': fast_result.get('confidence', 'Low'),
+            'catalyst_type': fast_result.get('catalyst_type', 'None')
+        }
+        return strong_result
+
+    def log_routing_stats(self):
+        """
+        Print per-tier fast/strong agreement and append today's stats to
+        logs/catalyst_routing_stats.json (v10.6)
+        """
+        stats = self.routing_stats
+        print(f"\n   🔀 MODEL ROUTING ({stats['policy']}): {stats['fast_model']} → {stats['strong_model']}")
+        print(f"      Fast model only: {stats['fast_only']} | Escalated: {stats['escalated']} | Escalation errors: {stats['escalation_errors']}")
+        for tier, tier_stats in sorted(stats['by_tier'].items()):
+            agreement_pct = tier_stats['agreed'] / tier_stats['escalated'] * 100 if tier_stats['escalated'] else 0
+            changes = ', '.join(f"{t}: {n}" for t, n in sorted(tier_stats['changed_to'].items())) or 'none'
+            print(f"      {tier}: {tier_stats['agreed']}/{tier_stats['escalated']} agreed ({agreement_pct:.0f}%) | changed to: {changes}")
+
+        if stats['fast_only'] == 0 and stats['escalated'] == 0:
+            return
+
+        try:
+            CATALYST_ROUTING_LOG_PATH.parent.mkdir(exist_ok=True)
+            existing_logs = []
+            if CATALYST_ROUTING_LOG_PATH.exists():
+                try:
+                    existing_logs = json.loads(CATALYST_ROUTING_LOG_PATH.read_text())
+                except Exception:
+                    pass
+            existing_logs.append({'date': self.today, 'timestamp': datetime.now(ET).isoformat(), **stats})
+            CATALYST_ROUTING_LOG_PATH.write_text(json.dumps(existing_logs, indent=2))
+        except Exception as e:
+            print(f"   Warning: Could not save routing stats: {e}")
+
     def batch_analyze_catalysts(self, stocks_with_news):
         """
         Batch process Claude catalyst analysis with parallel API calls
@@ -956,7 +1275,11 @@ Technical Context:
         print(f"\n🤖 CLAUDE CATALYST ANALYSIS")
         print(f"=" * 60)
         print(f"   Analyzing {len(stocks_with_news)} stocks with news catalysts")
-        print(f"   Using model: {CLAUDE_MODEL}")
+        if CATALYST_ROUTING_POLICY == 'cascade':
+            print(f"   Using models: {CATALYST_FAST_MODEL} → {CATALYST_STRONG_MODEL} "
+                  f"(escalate {'/'.join(CATALYST_ESCALATE_TIERS)} or {'/'.join(CATALYST_ESCALATE_CONFIDENCE)} confidence)")
+        else:
+            print(f"   Using model: {CATALYST_FAST_MODEL}")
         print(f"   Rate limiting: 5 concurrent workers + exponential backoff")
         print(f"   Batch size: 40 stocks (to respect rate limits)\n")
 
@@ -977,7 +1300,7 @@ Technical Context:
             with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
                 future_to_ticker = {
                     executor.submit(
-                        self.analyze_catalyst_with_claude,
+                        self.analyze_catalyst_routed,
                         stock['ticker'],
                         stock['sector'],
                         stock['news_articles'],
@@ -1028,6 +1351,8 @@ Technical Context:
         print(f"      Tier 1 (FDA, M&A, Major Earnings): {tier1_count}")
         print(f"      Tier 2 (Upgrades, PT Raises): {tier2_count}")
         print(f"      Multi-catalyst setups: {multi_catalyst_count}")
+
+        self.log_routing_stats()
         print(f"   {'='*60}\n")
 
         return results
@@ -1117,12 +1442,19 @@ Technical Context:
         if ticker in self.sector_cache:
             return self.sector_cache[ticker]
 
+        # v10.8: Then the cross-command cache (reference data, fresh for days)
+        if WARM_CACHE_AVAILABLE:
+            cached_sector = WARM_CACHE.get('reference', f'sector:{ticker}')
+            if cached_sector:
+                self.sector_cache[ticker] = cached_sector
+                return cached_sector
+
         try:
             # Query Polygon ticker details API
             url = f'https://api.polygon.io/v3/reference/tickers/{ticker}'
             params = {'apiKey': self.api_key}
 
-            response = requests.get(url, params=params, timeout=5)
+            response = MARKET_DATA.http_get('polygon', 'ticker_details', url, params=params, timeout=5)
             data = response.json()
 
             if response.status_code == 200 and 'results' in data:
@@ -1134,6 +1466,8 @@ Technical Context:
 
                 # Cache the result
                 self.sector_cache[ticker] = sector
+                if WARM_CACHE_AVAILABLE:
+                    WARM_CACHE.set('reference', f'sector:{ticker}', sector)
                 return sector
             else:
                 # API failed, use fallback
@@ -1264,7 +1598,7 @@ Technical Context:
             url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/prev'
             params = {'apiKey': self.api_key}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = MARKET_DATA.http_get('polygon', 'prev_close', url, params=params)
             data = response.json()
             
             if data.get('status') in ['OK', 'DELAYED'] and 'results' in data:
@@ -1309,7 +1643,7 @@ Technical Context:
                 'token': finnhub_key
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = MARKET_DATA.http_get('finnhub', 'earnings_calendar', url, params=params)
 
             if response.status_code != 200:
                 return None
@@ -1381,6 +1715,42 @@ Technical Context:
             # Silently fail - earnings data is supplementary
             return None
 
+    def get_daily_bars(self, ticker, days, fetch_days=None):
+        """
+        Split-adjusted daily bars for the last `days` calendar days (v10.8 warm cache)
+
+        Served from the cross-command cache when a fresh, wide enough window
+        exists. Otherwise fetches `fetch_days` (default `days`) through the market
+        data layer (Polygon, failing over to Alpaca) and caches the window for
+        later calls and commands. If no provider can serve it (down, or past
+        SCREENER_DEADLINE), a recently expired cached window is used, flagged.
+
+        Returns: BarSeries (typed arrays, oldest first; v10.8), or None if unavailable
+        """
+        start_str = (datetime.now(ET) - timedelta(days=days)).strftime('%Y-%m-%d')
+        if WARM_CACHE_AVAILABLE:
+            cached = WARM_CACHE.get_daily_bars(ticker, start_str)
+            if cached is not None:
+                return cached
+
+        fetch_start = (datetime.now(ET) - timedelta(days=max(days, fetch_days or days))).strftime('%Y-%m-%d')
+        end_str = datetime.now(ET).strftime('%Y-%m-%d')
+        try:
+            bars = MARKET_DATA.daily_bars(ticker, fetch_start, end_str)
+        except ProviderError:
+            # Providers down or out of time - an expired window beats no bars (flagged)
+            stale = WARM_CACHE.get_daily_bars(ticker, start_str, stale=True) if WARM_CACHE_AVAILABLE else None
+            if stale is not None:
+                MARKET_DATA.flag('stale_cache', 'daily_bars')
+            return stale
+        if not bars:
+            return None
+
+        results = BarSeries.from_polygon(bars)
+        if WARM_CACHE_AVAILABLE:
+            WARM_CACHE.put_daily_bars(ticker, fetch_start, results)
+        return results.since(start_str)
+
     def get_3month_return(self, ticker):
         """
         Calculate 3-month return using Polygon API
@@ -1388,22 +1758,11 @@ Technical Context:
         Returns: Float (percentage, e.g., 15.5 = +15.5%)
         """
         try:
-            end_date = datetime.now(ET)
-            start_date = end_date - timedelta(days=90)
-
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
-
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_str}/{end_str}?apiKey={self.api_key}'
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
+            results = self.get_daily_bars(ticker, 90)
 
-            # Accept both 'OK' and 'DELAYED' status
-            if data.get('status') in ['OK', 'DELAYED'] and 'results' in data and len(data['results']) >= 2:
-                results = data['results']
-                first_close = results[0]['c']
-                last_close = results[-1]['c']
+            if results and len(results) >= 2:
+                first_close = float(results.close[0])
+                last_close = float(results.close[-1])
                 return_pct = ((last_close - first_close) / first_close) * 100
                 return round(return_pct, 2)
 
@@ -1463,6 +1822,32 @@ Technical Context:
             'rs_percentile': None  # Will be calculated after full scan
         }
 
+    def compute_stage2_flags(self, tickers, closes):
+        """
+        v10.8: Minervini Stage 2 trend template for the whole universe (one vectorized pass)
+
+        Same checks as the agent's check_stage2_alignment, on the cached bar
+        window breadth already loaded. Each candidate record carries its
+        ticker's result under 'stage2' so GO does not refetch 400 days per BUY.
+
+        Args:
+            tickers: Universe tickers with bars
+            closes: Matching close arrays (oldest first)
+
+        Returns: None (sets self.stage2_flags = {ticker: check_stage2_alignment-style dict})
+        """
+        if not tickers:
+            return
+        started = time.time()
+        template = indicators.trend_template(indicators.stack(closes, length=252))
+        self.stage2_flags = {ticker: indicators.stage2_record(template, row, ticker)
+                             for row, ticker in enumerate(tickers)}
+        stage2_count = int(template['stage2'].sum())
+        eligible = int(template['eligible'].sum())
+        print(f"   📐 Stage 2 template: {stage2_count}/{eligible} stocks in Stage 2 "
+              f"({len(tickers) - eligible} with <{indicators.STAGE2_MIN_BARS} bars) in {(time.time() - started) * 1000:.0f}ms")
+        print()
+
     def calculate_rs_percentiles(self, candidates):
         """
         PHASE 3.1: Calculate IBD-style RS percentile rank (0-100) for all candidates
@@ -1536,26 +1921,16 @@ Technical Context:
         Returns: Dict with gap-up data and catalyst classification
         """
         try:
-            end_date = datetime.now(ET)
-            start_date = end_date - timedelta(days=30)  # 30 days for volume calc
-
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
+            # 30 days for volume calc (v10.8: shared cached window, as a BarSeries)
+            results = self.get_daily_bars(ticker, 30)
 
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_str}/{end_str}?apiKey={self.api_key}'
-            response = requests.get(url, timeout=15)
-            data = response.json()
-
-            if data.get('status') not in ['OK', 'DELAYED'] or 'results' not in data or len(data['results']) < 21:
+            if results is None or len(results) < 21:
                 return {'has_gap_up': False, 'score': 0, 'catalyst_type': None}
 
-            results = data['results']
-
             # DATA FRESHNESS CHECK (CRITICAL FIX - Dec 29, 2025)
             # ATMC bug: Last trade Dec 8, screener ran Dec 29 - 21 days stale!
             # Reject stocks with no recent trading activity (halted/frozen/low liquidity)
-            most_recent_bar_timestamp = results[-1]['t']
-            most_recent_bar_date = datetime.fromtimestamp(most_recent_bar_timestamp / 1000, ET)
+            most_recent_bar_date = results.last_bar_time()
             days_since_last_trade = (datetime.now(ET) - most_recent_bar_date).days
             
             # HARD FILTER: Reject if most recent data is >5 trading days old
@@ -1569,20 +1944,16 @@ Technical Context:
                 return {'has_gap_up': False, 'score': 0, 'catalyst_type': None}
 
             # Calculate 20-day average volume
-            recent_volumes = [r['v'] for r in results[-20:]]
-            avg_volume_20d = sum(recent_volumes) / len(recent_volumes)
+            avg_volume_20d = float(results.volume[-20:].mean())
 
             # Check today's gap
             if len(results) < 2:
                 return {'has_gap_up': False, 'score': 0, 'catalyst_type': None}
 
-            yesterday = results[-2]
-            today = results[-1]
-
-            yesterday_close = yesterday['c']
-            today_open = today['o']
-            today_close = today['c']
-            today_volume = today['v']
+            yesterday_close = float(results.close[-2])
+            today_open = float(results.open[-1])
+            today_close = float(results.close[-1])
+            today_volume = int(results.volume[-1])
 
             # Calculate gap percentage
             gap_pct = ((today_open - yesterday_close) / yesterday_close) * 100
@@ -1759,7 +2130,7 @@ Technical Context:
                 'apiKey': self.api_key
             }
 
-            response = requests.get('https://api.polygon.io/v2/reference/news', params=params, timeout=10)
+            response = MARKET_DATA.http_get('polygon', 'news', 'https://api.polygon.io/v2/reference/news', params=params)
             response.raise_for_status()
             articles = response.json().get('results', [])
 
@@ -2080,22 +2451,12 @@ Technical Context:
         Returns: Dict with volume metrics
         """
         try:
-            end_date = datetime.now(ET)
-            start_date = end_date - timedelta(days=30)
-
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
+            results = self.get_daily_bars(ticker, 30)
 
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_str}/{end_str}?apiKey={self.api_key}'
-            response = requests.get(url, timeout=15)
-            data = response.json()
-
-            if data.get('status') in ['OK', 'DELAYED'] and 'results' in data and len(data['results']) >= 20:
-                results = data['results']
+            if results and len(results) >= 20:
 
                 # DATA FRESHNESS CHECK (Dec 29, 2025 - ATMC bug)
-                most_recent_bar_timestamp = results[-1]['t']
-                most_recent_bar_date = datetime.fromtimestamp(most_recent_bar_timestamp / 1000, ET)
+                most_recent_bar_date = results.last_bar_time()
                 days_since_last_trade = (datetime.now(ET) - most_recent_bar_date).days
                 # BUG FIX (Dec 30): Use hours for more precise check (days truncate to integers)
                 # AUDIT FIX #4: Extended to 120h (5 calendar days) for Tier 1 catalysts
@@ -2107,9 +2468,9 @@ Technical Context:
                 # Calculate 20-day median volume (v10.2 - Third-Party Audit Recommendation)
                 # Median is more stable than mean, especially during holidays
                 import statistics
-                volumes_20d = [r['v'] for r in results[:-1][-20:]]
+                volumes_20d = results.volume[:-1][-20:].tolist()
                 median_volume = statistics.median(volumes_20d) if volumes_20d else 0
-                yesterday_volume = results[-1]['v']
+                yesterday_volume = int(results.volume[-1])
 
                 volume_ratio = yesterday_volume / median_volume if median_volume > 0 else 1.0
 
@@ -2126,6 +2487,21 @@ Technical Context:
         except Exception:
             return {'volume_ratio': 1.0, 'avg_volume_20d': 0, 'yesterday_volume': 0, 'score': 33.3}
 
+    @staticmethod
+    def _full_indicators(results):
+        """Indicator values recomputed over the full bar history (indicators.py kernels)"""
+        columns = indicators.bar_arrays(results, ('h', 'l', 'c'))
+        high, low, close = columns['h'], columns['l'], columns['c']
+        return {
+            'sma20': indicators.scalar(indicators.sma(close, 20)),
+            'sma50': indicators.scalar(indicators.sma(close, 50)),
+            'ema5': indicators.scalar(indicators.ema(close, 5)),
+            'ema20': indicators.scalar(indicators.ema(close, 20)),
+            'rsi14': indicators.scalar(indicators.rsi(close, 14)),
+            'dx14': indicators.scalar(indicators.dx(high, low, close, 14)),
+            'adx14': indicators.scalar(indicators.adx(high, low, close, 14)),
+        }
+
     def get_technical_setup(self, ticker, skip_freshness_check=False):
         """
         Check proximity to 52-week high and calculate 50-day MA for market breadth
@@ -2137,24 +2513,15 @@ Technical Context:
         Returns: Dict with technical metrics including above_50d_sma for breadth calculation
         """
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=252)  # ~1 year
-
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
+            # ~1 year of bars; the fetched (and cached) window is WARM_BAR_DAYS wide
+            results = self.get_daily_bars(ticker, 252, fetch_days=WARM_BAR_DAYS)
 
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_str}/{end_str}?apiKey={self.api_key}'
-            response = requests.get(url, timeout=15)
-            data = response.json()
-
-            if data.get('status') in ['OK', 'DELAYED'] and 'results' in data and len(data['results']) >= 2:
-                results = data['results']
+            if results and len(results) >= 2:
 
                 # DATA FRESHNESS CHECK (Dec 29, 2025 - ATMC bug)
                 # Skip for breadth calculation (we want ALL stocks, not just fresh ones)
                 if not skip_freshness_check:
-                    most_recent_bar_timestamp = results[-1]['t']
-                    most_recent_bar_date = datetime.fromtimestamp(most_recent_bar_timestamp / 1000, ET)
+                    most_recent_bar_date = results.last_bar_time()
                     days_since_last_trade = (datetime.now(ET) - most_recent_bar_date).days
                     # BUG FIX (Dec 30): Use hours for more precise check (days truncate to integers)
                     # AUDIT FIX #4: Extended to 120h (5 calendar days) for Tier 1 catalysts
@@ -2164,15 +2531,19 @@ Technical Context:
                         return {'distance_from_52w_high_pct': 100, 'is_near_high': False, 'high_52w': 0, 'current_price': 0, 'above_50d_sma': False, 'score': 0}
 
                 # Find 52-week high
-                high_52w = max(r['h'] for r in results)
-                current_price = results[-1]['c']
+                high_52w = float(results.high.max())
+                current_price = float(results.close[-1])
 
                 distance_pct = ((high_52w - current_price) / high_52w) * 100
                 is_near_high = distance_pct <= 5.0  # Within 5%
 
+                # v10.8: incremental state (advanced by new bars only), else the NumPy kernels -
+                # same definitions as the agent
+                state = INDICATOR_STORE.update(ticker, results) if INDICATOR_STATE_AVAILABLE else self._full_indicators(results)
+
                 # Calculate 50-day MA for market breadth (Phase 4.2 requirement)
-                if len(results) >= 50:
-                    ma_50 = sum(r['c'] for r in results[-50:]) / 50
+                ma_50 = state['sma50']
+                if ma_50:
                     above_50d_sma = current_price > ma_50
                     distance_from_50ma_pct = ((current_price - ma_50) / ma_50) * 100
                 else:
@@ -2180,26 +2551,13 @@ Technical Context:
                     distance_from_50ma_pct = 0
 
                 # Calculate 20-day MA for extension check
-                if len(results) >= 20:
-                    ma_20 = sum(r['c'] for r in results[-20:]) / 20
-                    distance_from_20ma_pct = ((current_price - ma_20) / ma_20) * 100
-                else:
-                    distance_from_20ma_pct = 0
-
-                # Calculate 5 EMA and 20 EMA for cross check
-                if len(results) >= 20:
-                    # 5 EMA
-                    ema_5_multiplier = 2 / (5 + 1)
-                    ema_5 = results[-6]['c']  # Start with close 6 days ago
-                    for r in results[-5:]:
-                        ema_5 = (r['c'] - ema_5) * ema_5_multiplier + ema_5
-
-                    # 20 EMA
-                    ema_20_multiplier = 2 / (20 + 1)
-                    ema_20 = sum(r['c'] for r in results[-40:-20]) / 20  # SMA for seed
-                    for r in results[-20:]:
-                        ema_20 = (r['c'] - ema_20) * ema_20_multiplier + ema_20
+                ma_20 = state['sma20']
+                distance_from_20ma_pct = ((current_price - ma_20) / ma_20) * 100 if ma_20 else 0
 
+                # Calculate 5 EMA and 20 EMA for cross check (SMA-seeded over the full history)
+                ema_5 = state['ema5']
+                ema_20 = state['ema20']
+                if ema_5 is not None and ema_20 is not None:
                     ema_5_above_20 = ema_5 > ema_20
                 else:
                     ema_5 = 0
@@ -2207,57 +2565,18 @@ Technical Context:
                     ema_5_above_20 = False
 
                 # Calculate RSI (14-period)
-                if len(results) >= 15:
-                    gains = []
-                    losses = []
-                    for i in range(-14, 0):
-                        change = results[i]['c'] - results[i-1]['c']
-                        if change > 0:
-                            gains.append(change)
-                            losses.append(0)
-                        else:
-                            gains.append(0)
-                            losses.append(abs(change))
-
-                    avg_gain = sum(gains) / 14
-                    avg_loss = sum(losses) / 14
-
-                    if avg_loss == 0:
-                        rsi = 100
-                    else:
-                        rs = avg_gain / avg_loss
-                        rsi = 100 - (100 / (1 + rs))
-                else:
+                rsi = state['rsi14']
+                if rsi is None:
                     rsi = 50  # Neutral if not enough data
 
-                # Calculate ADX (14-period) - simplified version
-                if len(results) >= 15:
-                    dx_values = []
-                    for i in range(-14, 0):
-                        high = results[i]['h']
-                        low = results[i]['l']
-                        prev_close = results[i-1]['c']
-
-                        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-
-                        plus_dm = max(high - results[i-1]['h'], 0) if high - results[i-1]['h'] > results[i-1]['l'] - low else 0
-                        minus_dm = max(results[i-1]['l'] - low, 0) if results[i-1]['l'] - low > high - results[i-1]['h'] else 0
-
-                        if tr > 0:
-                            plus_di = (plus_dm / tr) * 100
-                            minus_di = (minus_dm / tr) * 100
-
-                            if plus_di + minus_di > 0:
-                                dx = abs(plus_di - minus_di) / (plus_di + minus_di) * 100
-                                dx_values.append(dx)
-
-                    adx = sum(dx_values) / len(dx_values) if dx_values else 0
-                else:
-                    adx = 0
+                # Calculate ADX (14-period) - Wilder ADX, unsmoothed DX on short histories
+                adx = state['adx14']
+                if adx is None:
+                    adx = state['dx14'] or 0
 
                 # Calculate 3-day return
                 if len(results) >= 4:
-                    three_days_ago_close = results[-4]['c']
+                    three_days_ago_close = float(results.close[-4])
                     three_day_return_pct = ((current_price - three_days_ago_close) / three_days_ago_close) * 100
                 else:
                     three_day_return_pct = 0
@@ -2307,26 +2626,16 @@ Technical Context:
         Returns: Dict with breakout data and catalyst classification
         """
         try:
-            end_date = datetime.now(ET)
-            start_date = end_date - timedelta(days=252)  # ~1 year
+            # ~1 year (v10.8: same cached window as get_technical_setup, as a BarSeries)
+            results = self.get_daily_bars(ticker, 252, fetch_days=WARM_BAR_DAYS)
 
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
-
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_str}/{end_str}?apiKey={self.api_key}'
-            response = requests.get(url, timeout=15)
-            data = response.json()
-
-            if data.get('status') not in ['OK', 'DELAYED'] or 'results' not in data or len(data['results']) < 21:
+            if results is None or len(results) < 21:
                 return {'has_breakout': False, 'score': 0, 'catalyst_type': None}
 
-            results = data['results']
-
             # DATA FRESHNESS CHECK (CRITICAL FIX - Dec 29, 2025)
             # ATMC bug: Last trade Dec 8, screener ran Dec 29 - 21 days stale!
             # Reject stocks with no recent trading activity (halted/frozen/low liquidity)
-            most_recent_bar_timestamp = results[-1]['t']
-            most_recent_bar_date = datetime.fromtimestamp(most_recent_bar_timestamp / 1000, ET)
+            most_recent_bar_date = results.last_bar_time()
             days_since_last_trade = (datetime.now(ET) - most_recent_bar_date).days
             
             # BUG FIX (Dec 30): 96h→120h for tier-aware freshness (Audit Fix #4)
@@ -2339,20 +2648,20 @@ Technical Context:
                 return {'has_breakout': False, 'score': 0, 'catalyst_type': None}
 
             # Calculate 20-day average volume
-            recent_volumes = [r['v'] for r in results[-20:]]
-            avg_volume_20d = sum(recent_volumes) / len(recent_volumes)
+            avg_volume_20d = float(results.volume[-20:].mean())
             # Find TRUE 52-week high from ALL data (FIX: Dec 29, 2025)
             # Bug was: excluded last 5 days, so could never detect breakouts IN those days
-            high_52w = max(r['h'] for r in results)
+            high_52w = float(results.high.max())
             
             # Check last 5 days for NEW 52-week highs with volume confirmation
             has_breakout = False
             breakout_day_idx = None
             days_ago = None
 
+            highs, volumes = results.high.tolist(), results.volume.tolist()
             for i in range(max(len(results) - 5, 0), len(results)):
-                day_high = results[i]['h']
-                day_volume = results[i]['v']
+                day_high = highs[i]
+                day_volume = volumes[i]
 
                 # Check if this day made a NEW 52-week high (within 0.1% tolerance)
                 # AND had strong volume confirmation
@@ -2366,14 +2675,14 @@ Technical Context:
                 return {'has_breakout': False, 'score': 0, 'catalyst_type': None}
 
             # Get breakout details
-            breakout_price = results[breakout_day_idx]['h']
-            breakout_volume = results[breakout_day_idx]['v']
+            breakout_price = highs[breakout_day_idx]
+            breakout_volume = volumes[breakout_day_idx]
             volume_ratio = breakout_volume / avg_volume_20d
-            current_price = results[-1]['c']
+            current_price = float(results.close[-1])
 
             # AUDIT FIX #5: Breakout maintenance soft scoring (3-6% partial, >6% reject)
             # Check if price still within 6% of 52-week high (breakout maintained)
-            current_high = max(r['h'] for r in results)
+            current_high = high_52w
             distance_from_high = ((current_high - current_price) / current_high) * 100
 
             # Hard reject if >6% from high (not a breakout anymore)
@@ -2445,7 +2754,7 @@ Technical Context:
                 'token': self.finnhub_key
             }
 
-            response = requests.get(url, params=params, timeout=30)
+            response = MARKET_DATA.http_get('finnhub', 'earnings_calendar', url, params=params, timeout=15)
             data = response.json()
 
             # Build ticker -> earnings data mapping
@@ -2790,7 +3099,7 @@ Technical Context:
                 'token': self.finnhub_key
             }
 
-            response = requests.get(url, params=params, timeout=30)
+            response = MARKET_DATA.http_get('finnhub', 'earnings_surprises', url, params=params)
             earnings = response.json()
 
             if not isinstance(earnings, list) or not earnings:
@@ -2906,7 +3215,7 @@ Technical Context:
                 'token': self.finnhub_key
             }
 
-            response = requests.get(url, params=params, timeout=30)
+            response = MARKET_DATA.http_get('finnhub', 'earnings_calendar', url, params=params)
             data = response.json()
             earnings = data.get('earningsCalendar', [])
 
@@ -3001,7 +3310,7 @@ Technical Context:
                 'token': self.finnhub_key
             }
 
-            response = requests.get(url, params=params, timeout=30)
+            response = MARKET_DATA.http_get('finnhub', 'insider_transactions', url, params=params)
             data = response.json()
 
             # Handle response format
@@ -3107,7 +3416,7 @@ Technical Context:
             url = f'https://api.polygon.io/v2/snapshot/locale/us/markets/options/tickers/{ticker}'
             params = {'apiKey': self.api_key}
 
-            response = requests.get(url, params=params, timeout=10)
+            response = MARKET_DATA.http_get('polygon', 'options_snapshot', url, params=params)
             data = response.json()
 
             if response.status_code != 200 or 'results' not in data:
@@ -3224,13 +3533,9 @@ Technical Context:
         """
         try:
             # Get aggregated bars for last 30 days (daily bars)
-            url = f'https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{(datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")}/{datetime.now().strftime("%Y-%m-%d")}'
-            params = {'apiKey': self.api_key}
-
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
-
-            if response.status_code != 200 or 'results' not in data:
+            # v10.8: shared cached window, as a BarSeries
+            results = self.get_daily_bars(ticker, 30)
+            if results is None:
                 return {
                     'has_unusual_activity': False,
                     'volume_spike_ratio': 0,
@@ -3238,7 +3543,6 @@ Technical Context:
                     'signal_type': None
                 }
 
-            results = data.get('results', [])
             if len(results) < 5:
                 # Not enough data
                 return {
@@ -3249,11 +3553,10 @@ Technical Context:
                 }
 
             # Calculate average volume (exclude most recent day)
-            volumes = [bar['v'] for bar in results[:-1]]
-            avg_volume = sum(volumes) / len(volumes)
+            avg_volume = float(results.volume[:-1].mean())
 
             # Get most recent day's volume
-            recent_volume = results[-1]['v']
+            recent_volume = int(results.volume[-1])
 
             # Calculate spike ratio
             if avg_volume == 0:
@@ -3324,7 +3627,7 @@ Technical Context:
                 'token': self.finnhub_key
             }
 
-            response = requests.get(url, params=params, timeout=30)
+            response = MARKET_DATA.http_get('finnhub', 'recommendations', url, params=params)
             data = response.json()
 
             # API returns list of monthly snapshots, newest first
@@ -3431,7 +3734,7 @@ Technical Context:
                 'apikey': self.fmp_key
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = MARKET_DATA.http_get('fmp', 'price_targets', url, params=params)
 
             if response.status_code != 200:
                 result = {'has_target_increase': False, 'score': 0, 'catalyst_type': None}
@@ -3543,7 +3846,7 @@ Technical Context:
                 'output': 'atom'
             }
 
-            response = requests.get(cik_url, params=params, headers=headers, timeout=10)
+            response = MARKET_DATA.http_get('sec', 'edgar', cik_url, params=params, headers=headers)
 
             # Parse for recent 8-K filings
             # Look for Item 1.01 (Material Agreement) or Item 2.01 (M&A completion)
@@ -3691,6 +3994,7 @@ Technical Context:
             'catalyst_signals': news_result,  # Raw news, no keyword filtering
             'earnings_calendar': earnings_info,  # v8.5: Earnings date for risk awareness
             'price_targets': price_target_info,  # v8.6: Analyst consensus for upside evaluation
+            'stage2': self.stage2_flags.get(ticker),  # v10.8: Trend template from the universe pass
             'passed_binary_gates': True
         }
 
@@ -4329,9 +4633,8 @@ Technical Context:
 
         # Get VIX data for risk-off detection
         try:
-            vix_data = requests.get(
-                f"https://api.polygon.io/v2/aggs/ticker/VIX/prev?apiKey={self.polygon_key}",
-                timeout=10
+            vix_data = MARKET_DATA.http_get(
+                'polygon', 'prev_close', f"https://api.polygon.io/v2/aggs/ticker/VIX/prev?apiKey={self.polygon_key}"
             )
             vix_close = vix_data.json().get('results', [{}])[0].get('c', 20)  # Default to 20 if unavailable
         except:
@@ -4418,25 +4721,44 @@ Technical Context:
         print(f"\nCalculating market breadth for {universe_size} stocks...")
         print("(Quick scan: price vs 50-day MA only)\n")
 
+        # v10.8: advance each ticker's stored indicator state by its new bars (one bulk
+        # state load); without it, one 2-D SMA50 pass over the collected closes
+        breadth_closes = []
         breadth_above_50d_count = 0
         breadth_total_count = 0
+        breadth_start = (datetime.now(ET) - timedelta(days=252)).strftime('%Y-%m-%d')
+        stage2_tickers, stage2_closes = [], []  # v10.8: full cached window for the trend template
+        if INDICATOR_STATE_AVAILABLE:
+            INDICATOR_STORE.load(tickers)
 
         for i, ticker in enumerate(tickers, 1):
             if i % 100 == 0:
                 print(f"   Breadth scan: {i}/{universe_size} processed")
 
             try:
-                # Use get_technical_setup() which includes 50-day MA calculation
+                # Same bars get_technical_setup() uses (cached for the candidate scan)
                 # Skip freshness check for breadth - we want ALL stocks regardless of trading activity
                 time.sleep(0.1)  # Rate limit: 10 req/sec (Polygon free tier allows 5 req/sec)
-                tech_result = self.get_technical_setup(ticker, skip_freshness_check=True)
-                if tech_result and tech_result.get('current_price', 0) > 0:
+                window = self.get_daily_bars(ticker, WARM_BAR_DAYS)
+                if window:
+                    stage2_tickers.append(ticker)
+                    stage2_closes.append(window.close)
+                results = window.since(breadth_start) if window else None
+                if results and len(results) >= 2 and results.close[-1] > 0:
                     breadth_total_count += 1
-                    if tech_result.get('above_50d_sma', False):
-                        breadth_above_50d_count += 1
+                    if INDICATOR_STATE_AVAILABLE:
+                        state = INDICATOR_STORE.update(ticker, results)
+                        if state['sma50'] and state['close'] > state['sma50']:
+                            breadth_above_50d_count += 1
+                    else:
+                        breadth_closes.append(results.close)
             except:
                 pass  # Skip stocks with data errors
 
+        if breadth_closes:
+            closes = indicators.stack(breadth_closes, length=50)
+            breadth_above_50d_count = int(indicators.above_sma(closes, 50).sum())  # <50 bars counts as below
+
         breadth_pct = (breadth_above_50d_count / breadth_total_count * 100) if breadth_total_count > 0 else 0
         print(f"\n📊 MARKET BREADTH (calculated at scan time):")
         print(f"   Stocks above 50-day MA: {breadth_above_50d_count}/{breadth_total_count} ({breadth_pct:.1f}%)")
@@ -4448,6 +4770,9 @@ Technical Context:
             print(f"   Market Regime: UNHEALTHY (<40%)")
         print()
 
+        # v10.8: Stage 2 trend template for the whole universe in one pass (GO reads it from the candidates)
+        self.compute_stage2_flags(stage2_tickers, stage2_closes)
+
         print(f"\nScanning {universe_size} stocks for candidates...")
         print("(This will take 5-10 minutes due to API rate limits)\n")
 
@@ -4504,11 +4829,46 @@ Technical Context:
                     stocks_without_news += 1
 
             print(f"   Analyzing {len(stocks_for_claude)} stocks ({len(stocks_for_claude) - stocks_without_news} with news, {stocks_without_news} technical-only)")
-            print(f"   Using model: {CLAUDE_MODEL}")
-            print(f"   Expected cost: ~${len(stocks_for_claude) * 0.0003:.2f} (~$0.0003 per stock)\n")
+
+            # v10.5: Resolve trivially decidable candidates locally, escalate the rest
+            claude_results = {}
+            local_technical_only = 0
+            local_rejects = 0
+            if LOCAL_PREFILTER_ENABLED:
+                escalated = []
+                for stock in stocks_for_claude:
+                    local_result = classify_catalyst_locally(stock['ticker'], stock['news_articles'])
+                    if local_result is None:
+                        escalated.append(stock)
+                        continue
+                    claude_results[stock['ticker']] = local_result
+                    if local_result['local_rule'] == 'no_news':
+                        local_technical_only += 1
+                    else:
+                        local_rejects += 1
+                stocks_for_claude = escalated
+
+            local_total = local_technical_only + local_rejects
+            analyzed_total = local_total + len(stocks_for_claude)
+            local_share_pct = (local_total / analyzed_total * 100) if analyzed_total > 0 else 0
+            self.local_prefilter_stats = {
+                'enabled': LOCAL_PREFILTER_ENABLED,
+                'total': analyzed_total,
+                'resolved_locally': local_total,
+                'technical_only': local_technical_only,
+                'hard_rejects': local_rejects,
+                'escalated_to_claude': len(stocks_for_claude),
+                'local_share_pct': round(local_share_pct, 1)
+            }
+            print(f"   Local fast-path: {local_total}/{analyzed_total} resolved locally ({local_share_pct:.1f}%)"
+                  f" - {local_technical_only} technical-only, {local_rejects} hard rejects")
+            print(f"   Escalating {len(stocks_for_claude)} ambiguous stocks to Claude")
+            # Actual spend (fast + escalated calls) is reported from the Claude ledger at save time
+            print(f"   Routing policy: {CATALYST_ROUTING_POLICY} ({CATALYST_FAST_MODEL} → {CATALYST_STRONG_MODEL})\n")
 
             # Batch analyze with Claude
-            claude_results = self.batch_analyze_catalysts(stocks_for_claude)
+            if stocks_for_claude:
+                claude_results.update(self.batch_analyze_catalysts(stocks_for_claude))
 
             # Filter candidates based on Claude's analysis
             # REJECT stocks with negative flags or tier="None"
@@ -4614,7 +4974,10 @@ Technical Context:
             elif catalyst_tier.startswith('Tier 2'):
                 tier_bonus = 10  # Tier 2
 
-            candidate['composite_score'] = round(base_score + tier_bonus, 2)
+            # v10.8: Confirmed uptrend (all five Stage 2 checks) ranks ahead
+            stage2_bonus = STAGE2_RANK_BONUS if (candidate.get('stage2') or {}).get('stage2') else 0
+
+            candidate['composite_score'] = round(base_score + tier_bonus + stage2_bonus, 2)
         print(f"   ✓ Recalculated scores for {len(candidates)} candidates")
 
         # PHASE 3.2: Detect sector rotation
@@ -4633,25 +4996,30 @@ Technical Context:
         # Sort each tier by composite score with tie-breakers (rank WITHIN tier, not across)
         # Primary: composite_score (descending)
         # Tie-breaker 1: rs_percentile (descending) - stronger relative strength wins
-        # Tie-breaker 2: avg_volume (descending) - higher liquidity wins
+        # Tie-breaker 2: Stage 2 checks passed (descending) - v10.8, closer to a confirmed uptrend wins
+        # Tie-breaker 3: avg_volume (descending) - higher liquidity wins
         tier1.sort(key=lambda x: (
             -x['composite_score'],
             -x.get('relative_strength', {}).get('rs_percentile', 0),
+            -(x.get('stage2') or {}).get('checks_passed', 0),
             -x.get('avg_volume', 0)
         ))
         tier2.sort(key=lambda x: (
             -x['composite_score'],
             -x.get('relative_strength', {}).get('rs_percentile', 0),
+            -(x.get('stage2') or {}).get('checks_passed', 0),
             -x.get('avg_volume', 0)
         ))
         tier3.sort(key=lambda x: (
             -x['composite_score'],
             -x.get('relative_strength', {}).get('rs_percentile', 0),
+            -(x.get('stage2') or {}).get('checks_passed', 0),
             -x.get('avg_volume', 0)
         ))
         no_catalyst.sort(key=lambda x: (
             -x['composite_score'],
             -x.get('relative_strength', {}).get('rs_percentile', 0),
+            -(x.get('stage2') or {}).get('checks_passed', 0),
             -x.get('avg_volume', 0)
         ))
 
@@ -4725,9 +5093,35 @@ Technical Context:
                 'min_market_cap': MIN_MARKET_CAP
             },
             'sector_rotation': sector_rotation,  # PHASE 3.2: Sector rotation analysis
+            'local_prefilter': self.local_prefilter_stats,  # v10.5: Share resolved without Claude
+            'model_routing': self.routing_stats,  # v10.6: Fast/strong model agreement by tier
+            'data_quality': MARKET_DATA.data_quality(),  # v10.8: Deadline / circuit / stale-cache flags
             'candidates': top_candidates
         }
 
+        # v10.7: Dashboard rollup of today's Claude calls (replaces guesswork on cost)
+        if LEDGER_AVAILABLE:
+            usage_rollup = CLAUDE_LEDGER.write_daily_rollup(self.today)
+            screener_usage = (usage_rollup or {}).get('by_command', {}).get('screener')
+            if screener_usage:
+                print(f"💰 CLAUDE USAGE TODAY (screener): {screener_usage['calls']} calls, "
+                      f"${screener_usage['cost_usd']:.4f}, cache hit {screener_usage['cache_hit_rate_pct']:.1f}%, "
+                      f"p95 {screener_usage['latency_ms']['p95']:.0f}ms\n")
+
+        # v10.8: Persist indicator states advanced during this scan
+        if INDICATOR_STATE_AVAILABLE:
+            INDICATOR_STORE.save()
+            INDICATOR_STORE.print_stats()
+
+        # v10.8: Provider latency / errors / failovers / open circuits / degraded-data flags
+        MARKET_DATA.print_stats()
+
+        # v10.8: Cross-command cache effectiveness (bars reused by breadth → gates → GO)
+        if WARM_CACHE_AVAILABLE:
+            WARM_CACHE.purge_expired(keep_stale=True)
+            WARM_CACHE.print_stats()
+            print()
+
         return scan_output
 
     def save_results(self, scan_output):
@@ -4779,11 +5173,31 @@ Technical Context:
 
         print("=" * 80)
 
+def run_scan_with_deadline(screener):
+    """
+    Run one scan under SCREENER_DEADLINE with fresh degraded-data flags and stats (v10.8)
+
+    Fetches fail fast once the scan runs into GO's window. Shared by main() and
+    agent_daemon.py, whose process keeps MARKET_DATA across commands.
+
+    Returns: scan output (see MarketScreener.run_scan)
+    """
+    MARKET_DATA.reset_flags()
+    MARKET_DATA.reset_stats()
+    if WARM_CACHE_AVAILABLE:
+        WARM_CACHE.reset_stats()
+    if INDICATOR_STATE_AVAILABLE:
+        INDICATOR_STORE.reset_stats()
+    deadline = Deadline.at(SCREENER_DEADLINE, 'screener', fallback_seconds=SCREENER_BUDGET_SECONDS)
+    with deadline_scope(deadline):
+        return screener.run_scan()
+
+
 def main():
     """Main execution"""
     try:
         screener = MarketScreener()
-        scan_output = screener.run_scan()
+        scan_output = run_scan_with_deadline(screener)
         screener.save_results(scan_output)
 
         print("\n✓ Market screening completed successfully")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Minute VWAP - Incremental session VWAP / range from minute bars
+
+RECHECK's research basis is "wait 30 min for pullback to VWAP", but it only
+ever looked at one point-in-time price. This module keeps a running session
+state per ticker from Polygon minute aggregates:
+
+- VWAP (sum of bar VWAP x volume / volume) from the 9:30 AM ET open
+- Session high/low and the opening range (first OPENING_RANGE_MINUTES)
+- When the price last pulled back to VWAP (bar low within
+  VWAP_TOUCH_TOLERANCE_PCT of the running VWAP)
+
+States live in the warm cache (kind 'minute_vwap', one per ticker and
+session), so a repeat run fetches only the minutes after the last stored bar -
+one request per ticker window, all tickers concurrently. A bar whose minute
+has not closed yet is applied to a copy for the returned values, never to the
+stored state.
+
+Usage:
+    values = MINUTE_VWAP.update(tickers, fetch_minutes)   # fetch_minutes(ticker, from_ms, to_ms) -> Polygon results
+    values['NVDA']['vwap'], values['NVDA']['last_touch']  # 'HH:MM' ET or None
+    MINUTE_VWAP.save()
+"""
+
+import copy
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from warm_cache import WARM_CACHE, ET
+
+# Bump when the stored layout changes (old states are rebuilt)
+STATE_VERSION = 1
+
+SESSION_OPEN = (9, 30)
+OPENING_RANGE_MINUTES = 30
+MINUTE_MS = 60 * 1000
+
+# A bar low within this % above VWAP counts as a pullback to VWAP
+VWAP_TOUCH_TOLERANCE_PCT = float(os.environ.get('VWAP_TOUCH_TOLERANCE_PCT', '0.1'))
+
+MINUTE_FETCH_WORKERS = int(os.environ.get('MINUTE_FETCH_WORKERS', '8'))
+
+
+def session_open_ms(now: datetime) -> int:
+    """Epoch ms of today's 9:30 AM ET open"""
+    now_et = now.astimezone(ET)
+    return int(now_et.replace(hour=SESSION_OPEN[0], minute=SESSION_OPEN[1], second=0, microsecond=0).timestamp() * 1000)
+
+
+def clock(ms: Optional[int]) -> Optional[str]:
+    """Epoch ms -> 'HH:MM' ET"""
+    return datetime.fromtimestamp(ms / 1000, ET).strftime('%H:%M') if ms else None
+
+
+class SessionVWAP:
+    """Running VWAP / range state for one ticker's session"""
+
+    def __init__(self, state: Optional[Dict] = None, open_ms: int = 0):
+        self.state = state or {
+            'version': STATE_VERSION, 'open_ms': open_ms, 'last_t': None, 'bars': 0,
+            'pv': 0.0, 'volume': 0.0, 'open': None, 'high': None, 'low': None, 'close': None,
+            'or_high': None, 'or_low': None, 'first_touch': None, 'last_touch': None,
+        }
+
+    def advance(self, bars: List[Dict]):
+        """Apply minute bars (Polygon t/o/h/l/c/v/vw, oldest first) newer than the state"""
+        s = self.state
+        or_end = s['open_ms'] + OPENING_RANGE_MINUTES * MINUTE_MS
+        for bar in bars:
+            t = bar['t']
+            if t < s['open_ms'] or (s['last_t'] is not None and t <= s['last_t']):
+                continue
+            high, low, close, volume = bar['h'], bar['l'], bar['c'], bar.get('v') or 0
+            typical = bar.get('vw') or (high + low + close) / 3
+            s['pv'] += typical * volume
+            s['volume'] += volume
+            if s['open'] is None:
+                s['open'] = bar['o']
+            s['high'] = high if s['high'] is None else max(s['high'], high)
+            s['low'] = low if s['low'] is None else min(s['low'], low)
+            s['close'] = close
+            if t < or_end:
+                s['or_high'] = high if s['or_high'] is None else max(s['or_high'], high)
+                s['or_low'] = low if s['or_low'] is None else min(s['or_low'], low)
+            vwap = self.vwap
+            if vwap and low <= vwap * (1 + VWAP_TOUCH_TOLERANCE_PCT / 100):
+                s['first_touch'] = s['first_touch'] or t
+                s['last_touch'] = t
+            s['last_t'] = t
+            s['bars'] += 1
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.state['pv'] / self.state['volume'] if self.state['volume'] else None
+
+    def values(self) -> Dict:
+        s = self.state
+        vwap = self.vwap
+        return {
+            'vwap': round(vwap, 4) if vwap else None,
+            'last_price': s['close'],
+            'distance_from_vwap_pct': round((s['close'] - vwap) / vwap * 100, 2) if vwap and s['close'] else None,
+            'session_open': s['open'],
+            'session_high': s['high'],
+            'session_low': s['low'],
+            'opening_range_high': s['or_high'],
+            'opening_range_low': s['or_low'],
+            'first_touch': clock(s['first_touch']),
+            'last_touch': clock(s['last_touch']),
+            'bars': s['bars'],
+            'as_of': clock(s['last_t']),
+        }
+
+    def copy(self) -> 'SessionVWAP':
+        return SessionVWAP(copy.deepcopy(self.state))
+
+
+class MinuteVWAPEngine:
+    """Session VWAP states for many tickers, stored in the warm cache"""
+
+    def __init__(self, cache=None, workers: int = MINUTE_FETCH_WORKERS):
+        self.cache = cache if cache is not None else WARM_CACHE
+        self.workers = workers
+        self._states: Dict[str, SessionVWAP] = {}
+        self._dirty = set()
+        self.stats = {'advanced': 0, 'bars': 0, 'new': 0, 'requests': 0, 'failed': 0, 'seconds': 0.0}
+
+    @staticmethod
+    def _key(ticker: str, now: datetime) -> str:
+        return f"{ticker}:{now.astimezone(ET).strftime('%Y-%m-%d')}"
+
+    def update(self, tickers: List[str], fetch_minutes: Callable[[str, int, int], List[Dict]],
+               now: Optional[datetime] = None) -> Dict[str, Dict]:
+        """
+        Session VWAP values for tickers, fetching only minutes after each stored state
+
+        Args:
+            tickers: Tickers to evaluate
+            fetch_minutes: fetch_minutes(ticker, from_ms, to_ms) -> Polygon minute results
+                           (oldest first); may raise - the ticker is then reported from
+                           its stored state, or omitted
+            now: Evaluation time (default: now)
+
+        Returns: {ticker: SessionVWAP.values()} for tickers with any session bars
+        """
+        started = time.perf_counter()
+        now = now or datetime.now(ET)
+        open_ms = session_open_ms(now)
+        now_ms = int(now.timestamp() * 1000)
+        tickers = list(dict.fromkeys(tickers))
+
+        keys = {t: self._key(t, now) for t in tickers}
+        missing = [t for t in tickers if keys[t] not in self._states]
+        for key, state in self.cache.get_many('minute_vwap', [keys[t] for t in missing]).items():
+            if state.get('version') == STATE_VERSION and state.get('open_ms') == open_ms:
+                self._states[key] = SessionVWAP(state)
+
+        def fetch(ticker):
+            stored = self._states.get(keys[ticker])
+            from_ms = stored.state['last_t'] + MINUTE_MS if stored and stored.state['last_t'] else open_ms
+            try:
+                return ticker, fetch_minutes(ticker, from_ms, now_ms)
+            except Exception as e:
+                print(f"   ⚠️ Minute bars failed for {ticker}: {e}")
+                return ticker, None
+
+        fetched = {}
+        if tickers and now_ms > open_ms:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(tickers)))) as executor:
+                fetched = dict(executor.map(fetch, tickers))
+        self.stats['requests'] += len(fetched)
+
+        values = {}
+        for ticker in tickers:
+            key = keys[ticker]
+            session = self._states.get(key)
+            bars = fetched.get(ticker)
+            if bars is None:
+                self.stats['failed'] += ticker in fetched
+            else:
+                if session is None:
+                    session = SessionVWAP(open_ms=open_ms)
+                    self.stats['new'] += 1
+                # The last minute is not final until it has closed
+                final = [b for b in bars if b['t'] + MINUTE_MS <= now_ms]
+                partial = bars[len(final):]
+                if final:
+                    before = session.state['bars']
+                    session.advance(final)
+                    if session.state['bars'] > before:
+                        self.stats['advanced'] += 1
+                        self.stats['bars'] += session.state['bars'] - before
+                        self._states[key] = session
+                        self._dirty.add(key)
+                if partial:
+                    session = session.copy()
+                    session.advance(partial)
+            if session is not None and session.state['bars']:
+                values[ticker] = session.values()
+
+        self.stats['seconds'] += time.perf_counter() - started
+        return values
+
+    def save(self):
+        """Persist states advanced since the last save"""
+        if not self._dirty:
+            return
+        self.cache.set_many('minute_vwap', {key: self._states[key].state for key in self._dirty})
+        self._dirty.clear()
+
+    def reset_stats(self):
+        """Start a new command's counters (the daemon reuses this instance)"""
+        self.stats = {'advanced': 0, 'bars': 0, 'new': 0, 'requests': 0, 'failed': 0, 'seconds': 0.0}
+
+    def print_stats(self, label: str = 'Minute VWAP'):
+        s = self.stats
+        if not s['requests']:
+            return
+        print(f"   📉 {label}: {s['requests']} requests, {s['advanced']} tickers advanced by {s['bars']} bars "
+              f"({s['new']} new sessions, {s['failed']} failed) in {s['seconds'] * 1000:.0f}ms")
+
+
+# Shared instance used by the agent
+MINUTE_VWAP = MinuteVWAPEngine()
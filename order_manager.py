@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Order Manager - Concurrent order submission with event-driven fill tracking
+
+EXECUTE used to place one market order at a time and poll get_order (up to
+10 x 0.5s) before moving to the next ticker, then sleep 3s before each
+stop-loss - a 10-buy morning spent most of a minute waiting. The manager:
+
+- Submits all exits concurrently, waits for them to fill (frees buying power),
+  then submits all entries concurrently
+- Tracks fills from Alpaca's trade-updates stream, with get_order polling as
+  the fallback (and as a slow safety net while the stream is connected)
+- Places each entry's protective stop as soon as that entry's fill arrives
+  (after the wash-trade delay), instead of one entry after another
+
+The broker is duck-typed (AlpacaBroker methods), so tests can pass a fake.
+
+Usage:
+    with OrderManager(broker, updates_feed=TradeUpdatesFeed.from_broker(broker)) as manager:
+        manager.submit_exits(exits)
+        manager.submit_entries(entries, stop_price_for=callback)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+ORDER_FILL_TIMEOUT = float(os.environ.get('ORDER_FILL_TIMEOUT', '10'))  # Seconds to wait for a batch to fill
+ORDER_POLL_INTERVAL = 0.5     # get_order polling when no trade-updates stream
+STREAM_POLL_INTERVAL = 2.0    # Safety-net polling while the stream is connected
+WASH_TRADE_DELAY = 3.0        # Alpaca rejects a stop placed right after its buy / a sell right after a cancel
+ORDER_WORKERS = int(os.environ.get('ORDER_WORKERS', '8'))
+ORDER_TRADE_UPDATES = os.environ.get('ORDER_TRADE_UPDATES', 'true').lower() == 'true'
+
+FAILED_STATUSES = ('canceled', 'expired', 'rejected')
+
+
+def order_status(status) -> str:
+    """Order status as a lowercase string (alpaca-trade-api returns enums or strings)"""
+    if hasattr(status, 'value'):
+        return status.value
+    return str(status).lower()
+
+
+def _field(order, name):
+    """Read a field from an order object or a trade-update order dict"""
+    if isinstance(order, dict):
+        return order.get(name)
+    return getattr(order, name, None)
+
+
+@dataclass
+class OrderTicket:
+    """One market order and everything learned about it"""
+    ticker: str
+    side: str                        # 'buy' or 'sell'
+    qty: int
+    context: Any = None              # Caller data (e.g. the position dict)
+    notional: float = 0.0            # Dollar size (entries: buying power check)
+    quote_price: float = 0.0         # Price used to size the order
+    order_id: Optional[str] = None
+    status: str = 'pending'
+    filled_qty: int = 0
+    fill_price: Optional[float] = None
+    error: Optional[str] = None
+    filled_at: Optional[float] = None
+    stop_order_id: Optional[str] = None
+    stop_price: Optional[float] = None
+    stop_message: Optional[str] = None
+    stop_placed: bool = False
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _protected: bool = field(default=False, repr=False)
+
+    @classmethod
+    def entry(cls, ticker: str, dollars: float, price: float, context: Any = None) -> 'OrderTicket':
+        """Buy ticket sized from a dollar amount"""
+        return cls(ticker=ticker, side='buy', qty=int(dollars / price), context=context,
+                   notional=dollars, quote_price=price)
+
+    @classmethod
+    def exit(cls, ticker: str, shares, context: Any = None) -> 'OrderTicket':
+        """Sell ticket (quantity is capped at the broker position when submitted)"""
+        return cls(ticker=ticker, side='sell', qty=int(shares), context=context)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def success(self) -> bool:
+        """Order accepted by the broker and not canceled/expired/rejected"""
+        return self.order_id is not None and self.error is None
+
+    def fail(self, message: str):
+        self.error = message
+        self._done.set()
+
+
+class OrderManager:
+    """
+    Submits batches of market orders concurrently and tracks their fills
+
+    Fill events (stream or poll) update tickets under a lock; entry fills
+    schedule their protective stop on the worker pool right away.
+    """
+
+    def __init__(self, broker, updates_feed=None, fill_timeout: float = ORDER_FILL_TIMEOUT,
+                 poll_interval: float = ORDER_POLL_INTERVAL, stop_delay: float = WASH_TRADE_DELAY,
+                 max_workers: int = ORDER_WORKERS):
+        self.broker = broker
+        self.updates_feed = updates_feed
+        self.fill_timeout = fill_timeout
+        self.poll_interval = poll_interval
+        self.stop_delay = stop_delay
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='orders')
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._tickets: Dict[str, OrderTicket] = {}
+        self._protections = []
+        self._stop_price_for: Optional[Callable[[OrderTicket], Optional[float]]] = None
+        self.stream_events = 0
+        self.polls = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def start(self):
+        """Connect the trade-updates stream (polling covers anything it misses)"""
+        if self.updates_feed is not None:
+            try:
+                self.updates_feed.start(self._on_stream_update)
+            except Exception as e:
+                print(f"      ⚠️ Trade updates stream unavailable ({e}) - polling for fills")
+                self.updates_feed = None
+
+    def close(self):
+        if self.updates_feed is not None:
+            self.updates_feed.stop()
+        self._pool.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Batches
+    # ------------------------------------------------------------------
+
+    def submit_exits(self, tickets: List[OrderTicket]) -> List[OrderTicket]:
+        """
+        Sell every ticket concurrently and wait for the fills
+
+        Open orders on each symbol (stop-losses lock the shares) are canceled
+        first; one wash-trade delay then covers the whole batch.
+        """
+        canceled = list(self._pool.map(self._prepare_exit, tickets))
+        if any(canceled):
+            time.sleep(self.stop_delay)  # Wait for Alpaca to release the shares
+        self._submit_batch([t for t in tickets if t.error is None])
+        self.wait(tickets)
+        return tickets
+
+    def submit_entries(self, tickets: List[OrderTicket],
+                       stop_price_for: Optional[Callable[[OrderTicket], Optional[float]]] = None) -> List[OrderTicket]:
+        """
+        Buy every ticket concurrently, wait for the fills and the protective stops
+
+        Args:
+            stop_price_for: Called (on a worker thread) once an entry's filled
+                quantity is verified; returns the stop price, or None for no stop
+        """
+        self._stop_price_for = stop_price_for
+        try:
+            buying_power = float(self.broker.get_account().buying_power)
+        except Exception as e:
+            for ticket in tickets:
+                ticket.fail(f"Alpaca buy failed: {e}")
+            return tickets
+
+        to_submit = []
+        for ticket in tickets:
+            if ticket.qty <= 0:
+                ticket.fail(f"Invalid quantity: {ticket.qty} (${ticket.notional:.2f} / ${ticket.quote_price:.2f})")
+            elif ticket.notional > buying_power:
+                ticket.fail(f"Insufficient buying power: ${buying_power:.2f} < ${ticket.notional:.2f}")
+            else:
+                buying_power -= ticket.notional
+                to_submit.append(ticket)
+
+        self._submit_batch(to_submit)
+        self.wait(to_submit)
+        # Entries still open at the timeout are protected for whatever has filled so far
+        for ticket in to_submit:
+            if ticket.success:
+                self._schedule_protection(ticket)
+        for future in list(self._protections):
+            future.result()
+        return tickets
+
+    def wait(self, tickets: List[OrderTicket]):
+        """Block until every submitted ticket is filled/failed or the fill timeout passes"""
+        deadline = time.monotonic() + self.fill_timeout
+        while True:
+            pending = [t for t in tickets if t.order_id and not t.done]
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            interval = STREAM_POLL_INTERVAL if self.updates_feed is not None else self.poll_interval
+            self._changed.clear()
+            if not self._changed.wait(min(interval, remaining)):
+                self._poll(pending)  # No stream event this interval - ask the broker
+        self._finalize(tickets)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _prepare_exit(self, ticket: OrderTicket) -> bool:
+        """Cap quantity at the broker position and cancel open orders; True if any were canceled"""
+        try:
+            position = self.broker.get_position(ticket.ticker)
+            if not position:
+                ticket.fail(f"No Alpaca position found for {ticket.ticker}")
+                return False
+            ticket.qty = min(ticket.qty, int(float(position.qty)))
+            if ticket.qty <= 0:
+                ticket.fail(f"Invalid quantity: {ticket.qty}")
+                return False
+        except Exception as e:
+            ticket.fail(f"Alpaca sell failed: {e}")
+            return False
+
+        canceled = False
+        try:
+            for order in self.broker.get_orders_for_symbol(ticket.ticker, status='open') or []:
+                self.broker.cancel_order(order.id)
+                print(f"      🔄 Canceled open {order.type} order for {ticket.ticker}")
+                canceled = True
+        except Exception as cancel_err:
+            print(f"      ⚠️ Could not cancel open orders: {cancel_err}")  # Try the sell anyway
+        return canceled
+
+    def _submit_batch(self, tickets: List[OrderTicket]):
+        list(self._pool.map(self._submit, tickets))
+
+    def _submit(self, ticket: OrderTicket):
+        side = ticket.side.upper()
+        if ticket.side == 'buy':
+            print(f"      📤 Placing Alpaca {side} order: {ticket.qty} shares of {ticket.ticker} (~${ticket.notional:.2f})")
+        else:
+            print(f"      📤 Placing Alpaca {side} order: {ticket.qty} shares of {ticket.ticker}")
+        try:
+            order = self.broker.place_market_order(ticket.ticker, ticket.qty, side=ticket.side)
+        except Exception as e:
+            ticket.fail(f"Alpaca {ticket.side} failed: {e}")
+            return
+        with self._lock:
+            ticket.order_id = order.id
+            self._tickets[order.id] = ticket
+        self._apply(order)  # Market orders sometimes come back already filled
+
+    def _on_stream_update(self, order):
+        self.stream_events += 1
+        self._apply(order)
+
+    def _poll(self, tickets: List[OrderTicket]):
+        def fetch(ticket):
+            try:
+                self._apply(self.broker.get_order(ticket.order_id))
+            except Exception:
+                pass  # Keep waiting - the next poll or stream event may succeed
+        self.polls += 1
+        list(self._pool.map(fetch, tickets))
+
+    def _apply(self, order):
+        """Record an order update (REST order or trade-update payload)"""
+        if order is None:
+            return
+        with self._lock:
+            ticket = self._tickets.get(str(_field(order, 'id')))
+            if ticket is None or ticket.done:
+                return
+            status = order_status(_field(order, 'status'))
+            ticket.status = status
+            if _field(order, 'filled_qty'):
+                ticket.filled_qty = int(float(_field(order, 'filled_qty')))
+            if _field(order, 'filled_avg_price'):
+                ticket.fill_price = float(_field(order, 'filled_avg_price'))
+            if status == 'filled':
+                ticket.filled_at = time.monotonic()
+                ticket._done.set()
+            elif status in FAILED_STATUSES:
+                ticket.fail(f"Order {status}: {ticket.order_id}")
+        self._changed.set()
+        if status == 'filled' and ticket.side == 'buy':
+            self._schedule_protection(ticket)
+
+    def _finalize(self, tickets: List[OrderTicket]):
+        """Last fetch for unfinished orders; re-verify fills whose quantity looks short"""
+        unfinished = [t for t in tickets if t.order_id and not t.done]
+        if unfinished:
+            self._poll(unfinished)
+        # Alpaca can report status=filled before filled_qty catches up
+        short = [t for t in tickets if t.done and t.success and t.filled_qty and t.filled_qty != t.qty]
+        if short:
+            time.sleep(1.0)
+            for ticket in short:
+                try:
+                    order = self.broker.get_order(ticket.order_id)
+                    if order and _field(order, 'filled_qty'):
+                        ticket.filled_qty = int(float(_field(order, 'filled_qty')))
+                except Exception as e:
+                    print(f"      ⚠️ Verification failed for {ticket.ticker}: {e}")
+
+    def _schedule_protection(self, ticket: OrderTicket):
+        with self._lock:
+            if ticket._protected or self._stop_price_for is None:
+                return
+            ticket._protected = True
+        self._protections.append(self._pool.submit(self._protect, ticket))
+
+    def _protect(self, ticket: OrderTicket):
+        """
+        Place the entry's stop-loss once the wash-trade delay since its fill has passed
+
+        The stop covers the filled quantity re-read from the broker, never the
+        requested one - a short or partial fill gets a matching stop, no fill gets none.
+        """
+        filled_at = ticket.filled_at or time.monotonic()
+        delay = filled_at + self.stop_delay - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            qty = self._verified_fill(ticket)
+            if qty <= 0:
+                ticket.stop_message = f"No verified fill for {ticket.ticker} - stop-loss not placed"
+                return
+            stop_price = self._stop_price_for(ticket)
+            if not stop_price:
+                return
+            ticket.stop_price = stop_price
+            ticket.stop_placed, ticket.stop_message, ticket.stop_order_id = self.broker.place_stop_loss_order(
+                ticker=ticket.ticker, qty=qty, stop_price=stop_price
+            )
+        except Exception as e:
+            ticket.stop_message = f"Failed to place stop-loss: {e}"
+
+    def _verified_fill(self, ticket: OrderTicket) -> int:
+        """Filled quantity re-read from the broker (fill events can run ahead of filled_qty)"""
+        try:
+            order = self.broker.get_order(ticket.order_id)
+            if order is not None:
+                with self._lock:
+                    ticket.filled_qty = int(float(_field(order, 'filled_qty') or 0))
+        except Exception as e:
+            print(f"      ⚠️ Fill verification failed for {ticket.ticker} ({e}) - using last reported fill")
+        return ticket.filled_qty
+
+
+class TradeUpdatesFeed:
+    """Alpaca trade-updates stream (order fills for this account)"""
+
+    def __init__(self, api_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 base_url: Optional[str] = None):
+        self.api_key = api_key or os.environ.get('ALPACA_API_KEY')
+        self.secret_key = secret_key or os.environ.get('ALPACA_SECRET_KEY')
+        self.base_url = base_url or os.environ.get('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets')
+        if not self.api_key or not self.secret_key:
+            raise ValueError("Alpaca API credentials not found. Set ALPACA_API_KEY and ALPACA_SECRET_KEY environment variables.")
+        self._stream = None
+        self._thread = None
+
+    @classmethod
+    def from_broker(cls, broker) -> Optional['TradeUpdatesFeed']:
+        """Feed using the broker's credentials, or None when disabled/unavailable"""
+        if not ORDER_TRADE_UPDATES:
+            return None
+        try:
+            return cls(getattr(broker, 'api_key', None), getattr(broker, 'secret_key', None),
+                       getattr(broker, 'base_url', None))
+        except ValueError:
+            return None
+
+    def start(self, on_update: Callable):
+        from alpaca_trade_api.stream import Stream  # Deferred: heavy import, only needed live
+
+        self._stream = Stream(self.api_key, self.secret_key, base_url=self.base_url)
+
+        async def handle_update(update):
+            order = getattr(update, 'order', None)
+            if order is None and isinstance(update, dict):
+                order = update.get('order')
+            on_update(order)
+
+        self._stream.subscribe_trade_updates(handle_update)
+        self._thread = threading.Thread(target=self._stream.run, name='trade-updates', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+            except Exception:
+                pass  # Stream already closed
+        if self._thread is not None:
+            self._thread.join(timeout=5)
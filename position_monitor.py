@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Position Monitor - Event-driven intraday stop/target/trailing evaluation
+
+Rule-based exits were only evaluated when a cron command ran (mostly EXIT at
+3:45 PM). The monitor subscribes to a trade feed instead and evaluates every
+open position on every tick:
+
+- Stop loss: price <= stop_loss                     -> STOP_LOSS intent
+- Profit target: price >= price_target              -> TARGET_REACHED intent
+  (trailing stop activates at +8% floor, as in check_position_exits)
+- Trailing stop (JSON-tracked positions only; Alpaca trailing orders
+  execute themselves): price <= trailing stop       -> TRAILING_STOP intent
+
+Per-position state lives in a dict keyed by ticker, so each tick is one
+lookup and a few comparisons - O(1) regardless of portfolio size. Intents are
+delivered to a callback the moment they happen; the agent decides what to do
+with them (log, or sell when MONITOR_AUTO_EXIT is enabled).
+
+Feeds:
+- AlpacaTradeFeed: Alpaca real-time trade stream (alpaca-trade-api)
+- ReplayFeed: local stand-in replaying recorded ticks (tests, dry runs)
+
+Time stops and news invalidation stay with the EXIT command - they do not
+change tick by tick.
+
+The portfolio can change under a running monitor (RECHECK enters at 10:15 AM,
+EXIT or a broker stop closes). run(refresh=...) re-reads it periodically:
+new positions are added and subscribed on the feed, closed ones are dropped.
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo('America/New_York')
+
+# Same thresholds as TradingAgent.check_position_exits
+DEFAULT_STOP_LOSS_PCT = 0.07
+DEFAULT_TARGET_PCT = 0.10
+TRAILING_FLOOR_PCT = 0.08
+TRAIL_PCT = 0.02
+LARGE_GAP_PCT = 5.0
+GAP_CONSOLIDATION_DAYS = 2
+
+
+class IntentKind(str, Enum):
+    """What a tick triggered"""
+    STOP_LOSS = "STOP_LOSS"            # Exit: stop loss hit
+    TRAILING_STOP = "TRAILING_STOP"    # Exit: JSON-tracked trailing stop hit
+    TARGET_REACHED = "TARGET_REACHED"  # Not an exit: activate trailing stop
+
+
+@dataclass(frozen=True)
+class ExitIntent:
+    """An action the monitor wants taken for one position"""
+    ticker: str
+    kind: IntentKind
+    price: float
+    return_pct: float
+    reason: str
+    timestamp: str
+
+    @property
+    def is_exit(self) -> bool:
+        return self.kind != IntentKind.TARGET_REACHED
+
+    def to_dict(self) -> Dict:
+        return {
+            'ticker': self.ticker,
+            'kind': self.kind.value,
+            'price': round(self.price, 4),
+            'return_pct': round(self.return_pct, 2),
+            'reason': self.reason,
+            'timestamp': self.timestamp,
+        }
+
+
+@dataclass
+class PositionState:
+    """In-memory exit state for one position (mutated on every tick)"""
+    ticker: str
+    entry_price: float
+    stop_loss: float
+    price_target: float
+    gap_consolidating: bool = False
+    trailing_active: bool = False
+    trailing_stop_price: float = 0.0
+    peak_price: float = 0.0
+    last_price: float = 0.0
+    done: bool = False  # Exit intent emitted - ignore further ticks
+
+    @classmethod
+    def from_position(cls, position: Dict) -> 'PositionState':
+        """Build from a current_portfolio.json position (same defaults as check_position_exits)"""
+        entry_price = float(position['entry_price'])
+        gap_pct = position.get('gap_percent', 0) or 0
+        return cls(
+            ticker=position['ticker'],
+            entry_price=entry_price,
+            stop_loss=float(position.get('stop_loss') or entry_price * (1 - DEFAULT_STOP_LOSS_PCT)),
+            price_target=float(position.get('price_target') or entry_price * (1 + DEFAULT_TARGET_PCT)),
+            gap_consolidating=gap_pct >= LARGE_GAP_PCT and position.get('days_since_large_gap', 0) < GAP_CONSOLIDATION_DAYS,
+            trailing_active=bool(position.get('trailing_stop_active')),
+            trailing_stop_price=float(position.get('trailing_stop_price') or 0.0),
+            peak_price=float(position.get('peak_price') or 0.0),
+        )
+
+    def return_pct(self, price: float) -> float:
+        return (price - self.entry_price) / self.entry_price * 100
+
+
+class PositionMonitor:
+    """
+    Evaluates stop/target/trailing rules for open positions on every trade tick
+
+    Usage:
+        monitor = PositionMonitor(portfolio['positions'], on_intent=handle)
+        monitor.run(ReplayFeed.from_file('ticks.jsonl'))
+    """
+
+    def __init__(self, positions: Iterable[Dict], on_intent: Optional[Callable[[ExitIntent], None]] = None,
+                 broker_trailing: bool = False):
+        """
+        Args:
+            positions: Open positions from current_portfolio.json
+            on_intent: Called synchronously for each intent (keep it fast - queue slow work)
+            broker_trailing: True if Alpaca trailing stop orders execute trailing exits
+        """
+        self.states: Dict[str, PositionState] = {}
+        for position in positions:
+            state = PositionState.from_position(position)
+            self.states[state.ticker] = state
+        self.on_intent = on_intent
+        self.broker_trailing = broker_trailing
+        self.intents: List[ExitIntent] = []
+        self.ticks = 0
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.states)
+
+    def sync(self, positions: Iterable[Dict]) -> List[str]:
+        """
+        Match monitored positions to the current portfolio
+
+        Positions not seen before are added; positions no longer held are marked
+        done so later ticks are ignored. State of positions still held (peak,
+        trailing) is kept.
+
+        Returns:
+            Tickers added by this call (to subscribe on the feed)
+        """
+        held = {}
+        for position in positions:
+            held[position['ticker']] = position
+        added = []
+        for ticker, position in held.items():
+            if ticker not in self.states:
+                self.states[ticker] = PositionState.from_position(position)
+                added.append(ticker)
+        for ticker, state in self.states.items():
+            if ticker not in held:
+                state.done = True
+        return added
+
+    def on_trade(self, ticker: str, price: float, timestamp: Optional[str] = None) -> Optional[ExitIntent]:
+        """Evaluate one trade tick; returns the intent it triggered, if any"""
+        state = self.states.get(ticker)
+        if state is None or state.done or not price or price <= 0:
+            return None
+        self.ticks += 1
+        state.last_price = price
+
+        # PRIORITY 1: Stop loss
+        if price <= state.stop_loss:
+            state.done = True
+            return self._emit(state, IntentKind.STOP_LOSS, price, 'stop loss', timestamp)
+
+        # PRIORITY 2: Trailing stop already active - ratchet peak, exit on pullback
+        if state.trailing_active:
+            if price > state.peak_price:
+                state.peak_price = price
+                state.trailing_stop_price = max(state.trailing_stop_price, price * (1 - TRAIL_PCT))
+            elif not self.broker_trailing and price <= state.trailing_stop_price:
+                state.done = True
+                peak_pct = state.return_pct(state.peak_price)
+                return self._emit(state, IntentKind.TRAILING_STOP, price,
+                                  f"Trailing stop at +{state.return_pct(price):.1f}% (peak +{peak_pct:.1f}%)", timestamp)
+            return None
+
+        # PRIORITY 3: Profit target - activate trailing (unless still in large-gap consolidation)
+        if price >= state.price_target and not state.gap_consolidating:
+            state.trailing_active = True
+            state.trailing_stop_price = state.entry_price * (1 + TRAILING_FLOOR_PCT)
+            state.peak_price = price
+            return self._emit(state, IntentKind.TARGET_REACHED, price,
+                              f"Target reached at +{state.return_pct(price):.1f}%", timestamp)
+
+        return None
+
+    def _emit(self, state: PositionState, kind: IntentKind, price: float, reason: str,
+              timestamp: Optional[str]) -> ExitIntent:
+        intent = ExitIntent(
+            ticker=state.ticker,
+            kind=kind,
+            price=price,
+            return_pct=state.return_pct(price),
+            reason=reason,
+            timestamp=timestamp or datetime.now(ET).isoformat(timespec='seconds'),
+        )
+        self.intents.append(intent)
+        if self.on_intent:
+            self.on_intent(intent)
+        return intent
+
+    def run(self, feed, until: Optional[datetime] = None,
+            refresh: Optional[Callable[[], Iterable[Dict]]] = None, refresh_seconds: float = 60.0):
+        """
+        Consume a feed until it ends, every position has exited, or `until` passes
+
+        The feed runs on a worker thread; this call blocks.
+
+        Args:
+            refresh: Returns the current open positions; called every refresh_seconds
+                and applied with sync(). With a refresh the monitor keeps running
+                after every position has exited - a later entry may still arrive.
+        """
+        runner = threading.Thread(target=feed.run, args=(self.on_trade,), name='monitor-feed', daemon=True)
+        runner.start()
+        next_refresh = time.monotonic() + refresh_seconds
+        try:
+            while runner.is_alive():
+                if until and datetime.now(ET) >= until:
+                    break
+                if refresh is None and self.states and all(state.done for state in self.states.values()):
+                    break
+                if refresh is not None and time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + refresh_seconds
+                    self._refresh(feed, refresh)
+                runner.join(timeout=1.0)
+        finally:
+            feed.stop()
+            runner.join(timeout=10)
+
+    def _refresh(self, feed, refresh: Callable[[], Iterable[Dict]]):
+        try:
+            added = self.sync(refresh())
+        except Exception:
+            return  # Portfolio unreadable right now - keep monitoring what we have, retry next round
+        if added:
+            feed.subscribe(added)
+
+
+# ----------------------------------------------------------------------
+# Feeds
+# ----------------------------------------------------------------------
+
+class ReplayFeed:
+    """
+    Local stand-in for the live stream: replays recorded trade ticks
+
+    Events are dicts with ticker, price and (optional) timestamp. speed=0
+    replays as fast as possible; speed=1.0 keeps the recorded spacing.
+    """
+
+    def __init__(self, events: Iterable[Dict], speed: float = 0.0):
+        self.events = list(events)
+        self.speed = speed
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_file(cls, path, speed: float = 0.0) -> 'ReplayFeed':
+        """Load ticks from JSONL ({"ticker", "price", "timestamp"} per line) or CSV with those columns"""
+        path = Path(path)
+        with open(path) as f:
+            if path.suffix == '.csv':
+                events = [{'ticker': row['ticker'], 'price': float(row['price']), 'timestamp': row.get('timestamp')}
+                          for row in csv.DictReader(f)]
+            else:
+                events = [json.loads(line) for line in f if line.strip()]
+        return cls(events, speed)
+
+    def run(self, on_trade: Callable):
+        previous = None
+        for event in self.events:
+            if self._stop.is_set():
+                break
+            timestamp = event.get('timestamp')
+            if self.speed and previous and timestamp:
+                gap = (datetime.fromisoformat(timestamp) - datetime.fromisoformat(previous)).total_seconds()
+                if gap > 0:
+                    self._stop.wait(gap / self.speed)
+            previous = timestamp or previous
+            on_trade(event['ticker'], float(event['price']), timestamp)
+
+    def subscribe(self, tickers: List[str]):
+        pass  # Recorded ticks already cover every ticker
+
+    def stop(self):
+        self._stop.set()
+
+
+class AlpacaTradeFeed:
+    """Alpaca real-time trade stream (IEX feed by default; set ALPACA_DATA_FEED=sip if subscribed)"""
+
+    def __init__(self, tickers: List[str], api_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 data_feed: Optional[str] = None):
+        self.tickers = list(tickers)
+        self.api_key = api_key or os.environ.get('ALPACA_API_KEY')
+        self.secret_key = secret_key or os.environ.get('ALPACA_SECRET_KEY')
+        self.data_feed = data_feed or os.environ.get('ALPACA_DATA_FEED', 'iex')
+        if not self.api_key or not self.secret_key:
+            raise ValueError("Alpaca API credentials not found. Set ALPACA_API_KEY and ALPACA_SECRET_KEY environment variables.")
+        self._stream = None
+        self._handle_trade = None
+
+    def run(self, on_trade: Callable):
+        from alpaca_trade_api.stream import Stream  # Deferred: heavy import, only needed live
+
+        self._stream = Stream(self.api_key, self.secret_key, data_feed=self.data_feed)
+
+        async def handle_trade(trade):
+            timestamp = trade.timestamp.isoformat() if hasattr(trade.timestamp, 'isoformat') else str(trade.timestamp)
+            on_trade(trade.symbol, float(trade.price), timestamp)
+
+        self._handle_trade = handle_trade
+        self._stream.subscribe_trades(handle_trade, *self.tickers)
+        self._stream.run()
+
+    def subscribe(self, tickers: List[str]):
+        """Add tickers to a running stream (positions entered after the monitor started)"""
+        new = [ticker for ticker in tickers if ticker not in self.tickers]
+        self.tickers.extend(new)
+        if new and self._stream is not None and self._handle_trade is not None:
+            self._stream.subscribe_trades(self._handle_trade, *new)
+
+    def stop(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+            except Exception:
+                pass  # Stream already closed
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+RECHECK queue - stocks EXECUTE skipped for gaps, awaiting re-evaluation
+
+Kept separate from agent_v5.5.py (and free of heavy imports) so agent_cli.py
+can answer "nothing to recheck" - the common case - without loading the agent.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+SKIPPED_FILE_NAME = 'skipped_for_gap.json'
+
+
+def load_recheck_queue(project_dir: Path) -> Tuple[List[Dict], List[str], Optional[str]]:
+    """
+    Load today's gap-skipped stocks
+
+    Returns:
+        (stocks, notes, response):
+        - stocks: stocks to re-evaluate (empty when there is nothing to do)
+        - notes: console lines explaining why there is nothing to do
+        - response: message saved to daily_reviews when there is nothing to do
+    """
+    skipped_file = Path(project_dir) / SKIPPED_FILE_NAME
+    if not skipped_file.exists():
+        return [], ["\n✓ No skipped stocks file found.",
+                    "   (No stocks were skipped for gaps during EXECUTE)"], \
+            "No stocks skipped for gaps - nothing to recheck"
+
+    with open(skipped_file) as f:
+        skipped_data = json.load(f)
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    if skipped_data.get('date') != today:
+        return [], [f"\n✓ Skipped stocks file is from {skipped_data.get('date')}, not today ({today}).",
+                    "   (Stale file from previous day - ignoring)"], \
+            f"Skipped file from {skipped_data.get('date')} - stale, nothing to recheck today"
+
+    stocks = skipped_data.get('stocks', [])
+    if not stocks:
+        return [], ["\n✓ Skipped stocks file exists but is empty."], "Skipped file empty - nothing to recheck"
+
+    return stocks, [], None
+
+
+def report_nothing_to_recheck(notes: List[str], response: str, save_response: Callable[[str, str], None]):
+    """Print the empty RECHECK summary and save the daily review entry"""
+    for line in notes:
+        print(line)
+    print(f"\n{'='*60}")
+    print(f"RECHECK SUMMARY")
+    print(f"{'='*60}")
+    print(f"   Stocks checked:  0")
+    print(f"   Entered:         0")
+    print(f"   Still skipped:   0")
+    save_response("recheck", response)
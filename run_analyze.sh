@@ -55,6 +55,14 @@ if [ ! -f "/root/.env" ]; then
 fi
 source /root/.env
 
+# v10.8: Route through the resident agent daemon when enabled (AGENT_DAEMON_ENABLED=true)
+# agent_daemon.py send falls back to a direct run if the daemon is not listening
+if [ "${AGENT_DAEMON_ENABLED:-false}" = "true" ]; then
+    AGENT_RUN="python3 agent_daemon.py send"
+else
+    AGENT_RUN="python3 agent_cli.py"  # Same as $AGENT_SCRIPT, but cached bytecode + quick paths
+fi
+
 # Verify agent script exists
 if [ ! -f "$AGENT_SCRIPT" ]; then
     update_status "FAILED" "Agent script not found: $AGENT_SCRIPT"
@@ -66,7 +74,7 @@ echo "============================================================" >> "$LOG_FIL
 echo "ANALYZE Command Starting: $(date)" >> "$LOG_FILE"
 echo "============================================================" >> "$LOG_FILE"
 
-if python3 "$AGENT_SCRIPT" analyze >> "$LOG_FILE" 2>&1; then
+if $AGENT_RUN analyze >> "$LOG_FILE" 2>&1; then
     # Success
     update_status "SUCCESS"
     echo "ANALYZE command completed successfully: $(date)" >> "$LOG_FILE"
@@ -0,0 +1,40 @@
+#!/bin/bash
+# Wrapper script for the resident agent daemon (v10.8)
+# Start once (e.g. @reboot cron or systemd); see agent_daemon.py for details
+#
+# Pass --no-schedule to keep cron in charge of timing and only use the
+# daemon as a warm executor for the run_*.sh wrappers.
+
+# Configuration
+SCRIPT_DIR="/root/paper_trading_lab"
+LOG_FILE="$SCRIPT_DIR/logs/daemon.log"
+
+mkdir -p "$SCRIPT_DIR/logs"
+
+# Change to script directory
+cd "$SCRIPT_DIR" || {
+    echo "Could not change to directory $SCRIPT_DIR" >&2
+    exit 1
+}
+
+# Activate virtual environment
+if [ ! -f "venv/bin/activate" ]; then
+    echo "Virtual environment not found at venv/bin/activate" >&2
+    exit 1
+fi
+source venv/bin/activate
+
+# Load environment variables (exported so the daemon process sees them)
+if [ ! -f "config/.env" ]; then
+    echo "Environment file not found at config/.env" >&2
+    exit 1
+fi
+set -a
+source config/.env
+set +a
+
+echo "============================================================" >> "$LOG_FILE"
+echo "Agent Daemon Starting: $(date)" >> "$LOG_FILE"
+echo "============================================================" >> "$LOG_FILE"
+
+exec python3 -u agent_daemon.py serve "$@" >> "$LOG_FILE" 2>&1
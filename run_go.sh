@@ -52,6 +52,14 @@ if [ ! -f "config/.env" ]; then
 fi
 source config/.env
 
+# v10.8: Route through the resident agent daemon when enabled (AGENT_DAEMON_ENABLED=true)
+# agent_daemon.py send falls back to a direct run if the daemon is not listening
+if [ "${AGENT_DAEMON_ENABLED:-false}" = "true" ]; then
+    AGENT_RUN="python3 agent_daemon.py send"
+else
+    AGENT_RUN="python3 agent_cli.py"  # Same as $AGENT_SCRIPT, but cached bytecode + quick paths
+fi
+
 # ============================================================
 # MARKET HOLIDAY CHECK (v8.9.8)
 # Skip trading on weekends and US market holidays
@@ -78,7 +86,7 @@ echo "============================================================" >> "$LOG_FIL
 echo "GO Command Starting: $(date)" >> "$LOG_FILE"
 echo "============================================================" >> "$LOG_FILE"
 
-if python3 "$AGENT_SCRIPT" go >> "$LOG_FILE" 2>&1; then
+if $AGENT_RUN go >> "$LOG_FILE" 2>&1; then
     # Success
     update_status "SUCCESS"
     echo "GO command completed successfully: $(date)" >> "$LOG_FILE"
@@ -74,6 +74,15 @@ while IFS= read -r line; do
     fi
 done < config/.env
 
+# v10.8: Route through the resident agent daemon when enabled (AGENT_DAEMON_ENABLED=true)
+if [ "${AGENT_DAEMON_ENABLED:-false}" = "true" ]; then
+    SCREENER_RUN="python3 agent_daemon.py send screener"
+    PRE_GO_RUN="python3 agent_daemon.py send pre_go"
+else
+    SCREENER_RUN="python3 $SCREENER_SCRIPT"
+    PRE_GO_RUN="python3 agent_cli.py pre_go"
+fi
+
 # ============================================================
 # MARKET HOLIDAY CHECK (v8.9.8)
 # Skip trading on weekends and US market holidays
@@ -100,7 +109,7 @@ echo "============================================================" >> "$LOG_FIL
 echo "Market Screener Starting: $(date)" >> "$LOG_FILE"
 echo "============================================================" >> "$LOG_FILE"
 
-if python3 "$SCREENER_SCRIPT" >> "$LOG_FILE" 2>&1; then
+if $SCREENER_RUN >> "$LOG_FILE" 2>&1; then
     # Success - Extract stats from screener_candidates.json (v7.0 metrics)
     CANDIDATES_FILE="$SCRIPT_DIR/screener_candidates.json"
     if [ -f "$CANDIDATES_FILE" ]; then
@@ -132,6 +141,18 @@ EOF
     fi
 
     echo "Market screener completed successfully: $(date)" >> "$LOG_FILE"
+
+    # v10.8: Optional pre-GO preparation (set PRE_GO_ENABLED=true in config/.env)
+    # Failure here never fails the screener - GO falls back to building everything itself
+    if [ "${PRE_GO_ENABLED:-false}" = "true" ]; then
+        echo "Pre-GO preparation starting: $(date)" >> "$LOG_FILE"
+        if $PRE_GO_RUN >> "$LOG_FILE" 2>&1; then
+            echo "Pre-GO preparation completed: $(date)" >> "$LOG_FILE"
+        else
+            echo "Pre-GO preparation failed (GO will run without it): $(date)" >> "$LOG_FILE"
+        fi
+    fi
+
     exit 0
 else
     # Failure
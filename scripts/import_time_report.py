@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Import-time report - startup cost of each entry point, per imported module
+
+Runs each entry point in a fresh interpreter under `python -X importtime` and
+reports its total load time plus the modules with the highest cumulative
+import cost. Save a run with --json and compare later runs against it with
+--baseline to catch a heavy dependency creeping back into startup.
+
+Usage:
+  python3 scripts/import_time_report.py
+  python3 scripts/import_time_report.py --top 15 --json reports/import_time_baseline.json
+  python3 scripts/import_time_report.py --baseline reports/import_time_baseline.json
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+# Entry point -> code that loads it (printing its own load time in ms last)
+ENTRY_POINTS = {
+    'agent_cli': 'import agent_cli',
+    'agent': 'import agent_cli; agent_cli.load_agent_module()',
+    'screener': 'import market_screener',
+    'alpaca_broker': 'import alpaca_broker',
+}
+
+_TIMER = ('import time as _t; _s = _t.perf_counter(); {code}; '
+          'print("__LOAD_MS__", round((_t.perf_counter() - _s) * 1000, 1))')
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(code: str, runs: int = 3) -> Dict:
+    """Best-of-N load time and the per-module import table of the fastest run"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _TIMER.format(code=code)],
+            cwd=str(PROJECT_DIR), capture_output=True, text=True
+        )
+        load_ms = None
+        for line in result.stdout.splitlines():
+            if line.startswith('__LOAD_MS__'):
+                load_ms = float(line.split()[1])
+        if load_ms is None:
+            raise RuntimeError(f"Entry point failed to load:\n{result.stderr[-2000:]}")
+
+        modules = []
+        for line in result.stderr.splitlines():
+            match = _LINE_RE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                modules.append({
+                    'module': name,
+                    'self_ms': int(self_us) / 1000,
+                    'cumulative_ms': int(cumulative_us) / 1000,
+                    'depth': (len(indent) - 1) // 2,
+                })
+        if best is None or load_ms < best['load_ms']:
+            best = {'load_ms': load_ms, 'modules': modules}
+    return best
+
+
+def build_report(top: int, runs: int) -> Dict:
+    report = {}
+    for name, code in ENTRY_POINTS.items():
+        result = measure(code, runs)
+        heaviest = sorted(result['modules'], key=lambda m: m['cumulative_ms'], reverse=True)[:top]
+        report[name] = {
+            'load_ms': result['load_ms'],
+            'modules_imported': len(result['modules']),
+            'top_modules': [{k: m[k] for k in ('module', 'cumulative_ms', 'self_ms')} for m in heaviest],
+        }
+    return report
+
+
+def print_report(report: Dict, baseline: Dict = None):
+    print(f"\nIMPORT-TIME REPORT ({sys.executable})")
+    print("=" * 70)
+    for name, entry in report.items():
+        delta = ''
+        if baseline and name in baseline:
+            diff = entry['load_ms'] - baseline[name]['load_ms']
+            delta = f"  ({diff:+.1f} ms vs baseline)"
+        print(f"\n{name}: {entry['load_ms']:.1f} ms, {entry['modules_imported']} modules{delta}")
+        print(f"   {'Module':<45} {'Cumulative ms':>14} {'Self ms':>9}")
+        for module in entry['top_modules']:
+            print(f"   {module['module']:<45} {module['cumulative_ms']:>14.1f} {module['self_ms']:>9.1f}")
+    print("=" * 70)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Per-module import cost of each entry point')
+    parser.add_argument('--top', type=int, default=10, help='Modules to list per entry point')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per entry point (fastest is kept)')
+    parser.add_argument('--json', help='Save the report as JSON')
+    parser.add_argument('--baseline', help='Compare load times against a saved report')
+    args = parser.parse_args(argv)
+
+    report = build_report(args.top, args.runs)
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    print_report(report, baseline)
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"Saved to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
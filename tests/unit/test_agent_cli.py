@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the fast agent launcher (agent_cli.py)
+
+Runs the launcher in fresh interpreters and checks which modules each
+command path imported:
+- status never loads the agent
+- recheck with nothing skipped today is answered without the agent
+- Commands that go through the agent import it without pandas, numpy,
+  anthropic, alpaca-trade-api or sendgrid (deferred until a command needs them)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_DIR))
+
+print('Testing Agent CLI Lazy Imports')
+print('=' * 80)
+
+HEAVY = ('pandas', 'numpy', 'anthropic', 'alpaca_trade_api', 'sendgrid')
+
+# Runs agent_cli.main() for argv[1:] with PROJECT_DIR in a temp dir, then
+# prints {'exit': code, 'loaded': [...]} as the last line
+PROBE = '''
+import json, sys
+from pathlib import Path
+sys.path.insert(0, {repo!r})
+import agent_cli
+agent_cli.PROJECT_DIR = Path({project!r})
+agent_cli.STATUS_DIR = agent_cli.PROJECT_DIR / 'dashboard_data' / 'operation_status'
+sys.argv = ['agent_cli.py'] + {args!r}
+try:
+    code = agent_cli.main()
+except SystemExit as e:
+    code = e.code
+names = {names!r}
+print(json.dumps({{'exit': code, 'loaded': [n for n in names if n in sys.modules]}}))
+'''
+
+
+def run(*args):
+    with tempfile.TemporaryDirectory() as tmp:
+        probe = PROBE.format(repo=str(REPO_DIR), project=tmp, args=list(args),
+                             names=list(HEAVY) + ['agent_v5_5', 'recheck_queue'])
+        completed = subprocess.run([sys.executable, '-c', probe], cwd=tmp, capture_output=True, text=True,
+                                   env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}, timeout=60)
+        lines = completed.stdout.strip().splitlines()
+        return json.loads(lines[-1]) if lines else {'exit': None, 'loaded': [], 'stderr': completed.stderr}
+
+
+results = []
+
+status = run('status')
+results.append(('status answered without the agent', status['exit'] == 0 and status['loaded'] == []))
+
+recheck = run('recheck')
+results.append(('recheck with nothing skipped skips the agent', recheck['exit'] == 0
+                and recheck['loaded'] == ['recheck_queue']))
+
+agent_path = run('no_such_command')
+results.append(('Agent path loads the agent', agent_path['exit'] == 1 and 'agent_v5_5' in agent_path['loaded']))
+results.append(('Agent import defers pandas/numpy/anthropic/alpaca/sendgrid',
+                not set(agent_path['loaded']) & set(HEAVY)))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Agent CLI lazy imports working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
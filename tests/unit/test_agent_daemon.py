@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for the resident agent daemon (agent_daemon.py)
+
+Checks:
+- A screener run through the daemon gets the same deadline as a cron-launched
+  scan (SCREENER_DEADLINE, or SCREENER_BUDGET_SECONDS once it has passed)
+- Degraded-data flags left by the previous command in the process are cleared
+  before the scan, and the deadline is lifted afterwards
+- run_command starts every command with clean per-command state (daily-bar
+  windows, correlation matrices, counters)
+- Schedule: weekdays, holidays, early-close times, grace window, overrides
+- Control socket: runs commands, skips repeats, keeps MONITOR out of the daemon
+"""
+
+import io
+import json
+import socket
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import agent_daemon
+import correlation
+import market_screener
+from agent_daemon import AgentDaemon, due_jobs, load_schedule
+from market_data import MARKET_DATA, current_deadline
+from warm_cache import ET, WARM_CACHE
+
+print('Testing Agent Daemon')
+print('=' * 80)
+
+seen = {}
+
+
+class FakeScreener:
+    def run_scan(self):
+        seen['deadline'] = current_deadline()
+        seen['quality'] = MARKET_DATA.data_quality()
+        return {'candidates': []}
+
+    def save_results(self, scan_output):
+        seen['saved'] = scan_output
+
+
+results = []
+
+daemon = object.__new__(AgentDaemon)
+daemon.screener_module = market_screener
+market_screener.MarketScreener = FakeScreener
+market_screener.SCREENER_DEADLINE = '00:00'  # Already passed: the run gets the seconds budget
+market_screener.SCREENER_BUDGET_SECONDS = 60
+
+MARKET_DATA.flag('deadline', 'daily_bars', 12)  # Left by the previous command in this process
+with redirect_stdout(io.StringIO()):
+    success = daemon._execute('screener', [])
+
+deadline = seen.get('deadline')
+results.append(('Scan saved', success and seen.get('saved') == {'candidates': []}))
+results.append(('Daemon scan runs under the screener deadline', deadline is not None and deadline.label == 'screener'
+                and 0 < deadline.remaining() <= 60))
+results.append(('Previous command flags cleared', seen['quality']['flags'] == {} and not seen['quality']['degraded']))
+results.append(('Deadline lifted after the scan', current_deadline() is None))
+
+# Per-command state in a resident process
+with redirect_stdout(io.StringIO()):
+    agent_module = agent_daemon.load_agent_module()
+agent = object.__new__(agent_module.TradingAgent)
+agent.use_alpaca = False
+agent.broker = None
+agent._daily_aggs_cache = {'AAA': {'fetched_on': '2026-03-09', 'start': '2025-02-01', 'results': []}}
+correlation.CORRELATION_ENGINE._matrices.append(object())
+correlation.CORRELATION_ENGINE.stats['built'] = 3
+MARKET_DATA.failovers = 4
+WARM_CACHE.stats['hits'] = 7
+agent_module._dispatch_command = lambda agent, command, args: seen.update(
+    windows=dict(agent._daily_aggs_cache), matrices=list(correlation.CORRELATION_ENGINE._matrices),
+    failovers=MARKET_DATA.failovers, cache_hits=WARM_CACHE.stats['hits']) or True
+agent_module.LEDGER_AVAILABLE = False
+agent_module.INDICATOR_STATE_AVAILABLE = False
+agent_module.MINUTE_VWAP_AVAILABLE = False
+with redirect_stdout(io.StringIO()):
+    agent_module.run_command(agent, 'exit')
+results.append(('Command starts without earlier windows and matrices', seen['windows'] == {} and seen['matrices'] == []))
+results.append(('Command counters start at zero', seen['failovers'] == 0 and seen['cache_hits'] == 0
+                and correlation.CORRELATION_ENGINE.stats['built'] == 0))
+
+# Scheduler
+schedule = load_schedule('')
+monday = datetime(2026, 3, 9, 9, 0, 30, tzinfo=ET)
+results.append(('GO due at 9:00 on a weekday', due_jobs(schedule, monday, {}) == ['go']))
+results.append(('Completed job not due again', due_jobs(schedule, monday, {'go': '2026-03-09'}) == []))
+results.append(('Grace window passed', due_jobs(schedule, datetime(2026, 3, 9, 9, 31, tzinfo=ET), {}) == []))
+results.append(('Nothing on weekends or holidays', due_jobs(schedule, datetime(2026, 3, 7, 9, 0, tzinfo=ET), {}) == []
+                and due_jobs(schedule, datetime(2026, 7, 3, 9, 0, tzinfo=ET), {}) == []))
+results.append(('EXIT moved up on early-close days', due_jobs(schedule, datetime(2026, 11, 27, 12, 46, tzinfo=ET), {})
+                == ['exit'] and due_jobs(schedule, datetime(2026, 11, 27, 15, 46, tzinfo=ET), {}) == []))
+learn_fridays = [(c, at, days) for c, at, days in schedule if c == 'learn'] == [('learn', '17:00', (4,))]
+overridden = {c: at for c, at, _ in load_schedule('go=09:05,learn=off')}
+results.append(('Schedule overrides', learn_fridays and overridden['go'] == '09:05' and 'learn' not in overridden))
+
+# Control socket
+with tempfile.TemporaryDirectory() as tmp:
+    agent_daemon.SOCKET_PATH = Path(tmp) / 'agent_daemon.sock'
+    daemon = object.__new__(AgentDaemon)
+    daemon.schedule = schedule
+    daemon.started_at = datetime.now(ET)
+    daemon.completed = {}
+    daemon.history = []
+    daemon.current = None
+    daemon._run_lock = threading.Lock()
+    daemon._stop = threading.Event()
+    ran = []
+    daemon._execute = lambda command, args: print(f"ran {command} {args}") or ran.append(command) or True
+
+    def send(request):
+        """Raw client: the daemon redirects this process's sys.stdout while a command runs"""
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(str(agent_daemon.SOCKET_PATH))
+        with client, client.makefile('rb') as reply:
+            client.sendall((json.dumps(request) + '\n').encode('utf-8'))
+            lines = [raw.decode('utf-8') for raw in reply]
+        code = int(lines[-1].split()[1]) if lines and lines[-1].startswith(agent_daemon.EXIT_MARKER) else None
+        return code, ''.join(lines[:-1])
+
+    with redirect_stdout(io.StringIO()):
+        daemon._start_socket_server()
+    try:
+        first = send({'action': 'run', 'command': 'go', 'args': []})
+        repeat = send({'action': 'run', 'command': 'go', 'args': []})
+        learn = send({'action': 'run', 'command': 'learn', 'args': ['60']})
+        monitor = send({'action': 'run', 'command': 'monitor'})
+        unknown = send({'action': 'run', 'command': 'rm'})
+        with redirect_stdout(io.StringIO()):
+            ping = agent_daemon.send_request({'action': 'ping'})
+    finally:
+        daemon._server.shutdown()
+        daemon._server.server_close()
+
+results.append(('Socket runs a command and streams its output', first[0] == 0 and 'ran go []' in first[1]))
+results.append(('Once-per-day command skipped on repeat', repeat[0] == 0 and 'already completed today' in repeat[1]
+                and ran == ['go', 'learn'] and "ran learn ['60']" in learn[1]))
+results.append(('MONITOR and unknown commands refused', monitor[0] == 2 and 'own process' in monitor[1]
+                and unknown[0] == 2 and ping == 0))
+
+launched = []
+agent_daemon.run_directly = lambda command, args: launched.append((command, args)) or 0
+agent_daemon.send_request = lambda request: launched.append('socket') or 0
+sys.argv = ['agent_daemon.py', 'send', 'monitor', 'ticks.jsonl']
+with redirect_stdout(io.StringIO()):
+    code = agent_daemon.main()
+results.append(('send monitor starts its own process', code == 0 and launched == [('monitor', ['ticks.jsonl'])]))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Agent daemon working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the EXECUTE allocation solver (allocation.py)
+
+Checks:
+- With enough cash every buy gets its requested size (per-name cap applies)
+- Scarce cash funds higher conviction first, regardless of list order, and
+  splits a tier pro rata
+- Sector exposure (held + new) is capped
+- Buys cut below the minimum or one share are dropped and their cash redistributed
+- TradingAgent.plan_buy_allocation feeds held sector exposure into the solver
+- The agent finds allocation.py when loaded by path from another directory
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agent_cli import load_agent_module
+from allocation import BuyRequest, conviction_of, solve_allocation
+
+print('Testing Allocation Solver')
+print('=' * 80)
+
+
+def buy(ticker, pct, conviction='MEDIUM', sector='Technology', price=50.0):
+    return BuyRequest(ticker=ticker, price=price, requested_pct=pct, sector=sector, conviction=conviction)
+
+
+def sizes(plan):
+    return {o.ticker: o.dollars for o in plan.orders}
+
+
+results = []
+
+plan = solve_allocation([buy('AAA', 10), buy('BBB', 20, sector='Energy')], 10000, 5000)
+results.append(('Enough cash: requested sizes, per-name cap', sizes(plan) == {'AAA': 1000, 'BBB': 1500}
+                and plan.get('BBB').constraints == ['per-name cap'] and plan.cash_after == 2500))
+
+# MEDIUM listed first used to take the cash; HIGH is funded first now
+plan = solve_allocation([buy('MED', 10, sector='Energy'), buy('HI', 10, 'HIGH', sector='Health')], 10000, 1500)
+results.append(('Higher conviction funded first', sizes(plan) == {'MED': 500, 'HI': 1000}
+                and plan.get('MED').constraints == ['cash'] and [o.ticker for o in plan.orders] == ['MED', 'HI']))
+
+plan = solve_allocation([buy('A', 10, sector='S1'), buy('B', 5, sector='S2')], 10000, 900)
+results.append(('Tier split pro rata', sizes(plan) == {'A': 600, 'B': 300}))
+
+plan = solve_allocation([buy('NEW1', 10), buy('NEW2', 10), buy('OIL', 10, sector='Energy')], 10000, 9000,
+                        sector_exposure={'Technology': 2000})
+results.append(('Sector cap counts held exposure', sizes(plan) == {'NEW1': 500, 'NEW2': 500, 'OIL': 1000}
+                and 'sector cap' in plan.get('NEW1').constraints))
+
+# 3 x 10% with $1,000 cash: $333 each is above the $300 minimum
+plan = solve_allocation([buy('A', 10, sector='S1'), buy('B', 10, sector='S2'), buy('C', 10, sector='S3')], 10000, 1000)
+results.append(('Pro-rata sizes above the minimum are kept', len(plan.orders) == 3 and plan.total_dollars >= 999.99))
+
+# HIGH 5% takes $500; the MEDIUM pair shares the rest
+plan = solve_allocation([buy('H', 5, 'HIGH', sector='S1'), buy('M1', 10, sector='S2'), buy('M2', 10, sector='S3')],
+                        10000, 700)
+results.append(('Undersized buys dropped, cash redistributed', sizes(plan) == {'H': 500}
+                and sorted(t for t, _ in plan.dropped) == ['M1', 'M2']))
+plan = solve_allocation([buy('H', 5, 'HIGH', sector='S1'), buy('M1', 10, sector='S2'), buy('M2', 10, sector='S3')],
+                        10000, 1000)
+results.append(('Dropping one funds the other', sizes(plan) == {'H': 500, 'M2': 500}
+                and plan.dropped == [('M1', 'Allocation $250.00 below 3.0% minimum (limited by cash)')]))
+
+plan = solve_allocation([buy('PRICY', 10, price=1500.0), buy('SMALL', 2, sector='S2')], 10000, 1200)
+results.append(('Below one share dropped; small request keeps its size',
+                [t for t, _ in plan.dropped] == ['PRICY'] and 'one share' in plan.dropped[0][1]
+                and sizes(plan) == {'SMALL': 200}))
+
+results.append(('Conviction from GO, else confidence', conviction_of({'conviction_level': 'HIGH', 'confidence': 'low'}) == 'HIGH'
+                and conviction_of({'confidence': 'medium-high'}) == 'MEDIUM-HIGH' and conviction_of({}) == 'MEDIUM'))
+
+# Agent: held positions feed sector exposure
+agent_module = load_agent_module()
+agent = object.__new__(agent_module.TradingAgent)
+candidates = [({'ticker': 'NVDA', 'sector': 'Technology', 'position_size_pct': 10, 'conviction_level': 'HIGH'}, 100.0, {}),
+              ({'ticker': 'XOM', 'sector': 'Energy', 'position_size_pct': 10}, 100.0, {})]
+held = [{'ticker': 'AMD', 'sector': 'Technology', 'position_size': 2500}]
+plan = agent.plan_buy_allocation(candidates, 10000, 5000, held)
+results.append(('Agent plan uses held sector exposure', sizes(plan) == {'NVDA': 500, 'XOM': 1000}))
+
+# Agent loaded by path (as tests/unit/test_technical_indicators.py does), repo root not on sys.path
+agent_path = Path(__file__).resolve().parents[2] / 'agent_v5.5.py'
+load_by_path = (f"import importlib.util; spec = importlib.util.spec_from_file_location('agent', {str(agent_path)!r}); "
+                "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module); "
+                "print(module.solve_allocation.__module__)")
+with tempfile.TemporaryDirectory() as tmp:
+    loaded = subprocess.run([sys.executable, '-I', '-c', load_by_path], cwd=tmp, capture_output=True, text=True)
+results.append(('Agent loads allocation from its own directory', loaded.returncode == 0
+                and loaded.stdout.strip().endswith('allocation')))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Allocation solver working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the struct-of-arrays daily bar type (bar_series.py)
+
+Checks:
+- Polygon results become typed arrays with correct ET trading dates (EST and EDT)
+- Slicing (by position and by date) is zero-copy
+- Bar views answer Polygon- and agent-style keys
+- Cached column form round-trips, and the warm cache serves BarSeries
+"""
+
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+
+from bar_series import BarSeries, to_date, to_day
+from warm_cache import ET, WarmCache
+
+print('Testing Bar Series')
+print('=' * 80)
+
+
+def polygon_bar(date_str, close, hour=0):
+    """Polygon daily bars are stamped at ET midnight"""
+    stamp = datetime.strptime(date_str, '%Y-%m-%d').replace(hour=hour, tzinfo=ET)
+    return {'t': int(stamp.timestamp() * 1000), 'o': close - 1, 'h': close + 1, 'l': close - 2, 'c': close, 'v': 1000 + close}
+
+
+results = []
+dates = ['2026-01-05', '2026-03-06', '2026-03-09', '2026-07-01', '2026-11-02', '2026-12-31']
+raw = [polygon_bar(d, 10.0 + i) for i, d in enumerate(dates)]
+bars = BarSeries.from_polygon(raw)
+
+results.append(('Typed columns', bars.day.dtype == np.int32 and bars.close.dtype == np.float64
+                and bars.volume.dtype == np.int64 and len(bars) == 6))
+results.append(('ET dates across DST changes', bars.dates() == dates))
+results.append(('Intraday stamps keep their ET date',
+                BarSeries.from_polygon([polygon_bar('2026-07-01', 5, hour=22), polygon_bar('2026-12-01', 5, hour=22)]).dates()
+                == ['2026-07-01', '2026-12-01']))
+results.append(('Epoch day helpers round-trip', to_date(to_day('2026-03-09')) == '2026-03-09'))
+
+tail = bars[-3:]
+since = bars.since('2026-03-07')
+results.append(('Slices are views', np.shares_memory(tail.close, bars.close) and np.shares_memory(since.close, bars.close)))
+results.append(('since/until by date', since.dates() == dates[2:] and bars.until('2026-03-09').dates() == dates[:3]))
+results.append(('index_of finds exact dates', bars.index_of('2026-07-01') == 3 and bars.index_of('2026-07-02') is None))
+
+bar = bars[-1]
+results.append(('Bar view keys', bar['c'] == 15.0 and bar['close'] == 15.0 and bar['h'] == 16.0
+                and bar['volume'] == 1015 and bar['date'] == '2026-12-31' and bar['t'] == raw[-1]['t']))
+results.append(('Iteration and negative index', [b['c'] for b in bars] == [r['c'] for r in raw] and bars[-6]['c'] == 10.0))
+results.append(('Empty series is falsy', not BarSeries.empty() and bars.last_bar_time().hour == 0))
+
+restored = BarSeries.from_columns(bars.to_columns())
+results.append(('Column form round-trips', all(np.array_equal(getattr(restored, f), getattr(bars, f))
+                                                for f in ('day', 'open', 'high', 'low', 'close', 'volume'))))
+
+with tempfile.TemporaryDirectory() as tmp:
+    cache = WarmCache(Path(tmp) / 'cache.sqlite3')
+    cache.put_daily_bars('AAPL', '2026-01-01', bars)
+    served = cache.get_daily_bars('AAPL', '2026-03-01')
+    results.append(('Warm cache serves sliced BarSeries', isinstance(served, BarSeries) and served.dates() == dates[1:]))
+    cache.set('daily_bars', 'MSFT', {'start': '2026-01-01', 'results': raw})  # Entry written before BarSeries
+    results.append(('Older cached results still load', cache.get_daily_bars('MSFT', '2026-01-01').dates() == dates))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Bar series working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
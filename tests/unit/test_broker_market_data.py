@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-symbol broker market data methods (alpaca_broker.py)
+
+Uses an in-memory stand-in for the Alpaca REST client and checks:
+- Latest trades/quotes/snapshots are requested in MARKET_DATA_BATCH_SIZE chunks,
+  symbols deduplicated and order kept
+- A failed chunk is skipped (logged) and the other chunks still return
+- Symbols without a trade/quote (or a zero price) are omitted
+- get_last_prices fills missing symbols with 0.0
+- EXIT's fetch_alpaca_realtime_prices gets Polygon prices for exactly the
+  tickers Alpaca returned nothing for
+"""
+
+import io
+import logging
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import alpaca_broker
+from agent_cli import load_agent_module
+from alpaca_broker import AlpacaBroker
+
+print('Testing Broker Multi-Symbol Market Data')
+print('=' * 80)
+
+logging.disable(logging.WARNING)  # Failed-chunk warnings are expected here
+alpaca_broker.MARKET_DATA_BATCH_SIZE = 3
+
+
+class FakeRest:
+    """Records each multi-symbol request; chunks containing `failing` raise"""
+
+    def __init__(self, failing=None):
+        self.requests = []
+        self.failing = failing
+
+    def _request(self, name, symbols):
+        self.requests.append((name, list(symbols)))
+        if self.failing in symbols:
+            raise Exception('503 Service Unavailable')
+
+    def get_latest_trades(self, symbols):
+        self._request('trades', symbols)
+        return {s: (None if s == 'NOTRADE' else SimpleNamespace(price=0 if s == 'ZERO' else 10.0 + len(s)))
+                for s in symbols}
+
+    def get_latest_quotes(self, symbols):
+        self._request('quotes', symbols)
+        return {s: (None if s == 'NOTRADE' else SimpleNamespace(bid_price=9.9, ask_price=10.1, bid_size=3,
+                                                               ask_size=None, timestamp='2026-03-10T15:45:00Z'))
+                for s in symbols}
+
+    def get_snapshots(self, symbols):
+        self._request('snapshots', symbols)
+        return {s: (None if s == 'NOTRADE' else SimpleNamespace(symbol=s)) for s in symbols}
+
+
+def make_broker(failing=None):
+    broker = object.__new__(AlpacaBroker)  # Skip __init__ (needs credentials and the SDK)
+    broker.api = FakeRest(failing)
+    return broker
+
+
+results = []
+
+tickers = ['A', 'BB', 'A', 'CCC', 'NOTRADE', 'ZERO', 'DD', 'E']
+broker = make_broker()
+trades = broker.get_latest_trades(tickers)
+results.append(('Trades chunked, deduplicated, order kept', broker.api.requests == [
+    ('trades', ['A', 'BB', 'CCC']), ('trades', ['NOTRADE', 'ZERO', 'DD']), ('trades', ['E'])]))
+results.append(('Missing and zero-price trades omitted',
+                trades == {'A': 11.0, 'BB': 12.0, 'CCC': 13.0, 'DD': 12.0, 'E': 11.0}))
+results.append(('get_last_prices fills missing with 0.0',
+                broker.get_last_prices(['A', 'NOTRADE']) == {'A': 11.0, 'NOTRADE': 0.0}))
+
+broker = make_broker(failing='CCC')
+trades = broker.get_latest_trades(tickers)
+results.append(('Failed chunk skipped, other chunks returned',
+                len(broker.api.requests) == 3 and sorted(trades) == ['DD', 'E']))
+
+broker = make_broker(failing='E')
+quotes = broker.get_latest_quotes(tickers)
+results.append(('Quotes chunked like trades', [r[1] for r in broker.api.requests] == [
+    ['A', 'BB', 'CCC'], ['NOTRADE', 'ZERO', 'DD'], ['E']]))
+results.append(('Quotes converted, missing and failed omitted',
+                sorted(quotes) == ['A', 'BB', 'CCC', 'DD', 'ZERO']
+                and quotes['A'] == {'bid': 9.9, 'ask': 10.1, 'bid_size': 3, 'ask_size': 0,
+                                    'timestamp': '2026-03-10T15:45:00Z'}))
+
+broker = make_broker()
+snapshots = broker.get_snapshots(tickers)
+results.append(('Snapshots chunked, missing omitted',
+                len(broker.api.requests) == 3 and 'NOTRADE' not in snapshots and len(snapshots) == 6))
+
+# EXIT prices: Polygon only for the tickers Alpaca returned nothing for
+with redirect_stdout(io.StringIO()):
+    agent_module = load_agent_module()
+agent = object.__new__(agent_module.TradingAgent)
+agent.use_alpaca = True
+agent.broker = make_broker(failing='CCC')
+polygon_requests = []
+
+
+def fake_polygon(requested):
+    polygon_requests.append(list(requested))
+    return {t: 50.0 for t in requested if t != 'NOTRADE'}
+
+
+agent.fetch_current_prices = fake_polygon
+with redirect_stdout(io.StringIO()) as out:
+    prices = agent.fetch_alpaca_realtime_prices(['A', 'BB', 'CCC', 'NOTRADE', 'ZERO', 'DD', 'E'])
+results.append(('Polygon fallback only for missing tickers',
+                polygon_requests == [['A', 'BB', 'CCC', 'NOTRADE', 'ZERO']]))
+results.append(('Alpaca and Polygon prices merged',
+                prices == {'DD': 12.0, 'E': 11.0, 'A': 50.0, 'BB': 50.0, 'CCC': 50.0, 'ZERO': 50.0}
+                and 'No price for NOTRADE' in out.getvalue()))
+
+agent.broker = make_broker()
+polygon_requests.clear()
+with redirect_stdout(io.StringIO()):
+    prices = agent.fetch_alpaca_realtime_prices(['A', 'BB'])
+results.append(('No Polygon request when Alpaca has every price', polygon_requests == [] and len(prices) == 2))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Broker market data working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
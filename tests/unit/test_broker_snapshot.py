@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the request-scoped broker state snapshot (alpaca_broker.py)
+
+Uses an in-memory stand-in for the Alpaca REST client and checks:
+- Repeated position/account/order lookups inside a snapshot hit the API once
+- Order actions invalidate exactly the state they change
+- Canceled orders leave the open-order index without a refetch
+- Outside a snapshot every call goes to the API, as before
+"""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from alpaca_broker import AlpacaBroker
+
+print('Testing Broker State Snapshot')
+print('=' * 80)
+
+
+class FakeRest:
+    """Counts calls per endpoint"""
+
+    def __init__(self):
+        self.calls = {}
+        self.orders = [
+            SimpleNamespace(id='s1', symbol='AAA', type='stop', side='sell', stop_price='9.30'),
+            SimpleNamespace(id='t1', symbol='BBB', type='trailing_stop', side='sell', trail_percent='2.0'),
+        ]
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def get_account(self):
+        self._count('get_account')
+        return SimpleNamespace(equity='10000', cash='4000', buying_power='4000')
+
+    def list_positions(self):
+        self._count('list_positions')
+        return [SimpleNamespace(symbol='AAA', qty='10'), SimpleNamespace(symbol='BBB', qty='5')]
+
+    def get_position(self, ticker):
+        self._count('get_position')
+        raise Exception('position does not exist')
+
+    def list_orders(self, status='open', limit=50, symbols=None):
+        self._count('list_orders')
+        return [o for o in self.orders if not symbols or o.symbol in symbols]
+
+    def cancel_order(self, order_id):
+        self._count('cancel_order')
+        self.orders = [o for o in self.orders if o.id != order_id]
+
+    def submit_order(self, **kwargs):
+        self._count('submit_order')
+        return SimpleNamespace(id=f"o-{kwargs['symbol']}-{kwargs['type']}")
+
+
+def make_broker():
+    broker = object.__new__(AlpacaBroker)  # Skip __init__ (needs credentials and the SDK)
+    broker.api = FakeRest()
+    broker._snapshot = None
+    broker._snapshot_lock = threading.RLock()
+    broker.snapshot_stats = {'hits': 0, 'fetches': 0, 'invalidations': 0}
+    return broker
+
+
+results = []
+
+broker = make_broker()
+with broker.command_snapshot():
+    for _ in range(5):
+        broker.get_account()
+        broker.get_positions()
+        broker.get_position('AAA')
+        broker.has_stop_loss_order('AAA')
+        broker.has_trailing_stop_order('BBB')
+        broker.get_orders_for_symbol('AAA')
+    calls = dict(broker.api.calls)
+    results.append(('One fetch per state part', calls == {'get_account': 1, 'list_positions': 1, 'list_orders': 1}))
+    results.append(('Lookups answered from index', broker.get_position('AAA').qty == '10'
+                    and broker.get_position('ZZZ') is None
+                    and broker.has_stop_loss_order('AAA') == (True, 's1', 9.3)
+                    and broker.has_trailing_stop_order('BBB') == (True, 't1', 2.0)))
+
+    # Cancel: index updated in place, no order refetch
+    broker.cancel_order('s1')
+    results.append(('Canceled order leaves index', broker.has_stop_loss_order('AAA') == (False, None, None)
+                    and broker.api.calls['list_orders'] == 1))
+
+    # Stop placement invalidates open orders only
+    broker.place_stop_loss_order('AAA', 10, 9.3)
+    broker.get_orders_for_symbol('AAA')
+    broker.get_positions()
+    results.append(('Stop order refreshes open orders only', broker.api.calls['list_orders'] == 2
+                    and broker.api.calls['list_positions'] == 1))
+
+    # Market order invalidates everything
+    broker.place_market_order('CCC', 3, side='buy')
+    broker.get_positions()
+    broker.get_account()
+    results.append(('Market order refreshes all state', broker.api.calls['list_positions'] == 2
+                    and broker.api.calls['get_account'] == 2))
+    stats = broker.snapshot_stats
+
+results.append(('Stats count hits and invalidations', stats['hits'] > 20 and stats['invalidations'] >= 4))
+
+# No snapshot: behaves exactly as before
+broker.api.calls.clear()
+broker.get_account()
+broker.get_account()
+results.append(('No snapshot: every call hits the API', broker.api.calls == {'get_account': 2}
+                and broker.get_position('AAA') is None))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Broker snapshot working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for cascaded catalyst model routing (MarketScreener.analyze_catalyst_routed)
+
+Uses a fake Anthropic Messages endpoint (answers per model and ticker) and checks:
+- Low-confidence and Tier 1/2 fast verdicts escalate to the strong model,
+  whose verdict is final and carries the fast verdict
+- High-confidence Tier 3 verdicts stay with the fast model (one call)
+- A strong-model error keeps the fast verdict
+- Per-tier agreement stats (escalated/agreed/changed_to) and log_routing_stats
+- CATALYST_ROUTING_POLICY=single never escalates
+"""
+
+import io
+import json
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import requests
+
+import market_screener
+from market_screener import MarketScreener
+
+print('Testing Cascaded Catalyst Routing')
+print('=' * 80)
+
+FAST = market_screener.CATALYST_FAST_MODEL
+STRONG = market_screener.CATALYST_STRONG_MODEL
+
+# (model, ticker) -> (tier, confidence); None = HTTP 500
+VERDICTS = {
+    (FAST, 'LOWC'): ('Tier3', 'Low'),
+    (STRONG, 'LOWC'): ('Tier3', 'Medium'),
+    (FAST, 'TIER1'): ('Tier1', 'High'),
+    (STRONG, 'TIER1'): ('Tier1', 'High'),
+    (FAST, 'TIER2'): ('Tier2', 'Medium'),
+    (STRONG, 'TIER2'): ('Tier4', 'Medium'),
+    (FAST, 'SURE3'): ('Tier3', 'High'),
+    (FAST, 'DOWN'): ('Tier2', 'High'),
+    (STRONG, 'DOWN'): None,
+}
+
+
+json_dumps = json.dumps  # FakeAnthropic.post takes a `json` keyword, like requests.post
+
+
+class FakeAnthropic:
+    """Stands in for requests.post to the Messages API"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        ticker = json['messages'][0]['content'].split('Stock: ')[1].split('\n')[0]
+        with self.lock:
+            self.calls.append((json['model'], ticker))
+        verdict = VERDICTS[(json['model'], ticker)]
+        if verdict is None:
+            return FakeResponse(500, {'error': {'type': 'api_error'}})
+        tier, confidence = verdict
+        text = json_dumps({'tier': tier, 'confidence': confidence, 'catalyst_type': f'{tier}_news',
+                           'has_tier1_catalyst': tier == 'Tier1', 'reasoning': 'fake', 'negative_flags': []})
+        return FakeResponse(200, {'content': [{'type': 'text', 'text': text}],
+                                  'usage': {'input_tokens': 900, 'output_tokens': 60}})
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'{self.status_code} Server Error')
+
+
+fake = FakeAnthropic()
+market_screener.requests = SimpleNamespace(post=fake.post, exceptions=requests.exceptions)
+market_screener.CLAUDE_API_KEY = 'test-key'
+market_screener.LEDGER_AVAILABLE = False
+
+
+def make_screener():
+    screener = object.__new__(MarketScreener)  # Skip __init__ (loads universes and caches)
+    screener.today = '2026-03-10'
+    screener.routing_lock = threading.Lock()
+    screener.routing_stats = {'policy': market_screener.CATALYST_ROUTING_POLICY, 'fast_model': FAST,
+                              'strong_model': STRONG, 'fast_only': 0, 'escalated': 0,
+                              'escalation_errors': 0, 'by_tier': {}}
+    return screener
+
+
+def route(screener, ticker):
+    with redirect_stdout(io.StringIO()):
+        return screener.analyze_catalyst_routed(ticker, 'Technology', [{'title': f'{ticker} news'}], {'price': 10.0})
+
+
+results = []
+screener = make_screener()
+verdicts = {t: route(screener, t) for t in ('LOWC', 'TIER1', 'TIER2', 'SURE3', 'DOWN')}
+
+results.append(('Low confidence escalates', verdicts['LOWC']['model'] == STRONG
+                and verdicts['LOWC']['confidence'] == 'Medium' and verdicts['LOWC']['escalated']))
+results.append(('Tier 1/2 escalate, strong verdict final', verdicts['TIER1']['model'] == STRONG
+                and verdicts['TIER2']['tier'] == 'Tier4'
+                and verdicts['TIER2']['fast_verdict'] == {'tier': 'Tier2', 'confidence': 'Medium',
+                                                          'catalyst_type': 'Tier2_news'}))
+results.append(('High-confidence Tier 3 stays on the fast model', verdicts['SURE3']['model'] == FAST
+                and 'escalated' not in verdicts['SURE3']
+                and [c for c in fake.calls if c[1] == 'SURE3'] == [(FAST, 'SURE3')]))
+results.append(('Strong-model error keeps the fast verdict', verdicts['DOWN']['model'] == FAST
+                and verdicts['DOWN']['tier'] == 'Tier2' and 'error' not in verdicts['DOWN']))
+
+stats = screener.routing_stats
+results.append(('Routing counts', (stats['fast_only'], stats['escalated'], stats['escalation_errors']) == (1, 3, 1)))
+results.append(('Per-tier agreement stats', stats['by_tier'] == {
+    'Tier1': {'escalated': 1, 'agreed': 1, 'changed_to': {}},
+    'Tier2': {'escalated': 1, 'agreed': 0, 'changed_to': {'Tier4': 1}},
+    'Tier3': {'escalated': 1, 'agreed': 1, 'changed_to': {}},
+}))
+
+with tempfile.TemporaryDirectory() as tmp:
+    market_screener.CATALYST_ROUTING_LOG_PATH = Path(tmp) / 'catalyst_routing_stats.json'
+    with redirect_stdout(io.StringIO()) as out:
+        screener.log_routing_stats()
+    logged = json.loads(market_screener.CATALYST_ROUTING_LOG_PATH.read_text())
+    results.append(('Agreement reported and logged', 'Tier2: 0/1 agreed (0%) | changed to: Tier4: 1' in out.getvalue()
+                    and 'Tier1: 1/1 agreed (100%)' in out.getvalue()
+                    and logged[-1]['date'] == '2026-03-10' and logged[-1]['escalated'] == 3))
+
+market_screener.CATALYST_ROUTING_POLICY = 'single'
+screener = make_screener()
+fake.calls.clear()
+verdict = route(screener, 'TIER1')
+results.append(('Single policy never escalates', fake.calls == [(FAST, 'TIER1')]
+                and verdict['model'] == FAST and screener.routing_stats['fast_only'] == 1))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Catalyst routing working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the Claude call ledger (claude_ledger.py)
+
+Uses a temporary directory and checks:
+- record() appends one JSON line per call with model, tokens, latency,
+  retries, status and estimated cost (empty optional fields dropped)
+- Dated model ids are priced by family
+- write_daily_rollup aggregates one day's records only, by command,
+  command:stage and model, and writes <date>.json and latest.json
+- Partially written lines are skipped
+"""
+
+import io
+import json
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from claude_ledger import ET, ClaudeLedger, estimate_cost
+
+print('Testing Claude Ledger')
+print('=' * 80)
+
+HAIKU = 'claude-haiku-4-5'
+SONNET = 'claude-sonnet-4-5-20250929'
+
+results = []
+with tempfile.TemporaryDirectory() as tmp:
+    ledger = ClaudeLedger(Path(tmp))
+    today = datetime.now(ET).strftime('%Y-%m-%d')
+
+    first = ledger.record(command='screener', stage='catalyst', ticker='AAPL', model=HAIKU, latency_ms=812.34,
+                          usage={'input_tokens': 1000, 'output_tokens': 100, 'cache_read_input_tokens': 4000},
+                          http_status=200)
+    ledger.record(command='screener', stage='catalyst', ticker='MSFT', model=SONNET, latency_ms=2400.0,
+                  usage={'input_tokens': 1200, 'output_tokens': 150, 'cache_creation_input_tokens': 4000},
+                  http_status=200)
+    ledger.record(command='screener', stage='catalyst', ticker='NVDA', model=HAIKU, latency_ms=95.0,
+                  status='rate_limited', retries=1, http_status=429)
+    ledger.record(command='go', model=SONNET, latency_ms=30000.0, status='timeout', error='Read timed out')
+
+    lines = ledger.ledger_file(today).read_text().splitlines()
+    stored = json.loads(lines[0])
+    results.append(('One JSON line per call', len(lines) == 4 and stored == first))
+    results.append(('Model, tokens, latency and status recorded',
+                    (stored['model'], stored['in'], stored['out'], stored['cr'], stored['cw'], stored['ms'], stored['st'])
+                    == (HAIKU, 1000, 100, 4000, 0, 812.3, 'ok')
+                    and stored['cmd'] == 'screener' and stored['stage'] == 'catalyst' and stored['ticker'] == 'AAPL'))
+    results.append(('Cost estimated from model pricing', abs(stored['usd'] - (1000 * 1.0 + 100 * 5.0 + 4000 * 0.1) / 1e6) < 1e-9))
+    results.append(('Dated model id priced by family',
+                    estimate_cost(SONNET, 1_000_000, 0) == 3.0 and estimate_cost('unknown-model', 1_000_000, 0) == 3.0))
+    timeout = json.loads(lines[3])
+    results.append(('Empty optional fields dropped, error kept',
+                    'ticker' not in timeout and 'stage' not in timeout and 'http' not in timeout
+                    and timeout['st'] == 'timeout' and timeout['err'] == 'Read timed out'))
+
+    # Another day's calls (and a torn line) must not leak into today's rollup
+    ledger.ledger_file('2026-03-09').write_text(json.dumps(
+        {'ts': '2026-03-09T10:00:00-04:00', 'cmd': 'exit', 'model': HAIKU, 'in': 10, 'out': 5, 'ms': 50.0,
+         'rt': 0, 'st': 'ok', 'usd': 0.0001}) + '\n')
+    with open(ledger.ledger_file(today), 'a') as f:
+        f.write('{"ts": "torn')
+
+    rollup = ledger.write_daily_rollup(today)
+    totals = rollup['totals']
+    results.append(('Rollup totals for the day', (totals['calls'], totals['ok'], totals['errors'], totals['rate_limited'],
+                                                  totals['retries'], totals['input_tokens'], totals['output_tokens'])
+                    == (4, 2, 1, 1, 1, 2200, 250)))
+    results.append(('Latency summary', totals['latency_ms']['max'] == 30000.0 and totals['latency_ms']['total'] == 33307.3))
+    results.append(('Aggregated by command', {k: v['calls'] for k, v in rollup['by_command'].items()} == {'go': 1, 'screener': 3}))
+    results.append(('Aggregated by command:stage',
+                    {k: v['calls'] for k, v in rollup['by_stage'].items()} == {'go:-': 1, 'screener:catalyst': 3}))
+    by_model = rollup['by_model']
+    results.append(('Aggregated by model', sorted(by_model) == [HAIKU, SONNET]
+                    and by_model[HAIKU]['calls'] == 2 and by_model[HAIKU]['rate_limited'] == 1
+                    and by_model[SONNET]['cache_write_tokens'] == 4000 and by_model[SONNET]['errors'] == 1))
+    results.append(('Slowest calls first', [r['ms'] for r in rollup['slowest_calls']][:2] == [30000.0, 2400.0]))
+
+    written = json.loads((ledger.rollup_dir / f'{today}.json').read_text())
+    latest = json.loads((ledger.rollup_dir / 'latest.json').read_text())
+    results.append(('Rollup written to <date>.json and latest.json', written == latest and written['totals'] == totals))
+
+    other = ledger.write_daily_rollup('2026-03-09')
+    results.append(('Each day rolled up separately', other['totals']['calls'] == 1
+                    and list(other['by_command']) == ['exit']
+                    and json.loads((ledger.rollup_dir / 'latest.json').read_text())['date'] == '2026-03-09'))
+
+    with redirect_stdout(io.StringIO()):
+        broken = ClaudeLedger(Path(tmp) / 'file.txt')
+        (Path(tmp) / 'file.txt').write_text('')  # A file where the ledger directory should be
+        results.append(('Recording never raises', broken.record(command='go', model=HAIKU, latency_ms=1.0) is None))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Claude ledger working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for the return correlation engine (correlation.py)
+
+Uses synthetic factor-driven bars and a temporary warm cache, and checks:
+- Correlation/covariance equal NumPy's on complete data and a per-pair
+  computation on histories with missing days
+- Correlated peers and clusters are found across "different" sectors
+- Matrices are cached (warm cache, sub-matrix reuse) and 50 names build in ms;
+  in-process matrices expire at the next close like the warm cache entries
+- GO's concentration step rejects a BUY that moves with two holdings, and the
+  rotation scorer penalizes replacements that duplicate a kept position
+"""
+
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+
+import correlation
+from agent_cli import load_agent_module
+from bar_series import BarSeries
+from correlation import CorrelationEngine, CorrelationMatrix, aligned_returns, pairwise
+from warm_cache import ET, WarmCache
+
+print('Testing Correlation Engine')
+print('=' * 80)
+
+DAYS = 130
+FIRST_DAY = 20000  # Epoch day of the first bar
+
+
+def factor(seed):
+    rng = random.Random(seed)
+    return [rng.gauss(0, 0.015) for _ in range(DAYS)]
+
+
+def make_bars(market, loading, seed, skip=()):
+    """Closes driven by a common factor plus idiosyncratic noise; `skip` drops days"""
+    rng = random.Random(seed)
+    closes, price = [], 50.0
+    for m in market:
+        price *= 1 + loading * m + rng.gauss(0, 0.006)
+        closes.append(price)
+    days = [d for d in range(DAYS) if d not in skip]
+    closes = [closes[d] for d in days]
+    n = len(days)
+    return BarSeries(np.array(days) + FIRST_DAY, closes, closes, closes, closes, np.zeros(n))
+
+
+semis, software, energy = factor(1), factor(2), factor(3)
+universe = {
+    'NVDA': make_bars(semis, 1.0, 10), 'AMD': make_bars(semis, 1.0, 11),
+    'AVGO': make_bars(semis, 1.0, 12), 'MU': make_bars(semis, 1.0, 13, skip={40, 41, 90}),
+    'CRM': make_bars(software, 1.0, 20), 'XOM': make_bars(energy, 1.0, 30),
+}
+
+results = []
+
+# Complete data: equals numpy
+complete = {t: b for t, b in universe.items() if t != 'MU'}
+tickers, days, returns = aligned_returns(complete, lookback=90)
+corr, cov, overlap = pairwise(returns)
+results.append(('Complete data matches numpy', np.allclose(corr, np.corrcoef(returns))
+                and np.allclose(cov, np.cov(returns)) and (overlap == 90).all()))
+
+# Missing days: each pair uses the days both have
+tickers, days, returns = aligned_returns(universe, lookback=90)
+corr, cov, overlap = pairwise(returns)
+i, j = tickers.index('MU'), tickers.index('NVDA')
+both = ~np.isnan(returns[i]) & ~np.isnan(returns[j])
+results.append(('Pairwise-complete on missing days', np.isclose(corr[i, j], np.corrcoef(returns[i, both], returns[j, both])[0, 1])
+                and np.isclose(cov[i, j], np.cov(returns[i, both], returns[j, both])[0, 1])
+                and overlap[i, j] == both.sum() < 90))
+results.append(('Short overlap is undefined', np.isnan(pairwise(returns[:, -10:])[0][0, 1])))
+
+matrix = CorrelationMatrix.from_bars(universe)
+peers = matrix.correlated_with('NVDA', ['AMD', 'CRM', 'XOM', 'MU'])
+results.append(('Correlated peers found', [t for t, _ in peers] == sorted(['AMD', 'MU'], key=lambda t: -matrix.get('NVDA', t))
+                and all(rho >= correlation.CORRELATION_HIGH for _, rho in peers)))
+results.append(('Clusters group co-moving names', matrix.clusters() == [['AMD', 'AVGO', 'MU', 'NVDA']]))
+
+with tempfile.TemporaryDirectory() as tmp:
+    cache = WarmCache(Path(tmp) / 'cache.sqlite3')
+    calls = []
+
+    def bars_for(tickers):
+        calls.append(list(tickers))
+        return {t: universe[t] for t in tickers}
+
+    engine = CorrelationEngine(cache)
+    first = engine.matrix(list(universe), bars_for)
+    engine.matrix(['XOM', 'NVDA'], bars_for)
+    results.append(('Sub-matrix reused in process', len(calls) == 1 and engine.stats['reused'] == 1))
+    restored = CorrelationEngine(cache).matrix(list(universe), bars_for)
+    results.append(('Warm cache serves the matrix', len(calls) == 1 and np.allclose(restored.correlation, first.correlation, equal_nan=True)))
+
+    # Resident process: a matrix built before a close is not reused after it
+    engine = CorrelationEngine(cache)
+    morning = datetime(2026, 3, 9, 10, 0, tzinfo=ET).timestamp()
+    engine.matrix(list(universe), bars_for, now=morning)
+    engine.matrix(['XOM', 'NVDA'], bars_for, now=morning + 3600)
+    reused_same_day = engine.stats['reused'] == 1
+    engine.matrix(['XOM', 'NVDA'], bars_for, now=datetime(2026, 3, 10, 10, 0, tzinfo=ET).timestamp())
+    results.append(('In-process matrices expire at the close', reused_same_day and engine.stats['reused'] == 1
+                    and len(engine._matrices) == 1))
+    engine.reset()
+    results.append(('Reset drops matrices and counters', engine._matrices == [] and engine.stats['built'] == 0))
+
+    # 50 names x 120 days of returns
+    wide = {f'T{k}': make_bars(factor(100 + k % 5), 1.0, 200 + k) for k in range(50)}
+    engine = CorrelationEngine(cache)
+    started = time.perf_counter()
+    engine.matrix(list(wide), lambda tickers: wide)
+    elapsed = time.perf_counter() - started
+    print(f"   50-name matrix: {elapsed * 1000:.1f}ms")
+    results.append(('50 names in milliseconds', elapsed < 0.1))
+
+    # GO concentration step and rotation scorer
+    agent_module = load_agent_module()
+    agent = object.__new__(agent_module.TradingAgent)
+    agent._correlation_bars = lambda tickers: {t: universe[t] for t in tickers}
+    correlation.CORRELATION_ENGINE = CorrelationEngine(cache)
+
+    buys = [{'ticker': 'AVGO', 'sector': 'Technology'}, {'ticker': 'XOM', 'sector': 'Energy'},
+            {'ticker': 'MU', 'sector': 'Industrials'}]
+    accepted, rejected = agent.enforce_sector_concentration(buys, ['NVDA', {'ticker': 'CRM'}])
+    results.append(('Third co-moving name rejected', [p['ticker'] for p in accepted] == ['AVGO', 'XOM']
+                    and [r['ticker'] for r in rejected] == ['MU'] and 'NVDA' in rejected[0]['reason']))
+    accepted, rejected = agent.enforce_sector_concentration(buys, ['NVDA', 'CRM'], exit_tickers=['NVDA'])
+    results.append(('Exited holdings do not count', len(accepted) == 3 and not rejected))
+
+    holds = [{'ticker': t, 'days_held': 8, 'unrealized_gain_pct': -3.0, 'catalyst_tier': 'Tier 2'}
+             for t in ('NVDA', 'CRM')]
+    opps = [{'ticker': 'AMD', 'catalyst_tier': 'Tier 1', 'catalyst_age_hours': 5, 'news_validation_score': 90},
+            {'ticker': 'XOM', 'catalyst_tier': 'Tier 1', 'catalyst_age_hours': 5, 'news_validation_score': 85}]
+    rotations = {c['exit_ticker']: c for c in agent._score_rotation_candidates(holds, opps)}
+    results.append(('Rotation avoids duplicating a kept position', rotations['CRM']['enter_ticker'] == 'XOM'
+                    and rotations['NVDA']['enter_ticker'] == 'AMD' and not rotations['NVDA']['enter_correlated_with']))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Correlation engine working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched premarket gap engine (gap_engine.py)
+
+Checks:
+- Gap classes at the v8.9.8 thresholds, and vectorized == per-ticker results
+- Snapshots persist per command for today only and diff against later ones
+- TradingAgent.take_gap_snapshot builds one snapshot from a batched quote
+  request, with the command's own prices / previous closes taking precedence
+"""
+
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+
+from agent_cli import load_agent_module
+from gap_engine import GapSnapshot, classify, gap_analysis, load_gap_snapshot, save_gap_snapshot
+
+print('Testing Gap Engine')
+print('=' * 80)
+
+results = []
+
+expected = {108.0: 'EXHAUSTION_GAP', 107.99: 'BREAKAWAY_GAP', 105.0: 'BREAKAWAY_GAP', 103.0: 'CONTINUATION_GAP',
+            102.0: 'SMALL_GAP', 101.0: 'NORMAL', 97.5: 'NORMAL', 97.0: 'GAP_DOWN', None: 'UNKNOWN'}
+classes = {price: gap_analysis(*classify(100.0, price))['classification'] for price in expected}
+results.append(('Classes at thresholds', classes == expected))
+results.append(('Non-positive previous close is a zero gap', classify(0.0, 50.0) == (0.0, 5)))
+
+agent_module = load_agent_module()
+agent = object.__new__(agent_module.TradingAgent)
+exhaustion = agent.analyze_premarket_gap('BIIB', 184.70, 165.40)
+results.append(('analyze_premarket_gap uses the engine', exhaustion['classification'] == 'EXHAUSTION_GAP'
+                and not exhaustion['should_enter_at_open'] and exhaustion['reasoning'] == 'Gap +11.7% too large, high fade risk'))
+
+rng = random.Random(7)
+tickers = [f'T{i}' for i in range(500)]
+previous = {t: rng.uniform(5, 500) for t in tickers}
+prices = {t: previous[t] * (1 + rng.uniform(-0.12, 0.12)) for t in tickers}
+prices['T3'] = None
+snapshot = GapSnapshot.build('EXECUTE', tickers, previous, prices, {t: 1000.0 for t in tickers})
+results.append(('Vectorized equals per-ticker analysis', all(
+    snapshot.analysis(t) == agent.analyze_premarket_gap(t, prices[t], previous[t]) for t in tickers)))
+results.append(('Missing ticker is UNKNOWN', snapshot.analysis('NOPE')['classification'] == 'UNKNOWN'
+                and snapshot.analysis('T3')['classification'] == 'UNKNOWN'))
+results.append(('Counts cover the snapshot', sum(snapshot.counts().values()) == 500))
+
+with tempfile.TemporaryDirectory() as tmp:
+    save_gap_snapshot(tmp, snapshot)
+    later = GapSnapshot.build('RECHECK', ['T0', 'T1', 'NEW'], previous, {'T0': prices['T0'] * 0.95, 'T1': prices['T1']},
+                              {'T0': 5000.0, 'T1': 1000.0})
+    save_gap_snapshot(tmp, later)
+    restored = load_gap_snapshot(tmp, 'EXECUTE')
+    results.append(('Snapshots persist per command', restored is not None and restored.tickers == tickers
+                    and np.array_equal(restored.codes, snapshot.codes) and load_gap_snapshot(tmp, 'RECHECK') is not None))
+
+    diff = restored.diff(later)
+    results.append(('Diff against a later snapshot', set(diff) == {'T0', 'T1'}
+                    and diff['T0']['price_change_pct'] == -5.0 and diff['T0']['volume_since'] == 4000.0
+                    and diff['T1']['gap_now'] == diff['T1']['gap_then']))
+
+    path = Path(tmp) / 'premarket_gaps.json'
+    data = json.loads(path.read_text())
+    data['date'] = '2020-01-02'
+    path.write_text(json.dumps(data))
+    results.append(('Stale snapshots are ignored', load_gap_snapshot(tmp, 'EXECUTE') is None))
+
+    # Agent: one batched request, command prices / bar closes win
+    requested = []
+
+    def fake_batch(chunk):
+        requested.append(list(chunk))
+        return {
+            'NVDA': {'prevDay': {'c': 100.0}, 'min': {'c': 109.0, 'av': 250000}, 'day': {'c': 0}},
+            'AMD': {'prevDay': {'c': 50.0}, 'day': {'c': 51.0, 'v': 80000}},
+        }
+
+    agent_module.POLYGON_API_KEY = 'test'
+    agent.project_dir = Path(tmp)
+    agent._fetch_snapshot_batch = fake_batch
+    gaps = agent.take_gap_snapshot(['NVDA', 'AMD', 'XOM'], 'EXECUTE', prices={'AMD': 52.0},
+                                   previous_closes={'NVDA': 101.0})
+    results.append(('Agent snapshot uses one batched request', requested == [['NVDA', 'AMD', 'XOM']]))
+    results.append(('Command prices and bar closes take precedence', gaps.price('AMD') == 52.0
+                    and gaps.previous('NVDA') == 101.0 and gaps.analysis('AMD')['classification'] == 'CONTINUATION_GAP'
+                    and gaps.analysis('NVDA')['classification'] == 'BREAKAWAY_GAP'))
+    results.append(('Volume from the snapshot', gaps.volume_of('NVDA') == 250000 and gaps.volume_of('AMD') == 80000
+                    and gaps.volume_of('XOM') is None and gaps.analysis('XOM')['classification'] == 'UNKNOWN'))
+    results.append(('Agent snapshot saved for RECHECK', load_gap_snapshot(tmp, 'EXECUTE').tickers == ['NVDA', 'AMD', 'XOM']))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Gap engine working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the fetch-once GO enrichment engine (prefetch_daily_aggs)
+
+Uses a counting fake in place of the daily-bars request and checks:
+- One request per ticker loads the widest window (duplicates collapse)
+- Narrower windows (3-month return, Stage 2, entry timing) are sliced from it
+- A second prefetch in the same command requests nothing
+- run_command clears the windows, so a later command in a resident agent
+  (EXIT/ANALYZE after the 9:00 GO) fetches bars with today's final bar
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agent_cli import load_agent_module
+from bar_series import BarSeries
+from warm_cache import ET
+
+print('Testing GO Enrichment Engine')
+print('=' * 80)
+
+with redirect_stdout(io.StringIO()):
+    agent_module = load_agent_module()
+
+agent_module.POLYGON_API_KEY = agent_module.POLYGON_API_KEY or 'test-key'
+agent_module.WARM_CACHE_AVAILABLE = False  # In-memory windows only
+
+requests_made = []
+
+
+def daily_bars(days):
+    """One bar per calendar day ending today"""
+    today = datetime.now(ET).replace(hour=0, minute=0, second=0, microsecond=0)
+    return [{'t': int((today - timedelta(days=k)).timestamp() * 1000), 'o': 10.0, 'h': 11.0, 'l': 9.0,
+             'c': 10.0 + k * 0.01, 'v': 1000 + k} for k in range(days, -1, -1)]
+
+
+def fake_request(ticker, start_str):
+    requests_made.append((ticker, start_str))
+    return BarSeries.from_polygon(daily_bars(agent_module.ENRICHMENT_BAR_DAYS)).since(start_str)
+
+
+agent = object.__new__(agent_module.TradingAgent)
+agent._daily_aggs_cache = {}
+agent.use_alpaca = False
+agent.broker = None
+agent._request_daily_aggs = fake_request
+
+results = []
+
+agent.prefetch_daily_aggs(['AAA', 'BBB', 'AAA', 'CCC'])
+results.append(('One request per ticker', sorted(t for t, _ in requests_made) == ['AAA', 'BBB', 'CCC']))
+
+three_month = agent._get_daily_aggs('AAA', 90)
+stage2 = agent._get_daily_aggs('BBB', 400)
+expected_start = (datetime.now(ET) - timedelta(days=90)).strftime('%Y-%m-%d')
+results.append(('Narrower windows sliced from the prefetch', len(requests_made) == 3
+                and three_month.first_date >= expected_start and len(three_month) < len(stage2)))
+
+agent.prefetch_daily_aggs(['AAA', 'BBB', 'CCC'])
+results.append(('Second prefetch requests nothing', len(requests_made) == 3))
+
+# A later command on the same (resident) agent starts without the morning's windows
+dispatched = []
+agent_module._dispatch_command = lambda agent, command, args: dispatched.append(command) or True
+agent_module.LEDGER_AVAILABLE = False
+agent_module.INDICATOR_STATE_AVAILABLE = False
+agent_module.MINUTE_VWAP_AVAILABLE = False
+with redirect_stdout(io.StringIO()):
+    success = agent_module.run_command(agent, 'exit')
+results.append(('run_command clears the windows', success and dispatched == ['exit'] and agent._daily_aggs_cache == {}))
+agent._get_daily_aggs('AAA', 90)
+results.append(('Next command fetches fresh bars', len(requests_made) == 4))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - GO enrichment engine working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental indicator state (indicator_state.py)
+
+Uses a temporary warm cache and checks:
+- State advanced bar by bar equals a full recompute (indicators.py kernels)
+- States persist and a new process advances them by the new bars only
+- Split adjustments and history gaps trigger a full rebuild
+- Today's not-yet-final bar is reflected in values but never stored
+- Advancing a 1500-ticker universe by one bar takes milliseconds
+"""
+
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import indicators
+from bar_series import BarSeries
+from indicator_state import IndicatorStore
+from warm_cache import ET, WarmCache
+
+print('Testing Indicator State')
+print('=' * 80)
+
+FIRST_DAY = datetime(2025, 1, 2, 12, tzinfo=ET)
+AFTER_CLOSE = datetime(2026, 1, 1, 17, tzinfo=ET)  # Every test bar is final
+
+
+def make_bars(n, seed):
+    rng = random.Random(seed)
+    bars, price = [], 40.0 + seed % 50
+    for day in range(n):
+        open_ = price * (1 + rng.uniform(-0.01, 0.01))
+        close = open_ * (1 + rng.uniform(-0.03, 0.03))
+        bars.append({'t': int((FIRST_DAY + timedelta(days=day)).timestamp() * 1000),
+                     'h': max(open_, close) * (1 + rng.uniform(0, 0.02)),
+                     'l': min(open_, close) * (1 - rng.uniform(0, 0.02)),
+                     'c': close, 'v': float(rng.randint(100_000, 2_000_000))})
+        price = close
+    return bars
+
+
+def full(bars):
+    c = indicators.bar_arrays(bars, ('h', 'l', 'c', 'v'))
+    return {
+        'sma20': indicators.scalar(indicators.sma(c['c'], 20)),
+        'sma50': indicators.scalar(indicators.sma(c['c'], 50)),
+        'ema5': indicators.scalar(indicators.ema(c['c'], 5)),
+        'ema20': indicators.scalar(indicators.ema(c['c'], 20)),
+        'rsi14': indicators.scalar(indicators.rsi(c['c'], 14)),
+        'atr14': indicators.scalar(indicators.atr(c['h'], c['l'], c['c'], 14, method='simple')),
+        'atr14_wilder': indicators.scalar(indicators.atr(c['h'], c['l'], c['c'], 14)),
+        'dx14': indicators.scalar(indicators.dx(c['h'], c['l'], c['c'], 14)),
+        'adx14': indicators.scalar(indicators.adx(c['h'], c['l'], c['c'], 14)),
+        'volume_ratio20': indicators.scalar(indicators.volume_ratio(c['v'], 20)),
+    }
+
+
+def matches(values, expected):
+    return all((values[k] is None and v is None) or
+               (values[k] is not None and v is not None and abs(values[k] - v) < 1e-9 * max(1.0, abs(v)))
+               for k, v in expected.items())
+
+
+results = []
+with tempfile.TemporaryDirectory() as tmp:
+    cache = WarmCache(Path(tmp) / 'cache.sqlite3')
+    bars = make_bars(200, 1)
+
+    # Bar-by-bar advance == full recompute at every step
+    store = IndicatorStore(cache)
+    checks = [matches(store.update('AAA', bars[:n], now=AFTER_CLOSE), full(bars[:n])) for n in range(1, 121)]
+    results.append(('Incremental equals full recompute', all(checks)))
+    results.append(('One rebuild, then one bar per call', store.stats['rebuilt'] == 1
+                    and store.stats['advanced'] == 119 and store.stats['bars'] == 119))
+    store.save()
+
+    # New process: loads the state, advances only the new bars
+    store = IndicatorStore(cache)
+    values = store.update('AAA', bars[:125], now=AFTER_CLOSE)
+    results.append(('Persisted state advanced by new bars', store.stats['advanced'] == 1 and store.stats['bars'] == 5
+                    and store.stats['rebuilt'] == 0 and matches(values, full(bars[:125]))))
+    store.update('AAA', bars[:125], now=AFTER_CLOSE)
+    results.append(('Unchanged history is current', store.stats['current'] == 1))
+    results.append(('Windowed history advances from the anchor',
+                    matches(store.update('AAA', bars[60:126], now=AFTER_CLOSE), full(bars[:126]))
+                    and store.stats['rebuilt'] == 0))
+
+    # Split adjustment: every historical price halves -> rebuild from the new history
+    adjusted = [dict(b, h=b['h'] / 2, l=b['l'] / 2, c=b['c'] / 2) for b in bars[:130]]
+    values = store.update('AAA', adjusted, now=AFTER_CLOSE)
+    results.append(('Split adjustment rebuilds', store.stats['rebuilt'] == 1 and matches(values, full(adjusted))))
+
+    # Gap: history no longer contains the state's last bar
+    gapped = adjusted[:129] + [dict(b, h=b['h'] / 2, l=b['l'] / 2, c=b['c'] / 2) for b in bars[131:135]]
+    values = store.update('AAA', gapped, now=AFTER_CLOSE)
+    results.append(('Missing anchor bar rebuilds', store.stats['rebuilt'] == 2 and matches(values, full(gapped))))
+
+    # Today's bar before the close: in the values, not in the stored state
+    store = IndicatorStore(cache)
+    last_day = FIRST_DAY + timedelta(days=140)
+    midday = last_day.replace(hour=11)
+    values = store.update('BBB', bars[:141], now=midday)
+    stored_date = store._states['BBB'].values()['date']
+    results.append(('Partial bar in values only', matches(values, full(bars[:141]))
+                    and stored_date == (last_day - timedelta(days=1)).strftime('%Y-%m-%d')))
+    values = store.update('BBB', bars[:141], now=last_day.replace(hour=17))
+    results.append(('Final bar stored after the close', store._states['BBB'].values()['date'] == last_day.strftime('%Y-%m-%d')
+                    and matches(values, full(bars[:141]))))
+
+    # Universe: 1500 tickers, one new bar each
+    universe = {f'T{i}': BarSeries.from_polygon(make_bars(252, i)) for i in range(1500)}
+    store = IndicatorStore(cache)
+    for ticker, history in universe.items():
+        store.update(ticker, history[:-1], now=AFTER_CLOSE)
+    store.save()
+    store = IndicatorStore(cache)
+    store.load(list(universe))
+    started = time.perf_counter()
+    for ticker, history in universe.items():
+        store.update(ticker, history, now=AFTER_CLOSE)
+    elapsed = time.perf_counter() - started
+    print(f"   Universe advance: {len(universe)} tickers in {elapsed * 1000:.0f}ms")
+    results.append(('Universe advanced without rebuilds', store.stats['advanced'] == 1500 and store.stats['rebuilt'] == 0))
+    results.append(('Universe advance takes milliseconds', elapsed < 1.0))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Indicator state working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
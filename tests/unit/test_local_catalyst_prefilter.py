@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for v10.5: Local fast-path catalyst classifier
+
+Verifies trivially decidable candidates are resolved without Claude and
+ambiguous headlines are escalated.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from market_screener import classify_catalyst_locally
+
+print('Testing Local Fast-Path Classifier')
+print('=' * 80)
+
+test_cases = [
+    {'name': 'No news -> Tier 4 technical-only', 'articles': [],
+     'expected_tier': 'Tier4', 'expected_flags': []},
+    {'name': 'Secondary offering -> reject', 'articles': [{'title': 'Acme announces $200M secondary offering'}],
+     'expected_tier': 'None', 'expected_flags': ['offering']},
+    {'name': 'Downgrade -> reject', 'articles': [{'title': 'Goldman downgrades Acme to Sell'}],
+     'expected_tier': 'None', 'expected_flags': ['downgrade']},
+    {'name': 'Beat but lowers guidance -> reject', 'articles': [{'title': 'Acme beats Q4 but lowers guidance'}],
+     'expected_tier': 'None', 'expected_flags': ['guidance_cut']},
+    {'name': 'CRL -> reject', 'articles': [{'title': 'FDA issues Complete Response Letter for Acme drug'}],
+     'expected_tier': 'None', 'expected_flags': ['regulatory_delay']},
+    {'name': 'Law firm spam -> escalate', 'articles': [{'title': 'ROSEN LAW FIRM encourages Acme investors - securities fraud class action lawsuit'}],
+     'expected_tier': 'ESCALATE', 'expected_flags': None},
+    {'name': 'Upgrade after downgrade -> escalate', 'articles': [{'title': 'Acme upgraded to Buy months after downgrade'}],
+     'expected_tier': 'ESCALATE', 'expected_flags': None},
+    {'name': 'Debt offering -> escalate', 'articles': [{'title': 'Acme prices public offering of senior notes'}],
+     'expected_tier': 'ESCALATE', 'expected_flags': None},
+    {'name': 'Positive news -> escalate', 'articles': [{'title': 'Acme wins $500M DoD contract'}],
+     'expected_tier': 'ESCALATE', 'expected_flags': None},
+]
+
+all_passed = True
+for test in test_cases:
+    result = classify_catalyst_locally('ACME', test['articles'])
+    tier = 'ESCALATE' if result is None else result['tier']
+    passed = tier == test['expected_tier']
+    if passed and result is not None:
+        passed = result['negative_flags'] == test['expected_flags'] and result['source'] == 'local_prefilter'
+
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {test['name']} (got {tier})")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Local fast-path classifier working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Test script for the provider-abstracted market data layer (market_data.py)
+
+Uses fake providers, and checks:
+- Erroring or slow providers are routed behind healthy ones, and get tried
+  first again after resting
+- Bars fail over to the next provider; prices fail over only missing tickers
+- Alpaca bars convert to the Polygon shape (same ET trading dates)
+- Circuit breakers open on outages only, fail fast while open, and probe once
+  after the cooldown
+- Past the command deadline calls fail fast and are flagged; timeouts shrink
+  to the time left
+- TradingAgent.fetch_current_prices and _request_daily_aggs go through the layer,
+  command deadlines follow the schedule, and expired bars are a flagged fallback
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import market_data
+from agent_cli import load_agent_module
+from bar_series import BarSeries
+import warm_cache
+from market_data import (ET, CircuitBreaker, CircuitOpen, Deadline, DeadlineExceeded, EndpointHealth, MarketData,
+                         PolygonProvider, ProviderError, _alpaca_bar, deadline_scope, is_outage, request_timeout)
+from warm_cache import WarmCache
+
+print('Testing Market Data Layer')
+print('=' * 80)
+
+BARS = [{'t': 1773115200000, 'o': 10.0, 'h': 11.0, 'l': 9.5, 'c': 10.5, 'v': 1000}]
+
+
+class NotFound(Exception):
+    status_code = 404
+
+
+class NotSubscribed(Exception):
+    status_code = 403  # e.g. Alpaca SIP data on a free plan
+
+
+class FakeProvider:
+    def __init__(self, name, prices=None, fail=False, delay=0.0):
+        self.name = name
+        self.prices = prices or {}
+        self.fail = fail  # True: connection error; or an exception to raise
+        self.delay = delay
+        self.calls = []
+
+    def available(self):
+        return True
+
+    def _maybe_fail(self):
+        time.sleep(self.delay)
+        if isinstance(self.fail, Exception):
+            raise self.fail
+        if self.fail:
+            raise ConnectionError(f'{self.name} down')
+
+    def daily_bars(self, ticker, start, end):
+        self.calls.append(('daily_bars', ticker))
+        self._maybe_fail()
+        return [dict(b, source=self.name) for b in BARS]
+
+    def minute_bars(self, ticker, from_ms, to_ms):
+        self.calls.append(('minute_bars', ticker))
+        self._maybe_fail()
+        return []
+
+    def latest_prices(self, tickers, is_after_market=False):
+        self.calls.append(('latest_prices', list(tickers)))
+        self._maybe_fail()
+        return {t: (self.prices[t], self.name) for t in tickers if t in self.prices}
+
+
+results = []
+
+# Routing: configured order, erroring provider moves back, rested provider returns
+polygon, alpaca = FakeProvider('polygon', fail=True), FakeProvider('alpaca')
+data = MarketData([polygon, alpaca])
+results.append(('Configured order when healthy', data.route('daily_bars') == ['polygon', 'alpaca']))
+first = data.daily_bars('NVDA', '2026-03-01', '2026-03-10')
+results.append(('Bars fail over on error', first[0]['source'] == 'alpaca' and data.failovers == 1))
+data.daily_bars('NVDA', '2026-03-01', '2026-03-10')
+results.append(('Erroring provider routed last', data.route('daily_bars') == ['alpaca', 'polygon']
+                and data.health[('polygon', 'daily_bars')].consecutive_errors == 2))
+data.health[('polygon', 'daily_bars')].last_seen -= market_data.MARKET_DATA_RETRY_SECONDS
+results.append(('Rested provider tried first again', data.route('daily_bars') == ['polygon', 'alpaca']))
+results.append(('Health is per endpoint', data.route('minute_bars') == ['polygon', 'alpaca']))
+
+alpaca.fail = True
+try:
+    data.daily_bars('NVDA', '2026-03-01', '2026-03-10')
+    results.append(('All providers failing raises', False))
+except ProviderError as e:
+    results.append(('All providers failing raises', 'polygon' in str(e) and 'alpaca' in str(e)))
+
+# Slow provider
+health = EndpointHealth()
+market_data.MARKET_DATA_SLOW_MS, slow_ms = 50, market_data.MARKET_DATA_SLOW_MS
+health.record(0.2)
+results.append(('Slow provider is degraded', health.degraded()))
+slow, fast = FakeProvider('polygon', delay=0.08), FakeProvider('alpaca')
+data = MarketData([slow, fast])
+data.daily_bars('NVDA', '2026-03-01', '2026-03-10')
+routed = data.route('daily_bars')
+market_data.MARKET_DATA_SLOW_MS = slow_ms
+results.append(('Slow provider routed behind a healthy one', routed == ['alpaca', 'polygon']))
+
+# Prices: only missing tickers fail over
+polygon = FakeProvider('polygon', prices={'NVDA': 130.0, 'AMD': 150.0})
+alpaca = FakeProvider('alpaca', prices={'XOM': 110.0, 'NVDA': 999.0})
+data = MarketData([polygon, alpaca])
+prices = data.latest_prices(['NVDA', 'AMD', 'XOM', 'NONE'])
+results.append(('Missing tickers fail over', prices == {'NVDA': (130.0, 'polygon'), 'AMD': (150.0, 'polygon'),
+                                                        'XOM': (110.0, 'alpaca')}
+                and alpaca.calls == [('latest_prices', ['XOM', 'NONE'])]))
+polygon.fail = True
+prices = data.latest_prices(['NVDA', 'AMD'], prefer='alpaca')
+results.append(('Preferred provider first', list(prices) == ['NVDA'] and prices['NVDA'] == (999.0, 'alpaca')))
+
+# Polygon provider keeps the snapshot field priority
+provider = PolygonProvider(api_key='test')
+provider.snapshots = lambda tickers: {'NVDA': {'day': {'c': 0}, 'min': {'c': 131.5}, 'prevDay': {'c': 128.0}},
+                                      'AMD': {'prevDay': {'c': 150.0}}}
+results.append(('Polygon field priority', provider.latest_prices(['NVDA', 'AMD'])
+                == {'NVDA': (131.5, 'recent min'), 'AMD': (150.0, 'prev close ⚠️')}))
+
+# Alpaca bars: same shape and trading dates as Polygon
+daily = _alpaca_bar({'t': '2026-03-10T04:00:00Z', 'o': 1, 'h': 2, 'l': 0.5, 'c': 1.5, 'v': 100, 'vw': 1.2})
+polygon_daily = {'t': 1773115200000, 'o': 1, 'h': 2, 'l': 0.5, 'c': 1.5, 'v': 100}
+results.append(('Alpaca bars in Polygon shape', daily['t'] == polygon_daily['t'] and daily['vw'] == 1.2
+                and BarSeries.from_polygon([daily]).dates() == ['2026-03-10']))
+
+# Circuit breakers: outages open the circuit, per-ticker errors do not
+results.append(('Outage classification', is_outage(ConnectionError('reset')) and is_outage(TimeoutError())
+                and is_outage(NotSubscribed()) and not is_outage(NotFound())
+                and not is_outage(ProviderError('status: NOT_FOUND'))))
+feed_env = os.environ.pop('ALPACA_DATA_FEED', None)
+results.append(('Alpaca defaults to the IEX feed', market_data.AlpacaProvider(api=object()).feed == 'iex'))
+if feed_env is not None:
+    os.environ['ALPACA_DATA_FEED'] = feed_env
+
+
+class FakeAlpacaAPI:
+    """Records get_bars / get_latest_trades arguments"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_bars(self, ticker, timeframe, **kwargs):
+        self.requests.append(('bars', timeframe, kwargs))
+        return [{'t': '2026-03-10T04:00:00Z', 'o': 1, 'h': 2, 'l': 0.5, 'c': 1.5, 'v': 100}]
+
+    def get_latest_trades(self, tickers, feed=None):
+        self.requests.append(('trades', feed))
+        return {t: SimpleNamespace(price=10.0) for t in tickers}
+
+
+api = FakeAlpacaAPI()
+provider = market_data.AlpacaProvider(api=api, feed='iex', bar_feed='sip')
+provider.daily_bars('NVDA', '2026-03-01', '2026-03-09')
+afternoon = datetime(2026, 3, 10, 15, 0, tzinfo=ET)
+provider._bars('NVDA', '1Day', '2026-03-01', '2026-03-10', now=afternoon)
+open_ms = int(datetime(2026, 3, 10, 14, 50, tzinfo=ET).timestamp() * 1000)
+recent = provider._bars('NVDA', '1Min', open_ms, open_ms + 5 * 60000, now=afternoon)
+provider.latest_prices(['NVDA'])
+past, today = api.requests[0][2], api.requests[1][2]
+results.append(('Alpaca bars on SIP, trades on IEX', past['feed'] == today['feed'] == 'sip'
+                and api.requests[-1] == ('trades', 'iex')))
+results.append(('Alpaca bar end clamped 15 min back', past['end'] == '2026-03-10T04:00:00Z'
+                and today['end'] == '2026-03-10T18:45:00Z' and recent == [] and len(api.requests) == 3))
+
+polygon, alpaca = FakeProvider('polygon', fail=NotFound()), FakeProvider('alpaca')
+data = MarketData([polygon, alpaca])
+for ticker in ('GONE1', 'GONE2', 'GONE3'):
+    data.daily_bars(ticker, '2026-03-01', '2026-03-10')
+results.append(('Per-ticker 404s do not degrade a provider', data.route('daily_bars') == ['polygon', 'alpaca']
+                and data.health[('polygon', 'daily_bars')].errors == 3))
+polygon.calls.clear()
+
+
+def call_polygon():
+    try:
+        data.call('polygon', 'daily_bars', 'NVDA', '2026-03-01', '2026-03-10')
+    except ProviderError:
+        raise
+    except Exception:
+        pass
+
+
+for _ in range(6):
+    call_polygon()
+results.append(('Per-ticker errors keep the circuit closed', data.breaker('polygon').state == 'closed'))
+polygon.fail = True
+for _ in range(market_data.CIRCUIT_FAILURE_THRESHOLD):
+    call_polygon()
+breaker = data.breaker('polygon')
+calls = len(polygon.calls)
+served = data.daily_bars('NVDA', '2026-03-01', '2026-03-10')
+results.append(('Repeated outages open the circuit', breaker.state == 'open' and breaker.trips == 1
+                and data.route('daily_bars') == ['alpaca'] and served[0]['source'] == 'alpaca'))
+try:
+    call_polygon()
+    results.append(('Open circuit fails fast', False))
+except CircuitOpen:
+    results.append(('Open circuit fails fast', len(polygon.calls) == calls
+                    and data.data_quality()['flags'] == {'circuit_open:daily_bars': 1}
+                    and data.data_quality()['open_circuits'] == ['polygon']))
+
+breaker.opened_at -= breaker.cooldown
+results.append(('One probe after the cooldown', breaker.allow() and not breaker.allow() and breaker.state == 'half_open'))
+breaker.record(outage=True)
+results.append(('Failed probe reopens', breaker.state == 'open' and breaker.trips == 2))
+breaker.opened_at -= breaker.cooldown
+polygon.fail = False
+call_polygon()
+results.append(('Successful probe closes', breaker.state == 'closed' and breaker.failures == 0))
+
+probe = CircuitBreaker(threshold=1, cooldown=0)
+probe.record(outage=True)
+probe.allow()
+probe.cancel()
+results.append(('Cancelled probe frees the slot', probe.allow()))
+
+# Deadlines: fail fast once passed, timeouts shrink to the time left
+data = MarketData([FakeProvider('polygon'), FakeProvider('alpaca', prices={'NVDA': 131.0})])
+with deadline_scope(Deadline.after(3, 'go')):
+    results.append(('Timeout shrinks to the time left', 1.0 <= request_timeout(8) <= 3))
+with deadline_scope(Deadline.after(-1, 'go')):
+    try:
+        data.daily_bars('NVDA', '2026-03-01', '2026-03-10')
+        skipped = False
+    except DeadlineExceeded:
+        skipped = True
+    prices = data.latest_prices(['NVDA'])
+    try:
+        request_timeout()
+        raised = False
+    except DeadlineExceeded:
+        raised = True
+    quality = data.data_quality()
+results.append(('Past the deadline calls fail fast', skipped and raised and prices == {}
+                and not any(p.calls for p in data.providers.values())))
+results.append(('Deadline flags in data quality', quality['degraded'] and quality['deadline']['missed']
+                and quality['flags'] == {'deadline:daily_bars': 1, 'deadline:latest_prices': 1, 'partial:latest_prices': 1}))
+results.append(('No deadline outside the scope', request_timeout(8) == 8 and data.data_quality()['deadline'] is None))
+data.reset_flags()
+results.append(('Flags reset per command', data.data_quality()['degraded'] is False))
+
+nine = datetime(2026, 3, 10, 9, 0, tzinfo=ET)
+ten = datetime(2026, 3, 10, 10, 0, tzinfo=ET)
+results.append(('Clock deadline today', Deadline.at('09:30', 'go', now=nine).expires_at
+                == datetime(2026, 3, 10, 9, 30, tzinfo=ET).timestamp()))
+results.append(('Budget when started after the deadline', Deadline.at('09:30', 'go', now=ten, fallback_seconds=600).expires_at
+                == datetime(2026, 3, 10, 10, 10, tzinfo=ET).timestamp()))
+
+# Agent wiring
+agent_module = load_agent_module()
+agent_module.POLYGON_API_KEY = 'test'
+agent_module.WARM_CACHE_AVAILABLE = False
+agent_module.MARKET_DATA = MarketData([FakeProvider('polygon', fail=True), FakeProvider('alpaca', prices={'NVDA': 131.0})])
+agent = object.__new__(agent_module.TradingAgent)
+agent._fetch_snapshot_single = lambda ticker: (ticker, None, 'down')
+prices = agent.fetch_current_prices(['NVDA', 'AMD'], max_retries=1)
+results.append(('fetch_current_prices fails over to Alpaca', prices == {'NVDA': 131.0}))
+bars = agent._request_daily_aggs('NVDA', '2026-03-01')
+results.append(('Agent daily bars through the layer', isinstance(bars, BarSeries) and len(bars) == 1))
+
+results.append(('GO deadline before the open', agent_module.command_deadline('go', now=nine).describe()['at'] == '09:30:00 ET'))
+results.append(('EXIT deadline earlier on early-close days', agent_module.command_deadline(
+    'exit', now=datetime(2026, 11, 27, 12, 45, tzinfo=ET)).describe()['at'] == '12:58:00 ET'))
+results.append(('Deadline overrides and exemptions', agent_module.command_deadline('go', now=nine, spec='go=off') is None
+                and agent_module.command_deadline('monitor') is None
+                and agent_module.command_deadline('analyze', now=nine).remaining() > 0))
+
+# Agent: providers down -> an expired cached window, flagged
+with tempfile.TemporaryDirectory() as tmp:
+    agent_module.WARM_CACHE = WarmCache(Path(tmp) / 'cache.sqlite3')
+    agent_module.WARM_CACHE_AVAILABLE = True
+    agent_module.MARKET_DATA = MarketData([FakeProvider('polygon', fail=True)])
+    agent._daily_aggs_cache = {}
+    original_rule = warm_cache.FRESHNESS_RULES['daily_bars']
+    warm_cache.FRESHNESS_RULES['daily_bars'] = 0.1
+    try:
+        recent = [dict(BARS[0], t=int((time.time() - 86400) * 1000))]
+        agent_module.WARM_CACHE.put_daily_bars('NVDA', '2020-01-01', BarSeries.from_polygon(recent))
+        time.sleep(0.2)
+    finally:
+        warm_cache.FRESHNESS_RULES['daily_bars'] = original_rule
+    stale = agent._get_daily_aggs('NVDA', 90)
+    results.append(('Expired bars as a flagged fallback', len(stale) == 1
+                    and agent_module.MARKET_DATA.data_quality()['flags'] == {'stale_cache:daily_bars': 1}))
+    try:
+        agent._get_daily_aggs('AMD', 90)
+        results.append(('No fallback raises ProviderError', False))
+    except ProviderError:
+        results.append(('No fallback raises ProviderError', True))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Market data layer working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental session VWAP engine (minute_vwap.py)
+
+Uses synthetic minute bars and a temporary warm cache, and checks:
+- VWAP, session range and opening range equal a full recomputation
+- Repeat runs fetch only the minutes after the stored state, and give the
+  same values as one pass over the whole session
+- A minute that has not closed yet is never stored
+- Pullbacks to VWAP are detected with their time
+- TradingAgent.session_vwap feeds minute aggregates into the shared engine
+"""
+
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agent_cli import load_agent_module
+from minute_vwap import MINUTE_MS, MinuteVWAPEngine, session_open_ms
+from warm_cache import ET, WarmCache
+
+print('Testing Minute VWAP Engine')
+print('=' * 80)
+
+SESSION = datetime(2026, 3, 10, 9, 30, tzinfo=ET)
+OPEN_MS = session_open_ms(SESSION)
+
+
+def make_minutes(ticker, count, seed):
+    """Premarket bars plus `count` session minutes: a gap up fading back toward VWAP"""
+    rng = random.Random(seed)
+    bars, price = [], 110.0
+    for k in range(-5, count):
+        drift = -0.0008 if k < 25 else 0.0004
+        close = price * (1 + drift + rng.uniform(-0.002, 0.002))
+        high, low = max(price, close) * 1.001, min(price, close) * 0.999
+        bars.append({'t': OPEN_MS + k * MINUTE_MS, 'o': price, 'h': high, 'l': low, 'c': close,
+                     'v': rng.randint(1000, 9000), 'vw': (high + low + close) / 3})
+        price = close
+    return bars
+
+
+minutes = {'NVDA': make_minutes('NVDA', 60, 1), 'AMD': make_minutes('AMD', 60, 2)}
+requests_made = []
+
+
+def fetch_minutes(ticker, from_ms, to_ms):
+    requests_made.append((ticker, from_ms))
+    return [b for b in minutes[ticker] if from_ms <= b['t'] <= to_ms]
+
+
+def expected(ticker, until):
+    session = [b for b in minutes[ticker] if OPEN_MS <= b['t'] and b['t'] + MINUTE_MS <= until]
+    opening = [b for b in session if b['t'] < OPEN_MS + 30 * MINUTE_MS]
+    return {
+        'vwap': round(sum(b['vw'] * b['v'] for b in session) / sum(b['v'] for b in session), 4),
+        'session_high': max(b['h'] for b in session), 'session_low': min(b['l'] for b in session),
+        'opening_range_high': max(b['h'] for b in opening), 'opening_range_low': min(b['l'] for b in opening),
+        'last_price': session[-1]['c'], 'bars': len(session),
+    }
+
+
+def matches(values, reference):
+    return all(abs(values[k] - v) < 1e-9 for k, v in reference.items())
+
+
+results = []
+
+with tempfile.TemporaryDirectory() as tmp:
+    cache = WarmCache(Path(tmp) / 'cache.sqlite3')
+    engine = MinuteVWAPEngine(cache)
+    at_1000 = SESSION + timedelta(minutes=30, seconds=30)  # 10:00 minute still open
+    first = engine.update(['NVDA', 'AMD'], fetch_minutes, now=at_1000)
+    results.append(('One request per ticker from the open', sorted(requests_made) == [('AMD', OPEN_MS), ('NVDA', OPEN_MS)]))
+    results.append(('VWAP and ranges equal full recompute', all(
+        matches(first[t], expected(t, int(at_1000.timestamp() * 1000) + MINUTE_MS)) for t in minutes)))
+    results.append(('Open minute not stored', engine._states[engine._key('NVDA', at_1000)].state['last_t']
+                    == OPEN_MS + 29 * MINUTE_MS))
+    engine.save()
+
+    # Repeat run (new process): only the minutes after the stored state
+    requests_made.clear()
+    engine = MinuteVWAPEngine(cache)
+    at_1030 = SESSION + timedelta(minutes=60)
+    later = engine.update(['NVDA', 'AMD'], fetch_minutes, now=at_1030)
+    results.append(('Repeat run fetches only new minutes', sorted(requests_made)
+                    == [('AMD', OPEN_MS + 30 * MINUTE_MS), ('NVDA', OPEN_MS + 30 * MINUTE_MS)]))
+    results.append(('Incremental equals one pass', all(
+        matches(later[t], expected(t, int(at_1030.timestamp() * 1000))) for t in minutes)))
+    results.append(('Stats count advanced bars', engine.stats['bars'] == 60 and engine.stats['new'] == 0))
+
+    # Pullback: the fade brings lows to VWAP
+    results.append(('Pullback to VWAP detected', later['NVDA']['last_touch'] is not None
+                    and '09:30' <= later['NVDA']['first_touch'] <= later['NVDA']['last_touch'] <= '10:29'))
+
+    # Failed fetch: the state stored by the 10:00 run is still reported
+    def failing(ticker, from_ms, to_ms):
+        raise ConnectionError('timeout')
+
+    stored = MinuteVWAPEngine(cache).update(['NVDA'], failing, now=at_1030)
+    results.append(('Failed fetch falls back to the stored state', stored['NVDA']['bars'] == 30))
+
+    # Agent wiring
+    agent_module = load_agent_module()
+    agent = object.__new__(agent_module.TradingAgent)
+    agent_module.POLYGON_API_KEY = 'test'
+    agent_module.MINUTE_VWAP = MinuteVWAPEngine(WarmCache(Path(tmp) / 'agent.sqlite3'))
+    agent._request_minute_aggs = fetch_minutes
+    original_update = agent_module.MINUTE_VWAP.update
+    agent_module.MINUTE_VWAP.update = lambda tickers, fetch, now=None: original_update(tickers, fetch, now=at_1030)
+    values = agent.session_vwap(['AMD'])
+    results.append(('Agent session_vwap uses the engine', matches(values['AMD'], expected('AMD', int(at_1030.timestamp() * 1000)))))
+    results.append(('No tickers, no requests', agent.session_vwap([]) == {}))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Minute VWAP engine working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for book-wide news invalidation scoring (score_book_news_invalidation)
+
+Uses a temporary warm cache and a counting wrapper around the scorer and checks:
+- Only articles inside NEWS_INVALIDATION_DAYS are scored
+- An unchanged article set is served from the cache (also to a new process)
+- A new article, or an article moving to another recency bucket, is rescored
+- Articles outside the window do not change the cache key
+- The same articles under another ticker are scored separately
+"""
+
+import io
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agent_cli import load_agent_module
+from warm_cache import WarmCache
+
+print('Testing News Invalidation Scoring')
+print('=' * 80)
+
+with redirect_stdout(io.StringIO()):
+    agent_module = load_agent_module()
+
+scored = []
+
+
+def make_agent():
+    agent = object.__new__(agent_module.TradingAgent)
+    real_scorer = agent._score_invalidation_articles
+
+    def counting_scorer(ticker, articles):
+        scored.append((ticker, len(articles)))
+        return real_scorer(ticker, articles)
+
+    agent._score_invalidation_articles = counting_scorer
+    return agent
+
+
+def article(article_id, title, age_hours):
+    published = datetime.now() - timedelta(hours=age_hours)
+    return {'id': article_id, 'title': title, 'description': '', 'age_hours': age_hours,
+            'published_utc': published.strftime('%Y-%m-%dT%H:%M:%SZ'), 'publisher': {'name': 'Reuters'}}
+
+
+results = []
+with tempfile.TemporaryDirectory() as tmp:
+    agent_module.WARM_CACHE_AVAILABLE = True
+    agent_module.WARM_CACHE = WarmCache(Path(tmp) / 'cache.sqlite3')
+    agent = make_agent()
+
+    fresh = [article('a1', 'Apple faces SEC investigation into accounting', 6),
+             article('a2', 'Apple shares steady', 20)]
+    old = [article('a0', 'Apple announces recall of devices', 24 * (agent_module.NEWS_INVALIDATION_DAYS + 2))]
+
+    first = agent.score_book_news_invalidation({'AAPL': fresh + old})
+    results.append(('Only articles inside the window scored', scored == [('AAPL', 2)]
+                    and first['AAPL']['articles_analyzed'] == 2
+                    and all('recall' not in a['title'] for a in first['AAPL']['triggering_articles'])))
+
+    again = agent.score_book_news_invalidation({'AAPL': fresh + old})
+    results.append(('Unchanged article set served from cache', len(scored) == 1 and again == first))
+
+    other_process = make_agent()
+    other_process.score_book_news_invalidation({'AAPL': list(reversed(fresh))})
+    results.append(('Cache shared across processes, order-independent, window-only key', len(scored) == 1))
+
+    agent.score_book_news_invalidation({'AAPL': fresh + [article('a3', 'Apple CFO resigns', 2)]})
+    results.append(('New article rescored', scored[-1] == ('AAPL', 3)))
+
+    breaking = [dict(fresh[0], age_hours=0.5), fresh[1]]
+    agent.score_book_news_invalidation({'AAPL': breaking})
+    results.append(('Recency bucket change rescored', len(scored) == 3))
+
+    agent.score_book_news_invalidation({'MSFT': fresh})
+    results.append(('Same articles, other ticker scored separately', scored[-1] == ('MSFT', 2)))
+
+    scores = agent.score_book_news_invalidation({'AAPL': fresh, 'MSFT': fresh, 'NVDA': []})
+    results.append(('Book scored in one pass, empty news scored once', len(scored) == 5 and set(scores) == {'AAPL', 'MSFT', 'NVDA'}
+                    and scores['NVDA']['articles_analyzed'] == 0))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - News invalidation scoring working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
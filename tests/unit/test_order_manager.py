@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent order submission (order_manager.py)
+
+Runs the manager against an in-memory broker and checks:
+- Exits fill before any entry is submitted
+- Entries are submitted concurrently (batch time ~ one order, not the sum)
+- Fills from the trade-updates feed place stops without polling
+- Polling fallback fills orders when there is no feed
+- Buying power, zero-quantity and rejected orders fail their ticket only
+- Stops cover the filled quantity re-read from the broker: a partial fill gets a
+  matching stop, an unfilled entry gets none
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from order_manager import OrderManager, OrderTicket
+
+print('Testing Order Manager')
+print('=' * 80)
+
+
+class FakeBroker:
+    """Market orders fill at a fixed price `fill_after` seconds after submission"""
+
+    def __init__(self, buying_power=10000.0, fill_after=0.0, submit_latency=0.2, reject=()):
+        self.buying_power = buying_power
+        self.fill_after = fill_after
+        self.submit_latency = submit_latency
+        self.reject = set(reject)
+        self.events = []  # (kind, ticker) in call order
+        self.orders = {}
+        self.lock = threading.Lock()
+        self.positions = {'OLD': 10, 'LOCK': 5}
+        self.open_orders = {'LOCK': [SimpleNamespace(id='stop-LOCK', type='stop')]}
+        self.stop_qty = {}
+
+    def get_account(self):
+        return SimpleNamespace(buying_power=str(self.buying_power))
+
+    def get_position(self, ticker):
+        qty = self.positions.get(ticker)
+        return SimpleNamespace(qty=str(qty)) if qty else None
+
+    def get_orders_for_symbol(self, ticker, status='open'):
+        return self.open_orders.pop(ticker, [])
+
+    def cancel_order(self, order_id):
+        self.events.append(('cancel', order_id))
+
+    def place_market_order(self, ticker, qty, side='buy'):
+        time.sleep(self.submit_latency)
+        with self.lock:
+            self.events.append((side, ticker))
+            order_id = f'{side}-{ticker}'
+            self.orders[order_id] = {'ticker': ticker, 'qty': qty, 'at': time.monotonic()}
+        return self.get_order(order_id)
+
+    def get_order(self, order_id):
+        order = self.orders[order_id]
+        if order['ticker'] in self.reject:
+            return SimpleNamespace(id=order_id, status='rejected', filled_qty='0', filled_avg_price=None)
+        if time.monotonic() - order['at'] >= self.fill_after:
+            return SimpleNamespace(id=order_id, status='filled', filled_qty=str(order['qty']), filled_avg_price='10.10')
+        return SimpleNamespace(id=order_id, status='new', filled_qty='0', filled_avg_price=None)
+
+    def place_stop_loss_order(self, ticker, qty, stop_price):
+        self.events.append(('stop', ticker))
+        self.stop_qty[ticker] = qty
+        return True, f"Stop-loss order placed at ${stop_price:.2f}", f'stop-{ticker}'
+
+
+class FakeUpdatesFeed:
+    """Pushes a fill event for every order the broker accepts"""
+
+    def __init__(self, broker):
+        self.broker = broker
+        self._stop = threading.Event()
+
+    def start(self, on_update):
+        def pump():
+            seen = set()
+            while not self._stop.is_set():
+                for order_id in list(self.broker.orders):
+                    if order_id not in seen:
+                        order = self.broker.get_order(order_id)
+                        if order.status != 'new':
+                            seen.add(order_id)
+                            on_update({'id': order.id, 'status': order.status, 'filled_qty': order.filled_qty,
+                                       'filled_avg_price': order.filled_avg_price})
+                self._stop.wait(0.01)
+        threading.Thread(target=pump, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+
+def entries(tickers, dollars=1000.0, price=10.0):
+    return [OrderTicket.entry(t, dollars, price, context={'ticker': t}) for t in tickers]
+
+
+results = []
+
+# Exits then entries, concurrently, stream-tracked fills, stop per fill
+broker = FakeBroker(fill_after=0.05)
+stops = []
+with OrderManager(broker, updates_feed=FakeUpdatesFeed(broker), stop_delay=0.1, fill_timeout=5) as manager:
+    exits = manager.submit_exits([OrderTicket.exit('OLD', 50), OrderTicket.exit('LOCK', 5), OrderTicket.exit('GONE', 3)])
+    started = time.monotonic()
+    buys = manager.submit_entries(entries(['AAA', 'BBB', 'CCC', 'DDD', 'EEE']),
+                                  stop_price_for=lambda t: stops.append(t.ticker) or round(t.fill_price * 0.93, 2))
+    elapsed = time.monotonic() - started
+    polls = manager.polls
+
+first_buy = next(i for i, e in enumerate(broker.events) if e[0] == 'buy')
+last_sell = max(i for i, e in enumerate(broker.events) if e[0] == 'sell')
+results.append(('Exits submitted before entries', last_sell < first_buy))
+results.append(('Exit qty capped at position', exits[0].qty == 10 and exits[0].success))
+results.append(('Open stop canceled before exit', ('cancel', 'stop-LOCK') in broker.events and exits[1].success))
+results.append(('Missing position fails its ticket only', exits[2].error == 'No Alpaca position found for GONE'))
+results.append(('Entries submitted concurrently', elapsed < 5 * broker.submit_latency))
+results.append(('Every entry filled at fill price', all(t.success and t.fill_price == 10.10 and t.filled_qty == 100 for t in buys)))
+results.append(('Stop placed for every fill', sorted(stops) == ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+                and all(t.stop_placed and t.stop_order_id == f'stop-{t.ticker}' for t in buys)))
+results.append(('Stream fills need no polling', polls == 0))
+
+# Polling fallback (no feed)
+broker = FakeBroker(fill_after=0.3, submit_latency=0.0)
+with OrderManager(broker, poll_interval=0.05, stop_delay=0.0, fill_timeout=5) as manager:
+    buys = manager.submit_entries(entries(['AAA', 'BBB']), stop_price_for=lambda t: 9.5)
+    polls = manager.polls
+results.append(('Polling fallback tracks fills', polls > 0 and all(t.done and t.fill_price == 10.10 for t in buys)))
+results.append(('Stops placed after polled fills', sorted(e for e in broker.events if e[0] == 'stop')
+                == [('stop', 'AAA'), ('stop', 'BBB')]))
+
+# Failures stay per ticket
+broker = FakeBroker(buying_power=2500.0, submit_latency=0.0, reject=['RRR'])
+with OrderManager(broker, poll_interval=0.05, stop_delay=0.0, fill_timeout=2) as manager:
+    buys = manager.submit_entries(
+        entries(['RRR']) + entries(['AAA']) + entries(['BIG'], dollars=2000.0) + entries(['PRICY'], dollars=50.0, price=100.0),
+        stop_price_for=lambda t: 9.5)
+rejected, ok, big, pricy = buys
+results.append(('Rejected order fails its ticket', not rejected.success and 'rejected' in rejected.error
+                and ('stop', 'RRR') not in broker.events))
+results.append(('Other entries still fill', ok.success and ok.stop_placed))
+results.append(('Buying power checked across the batch', big.error == 'Insufficient buying power: $500.00 < $2000.00'))
+results.append(('Zero-share entry rejected before submit', pricy.error.startswith('Invalid quantity: 0')
+                and ('buy', 'PRICY') not in broker.events))
+
+
+class PartialFillBroker(FakeBroker):
+    """PART fills 40 of 100 shares; LAG shows 70 filled once the stream has said all 100"""
+
+    def get_order(self, order_id):
+        order = self.orders[order_id]
+        if order['ticker'] == 'PART':
+            return SimpleNamespace(id=order_id, status='partially_filled', filled_qty='40', filled_avg_price='10.05')
+        if order['ticker'] == 'LAG':
+            order['reads'] = order.get('reads', 0) + 1
+            if order['reads'] == 1:  # Submit response
+                return SimpleNamespace(id=order_id, status='new', filled_qty='0', filled_avg_price=None)
+            return SimpleNamespace(id=order_id, status='filled', filled_qty='70', filled_avg_price='10.10')
+        return super().get_order(order_id)
+
+
+class AheadUpdatesFeed(FakeUpdatesFeed):
+    """Reports every order filled in full, ahead of what the broker shows"""
+
+    def start(self, on_update):
+        def pump():
+            seen = set()
+            while not self._stop.is_set():
+                for order_id, order in list(self.broker.orders.items()):
+                    if order_id not in seen and order['ticker'] == 'LAG':
+                        seen.add(order_id)
+                        on_update({'id': order_id, 'status': 'filled', 'filled_qty': str(order['qty'])})
+                self._stop.wait(0.01)
+        threading.Thread(target=pump, daemon=True).start()
+
+
+# Stops only on verified fills
+broker = PartialFillBroker(submit_latency=0.0)
+with OrderManager(broker, updates_feed=AheadUpdatesFeed(broker), stop_delay=0.0, fill_timeout=0.3) as manager:
+    part, lag = manager.submit_entries(entries(['PART', 'LAG']), stop_price_for=lambda t: 9.5)
+results.append(('Partial fill: stop on filled shares only', part.stop_placed and broker.stop_qty.get('PART') == 40))
+results.append(('Stop re-reads a fill the stream ran ahead of', lag.stop_placed and broker.stop_qty.get('LAG') == 70))
+
+broker = FakeBroker(submit_latency=0.0, fill_after=60)
+with OrderManager(broker, poll_interval=0.05, stop_delay=0.0, fill_timeout=0.3) as manager:
+    (unfilled,) = manager.submit_entries(entries(['SLOW']), stop_price_for=lambda t: 9.5)
+results.append(('Unfilled entry gets no stop', unfilled.success and not unfilled.stop_placed
+                and ('stop', 'SLOW') not in broker.events and 'No verified fill' in unfilled.stop_message))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Order manager working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test script for the event-driven position monitor (position_monitor.py)
+
+Replays ticks through the local ReplayFeed stand-in and checks:
+- Stop loss emits one intent, later ticks are ignored
+- Profit target activates trailing; JSON-tracked trailing exits on pullback
+- Alpaca-managed trailing stops never emit a trailing exit
+- Large-gap consolidation delays trailing activation
+- A running monitor picks up positions entered later (RECHECK) and subscribes them
+- Monitor actions wait for the portfolio lock and apply to a fresh read, so a
+  concurrent RECHECK write is kept
+- A stop intent for a position with an Alpaca stop order closes nothing
+"""
+
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agent_cli import load_agent_module
+from position_monitor import ET, IntentKind, PositionMonitor, ReplayFeed
+
+print('Testing Position Monitor')
+print('=' * 80)
+
+
+def position(ticker, entry, **extra):
+    return dict({'ticker': ticker, 'entry_price': entry}, **extra)
+
+
+results = []
+
+# Stop loss (default -7%)
+monitor = PositionMonitor([position('AAA', 100.0)])
+monitor.on_trade('AAA', 95.0)
+intent = monitor.on_trade('AAA', 92.9)
+results.append(('Stop loss intent at -7%', intent is not None and intent.kind == IntentKind.STOP_LOSS))
+results.append(('Ticks after exit ignored', monitor.on_trade('AAA', 80.0) is None and len(monitor.intents) == 1))
+results.append(('Unknown ticker ignored', monitor.on_trade('ZZZ', 10.0) is None))
+
+# Target -> trailing (JSON tracked)
+monitor = PositionMonitor([position('BBB', 100.0, price_target=110.0)])
+activated = monitor.on_trade('BBB', 110.5)
+results.append(('Target activates trailing', activated is not None and activated.kind == IntentKind.TARGET_REACHED
+                and not activated.is_exit))
+monitor.on_trade('BBB', 115.0)  # New peak -> trailing at 112.70
+results.append(('Trailing ratchets with peak', abs(monitor.states['BBB'].trailing_stop_price - 112.7) < 1e-9))
+results.append(('No exit above trailing stop', monitor.on_trade('BBB', 113.0) is None))
+exit_intent = monitor.on_trade('BBB', 112.5)
+results.append(('Trailing exit on pullback', exit_intent is not None and exit_intent.kind == IntentKind.TRAILING_STOP
+                and 'peak +15.0%' in exit_intent.reason))
+
+# Alpaca trailing order handles the exit itself
+monitor = PositionMonitor([position('CCC', 100.0)], broker_trailing=True)
+monitor.on_trade('CCC', 111.0)
+monitor.on_trade('CCC', 120.0)
+results.append(('Broker trailing: no JSON trailing exit', monitor.on_trade('CCC', 112.0) is None))
+
+# Large gap still consolidating: hold, no activation
+monitor = PositionMonitor([position('DDD', 100.0, gap_percent=6.0, days_since_large_gap=0)])
+results.append(('Gap consolidation delays trailing', monitor.on_trade('DDD', 112.0) is None
+                and not monitor.states['DDD'].trailing_active))
+
+# Replay feed end to end with callback
+received = []
+monitor = PositionMonitor([position('EEE', 50.0), position('FFF', 20.0)], on_intent=received.append)
+feed = ReplayFeed([
+    {'ticker': 'EEE', 'price': 50.5, 'timestamp': '2026-03-10T10:00:00-04:00'},
+    {'ticker': 'FFF', 'price': 18.5, 'timestamp': '2026-03-10T10:00:01-04:00'},
+    {'ticker': 'EEE', 'price': 55.2, 'timestamp': '2026-03-10T10:00:02-04:00'},
+])
+monitor.run(feed)
+results.append(('Replay delivers intents via callback', [(i.ticker, i.kind) for i in received]
+                == [('FFF', IntentKind.STOP_LOSS), ('EEE', IntentKind.TARGET_REACHED)]))
+results.append(('All ticks evaluated', monitor.ticks == 3))
+
+# Portfolio changes under a running monitor
+monitor = PositionMonitor([position('GGG', 100.0), position('HHH', 50.0)])
+added = monitor.sync([position('GGG', 100.0), position('III', 10.0)])
+results.append(('Sync adds new positions', added == ['III'] and 'III' in monitor.tickers))
+results.append(('Sync drops closed positions', monitor.states['HHH'].done and monitor.on_trade('HHH', 40.0) is None))
+
+
+class LateEntryFeed:
+    """Live-stream stand-in: trades only arrive for subscribed tickers"""
+
+    def __init__(self):
+        self.subscribed = threading.Event()
+        self.stopped = threading.Event()
+        self.tickers = []
+
+    def run(self, on_trade):
+        if self.subscribed.wait(5):
+            on_trade('KKK', 9.0, None)  # -10% from entry: stop loss
+        self.stopped.wait(5)
+
+    def subscribe(self, tickers):
+        self.tickers.extend(tickers)
+        self.subscribed.set()
+
+    def stop(self):
+        self.stopped.set()
+
+
+received = []
+portfolio = [position('JJJ', 100.0)]
+monitor = PositionMonitor(portfolio, on_intent=received.append)
+monitor.on_trade('JJJ', 90.0)  # Every position done before RECHECK enters
+portfolio.append(position('KKK', 10.0))
+feed = LateEntryFeed()
+monitor.run(feed, until=datetime.now(ET) + timedelta(seconds=4), refresh=lambda: list(portfolio), refresh_seconds=0)
+results.append(('Late entry subscribed on the feed', feed.tickers == ['KKK']))
+results.append(('Late entry monitored', [(i.ticker, i.kind) for i in received]
+                == [('JJJ', IntentKind.STOP_LOSS), ('KKK', IntentKind.STOP_LOSS)]))
+
+# Monitor action vs a concurrent RECHECK write
+agent_module = load_agent_module()
+agent = object.__new__(agent_module.TradingAgent)
+agent.use_alpaca = False
+agent.broker = None
+agent._execute_alpaca_sell = lambda ticker, shares, reason: (True, 'filled', 'order-1', 92.0)
+agent.close_position = lambda pos, price, reason: {'ticker': pos['ticker'], 'exit_price': price}
+agent.log_completed_trade = lambda trade: None
+agent.update_account_status = lambda: None
+agent.standardize_exit_reason = lambda pos, price, reason: reason
+agent_module.MONITOR_AUTO_EXIT = True
+
+with tempfile.TemporaryDirectory() as tmp:
+    agent_module.EXIT_INTENTS_FILE = Path(tmp) / 'exit_intents.jsonl'
+    agent.portfolio_file = Path(tmp) / 'current_portfolio.json'
+    agent.save_portfolio({'positions': [position('AAA', 100.0, shares=10)]})
+    intent = PositionMonitor([position('AAA', 100.0)]).on_trade('AAA', 92.0)
+
+    with redirect_stdout(io.StringIO()):
+        with agent.portfolio_lock():  # RECHECK holds the lock...
+            action = threading.Thread(target=agent._handle_monitor_intent, args=(intent,))
+            action.start()
+            time.sleep(0.3)
+            waited = action.is_alive()
+            # ...and adds its entry while the monitor waits
+            agent.save_portfolio({'positions': [position('AAA', 100.0, shares=10), position('NEW', 20.0, shares=5)]})
+        action.join(timeout=5)
+
+    saved = json.loads(agent.portfolio_file.read_text())
+    results.append(('Monitor action waits for the portfolio lock', waited))
+    results.append(('Monitor close keeps the RECHECK entry', [p['ticker'] for p in saved['positions']] == ['NEW']
+                    and saved['total_positions'] == 1))
+
+    # Broker-held stop: the monitor reports "not closed" and leaves the position alone
+    covered = dict(position('BRK', 50.0, shares=4), alpaca_stop_loss_order_id='stop-1')
+    agent.save_portfolio({'positions': [covered]})
+    stop_intent = PositionMonitor([position('BRK', 50.0)]).on_trade('BRK', 46.0)
+    with redirect_stdout(io.StringIO()):
+        closed = agent._apply_monitor_intent(stop_intent)
+    saved = json.loads(agent.portfolio_file.read_text())
+    results.append(('Alpaca stop order covers: not closed', closed is False
+                    and [p['ticker'] for p in saved['positions']] == ['BRK']))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Position monitor working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-GO preparation chained after the screener (run_screener.sh)
+
+Runs a copy of run_screener.sh against a temporary project directory whose
+screener, holiday check and agent entry points only record that they ran, and checks:
+- With PRE_GO_ENABLED=true, pre_go runs right after a successful screener
+- Without it (default), pre_go never runs
+- A failed screener does not trigger pre_go and fails the script
+- A failed pre_go never fails the screener run
+- With AGENT_DAEMON_ENABLED=true both go through agent_daemon.py send
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_DIR))
+
+print('Testing Pre-GO Trigger')
+print('=' * 80)
+
+SCRIPT = (REPO_DIR / 'run_screener.sh').read_text()
+SCRIPT_DIR_LINE = 'SCRIPT_DIR="/root/paper_trading_lab"'
+
+# Entry points: append "<name> <args>" to calls.log, exit with $FAIL_<NAME> (default 0)
+RECORDER = '''import os, sys
+name = os.path.basename(sys.argv[0])[:-3]
+with open('calls.log', 'a') as f:
+    f.write(' '.join([name] + sys.argv[1:]) + '\\n')
+sys.exit(int(os.environ.get('FAIL_' + name.upper(), '0')))
+'''
+
+
+def run(env_lines, fail=()):
+    """Run the wrapper in a fresh project dir; returns (exit code, recorded calls)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        (project / 'venv' / 'bin').mkdir(parents=True)
+        (project / 'venv' / 'bin' / 'activate').write_text('')
+        (project / 'config').mkdir()
+        (project / 'config' / '.env').write_text('\n'.join(['# test config', *env_lines]) + '\n')
+        for name in ('market_screener', 'market_holidays', 'agent_cli', 'agent_daemon'):
+            (project / f'{name}.py').write_text(RECORDER)
+        script = project / 'run_screener.sh'
+        script.write_text(SCRIPT.replace(SCRIPT_DIR_LINE, f'SCRIPT_DIR="{project}"'))
+
+        env = {k: v for k, v in os.environ.items() if not k.startswith(('PRE_GO', 'AGENT_DAEMON', 'FAIL_'))}
+        env.update({f'FAIL_{name.upper()}': '1' for name in fail})
+        code = subprocess.run(['bash', str(script)], cwd=project, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+        calls_log = project / 'calls.log'
+        calls = calls_log.read_text().splitlines() if calls_log.exists() else []
+        return code, [c for c in calls if not c.startswith('market_holidays')]
+
+
+results = []
+results.append(('Wrapper relocatable to a test directory', SCRIPT_DIR_LINE in SCRIPT))
+
+code, calls = run(['PRE_GO_ENABLED=true'])
+results.append(('Enabled: pre_go chained after the screener', code == 0 and calls == ['market_screener', 'agent_cli pre_go']))
+
+code, calls = run([])
+results.append(('Disabled by default', code == 0 and calls == ['market_screener']))
+
+code, calls = run(['PRE_GO_ENABLED="true"'], fail=('market_screener',))
+results.append(('Failed screener: no pre_go, script fails', code == 1 and calls == ['market_screener']))
+
+code, calls = run(['export PRE_GO_ENABLED=true'], fail=('agent_cli',))
+results.append(('Failed pre_go does not fail the screener', code == 0 and calls == ['market_screener', 'agent_cli pre_go']))
+
+code, calls = run(['PRE_GO_ENABLED=true', 'AGENT_DAEMON_ENABLED=true'])
+results.append(('Daemon route sends both commands', code == 0
+                and calls == ['agent_daemon send screener', 'agent_daemon send pre_go']))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Pre-GO trigger working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for batched Polygon snapshot pricing (TradingAgent.fetch_current_prices)
+
+Uses a Polygon provider whose HTTP layer is an in-memory stand-in and checks:
+- Tickers are deduplicated and priced in PRICE_BATCH_SIZE multi-ticker requests
+- Snapshot field priority is kept per ticker ($0 day close skipped)
+- Tickers missing from the batch are retried one by one, and only those
+- Tickers no request could price are left out of the result
+- Gap snapshots chunk by SNAPSHOT_BATCH_SIZE and skip a failed chunk
+"""
+
+import io
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import market_data
+from agent_cli import load_agent_module
+from market_data import MarketData, PolygonProvider
+
+print('Testing Polygon Snapshot Batching')
+print('=' * 80)
+
+SNAPSHOTS = {
+    'AAA': {'day': {'c': 10.5}, 'min': {'c': 10.4}, 'prevDay': {'c': 10.0}},
+    'BBB': {'day': {'c': 0}, 'min': {'c': 20.2}, 'prevDay': {'c': 19.0}},
+    'CCC': {'day': {'c': 30.0}, 'prevDay': {'c': 29.0}},
+    'DDD': {'day': {'c': 40.0}, 'prevDay': {'c': 41.0}},
+    'EEE': {'day': {'c': 50.0}, 'prevDay': {'c': 50.0}},
+    'LATE': {'day': {'c': 60.0}, 'prevDay': {'c': 58.0}},  # Only in the single-ticker endpoint
+}
+BATCH_OMITS = {'LATE', 'GONE'}
+
+
+class FakePolygon(PolygonProvider):
+    """Serves SNAPSHOTS; records every request"""
+
+    def __init__(self):
+        super().__init__(api_key='test')
+        self.batches, self.singles = [], []
+
+    def _get(self, path, params=None):
+        if path.endswith('/tickers'):
+            tickers = params['tickers'].split(',')
+            self.batches.append(tickers)
+            return {'status': 'OK', 'tickers': [dict(SNAPSHOTS[t], ticker=t) for t in tickers
+                                                if t in SNAPSHOTS and t not in BATCH_OMITS]}
+        ticker = path.rsplit('/', 1)[1]
+        self.singles.append(ticker)
+        if ticker not in SNAPSHOTS:
+            return {'status': 'NOT_FOUND'}
+        return {'status': 'OK', 'ticker': dict(SNAPSHOTS[ticker], ticker=ticker)}
+
+
+with redirect_stdout(io.StringIO()):
+    agent_module = load_agent_module()
+agent_module.POLYGON_API_KEY = 'test'
+agent_module.WARM_CACHE_AVAILABLE = False
+market_data.PRICE_BATCH_SIZE = 2
+polygon = FakePolygon()
+agent_module.MARKET_DATA = MarketData([polygon])
+agent = object.__new__(agent_module.TradingAgent)
+
+results = []
+tickers = ['AAA', 'BBB', 'AAA', 'CCC', 'LATE', 'DDD', 'GONE', 'EEE']
+with redirect_stdout(io.StringIO()) as out:
+    prices = agent.fetch_current_prices(tickers, max_retries=1)
+
+results.append(('Deduplicated and chunked by PRICE_BATCH_SIZE',
+                polygon.batches == [['AAA', 'BBB'], ['CCC', 'LATE'], ['DDD', 'GONE'], ['EEE']]))
+results.append(('Field priority per ticker', prices.get('AAA') == 10.5 and prices.get('BBB') == 20.2))
+results.append(('Only missing tickers retried singly', sorted(polygon.singles) == ['GONE', 'LATE']))
+results.append(('Retried ticker priced, unknown left out',
+                prices == {'AAA': 10.5, 'BBB': 20.2, 'CCC': 30.0, 'LATE': 60.0, 'DDD': 40.0, 'EEE': 50.0}
+                and 'Failed to fetch prices for: GONE' in out.getvalue()))
+
+polygon.batches.clear()
+polygon.singles.clear()
+with redirect_stdout(io.StringIO()):
+    prices = agent.fetch_current_prices(['AAA', 'CCC'])
+results.append(('Complete batch needs no single requests', polygon.batches == [['AAA', 'CCC']]
+                and polygon.singles == [] and len(prices) == 2))
+
+# Gap snapshot: one request per SNAPSHOT_BATCH_SIZE tickers, failed chunk skipped
+agent.SNAPSHOT_BATCH_SIZE = 3
+requested = []
+
+
+def fake_batch(chunk):
+    requested.append(list(chunk))
+    if 'DDD' in chunk:
+        raise market_data.ProviderError('503 Service Unavailable')
+    return {t: SNAPSHOTS[t] for t in chunk if t in SNAPSHOTS}
+
+
+agent._fetch_snapshot_batch = fake_batch
+with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+    agent.project_dir = Path(tmp)
+    snapshot = agent.take_gap_snapshot(['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'AAA'], 'EXECUTE')
+results.append(('Gap snapshot chunked by SNAPSHOT_BATCH_SIZE', requested == [['AAA', 'BBB', 'CCC'], ['DDD', 'EEE']]))
+results.append(('Failed gap chunk skipped, others kept', len(snapshot) == 5
+                and [snapshot.price(t) for t in ('AAA', 'BBB', 'CCC', 'DDD', 'EEE')] == [10.5, 20.2, 30.0, None, None]))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Snapshot batching working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
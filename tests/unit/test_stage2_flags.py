@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the universe-wide Stage 2 trend template (indicators.trend_template)
+
+Checks:
+- Vectorized flags equal TradingAgent.check_stage2_alignment for every ticker
+  (uptrends, downtrends, 200-219 bars, <200 bars)
+- The screener attaches the flags to candidates and ranks Stage 2 ahead
+- GO and pre-GO use the screener's flags instead of refetching bars
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+
+import indicators
+from agent_cli import load_agent_module
+from bar_series import BarSeries
+
+print('Testing Stage 2 Trend Template')
+print('=' * 80)
+
+
+def make_closes(n, seed, drift):
+    rng = random.Random(seed)
+    closes, price = [], 30.0 + seed
+    for _ in range(n):
+        price *= 1 + drift + rng.uniform(-0.02, 0.02)
+        closes.append(price)
+    return closes
+
+
+def series(closes):
+    n = len(closes)
+    return BarSeries(np.arange(n), closes, closes, closes, closes, np.zeros(n))
+
+
+# Mixed universe: strong uptrends, downtrends, choppy, short histories
+universe = {}
+for i in range(60):
+    n = (275, 260, 221, 219, 205, 200, 150, 30)[i % 8]
+    universe[f'T{i}'] = make_closes(n, i, (0.003, -0.002, 0.0)[i % 3])
+
+agent_module = load_agent_module()
+agent = object.__new__(agent_module.TradingAgent)
+agent._get_daily_aggs = lambda ticker, days: series(universe[ticker])
+
+tickers = list(universe)
+template = indicators.trend_template(indicators.stack(list(universe.values()), length=252))
+records = {t: indicators.stage2_record(template, row, t) for row, t in enumerate(tickers)}
+expected = {t: agent.check_stage2_alignment(t) for t in tickers}
+
+
+def same(record, reference):
+    if set(record) != set(reference) or ('error' in record) != ('error' in reference):
+        return False
+    for key, value in reference.items():
+        if isinstance(value, float) and key != 'distance_from_52w_high_pct':
+            if abs(record[key] - value) > 1e-9 * max(1.0, abs(value)):
+                return False
+        elif record[key] != value:
+            return False
+    return True
+
+
+mismatches = [t for t in tickers if not same(records[t], expected[t])]
+results = []
+results.append(('Vectorized flags equal check_stage2_alignment', not mismatches))
+if mismatches:
+    print(f"   Mismatches: {mismatches[:5]}")
+results.append(('Universe has Stage 2 and non-Stage 2 tickers',
+                any(r['stage2'] for r in records.values()) and not all(r['stage2'] for r in records.values())))
+results.append(('Short histories report an error', records['T6']['stage2'] is False and 'error' in records['T6']))
+one = indicators.trend_template(universe['T0'])
+results.append(('1-D input gives scalars', bool(one['stage2']) == records['T0']['stage2']
+                and int(one['checks_passed']) == records['T0']['checks_passed']))
+
+# Screener: flags stored per ticker, Stage 2 candidates get the rank bonus
+import market_screener
+
+screener = object.__new__(market_screener.MarketScreener)
+screener.stage2_flags = {}
+screener.compute_stage2_flags(tickers, [np.asarray(c) for c in universe.values()])
+results.append(('Screener stores records for the universe', screener.stage2_flags == records))
+
+# GO: screener flags are reused, no bars fetched
+fetched = []
+go_agent = object.__new__(agent_module.TradingAgent)
+go_agent._get_daily_aggs = lambda ticker, days: fetched.append(ticker) or series(universe[ticker])
+stage2_ticker = next(t for t in tickers if records[t]['stage2'])
+go_agent.screener_stage2 = {stage2_ticker: records[stage2_ticker], 'T6': records['T6']}
+results.append(('GO reads screener flags', go_agent._screener_stage2(stage2_ticker) is records[stage2_ticker]
+                and not fetched))
+results.append(('Errored or missing flags fall back to the live check',
+                go_agent._screener_stage2('T6') is None and go_agent._screener_stage2('T1') is None))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Stage 2 trend template working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-command warm cache (warm_cache.py)
+
+Uses a temporary SQLite file and checks:
+- Values round-trip and are shared between cache instances (processes)
+- Per-kind freshness: short-lived kinds expire, daily bars last until the close
+- Daily-bar windows are sliced and never replaced by a narrower window
+- A window holding today's unfinished bar expires after PARTIAL_BARS_TTL and
+  is replaced by a later fetch
+- Expired prices stay readable as a stale fallback until their stale limit
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import warm_cache
+from warm_cache import ET, PARTIAL_BARS_TTL, WarmCache, expires_at, first_open_day, next_daily_close
+
+print('Testing Warm Cache')
+print('=' * 80)
+
+
+def bar(date_str, close):
+    return {'t': int(datetime.strptime(date_str, '%Y-%m-%d').replace(hour=12, tzinfo=ET).timestamp() * 1000), 'c': close}
+
+
+results = []
+with tempfile.TemporaryDirectory() as tmp:
+    db_path = Path(tmp) / 'cache.sqlite3'
+    writer = WarmCache(db_path)
+    reader = WarmCache(db_path)
+
+    writer.set('reference', 'sector:AAPL', 'Technology')
+    results.append(('Value visible to a second instance', reader.get('reference', 'sector:AAPL') == 'Technology'))
+    results.append(('Missing key returns None', reader.get('reference', 'sector:MSFT') is None))
+
+    writer.set_many('intraday_price', {'AAPL': {'price': 190.5, 'source': 'day.c'}, 'MSFT': {'price': 410.0, 'source': 'min.c'}})
+    found = reader.get_many('intraday_price', ['AAPL', 'MSFT', 'NVDA'])
+    results.append(('get_many returns only cached keys', sorted(found) == ['AAPL', 'MSFT']))
+
+    # Short-lived kind expires (shrink the rule for the test)
+    original_rule = warm_cache.FRESHNESS_RULES['quote']
+    warm_cache.FRESHNESS_RULES['quote'] = 0.2
+    try:
+        writer.set('quote', 'AAPL', {'bid': 1.0, 'ask': 1.1})
+        fresh = reader.get('quote', 'AAPL') is not None
+        time.sleep(0.3)
+        expired = reader.get('quote', 'AAPL') is None
+    finally:
+        warm_cache.FRESHNESS_RULES['quote'] = original_rule
+    results.append(('Quote expires after its freshness window', fresh and expired))
+    results.append(('Expired entry purged', writer.purge_expired() == 1))
+
+    # Daily bars valid until the next 4:15 PM ET
+    morning = datetime(2026, 3, 10, 9, 0, tzinfo=ET)
+    evening = datetime(2026, 3, 10, 17, 0, tzinfo=ET)
+    results.append(('Morning bars expire at 4:15 PM same day',
+                    next_daily_close(morning) == datetime(2026, 3, 10, 16, 15, tzinfo=ET)))
+    results.append(('Evening bars expire at 4:15 PM next day',
+                    expires_at('daily_bars', evening.timestamp()) == datetime(2026, 3, 11, 16, 15, tzinfo=ET).timestamp()))
+
+    bars = [bar('2026-01-05', 10), bar('2026-02-02', 11), bar('2026-03-02', 12)]
+    writer.put_daily_bars('AAPL', '2026-01-01', bars)
+    sliced = reader.get_daily_bars('AAPL', '2026-02-01')
+    results.append(('Wider window sliced to requested start', [b['c'] for b in (sliced or [])] == [11, 12]))
+    results.append(('Narrower cached window is a miss', reader.get_daily_bars('AAPL', '2025-12-01') is None))
+
+    writer.put_daily_bars('AAPL', '2026-02-15', [bar('2026-03-02', 12)])
+    kept = reader.get_daily_bars('AAPL', '2026-01-01')
+    results.append(('Narrower window does not replace wider one', kept is not None and len(kept) == 3))
+
+    results.append(('Summary counts fresh entries', reader.summary().get('daily_bars', {}).get('fresh') == 1))
+
+    # Today's bar is unfinished until 4:15 PM ET: short TTL, replaced by a later fetch
+    results.append(('Today is open before the close, final after',
+                    first_open_day(morning) == first_open_day(evening) - 1))
+    writer.set_many_daily_bars({'NVDA': ('2026-01-01', [bar('2026-03-09', 130), bar('2026-03-10', 131)])},
+                               now=datetime(2026, 3, 10, 11, 0, tzinfo=ET))
+    expiry = writer._connection().execute(
+        "SELECT expires_at - created_at FROM entries WHERE kind = 'daily_bars' AND key = 'NVDA'").fetchone()[0]
+    results.append(('Mid-session window expires after PARTIAL_BARS_TTL', abs(expiry - PARTIAL_BARS_TTL) < 1))
+
+    writer.put_daily_bars('NVDA', '2025-12-01', [bar('2026-03-09', 130), bar('2026-03-10', 133), bar('2026-03-11', 134)])
+    replaced = reader.get_daily_bars('NVDA', '2025-12-01')
+    results.append(('Later, wider fetch replaces the partial window',
+                    replaced is not None and [b['c'] for b in replaced] == [130, 133, 134]))
+    writer.put_daily_bars('NVDA', '2025-12-01', [bar('2026-03-09', 130), bar('2026-03-10', 133)])
+    results.append(('Earlier-ending fetch does not replace it', len(reader.get_daily_bars('NVDA', '2025-12-01')) == 3))
+
+    # Stale fallback: expired prices readable (and kept by purge) within STALE_LIMITS
+    original_rule = warm_cache.FRESHNESS_RULES['intraday_price']
+    warm_cache.FRESHNESS_RULES['intraday_price'] = 0.1
+    try:
+        writer.set('intraday_price', 'NVDA', {'price': 131.0, 'source': 'intraday'})
+        time.sleep(0.2)
+    finally:
+        warm_cache.FRESHNESS_RULES['intraday_price'] = original_rule
+    hits = reader.stats['hits']
+    results.append(('Expired price not served fresh', reader.get_many('intraday_price', ['NVDA']) == {}))
+    stale = reader.get_many('intraday_price', ['NVDA'], stale=True)
+    results.append(('Expired price served as stale fallback', stale.get('NVDA', {}).get('price') == 131.0
+                    and reader.stats['stale'] == 1 and reader.stats['hits'] == hits))
+    writer.purge_expired(keep_stale=True)
+    results.append(('Stale entries kept by purge', reader.get_many('intraday_price', ['NVDA'], stale=True) != {}))
+    writer.purge_expired()
+    results.append(('Full purge drops stale entries', reader.get_many('intraday_price', ['NVDA'], stale=True) == {}))
+
+all_passed = True
+for name, passed in results:
+    all_passed = all_passed and passed
+    print(f"{'✓ PASS' if passed else '✗ FAIL'}: {name}")
+
+print('=' * 80)
+if all_passed:
+    print('\n✓ ALL TESTS PASSED - Warm cache working correctly')
+    exit(0)
+else:
+    print('\n✗ SOME TESTS FAILED - Review implementation')
+    exit(1)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Warm Cache - Shared cross-command market data cache
+
+Every cron command (screener → GO → EXECUTE → RECHECK → EXIT → ANALYZE) runs
+as a fresh process. This SQLite-backed cache lets a command reuse data an
+earlier command already downloaded: the screener's daily bars and sector
+lookups feed GO, GO's bar windows feed EXECUTE, EXIT's news feeds ANALYZE.
+
+Each entry has a data type (kind) with its own freshness rule:
+- intraday_price : 15 seconds (15-min delayed snapshot prices)
+- quote          : 5 seconds
+- news           : 15 minutes
+- news_score     : 1 day (invalidation score per article set)
+- indicator_state: 14 days (incremental indicators, advanced by new bars)
+- daily_bars     : until the next daily close is final (4:15 PM ET); a window
+                   holding today's unfinished bar only PARTIAL_BARS_TTL
+- correlation    : until the next daily close (return correlation matrices)
+- minute_vwap    : until the next daily close (session VWAP state from minute bars)
+- earnings       : 1 day
+- reference      : 3 days (sector / ticker details)
+
+Daily bars are stored as typed columns and served as BarSeries (bar_series.py).
+
+Kinds in STALE_LIMITS can also be read for a while after they expire
+(stale=True). Commands use that only when a provider is down or the command's
+deadline has passed, and flag the result (market_data.py); purge_expired(
+keep_stale=True) keeps such entries until their stale limit.
+
+The database lives at cache/warm_cache.sqlite3 (WAL mode, safe for concurrent
+processes). Like the Claude ledger, cache failures never raise - a broken
+cache just means a cold fetch.
+
+Usage:
+  python3 warm_cache.py          # Show entry counts per kind
+  python3 warm_cache.py purge    # Delete expired entries
+  python3 warm_cache.py clear    # Delete everything
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo('America/New_York')
+PROJECT_DIR = Path(__file__).parent
+DEFAULT_DB_PATH = PROJECT_DIR / 'cache' / 'warm_cache.sqlite3'
+
+# Daily bars are final once the 15-min delayed feed has seen the close
+DAILY_CLOSE_FINAL = (16, 15)  # 4:15 PM ET
+
+# Seconds of freshness per kind; 'market_close' = valid until the next daily close
+FRESHNESS_RULES = {
+    'intraday_price': 15,
+    'quote': 5,
+    'news': 15 * 60,
+    'news_score': 24 * 3600,
+    'indicator_state': 14 * 24 * 3600,
+    'daily_bars': 'market_close',
+    'correlation': 'market_close',
+    'minute_vwap': 'market_close',
+    'earnings': 24 * 3600,
+    'reference': 3 * 24 * 3600,
+}
+
+# Seconds of freshness for a daily_bars window whose last bar is still open
+# (fetched during market hours: later commands need the moved price)
+PARTIAL_BARS_TTL = 15 * 60
+
+# Seconds past expiry an entry may still be served as a flagged fallback
+# (bars: a Friday window still covers Monday's pre-market commands)
+STALE_LIMITS = {
+    'intraday_price': 15 * 60,
+    'daily_bars': 4 * 24 * 3600,
+}
+
+
+def next_daily_close(now: datetime) -> datetime:
+    """First 4:15 PM ET strictly after `now` (bars fetched before it may still change)"""
+    now_et = now.astimezone(ET)
+    close = now_et.replace(hour=DAILY_CLOSE_FINAL[0], minute=DAILY_CLOSE_FINAL[1], second=0, microsecond=0)
+    if now_et >= close:
+        close += timedelta(days=1)
+    return close
+
+
+def first_open_day(now: Optional[datetime] = None) -> int:
+    """Epoch day of the first bar that may still change (today until the close is final)"""
+    now_et = (now or datetime.now(ET)).astimezone(ET)
+    today = (now_et.date() - date(1970, 1, 1)).days
+    return today + 1 if (now_et.hour, now_et.minute) >= DAILY_CLOSE_FINAL else today
+
+
+def expires_at(kind: str, created: float) -> float:
+    """Expiry epoch for an entry of `kind` created at epoch `created`"""
+    rule = FRESHNESS_RULES.get(kind)
+    if rule is None:
+        raise ValueError(f"Unknown cache kind: {kind}")
+    if rule == 'market_close':
+        return next_daily_close(datetime.fromtimestamp(created, ET)).timestamp()
+    return created + rule
+
+
+def _entry_bars(entry: Dict):
+    """BarSeries of a cached daily_bars entry (columns; older entries hold Polygon results)"""
+    from bar_series import BarSeries  # numpy only when bars are touched
+    return BarSeries.of(entry['bars'] if 'bars' in entry else entry['results'])
+
+
+def bar_date(bar: Dict) -> str:
+    """ET trading date of a raw Polygon aggregate bar"""
+    return bar.get('date') or datetime.fromtimestamp(bar['t'] / 1000, ET).strftime('%Y-%m-%d')
+
+
+class WarmCache:
+    """SQLite key/value cache with per-kind freshness"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self._lock = threading.Lock()  # One connection shared by worker threads
+        self._conn = None
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'writes': 0, 'errors': 0}
+
+    def _connection(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                ' kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,'
+                ' created_at REAL NOT NULL, expires_at REAL NOT NULL,'
+                ' PRIMARY KEY (kind, key))'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_expiry ON entries (expires_at)')
+            self._conn = conn
+        return self._conn
+
+    def _error(self, action: str, e: Exception):
+        self.stats['errors'] += 1
+        if self.stats['errors'] <= 3:  # Don't flood logs if the DB is unusable
+            print(f"   ⚠️ Warm cache {action} failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Generic get/set
+    # ------------------------------------------------------------------
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Fresh value for (kind, key), or None"""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    'SELECT value FROM entries WHERE kind = ? AND key = ? AND expires_at > ?',
+                    (kind, key, time.time())
+                ).fetchone()
+        except Exception as e:
+            self._error('read', e)
+            return None
+
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return json.loads(row[0])
+
+    def get_many(self, kind: str, keys: List[str], stale: bool = False) -> Dict[str, Any]:
+        """
+        Fresh values for several keys of one kind: {key: value} (missing keys omitted)
+
+        stale=True also returns entries expired less than STALE_LIMITS[kind] ago
+        (fallback when the data cannot be fetched; counted as stale, not hits)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                cutoff = time.time() - (STALE_LIMITS.get(kind, 0) if stale else 0)
+                for start in range(0, len(keys), 500):  # Stay under SQLite's variable limit
+                    chunk = keys[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = conn.execute(
+                        f'SELECT key, value FROM entries WHERE kind = ? AND key IN ({placeholders}) AND expires_at > ?',
+                        (kind, *chunk, cutoff)
+                    ).fetchall()
+                    found.update({key: json.loads(value) for key, value in rows})
+        except Exception as e:
+            self._error('read', e)
+            return {}
+
+        if stale:
+            self.stats['stale'] += len(found)
+            return found
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def set(self, kind: str, key: str, value: Any):
+        """Store a value; expiry follows FRESHNESS_RULES[kind]"""
+        self.set_many(kind, {key: value})
+
+    def set_many(self, kind: str, values: Dict[str, Any], ttl: Optional[float] = None):
+        """Store several values of one kind in one transaction (ttl: seconds, overrides FRESHNESS_RULES)"""
+        if not values:
+            return
+        try:
+            created = time.time()
+            expiry = created + ttl if ttl is not None else expires_at(kind, created)
+            rows = [(kind, key, json.dumps(value, separators=(',', ':')), created, expiry)
+                    for key, value in values.items()]
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)', rows)
+            self.stats['writes'] += len(rows)
+        except Exception as e:
+            self._error('write', e)
+
+    def get_or_fetch(self, kind: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """Cached value, or fetch() and cache it (None/empty results are not cached)"""
+        value = self.get(kind, key)
+        if value is not None:
+            return value
+        value = fetch()
+        if value:
+            self.set(kind, key, value)
+        return value
+
+    # ------------------------------------------------------------------
+    # Daily bars (window-aware)
+    # ------------------------------------------------------------------
+
+    def get_daily_bars(self, ticker: str, start_date: str, stale: bool = False):
+        """
+        Daily bars (BarSeries) for ticker from start_date (YYYY-MM-DD) through today
+
+        Returns None unless a fresh (or, with stale=True, recently expired) cached
+        window starts on or before start_date.
+        """
+        window = self.get_many_daily_bars([ticker], stale=stale).get(ticker)
+        if window is None or window[0] > start_date:
+            return None
+        return window[1].since(start_date)
+
+    def get_many_daily_bars(self, tickers: List[str], stale: bool = False) -> Dict[str, Any]:
+        """Fresh cached windows: {ticker: (window start, BarSeries)}"""
+        return {ticker: (entry['start'], _entry_bars(entry))
+                for ticker, entry in self.get_many('daily_bars', tickers, stale=stale).items()}
+
+    def put_daily_bars(self, ticker: str, start_date: str, bars):
+        """Cache a daily-bar window unless a fresh, wider one ending on the same bar is already stored"""
+        from bar_series import BarSeries
+        bars = BarSeries.of(bars)
+        if not len(bars):
+            return
+        existing = self.get('daily_bars', ticker)
+        if (existing and existing['start'] <= start_date
+                and _entry_bars(existing).last_date >= bars.last_date):
+            return
+        self.set_many_daily_bars({ticker: (start_date, bars)})
+
+    def set_many_daily_bars(self, windows: Dict[str, Any], now: Optional[datetime] = None):
+        """
+        Store {ticker: (window start, bars)} (bars: BarSeries or Polygon results)
+
+        Windows ending in a bar that may still change (today before 4:15 PM ET)
+        expire after PARTIAL_BARS_TTL instead of at the close.
+        """
+        from bar_series import BarSeries  # numpy only when bars are touched
+        open_day = first_open_day(now)
+        final, partial = {}, {}
+        for ticker, (start, bars) in windows.items():
+            bars = BarSeries.of(bars)
+            if len(bars):
+                entries = partial if bars.day[-1] >= open_day else final
+                entries[ticker] = {'start': start, 'bars': bars.to_columns()}
+        self.set_many('daily_bars', final)
+        self.set_many('daily_bars', partial, ttl=PARTIAL_BARS_TTL)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def purge_expired(self, keep_stale: bool = False) -> int:
+        """Delete expired entries (keep_stale: except those within STALE_LIMITS); returns number removed"""
+        limits = STALE_LIMITS if keep_stale else {}
+        try:
+            now = time.time()
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    removed = 0
+                    for kind, limit in limits.items():
+                        removed += conn.execute('DELETE FROM entries WHERE kind = ? AND expires_at <= ?',
+                                                (kind, now - limit)).rowcount
+                    placeholders = ','.join('?' * len(limits))
+                    removed += conn.execute(f'DELETE FROM entries WHERE kind NOT IN ({placeholders}) AND expires_at <= ?',
+                                            (*limits, now)).rowcount
+            return removed
+        except Exception as e:
+            self._error('purge', e)
+            return 0
+
+    def clear(self):
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute('DELETE FROM entries')
+        except Exception as e:
+            self._error('clear', e)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Entry counts per kind: {kind: {'fresh': n, 'expired': n}}"""
+        try:
+            with self._lock:
+                rows = self._connection().execute(
+                    'SELECT kind, SUM(expires_at > ?), SUM(expires_at <= ?) FROM entries GROUP BY kind',
+                    (time.time(), time.time())
+                ).fetchall()
+            return {kind: {'fresh': int(fresh or 0), 'expired': int(expired or 0)} for kind, fresh, expired in rows}
+        except Exception as e:
+            self._error('summary', e)
+            return {}
+
+    def reset_stats(self):
+        """Start a new command's hit/miss counters (the daemon reuses this instance)"""
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'writes': 0, 'errors': 0}
+
+    def print_stats(self, label: str = 'Warm cache'):
+        s = self.stats
+        lookups = s['hits'] + s['misses']
+        if not lookups and not s['writes']:
+            return
+        hit_rate = s['hits'] / lookups * 100 if lookups else 0.0
+        stale = f", {s['stale']} stale fallbacks" if s['stale'] else ''
+        print(f"   🗄️  {label}: {s['hits']}/{lookups} hits ({hit_rate:.0f}%), {s['writes']} writes{stale}")
+
+
+# Shared instance used by the screener and agent
+WARM_CACHE = WarmCache()
+
+
+if __name__ == '__main__':
+    action = sys.argv[1] if len(sys.argv) > 1 else 'summary'
+    if action == 'purge':
+        print(f"Purged {WARM_CACHE.purge_expired()} expired entries")
+    elif action == 'clear':
+        WARM_CACHE.clear()
+        print("Cache cleared")
+    else:
+        print(f"\nWARM CACHE - {WARM_CACHE.path}")
+        print("=" * 50)
+        for kind, counts in sorted(WARM_CACHE.summary().items()):
+            rule = FRESHNESS_RULES.get(kind, '?')
+            print(f"{kind:<16} fresh {counts['fresh']:>6}  expired {counts['expired']:>6}  (rule: {rule})")